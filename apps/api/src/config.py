@@ -54,6 +54,16 @@ class ApiSettings(BaseSettings):
     INOREADER_APP_KEY: Optional[str] = None
     INOREADER_EMAIL: Optional[str] = None
     INOREADER_PASSWORD: Optional[str] = None
+    INOREADER_TOKEN_TTL: int = 86400  # seconds; a 401 forces an earlier login
+    INOREADER_CONCURRENCY: int = 4
+    INOREADER_SYNC_REDIS_URL: str = ""  # empty = sync progress is not persisted
+    INOREADER_SYNC_MAX_PAGES: int = 20
+    # "api" scrapes items here; "queue" hands them to the async worker's bulk lane
+    INOREADER_SCRAPE_MODE: str = "api"
+
+    # Async worker queue (INOREADER_SCRAPE_MODE=queue)
+    ARQ_REDIS_URL: str = "redis://localhost:6379/2"
+    TELEGRAM_BOT_ID: Optional[int] = None  # bot whose outbox delivers queued results
 
     # Utils
     HTTP_REQUEST_TIMEOUT: int = 30
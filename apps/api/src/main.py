@@ -1,13 +1,18 @@
+import asyncio
+
 import sentry_sdk
 
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from contextlib import asynccontextmanager
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from src import database
 from src.routers import inoreader, scraper_routers, scraper
+from src.services import queue_client
+from src.services.inoreader import sync as inoreader_sync
 from src.config import settings
+from fastfetchbot_shared.utils import telemetry
 from fastfetchbot_shared.utils.logger import logger
 from fastfetchbot_shared.exceptions import FastFetchBotError
 
@@ -25,13 +30,28 @@ sentry_sdk.init(
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    from fastfetchbot_shared.services.scrapers import registry
+    from fastfetchbot_shared.services.scrapers.config import JINJA2_ENV
+    from fastfetchbot_shared.utils.headers import init_user_agent_pool
+    from fastfetchbot_shared.utils.template import precompile_templates
+
+    precompile_templates(JINJA2_ENV)
+    await asyncio.to_thread(init_user_agent_pool)
+    telemetry.init_tracing("api")
     if settings.DATABASE_ON:
         await database.startup()
+    if settings.INOREADER_SCRAPE_MODE == "queue":
+        await queue_client.init()
+    registry.start_warm_up()
     try:
         yield
     finally:
         if settings.DATABASE_ON:
             await database.shutdown()
+        await queue_client.close()
+        await inoreader_sync.close()
+        await registry.close_loaded_scrapers()
+        telemetry.shutdown_tracing()
 
 
 class LogMiddleware(BaseHTTPMiddleware):
@@ -61,6 +81,11 @@ def create_app():
         logger.exception(f"Unhandled error on {request.method} {request.url}")
         return JSONResponse(status_code=500, content={"error": "Internal server error"})
 
+    @fastapi_app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        body, content_type = telemetry.render_metrics()
+        return Response(content=body, media_type=content_type)
+
     fastapi_app.add_middleware(LogMiddleware)
     fastapi_app.include_router(inoreader.router)
     fastapi_app.include_router(scraper.router)
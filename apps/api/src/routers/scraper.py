@@ -2,13 +2,17 @@ import asyncio
 
 from fastapi import APIRouter
 from fastapi.requests import Request
+from fastapi.responses import Response
 
 from src.config import settings
 from src.services.scrapers.common import InfoExtractService
 from fastapi import Security
 from src.auth import verify_api_key
+from fastfetchbot_shared.services.scrapers.circuit_breaker import breaker_states
+from fastfetchbot_shared.utils import codec
 from fastfetchbot_shared.utils.logger import logger
 from fastfetchbot_shared.utils.parse import get_url_metadata
+from fastfetchbot_shared.utils.telemetry import stage
 
 router = APIRouter(prefix="/scraper")
 
@@ -24,9 +28,10 @@ async def get_item_route(request: Request):
         query_params.pop(settings.API_KEY_NAME)
     url_metadata = await get_url_metadata(url, ban_list)
     item = InfoExtractService(url_metadata, **query_params)
-    result = await item.get_item()
+    with stage("scrape", source=url_metadata.source):
+        result = await item.get_item()
     logger.debug(f"getItem result: {result}")
-    return result
+    return Response(content=codec.encode(result), media_type="application/json")
 
 
 @router.post("/getUrlMetadata", dependencies=[Security(verify_api_key)])
@@ -35,3 +40,8 @@ async def get_url_metadata_route(request: Request):
     ban_list = request.query_params.get("ban_list")
     url_metadata = await get_url_metadata(url, ban_list)
     return url_metadata.to_dict()
+
+
+@router.get("/circuits", dependencies=[Security(verify_api_key)])
+async def get_circuits_route():
+    return breaker_states()
@@ -1,3 +1,5 @@
+import asyncio
+import time
 from typing import Optional
 from urllib.parse import quote
 
@@ -16,6 +18,11 @@ INOREADER_CONTENT_URL = "https://www.inoreader.com/reader/api/0/stream/contents/
 TAG_PATH = "user/-/label/"
 OTHER_PATH = "user/-/state/com.google/"
 INOREADER_LOGIN_URL = "https://www.inoreader.com/accounts/ClientLogin"
+INOREADER_MARK_ALL_AS_READ_URL = "https://www.inoreader.com/reader/api/0/mark-all-as-read"
+
+# ClientLogin token shared by every request: (expires_at, token)
+_auth_token: Optional[tuple[float, str]] = None
+_auth_lock = asyncio.Lock()
 
 
 class Inoreader(MetadataItem):
@@ -81,10 +88,13 @@ class Inoreader(MetadataItem):
         return stream_id
 
     @staticmethod
-    async def mark_all_as_read(stream_id: str, timestamp: int = 0) -> None:
-        request_url = "https://www.inoreader.com/reader/api/0/mark-all-as-read"
+    async def mark_all_as_read(
+            stream_id: str, timestamp: int = 0, client: httpx.AsyncClient = None
+    ) -> None:
         params = {"s": stream_id, "ts": timestamp}
-        resp = await Inoreader.get_api_info(url=request_url, params=params)
+        resp = await Inoreader.get_api_info(
+            url=INOREADER_MARK_ALL_AS_READ_URL, params=params, client=client
+        )
         logger.debug(resp.text)
 
     @staticmethod
@@ -93,7 +103,26 @@ class Inoreader(MetadataItem):
             tag: str = None,
             feed: str = None,
             params: dict = None,
+            client: httpx.AsyncClient = None,
     ) -> Optional[dict | list]:
+        data, _ = await Inoreader.get_api_page(
+            stream_type=stream_type, tag=tag, feed=feed, params=params, client=client
+        )
+        return data
+
+    @staticmethod
+    async def get_api_page(
+            stream_type: str = "broadcast",
+            tag: str = None,
+            feed: str = None,
+            params: dict = None,
+            client: httpx.AsyncClient = None,
+    ) -> tuple[list, Optional[str]]:
+        """Fetch one page of stream contents.
+
+        Returns the processed items and the ``continuation`` token to pass as
+        ``c`` for the next page, ``None`` on the last page.
+        """
         stream_id = Inoreader.get_stream_id(stream_type=stream_type, tag=tag, feed=feed)
         request_url = INOREADER_CONTENT_URL + stream_id
         default_params = {
@@ -105,16 +134,18 @@ class Inoreader(MetadataItem):
         if params:
             default_params.update(params)
         params = default_params
-        resp = await Inoreader.get_api_info(url=request_url, params=params)
+        resp = await Inoreader.get_api_info(url=request_url, params=params, client=client)
         logger.debug(resp.text)
-        data = resp.json()
-        data = await Inoreader.process_items_data(data)
-        return data
+        resp.raise_for_status()
+        raw_data = resp.json()
+        data = await Inoreader.process_items_data(raw_data)
+        return data, raw_data.get("continuation")
 
     @staticmethod
     async def process_items_data(data: dict) -> Optional[dict | list]:
         expression = """
                             items[].{
+                            "id": id,
                             "aurl": canonical[0].href,
                             "title": title,
                             "author": origin.title,
@@ -131,11 +162,17 @@ class Inoreader(MetadataItem):
         return data
 
     @staticmethod
-    async def get_api_info(
-            url: str,
-            params=None,
-    ) -> Response:
-        async with httpx.AsyncClient() as client:
+    async def get_auth_token(client: httpx.AsyncClient, rejected: str = None) -> str:
+        """Return the ClientLogin token, logging in only when the cached one has
+        expired or is the *rejected* token a request just got a 401 with."""
+        global _auth_token
+        async with _auth_lock:
+            if (
+                    _auth_token
+                    and _auth_token[0] > time.monotonic()
+                    and _auth_token[1] != rejected
+            ):
+                return _auth_token[1]
             resp = await client.post(
                 INOREADER_LOGIN_URL,
                 params={
@@ -143,21 +180,38 @@ class Inoreader(MetadataItem):
                     "Passwd": settings.INOREADER_PASSWORD,
                 },
             )
-            authorization = resp.text.split("\n")[2].split("=")[1]
-
-        async with httpx.AsyncClient() as client:
-            headers = HEADERS
-            headers["Authorization"] = f"GoogleLogin auth={authorization}"
-            params = params or {}
-            params.update(
-                {
-                    "AppId": settings.INOREADER_APP_ID,
-                    "AppKey": settings.INOREADER_APP_KEY,
-                }
-            )
+            resp.raise_for_status()
+            token = resp.text.split("\n")[2].split("=")[1]
+            _auth_token = (time.monotonic() + settings.INOREADER_TOKEN_TTL, token)
+            return token
+
+    @staticmethod
+    async def get_api_info(
+            url: str,
+            params=None,
+            client: httpx.AsyncClient = None,
+    ) -> Response:
+        if client is None:
+            async with httpx.AsyncClient(timeout=settings.HTTP_REQUEST_TIMEOUT) as client:
+                return await Inoreader.get_api_info(url=url, params=params, client=client)
+
+        params = {
+            **(params or {}),
+            "AppId": settings.INOREADER_APP_ID,
+            "AppKey": settings.INOREADER_APP_KEY,
+        }
+        token = await Inoreader.get_auth_token(client)
+        resp = await client.get(
+            url=url,
+            params=params,
+            headers={**HEADERS, "Authorization": f"GoogleLogin auth={token}"},
+        )
+        if resp.status_code == 401:
+            # Token revoked or expired early; log in again once
+            token = await Inoreader.get_auth_token(client, rejected=token)
             resp = await client.get(
                 url=url,
                 params=params,
-                headers=headers,
+                headers={**HEADERS, "Authorization": f"GoogleLogin auth={token}"},
             )
-            return resp
+        return resp
@@ -1,11 +1,14 @@
+import asyncio
 from typing import Union, Optional, Dict, Callable, Awaitable
 
 import httpx
 
 from src.config import settings
 from fastfetchbot_shared.models.url_metadata import UrlMetadata
-from src.services.inoreader import Inoreader
+from src.services import queue_client
+from src.services.inoreader import Inoreader, sync
 from src.services.scrapers.common import InfoExtractService
+from fastfetchbot_shared.utils import codec
 from fastfetchbot_shared.utils.logger import logger
 from fastfetchbot_shared.utils.parse import get_url_metadata, get_bool
 
@@ -13,17 +16,101 @@ default_telegram_channel_id = None
 
 # Type alias for the message callback
 MessageCallback = Callable[[dict, Union[int, str]], Awaitable[None]]
+# Called with the original Inoreader item after its message was delivered
+DeliveredCallback = Callable[[dict], Awaitable[None]]
 
 
-async def _default_message_callback(metadata_item: dict, chat_id: Union[int, str]) -> None:
+def _http_message_callback(client: httpx.AsyncClient) -> MessageCallback:
     """Default callback that sends via HTTP to the Telegram bot service."""
-    async with httpx.AsyncClient() as client:
+
+    async def send_message(metadata_item: dict, chat_id: Union[int, str]) -> None:
         await client.post(
             f"{settings.TELEGRAM_BOT_CALLBACK_URL}/send_message",
-            json={"data": metadata_item, "chat_id": str(chat_id)},
+            content=codec.encode({"data": metadata_item, "chat_id": str(chat_id)}),
+            headers={"Content-Type": "application/json"},
             timeout=120,
         )
 
+    return send_message
+
+
+async def _extract_item(item: dict, use_inoreader_content: bool) -> dict:
+    """Classify, scrape and enrich (Telegraph, PDF) one Inoreader item."""
+    url_type_item = await get_url_metadata(item["aurl"])
+    url_type_dict = url_type_item.to_dict()
+    logger.debug(f"ino original: {use_inoreader_content}")
+    if (
+            use_inoreader_content is True
+            or url_type_dict["content_type"] == "unknown"
+    ):
+        is_video = url_type_dict["content_type"] == "video"
+        content_type = url_type_dict["content_type"] if is_video else "social_media"
+        source = url_type_dict["source"] if is_video else "inoreader"
+        url_metadata = UrlMetadata(
+            url=item["aurl"],
+            content_type=content_type,
+            source=source,
+        )
+        metadata_item = InfoExtractService(
+            url_metadata=url_metadata,
+            data=item,
+            store_document=True,
+            category=item["category"],
+        )
+    else:
+        metadata_item = InfoExtractService(
+            url_metadata=url_type_item,
+            data=item,
+            store_document=True,
+        )
+    return await metadata_item.get_item()
+
+
+async def _enqueue_item(item: dict, telegram_channel_id: Union[int, str]) -> bool:
+    """Hand one item to the async worker's bulk lane.
+
+    Returns False for links no scraper recognises; those are scraped here.
+    """
+    url_metadata = await get_url_metadata(item["aurl"])
+    if url_metadata.content_type == "unknown":
+        return False
+    await queue_client.enqueue_scrape(
+        url=item["aurl"],
+        chat_id=telegram_channel_id,
+        source=url_metadata.source,
+        content_type=url_metadata.content_type,
+        store_document=True,
+    )
+    return True
+
+
+async def _prefetch_reddit(data: list) -> None:
+    """Load every Reddit submission of the batch with one API call.
+
+    The items then find their submission in the cache; on failure each item
+    fetches its own as usual.
+    """
+    from fastfetchbot_shared.services.scrapers.reddit.client import fetch_submissions
+
+    try:
+        await fetch_submissions(item["aurl"] for item in data)
+    except Exception as e:
+        logger.warning(f"Reddit prefetch failed: {e}")
+
+
+def _read_watermark(delivered: list, pending: list) -> Optional[int]:
+    """Timestamp for ``mark-all-as-read`` that covers every delivered item but no pending one.
+
+    Inoreader marks items older than the timestamp, so the watermark sits one
+    second past the newest delivered item, capped at the oldest pending item.
+    """
+    if not delivered:
+        return None
+    watermark = max(item["timestamp"] for item in delivered) + 1
+    if pending:
+        watermark = min(watermark, min(item["timestamp"] for item in pending))
+    return watermark
+
 
 async def process_inoreader_data(
         data: list,
@@ -31,44 +118,118 @@ async def process_inoreader_data(
         telegram_channel_id: Union[int, str] = default_telegram_channel_id,
         stream_id: str = None,
         message_callback: MessageCallback = None,
+        client: httpx.AsyncClient = None,
+        on_delivered: DeliveredCallback = None,
 ):
-    if message_callback is None:
-        message_callback = _default_message_callback
-
-    for item in data:
-        url_type_item = await get_url_metadata(item["aurl"])
-        url_type_dict = url_type_item.to_dict()
-        logger.debug(f"ino original: {use_inoreader_content}")
-        if (
-                use_inoreader_content is True
-                or url_type_dict["content_type"] == "unknown"
-        ):
-            is_video = url_type_dict["content_type"] == "video"
-            content_type = url_type_dict["content_type"] if is_video else "social_media"
-            source = url_type_dict["source"] if is_video else "inoreader"
-            url_metadata = UrlMetadata(
-                url=item["aurl"],
-                content_type=content_type,
-                source=source,
+    """Scrape up to ``INOREADER_CONCURRENCY`` items at a time and deliver them in feed order.
+
+    With ``INOREADER_SCRAPE_MODE=queue`` and *use_inoreader_content* off, items
+    are enqueued on the worker's bulk lane instead and count as delivered once
+    enqueued; the worker's results reach the channel through the bot's outbox.
+
+    When *stream_id* is given, the delivered items are marked as read with a
+    single watermark call once the run ends, also when an item fails part way.
+    """
+    if client is None:
+        async with httpx.AsyncClient(timeout=settings.HTTP_REQUEST_TIMEOUT) as client:
+            return await process_inoreader_data(
+                data, use_inoreader_content, telegram_channel_id, stream_id,
+                message_callback=message_callback, client=client,
+                on_delivered=on_delivered,
             )
-            metadata_item = InfoExtractService(
-                url_metadata=url_metadata,
-                data=item,
-                store_document=True,
-                category=item["category"],
+    if message_callback is None:
+        message_callback = _http_message_callback(client)
+
+    enqueue = settings.INOREADER_SCRAPE_MODE == "queue" and not use_inoreader_content
+    if not use_inoreader_content and not enqueue:
+        await _prefetch_reddit(data)
+
+    semaphore = asyncio.Semaphore(settings.INOREADER_CONCURRENCY)
+
+    async def extract(item: dict) -> Optional[dict]:
+        async with semaphore:
+            if enqueue and await _enqueue_item(item, telegram_channel_id):
+                return None
+            return await _extract_item(item, use_inoreader_content)
+
+    tasks = [asyncio.create_task(extract(item)) for item in data]
+    delivered = 0
+    try:
+        for task in tasks:
+            message_metadata_item = await task
+            if message_metadata_item is not None:
+                await message_callback(message_metadata_item, telegram_channel_id)
+            if on_delivered is not None:
+                await on_delivered(data[delivered])
+            delivered += 1
+    finally:
+        for task in tasks[delivered:]:
+            task.cancel()
+        await asyncio.gather(*tasks[delivered:], return_exceptions=True)
+        watermark = _read_watermark(data[:delivered], data[delivered:])
+        if stream_id and watermark is not None:
+            await Inoreader.mark_all_as_read(
+                stream_id=stream_id, timestamp=watermark, client=client
             )
-        else:
-            metadata_item = InfoExtractService(
-                url_metadata=url_type_item,
-                data=item,
-                store_document=True,
+
+
+async def sync_inoreader_stream(
+        stream_type: str,
+        tag: Optional[str],
+        feed: Optional[str],
+        params: Dict,
+        use_inoreader_content: bool,
+        telegram_channel_id: Union[int, str],
+        message_callback: MessageCallback = None,
+        client: httpx.AsyncClient = None,
+) -> None:
+    """Deliver everything new in a stream, paging with ``c`` and ``ot``.
+
+    Progress is saved after every delivered item (see :mod:`.sync`), so a
+    crashed or failed sync resumes on the page it stopped at and skips the
+    items it already delivered. Pages are capped at ``INOREADER_SYNC_MAX_PAGES``
+    per call; the next trigger picks up from the saved continuation.
+    """
+    stream_id = Inoreader.get_stream_id(stream_type=stream_type, tag=tag, feed=feed)
+    state = await sync.load_state(stream_id)
+    page_params = dict(params)
+    if state.timestamp:
+        # ot returns items newer than it; keep the watermark second for same-second items
+        page_params["ot"] = state.timestamp - 1
+
+    async def on_delivered(item: dict) -> None:
+        state.advance(item)
+        await sync.save_state(stream_id, state)
+
+    continuation = state.continuation
+    for _ in range(settings.INOREADER_SYNC_MAX_PAGES):
+        request_params = {**page_params, "c": continuation} if continuation else page_params
+        try:
+            data, next_continuation = await Inoreader.get_api_page(
+                stream_type=stream_type, tag=tag, feed=feed, params=request_params,
+                client=client,
             )
-        message_metadata_item = await metadata_item.get_item()
-        await message_callback(message_metadata_item, telegram_channel_id)
-        if stream_id:
-            await Inoreader.mark_all_as_read(
-                stream_id=stream_id, timestamp=item["timestamp"] - 1
+        except httpx.HTTPStatusError as e:
+            if not continuation:
+                raise
+            # Continuation tokens expire; the ot watermark alone still resumes correctly
+            logger.warning(f"Inoreader continuation for {stream_id} rejected ({e}), restarting from watermark")
+            continuation = None
+            continue
+        state.continuation = continuation
+        pending = [item for item in data if not state.is_delivered(item)]
+        if pending:
+            await process_inoreader_data(
+                pending, use_inoreader_content, telegram_channel_id, stream_id,
+                message_callback=message_callback, client=client,
+                on_delivered=on_delivered,
             )
+        state.continuation = next_continuation
+        await sync.save_state(stream_id, state)
+        if not next_continuation:
+            return
+        continuation = next_continuation
+    logger.info(f"Inoreader sync of {stream_id} stopped after {settings.INOREADER_SYNC_MAX_PAGES} pages")
 
 
 async def get_inoreader_item_async(
@@ -77,32 +238,30 @@ async def get_inoreader_item_async(
         params: Optional[Dict] = None,
         message_callback: MessageCallback = None,
 ) -> None:
-    stream_id = None
     use_inoreader_content = True
     telegram_channel_id = default_telegram_channel_id
-    if trigger and params and not data:
-        logger.debug(f"params:{params}")
-        use_inoreader_content = get_bool(params.get("useInoreaderContent"), True)
-        stream_type = params.get("streamType", "broadcast")
-        telegram_channel_id = params.get("channelId", default_telegram_channel_id)
-        tag = params.get("tag", None)
-        feed = params.get("feed", None)
-        the_remaining_params = {
-            k: v
-            for k, v in params.items()
-            if k not in ["streamType", "channelId", "tag", "feed"]
-        }
-        data = await Inoreader.get_api_item_data(
-            stream_type=stream_type, tag=tag, params=the_remaining_params, feed=feed
-        )
-        if not data:
+    async with httpx.AsyncClient(timeout=settings.HTTP_REQUEST_TIMEOUT) as client:
+        if trigger and params and not data:
+            logger.debug(f"params:{params}")
+            use_inoreader_content = get_bool(params.get("useInoreaderContent"), True)
+            stream_type = params.get("streamType", "broadcast")
+            telegram_channel_id = params.get("channelId", default_telegram_channel_id)
+            tag = params.get("tag", None)
+            feed = params.get("feed", None)
+            the_remaining_params = {
+                k: v
+                for k, v in params.items()
+                if k not in ["streamType", "channelId", "tag", "feed"]
+            }
+            await sync_inoreader_stream(
+                stream_type, tag, feed, the_remaining_params,
+                use_inoreader_content, telegram_channel_id,
+                message_callback=message_callback, client=client,
+            )
             return
-        stream_id = Inoreader.get_stream_id(stream_type=stream_type, tag=tag, feed=feed)
-    if type(data) is dict:
-        data = [data]
-    await process_inoreader_data(
-        data, use_inoreader_content, telegram_channel_id, stream_id,
-        message_callback=message_callback,
-    )
-    if stream_id:
-        await Inoreader.mark_all_as_read(stream_id=stream_id)
+        if type(data) is dict:
+            data = [data]
+        await process_inoreader_data(
+            data, use_inoreader_content, telegram_channel_id,
+            message_callback=message_callback, client=client,
+        )
@@ -0,0 +1,84 @@
+import json
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+import redis.asyncio as aioredis
+
+from src.config import settings
+from fastfetchbot_shared.utils.logger import logger
+
+SYNC_KEY_PREFIX = "inoreader:sync"
+
+_redis: aioredis.Redis | None = None
+
+
+@dataclass
+class SyncState:
+    """How far a stream has been delivered.
+
+    ``timestamp`` is the newest delivered item's ``updated`` time and ``ids``
+    the delivered items sharing that second, so a restart can tell them apart
+    from undelivered items with the same timestamp. ``continuation`` is the
+    token of the page being delivered; it is ``None`` once a sync reaches the
+    end of the stream.
+    """
+
+    timestamp: int = 0
+    ids: list[str] = field(default_factory=list)
+    continuation: Optional[str] = None
+
+    def is_delivered(self, item: dict) -> bool:
+        if item["timestamp"] == self.timestamp:
+            return item.get("id") in self.ids
+        return item["timestamp"] < self.timestamp
+
+    def advance(self, item: dict) -> None:
+        if item["timestamp"] > self.timestamp:
+            self.timestamp = item["timestamp"]
+            self.ids = [item.get("id")]
+        elif item["timestamp"] == self.timestamp:
+            self.ids.append(item.get("id"))
+
+
+async def _get_redis() -> aioredis.Redis | None:
+    """Return the shared Redis connection, None when sync state is not persisted."""
+    global _redis
+    if not settings.INOREADER_SYNC_REDIS_URL:
+        return None
+    if _redis is None:
+        _redis = aioredis.from_url(settings.INOREADER_SYNC_REDIS_URL, decode_responses=True)
+    return _redis
+
+
+def _redis_key(stream_id: str) -> str:
+    return f"{SYNC_KEY_PREFIX}:{stream_id}"
+
+
+async def load_state(stream_id: str) -> SyncState:
+    """Return the persisted state of *stream_id*, or a fresh one."""
+    try:
+        r = await _get_redis()
+        if r is not None:
+            raw = await r.get(_redis_key(stream_id))
+            if raw is not None:
+                return SyncState(**json.loads(raw))
+    except Exception as e:
+        logger.warning(f"Failed to load Inoreader sync state for {stream_id}: {e}")
+    return SyncState()
+
+
+async def save_state(stream_id: str, state: SyncState) -> None:
+    try:
+        r = await _get_redis()
+        if r is not None:
+            await r.set(_redis_key(stream_id), json.dumps(asdict(state)))
+    except Exception as e:
+        logger.warning(f"Failed to save Inoreader sync state for {stream_id}: {e}")
+
+
+async def close() -> None:
+    """Close the Redis connection."""
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
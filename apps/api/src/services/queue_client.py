@@ -0,0 +1,86 @@
+import uuid
+
+from arq.connections import ArqRedis, create_pool, RedisSettings
+
+from src.config import settings
+from fastfetchbot_shared.utils.config import SCRAPE_LANE_BULK, SCRAPE_LANE_QUEUES
+from fastfetchbot_shared.utils.logger import logger
+from fastfetchbot_shared.utils.telemetry import inject_context, stage
+
+_arq_redis: ArqRedis | None = None
+
+
+def _parse_redis_url(url: str) -> RedisSettings:
+    """Parse a redis:// URL into ARQ RedisSettings."""
+    from urllib.parse import urlparse
+
+    parsed = urlparse(url)
+    return RedisSettings(
+        host=parsed.hostname or "localhost",
+        port=parsed.port or 6379,
+        database=int(parsed.path.lstrip("/") or 0),
+        password=parsed.password,
+    )
+
+
+async def init() -> None:
+    """Initialize the ARQ Redis connection pool.
+
+    Raises:
+        RuntimeError: If ``TELEGRAM_BOT_ID`` is not set; queued results are
+            delivered through that bot's outbox.
+    """
+    global _arq_redis
+    if settings.TELEGRAM_BOT_ID is None:
+        raise RuntimeError("INOREADER_SCRAPE_MODE=queue requires TELEGRAM_BOT_ID")
+    if _arq_redis is None:
+        _arq_redis = await create_pool(_parse_redis_url(settings.ARQ_REDIS_URL))
+        logger.info(f"ARQ queue client initialized for bot_id={settings.TELEGRAM_BOT_ID}")
+
+
+async def close() -> None:
+    """Close the ARQ Redis connection pool."""
+    global _arq_redis
+    if _arq_redis is not None:
+        await _arq_redis.aclose()
+        _arq_redis = None
+        logger.info("ARQ queue client closed")
+
+
+async def enqueue_scrape(
+    url: str,
+    chat_id: int | str,
+    source: str = "",
+    content_type: str = "",
+    lane: str = SCRAPE_LANE_BULK,
+    **kwargs,
+) -> str:
+    """Enqueue a scrape-and-enrich job to the ARQ worker.
+
+    Jobs go to the bulk lane by default, so feed batches never sit in front
+    of the bot's interactive requests. The worker pushes the result to the
+    outbox of ``TELEGRAM_BOT_ID``, which sends it to *chat_id*.
+
+    Returns the job_id (UUID string).
+    """
+    if _arq_redis is None:
+        raise RuntimeError("Queue client not initialized. Call queue_client.init() first.")
+    if lane not in SCRAPE_LANE_QUEUES:
+        raise ValueError(f"Unknown scrape lane: {lane}")
+
+    job_id = str(uuid.uuid4())
+    with stage("enqueue", job_id=job_id, source=source, lane=lane):
+        await _arq_redis.enqueue_job(
+            "scrape_and_enrich",
+            _queue_name=SCRAPE_LANE_QUEUES[lane],
+            url=url,
+            chat_id=chat_id,
+            job_id=job_id,
+            source=source,
+            content_type=content_type,
+            bot_id=settings.TELEGRAM_BOT_ID,
+            trace_context=inject_context(),
+            **kwargs,
+        )
+    logger.info(f"Enqueued scrape job: job_id={job_id}, lane={lane}, url={url}")
+    return job_id
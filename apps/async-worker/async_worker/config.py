@@ -10,9 +10,14 @@ class AsyncWorkerSettings(BaseSettings):
     # ARQ Redis
     ARQ_REDIS_URL: str = "redis://localhost:6379/2"
 
+    # Priority lanes ("name:weight:reserved", highest priority first) sharing ARQ_MAX_JOBS slots
+    ARQ_MAX_JOBS: int = 10
+    ARQ_LANES: str = "interactive:6:4,background:3:2,bulk:1:1"
+
     # Outbox Redis
     OUTBOX_REDIS_URL: str = "redis://localhost:6379/3"
     OUTBOX_QUEUE_KEY: str = "scrape:outbox"
+    OUTBOX_STREAM_MAXLEN: int = 10000  # approximate cap per bot stream
 
     # Celery
     CELERY_BROKER_URL: str = "redis://localhost:6379/0"
@@ -31,9 +36,21 @@ class AsyncWorkerSettings(BaseSettings):
     MONGODB_PASSWORD: str = ""
     MONGODB_URL: str = ""
 
+    # Metadata version retention: the newest KEEP_LAST versions of a URL are kept
+    # (0 keeps all) and older versions past MAX_AGE seconds are deleted (0 disables);
+    # the newest version is always kept. Off until KEEP_LAST or MAX_AGE is set,
+    # since compaction deletes history for good.
+    METADATA_RETENTION_KEEP_LAST: int = 0
+    METADATA_RETENTION_MAX_AGE: int = 0
+    METADATA_RETENTION_INTERVAL: int = 3600  # seconds between compactions; 0 disables
+    METADATA_RETENTION_BATCH_SIZE: int = 500  # versions per delete_many
+
     # Timeout
     DOWNLOAD_VIDEO_TIMEOUT: int = 600
 
+    # Prometheus /metrics port (ARQ has no HTTP server of its own); 0 disables
+    METRICS_PORT: int = 10452
+
     # Runtime flag (not loaded from env; set at startup)
     file_id_consumer_ready: bool = False
 
@@ -0,0 +1,122 @@
+"""Priority lanes: one ARQ queue and one ARQ worker per lane, sharing job slots.
+
+All lane workers in a process draw from ``ARQ_MAX_JOBS`` slots through a
+single :class:`LaneCapacity`. Each lane owns ``reserved`` slots nobody else
+can take, so interactive jobs always have room to start. The remaining
+shared slots go to whichever waiting lane has borrowed the fewest of them
+relative to its weight (weighted fair sharing), so a bulk backlog can use
+idle capacity without starving the other lanes.
+"""
+
+import asyncio
+from dataclasses import dataclass
+
+from fastfetchbot_shared.utils.config import SCRAPE_LANE_QUEUES
+
+
+@dataclass(frozen=True)
+class Lane:
+    name: str
+    queue_name: str
+    weight: int
+    reserved: int
+
+
+def parse_lanes(raw: str, max_jobs: int) -> list[Lane]:
+    """Parse ``name:weight:reserved`` entries separated by commas.
+
+    Raises:
+        ValueError: On unknown lane names, non-positive weights, or when the
+            reservations add up to more than *max_jobs*.
+    """
+    lanes = []
+    for entry in raw.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, weight, reserved = (part.strip() for part in entry.split(":"))
+        if name not in SCRAPE_LANE_QUEUES:
+            raise ValueError(f"Unknown scrape lane '{name}' in ARQ_LANES")
+        lane = Lane(name=name, queue_name=SCRAPE_LANE_QUEUES[name], weight=int(weight), reserved=int(reserved))
+        if lane.weight < 1 or lane.reserved < 0:
+            raise ValueError(f"Lane '{name}' needs weight >= 1 and reserved >= 0")
+        lanes.append(lane)
+    if not lanes:
+        raise ValueError("ARQ_LANES defines no lanes")
+    if sum(lane.reserved for lane in lanes) > max_jobs:
+        raise ValueError(f"ARQ_LANES reserves more than ARQ_MAX_JOBS={max_jobs} slots")
+    return lanes
+
+
+class LaneCapacity:
+    """Job slots shared by the lane workers of one process."""
+
+    def __init__(self, lanes: list[Lane], max_jobs: int):
+        self.lanes = {lane.name: lane for lane in lanes}
+        self.shared = max_jobs - sum(lane.reserved for lane in lanes)
+        self.running = dict.fromkeys(self.lanes, 0)
+        self._waiting = dict.fromkeys(self.lanes, 0)
+        self._waiters: list[asyncio.Future] = []
+
+    def _borrowed(self, name: str) -> int:
+        return max(0, self.running[name] - self.lanes[name].reserved)
+
+    def _can_start(self, name: str) -> bool:
+        lane = self.lanes[name]
+        if self.running[name] < lane.reserved:
+            return True
+        if sum(self._borrowed(n) for n in self.lanes) >= self.shared:
+            return False
+        share = self._borrowed(name) / lane.weight
+        # Yield the shared slot to any other waiting lane that is further below its share
+        return all(
+            self._borrowed(other.name) / other.weight >= share
+            for other in self.lanes.values()
+            if other.name != name
+            and self._waiting[other.name]
+            and self.running[other.name] >= other.reserved
+        )
+
+    async def acquire(self, name: str) -> None:
+        self._waiting[name] += 1
+        try:
+            while not self._can_start(name):
+                waiter = asyncio.get_running_loop().create_future()
+                self._waiters.append(waiter)
+                await waiter
+        finally:
+            self._waiting[name] -= 1
+        self.running[name] += 1
+
+    def release(self, name: str) -> None:
+        self.running[name] -= 1
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+
+class LaneSemaphore:
+    """Stands in for ``arq.Worker.sem`` so a lane worker takes slots from a :class:`LaneCapacity`.
+
+    ARQ acquires ``sem`` before starting each job and releases it (synchronously)
+    when the job finishes, which is the only interface this needs to provide.
+    """
+
+    def __init__(self, capacity: LaneCapacity, lane_name: str):
+        self.capacity = capacity
+        self.lane_name = lane_name
+
+    async def acquire(self) -> bool:
+        await self.capacity.acquire(self.lane_name)
+        return True
+
+    def release(self) -> None:
+        self.capacity.release(self.lane_name)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.release()
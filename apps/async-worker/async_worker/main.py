@@ -1,18 +1,23 @@
 import asyncio
+import signal
 
+from arq import Worker
 from arq.connections import RedisSettings
 
 from async_worker.config import settings
+from async_worker.lanes import LaneCapacity, LaneSemaphore, parse_lanes
 from async_worker.tasks.scrape import scrape_and_enrich
+from fastfetchbot_shared.utils.logger import logger
 
 # The twitter-api-client-v2 library installs uvloop's EventLoopPolicy at
-# import time (triggered transitively via InfoExtractService → twitter).
-# uvloop's policy raises RuntimeError from get_event_loop() if no loop
-# exists, unlike stdlib asyncio which lazily creates one. ARQ's
-# Worker.__init__ calls get_event_loop() before any loop is running.
+# import time. Scrapers are loaded on first use or by the warm-up, so this
+# normally happens once the loop runs, but anything importing the twitter
+# scraper at module level would install it before ARQ starts. uvloop's policy
+# raises RuntimeError from get_event_loop() if no loop exists, unlike stdlib
+# asyncio which lazily creates one, and ARQ's Worker.__init__ calls
+# get_event_loop() before any loop is running.
 #
-# Fix: after all imports have completed (so uvloop policy is in place),
-# create and set a loop using uvloop's own new_event_loop().
+# Fix: after all imports have completed, make sure a loop is set.
 try:
     asyncio.get_event_loop()
 except RuntimeError:
@@ -36,7 +41,11 @@ def parse_redis_url(url: str) -> RedisSettings:
 
 
 class WorkerSettings:
-    """ARQ worker configuration."""
+    """ARQ worker configuration.
+
+    ``arq async_worker.main.WorkerSettings`` runs a single worker on the
+    interactive lane only; ``python -m async_worker.main`` runs every lane.
+    """
 
     functions = [scrape_and_enrich]
     redis_settings = parse_redis_url(settings.ARQ_REDIS_URL)
@@ -45,7 +54,7 @@ class WorkerSettings:
     job_timeout = 600
 
     # Maximum concurrent jobs
-    max_jobs = 10
+    max_jobs = settings.ARQ_MAX_JOBS
 
     # Retry jobs on transient failures (e.g. Redis timeout after task completes)
     retry_jobs = True
@@ -59,6 +68,17 @@ class WorkerSettings:
 
     @staticmethod
     async def on_startup(ctx: dict) -> None:
+        from fastfetchbot_shared.services.scrapers.config import JINJA2_ENV
+        from fastfetchbot_shared.utils.headers import init_user_agent_pool
+        from fastfetchbot_shared.utils.template import precompile_templates
+        from fastfetchbot_shared.utils import telemetry
+
+        precompile_templates(JINJA2_ENV)
+        await asyncio.to_thread(init_user_agent_pool)
+        telemetry.init_tracing("async-worker")
+        if settings.METRICS_PORT:
+            telemetry.start_metrics_server(settings.METRICS_PORT)
+
         if settings.DATABASE_ON:
             from fastfetchbot_shared.database.mongodb import init_mongodb
 
@@ -69,6 +89,14 @@ class WorkerSettings:
             await file_id_consumer.start()
             settings.file_id_consumer_ready = True
 
+            from async_worker.services import retention
+
+            await retention.start()
+
+        from fastfetchbot_shared.services.scrapers import registry
+
+        registry.start_warm_up()
+
     @staticmethod
     async def on_shutdown(ctx: dict) -> None:
         if settings.file_id_consumer_ready:
@@ -77,6 +105,96 @@ class WorkerSettings:
             await file_id_consumer.stop()
 
         if settings.DATABASE_ON:
+            from async_worker.services import retention
+
+            await retention.stop()
+
             from fastfetchbot_shared.database.mongodb import close_mongodb
 
             await close_mongodb()
+
+        from fastfetchbot_shared.services.scrapers import registry
+
+        await registry.close_loaded_scrapers()
+
+        from fastfetchbot_shared.utils import telemetry
+
+        telemetry.shutdown_tracing()
+
+
+def create_lane_workers(capacity: LaneCapacity) -> list[Worker]:
+    """Build one ARQ worker per lane, all gated by *capacity*.
+
+    Startup/shutdown hooks and signal handling are left to :func:`run_lanes`
+    so they run once per process rather than once per lane.
+    """
+    workers = []
+    for lane in capacity.lanes.values():
+        worker = Worker(
+            functions=WorkerSettings.functions,
+            queue_name=lane.queue_name,
+            redis_settings=WorkerSettings.redis_settings,
+            max_jobs=lane.reserved + capacity.shared,
+            job_timeout=WorkerSettings.job_timeout,
+            retry_jobs=WorkerSettings.retry_jobs,
+            max_tries=WorkerSettings.max_tries,
+            keep_result=WorkerSettings.keep_result,
+            health_check_interval=WorkerSettings.health_check_interval,
+            handle_signals=False,
+            ctx={"lane": lane.name},
+        )
+        worker.sem = LaneSemaphore(capacity, lane.name)
+        workers.append(worker)
+    return workers
+
+
+async def run_lanes() -> None:
+    """Run a worker for every lane in ``ARQ_LANES`` until SIGINT/SIGTERM.
+
+    If one lane's worker crashes, the other lanes are stopped and the error is
+    re-raised, so the process exits non-zero instead of running on without
+    draining that lane's queue.
+    """
+    lanes = parse_lanes(settings.ARQ_LANES, settings.ARQ_MAX_JOBS)
+    capacity = LaneCapacity(lanes, settings.ARQ_MAX_JOBS)
+    workers = create_lane_workers(capacity)
+
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(
+            signum, lambda s=signum: [worker.handle_sig(s) for worker in workers]
+        )
+
+    ctx: dict = {}
+    await WorkerSettings.on_startup(ctx)
+    logger.info(
+        "Lane workers starting: "
+        + ", ".join(f"{lane.name}(weight={lane.weight}, reserved={lane.reserved})" for lane in lanes)
+        + f", shared={capacity.shared}"
+    )
+    tasks = {asyncio.create_task(worker.async_run()): lane for worker, lane in zip(workers, lanes)}
+    failure: BaseException | None = None
+    try:
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                # handle_sig cancels a worker's main task, so a signal shows up as cancellation
+                if task.cancelled() or task.exception() is None or failure is not None:
+                    continue
+                failure = task.exception()
+                logger.opt(exception=failure).error(
+                    f"Lane {tasks[task].name} crashed, stopping the other lanes"
+                )
+                for worker in workers:
+                    worker.handle_sig(signal.SIGTERM)
+    finally:
+        for worker in workers:
+            await worker.close()
+        await WorkerSettings.on_shutdown(ctx)
+    if failure is not None:
+        raise failure
+
+
+if __name__ == "__main__":
+    asyncio.run(run_lanes())
@@ -3,6 +3,7 @@
 from fastfetchbot_shared.models.metadata_item import MessageType
 from fastfetchbot_shared.services.telegraph import Telegraph
 from fastfetchbot_shared.utils.logger import logger
+from fastfetchbot_shared.utils.telemetry import stage
 from async_worker.config import settings
 
 
@@ -33,7 +34,8 @@ async def enrich(
     if store_telegraph:
         telegraph_item = Telegraph.from_dict(metadata_item)
         try:
-            telegraph_url = await telegraph_item.get_telegraph()
+            with stage("telegraph"):
+                telegraph_url = await telegraph_item.get_telegraph()
         except Exception as e:
             logger.error(f"Error publishing to Telegraph: {e}")
             telegraph_url = ""
@@ -54,7 +56,8 @@ async def enrich(
                 celery_app=celery_app,
                 timeout=settings.DOWNLOAD_VIDEO_TIMEOUT,
             )
-            output_filename = await pdf_export.export()
+            with stage("pdf_export"):
+                output_filename = await pdf_export.export()
             metadata_item["media_files"].append(
                 {
                     "media_type": "document",
@@ -70,7 +73,8 @@ async def enrich(
         try:
             from fastfetchbot_shared.database.mongodb.cache import save_metadata
 
-            await save_metadata(metadata_item)
+            with stage("database_save"):
+                await save_metadata(metadata_item)
         except Exception as e:
             logger.error(f"Error saving to MongoDB: {e}")
 
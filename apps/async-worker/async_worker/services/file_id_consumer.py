@@ -1,14 +1,17 @@
 import asyncio
 import json
+from datetime import datetime
 
 import redis.asyncio as aioredis
 
 from async_worker.config import settings
+from fastfetchbot_shared.utils.file_id_index import index_entries, index_key
 from fastfetchbot_shared.utils.logger import logger
 
 FILEID_QUEUE_KEY = "fileid:updates"
 FILEID_DLQ_KEY = "fileid:updates:dlq"
 _MAX_RETRIES = 3
+_RESTORE_BATCH_SIZE = 1000
 
 _redis: aioredis.Redis | None = None
 _consumer_task: asyncio.Task | None = None
@@ -24,6 +27,10 @@ async def _get_redis() -> aioredis.Redis:
 async def _consume_loop() -> None:
     """Background loop: BRPOP from the file_id updates queue and persist to MongoDB."""
     r = await _get_redis()
+    try:
+        await _restore_file_id_index(r)
+    except Exception as e:
+        logger.warning(f"Failed to restore the file_id index from MongoDB: {e}")
     logger.info(f"file_id consumer started, listening on '{FILEID_QUEUE_KEY}'")
 
     while True:
@@ -82,8 +89,58 @@ async def _consume_loop() -> None:
             await asyncio.sleep(1)
 
 
+async def _restore_file_id_index(r: aioredis.Redis) -> None:
+    """Reload the Redis file_id index of each bot from MongoDB.
+
+    Fields are written with HSETNX, so entries a bot has recorded since
+    Redis lost its data are kept and only the missing ones are filled in.
+    """
+    from fastfetchbot_shared.database.mongodb.models.metadata import TelegramFileId
+
+    collection = TelegramFileId.get_pymongo_collection()
+
+    async def restore_batch(key: str, entries: dict[str, str]) -> int:
+        async with r.pipeline(transaction=False) as pipe:
+            for media_key, file_id in entries.items():
+                pipe.hsetnx(key, media_key, file_id)
+            return sum(await pipe.execute())
+
+    for bot_id in await collection.distinct("bot_id"):
+        key = index_key(bot_id)
+        restored = 0
+        entries = {}
+        async for doc in collection.find({"bot_id": bot_id}, {"_id": 0, "media_key": 1, "file_id": 1}):
+            entries[doc["media_key"]] = doc["file_id"]
+            if len(entries) >= _RESTORE_BATCH_SIZE:
+                restored += await restore_batch(key, entries)
+                entries = {}
+        if entries:
+            restored += await restore_batch(key, entries)
+        if restored:
+            logger.info(f"Restored {restored} file_ids of bot {bot_id} from MongoDB")
+
+
+async def _persist_file_ids(bot_id: int, updates: list[dict]) -> None:
+    """Upsert the bot-scoped file_id index entries of the updates into MongoDB."""
+    from pymongo import UpdateOne
+    from fastfetchbot_shared.database.mongodb.models.metadata import TelegramFileId
+
+    now = datetime.utcnow()
+    operations = [
+        UpdateOne(
+            {"bot_id": bot_id, "media_key": media_key},
+            {"$set": {"file_id": file_id, "updated_at": now}},
+            upsert=True,
+        )
+        for media_key, file_id in index_entries(updates).items()
+    ]
+    if operations:
+        await TelegramFileId.get_pymongo_collection().bulk_write(operations, ordered=False)
+
+
 async def _process_file_id_update(payload: dict) -> None:
-    """Update the latest Metadata document with telegram file_ids."""
+    """Persist the bot's file_id index entries and update the latest Metadata document
+    with telegram file_ids and media store keys."""
     from fastfetchbot_shared.database.mongodb.models.metadata import Metadata
 
     metadata_url = payload.get("metadata_url", "")
@@ -93,6 +150,10 @@ async def _process_file_id_update(payload: dict) -> None:
         logger.warning(f"Invalid file_id update payload: {payload}")
         return
 
+    bot_id = payload.get("bot_id")
+    if bot_id is not None:
+        await _persist_file_ids(bot_id, updates)
+
     doc = await Metadata.find(
         Metadata.url == metadata_url
     ).sort("-version").limit(1).first_or_none()
@@ -104,9 +165,16 @@ async def _process_file_id_update(payload: dict) -> None:
     matched = 0
     for update in updates:
         for mf in doc.media_files:
-            if mf.url == update["url"] and mf.telegram_file_id is None:
+            if mf.url != update["url"]:
+                continue
+            updated = False
+            if update.get("telegram_file_id") and mf.telegram_file_id is None:
                 mf.telegram_file_id = update["telegram_file_id"]
-                matched += 1
+                updated = True
+            if update.get("file_key") and mf.file_key is None:
+                mf.file_key = update["file_key"]
+                updated = True
+            matched += updated
 
     if matched > 0:
         await doc.save()
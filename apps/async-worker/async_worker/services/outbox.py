@@ -1,9 +1,9 @@
-import json
-
 import redis.asyncio as aioredis
 
 from async_worker.config import settings
+from fastfetchbot_shared.utils import codec
 from fastfetchbot_shared.utils.logger import logger
+from fastfetchbot_shared.utils.telemetry import inject_context, stage
 
 _redis: aioredis.Redis | None = None
 
@@ -24,10 +24,13 @@ async def push(
     error: str | None = None,
     bot_id: int | str | None = None,
 ) -> None:
-    """Push a result payload to the per-bot Redis outbox queue.
+    """Append a result payload to the per-bot Redis outbox stream.
 
-    The queue key is ``{OUTBOX_QUEUE_KEY}:{bot_id}`` when *bot_id* is provided,
+    The stream key is ``{OUTBOX_QUEUE_KEY}:{bot_id}`` when *bot_id* is provided,
     falling back to the plain ``OUTBOX_QUEUE_KEY`` for backward compatibility.
+    Entries are consumed by the bot through a consumer group, so several bot
+    replicas can share one stream and unacknowledged entries survive crashes.
+    The payload carries the current trace context so delivery joins the trace.
     """
     r = await get_outbox_redis()
     queue_key = f"{settings.OUTBOX_QUEUE_KEY}:{bot_id}" if bot_id is not None else settings.OUTBOX_QUEUE_KEY
@@ -37,9 +40,19 @@ async def push(
         "message_id": message_id,
         "metadata_item": metadata_item,
         "error": error,
+        "trace_context": inject_context(),
     }
-    await r.lpush(queue_key, json.dumps(payload, ensure_ascii=False))
-    logger.info(f"Pushed result to outbox: job_id={job_id}, queue={queue_key}, error={error is not None}")
+    with stage("outbox_push"):
+        entry_id = await r.xadd(
+            queue_key,
+            {"payload": codec.encode(payload)},
+            maxlen=settings.OUTBOX_STREAM_MAXLEN,
+            approximate=True,
+        )
+    logger.info(
+        f"Pushed result to outbox: job_id={job_id}, stream={queue_key}, "
+        f"entry_id={entry_id}, error={error is not None}"
+    )
 
 
 async def close() -> None:
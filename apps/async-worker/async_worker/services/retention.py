@@ -0,0 +1,147 @@
+"""Periodic Metadata version compaction, and a command line report.
+
+Every ``METADATA_RETENTION_INTERVAL`` seconds one worker replica (the one
+that takes the Redis lock) deletes the Metadata versions the retention
+policy no longer keeps.
+
+Report per-URL version counts and the space a compaction would reclaim, or
+run one compaction by hand::
+
+    python -m async_worker.services.retention report [--top 20] [--json]
+    python -m async_worker.services.retention compact [--keep-last 3] [--max-age 2592000]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from dataclasses import asdict
+
+import redis.asyncio as aioredis
+
+from async_worker.config import settings
+from fastfetchbot_shared.utils.logger import logger
+
+RETENTION_LOCK_KEY = "metadata:retention:lock"
+
+_redis: aioredis.Redis | None = None
+_task: asyncio.Task | None = None
+
+
+async def _get_redis() -> aioredis.Redis:
+    global _redis
+    if _redis is None:
+        _redis = aioredis.from_url(settings.OUTBOX_REDIS_URL, decode_responses=True)
+    return _redis
+
+
+def policy_from_settings():
+    from fastfetchbot_shared.database.mongodb.retention import RetentionPolicy
+
+    return RetentionPolicy(
+        keep_last=settings.METADATA_RETENTION_KEEP_LAST,
+        max_age=settings.METADATA_RETENTION_MAX_AGE,
+    )
+
+
+async def run_once() -> bool:
+    """Compact if no other replica did within the interval; True if this one ran."""
+    from fastfetchbot_shared.database.mongodb.retention import compact
+
+    r = await _get_redis()
+    # Expires on its own, so a crashed replica does not block compaction
+    if not await r.set(RETENTION_LOCK_KEY, os.getpid(), nx=True, ex=settings.METADATA_RETENTION_INTERVAL):
+        return False
+    await compact(policy_from_settings(), batch_size=settings.METADATA_RETENTION_BATCH_SIZE)
+    return True
+
+
+async def _retention_loop() -> None:
+    logger.info(f"Metadata retention started: {policy_from_settings()}")
+    while True:
+        try:
+            await run_once()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Metadata retention failed: {e}")
+        await asyncio.sleep(settings.METADATA_RETENTION_INTERVAL)
+
+
+async def start() -> None:
+    """Start the compaction loop as a background asyncio task."""
+    global _task
+    if _task is not None:
+        logger.warning("Metadata retention already running")
+        return
+    if not settings.METADATA_RETENTION_INTERVAL or not policy_from_settings().enabled:
+        logger.info("Metadata retention disabled")
+        return
+    _task = asyncio.create_task(_retention_loop())
+
+
+async def stop() -> None:
+    """Stop the compaction loop and close the Redis connection."""
+    global _task, _redis
+
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
+        logger.info("Metadata retention stopped")
+
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+
+
+def _print_report(report) -> None:
+    action = "would reclaim" if report.dry_run else "reclaimed"
+    print(f"{report.urls} URLs, {report.versions} versions, {report.bytes} bytes; "
+          f"{report.pruned} versions pruned, {action} {report.reclaimed_bytes} bytes")
+    for url in report.top_urls:
+        print(f"    {url.versions:>5} versions {url.bytes:>12} bytes  "
+              f"-{url.pruned:<5} -{url.reclaimed_bytes:<12} {url.url}")
+
+
+async def _main(args: argparse.Namespace) -> None:
+    from fastfetchbot_shared.database.mongodb import close_mongodb, init_mongodb
+    from fastfetchbot_shared.database.mongodb.retention import RetentionPolicy, compact
+
+    policy = RetentionPolicy(
+        keep_last=settings.METADATA_RETENTION_KEEP_LAST if args.keep_last is None else args.keep_last,
+        max_age=settings.METADATA_RETENTION_MAX_AGE if args.max_age is None else args.max_age,
+    )
+    await init_mongodb(settings.MONGODB_URL)
+    try:
+        report = await compact(
+            policy,
+            batch_size=settings.METADATA_RETENTION_BATCH_SIZE,
+            dry_run=args.command == "report",
+            top=args.top,
+        )
+    finally:
+        await close_mongodb()
+    if args.json:
+        json.dump(asdict(report), sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write(os.linesep)
+    else:
+        _print_report(report)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["report", "compact"])
+    parser.add_argument("--keep-last", type=int, help="override METADATA_RETENTION_KEEP_LAST")
+    parser.add_argument("--max-age", type=int, help="override METADATA_RETENTION_MAX_AGE (seconds)")
+    parser.add_argument("--top", type=int, default=20, help="URLs with the most versions to list")
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
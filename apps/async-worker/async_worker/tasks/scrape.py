@@ -1,9 +1,13 @@
 import uuid
 import traceback
+from datetime import datetime, timezone
 
+from fastfetchbot_shared.models.metadata_item import DELIVERY_FIELDS
 from fastfetchbot_shared.models.url_metadata import UrlMetadata
 from fastfetchbot_shared.services.scrapers.common import InfoExtractService
+from fastfetchbot_shared.utils.config import SCRAPE_LANE_INTERACTIVE
 from fastfetchbot_shared.utils.logger import logger
+from fastfetchbot_shared.utils.telemetry import observe, stage
 from async_worker.services import outbox, enrichment
 from async_worker.celery_client import celery_app
 from async_worker.config import settings
@@ -21,6 +25,7 @@ async def scrape_and_enrich(
     store_telegraph: bool | None = None,
     store_document: bool | None = None,
     force_refresh_cache: bool = False,
+    trace_context: dict | None = None,
     **kwargs,
 ) -> dict:
     """ARQ task: scrape a URL, enrich the result, and push to the outbox.
@@ -38,6 +43,8 @@ async def scrape_and_enrich(
         store_telegraph: Override Telegraph publishing flag.
         store_document: Override PDF export flag.
         force_refresh_cache: If True, bypass the database cache and re-scrape.
+        trace_context: W3C trace carrier from the bot, so the worker's spans
+                       join the trace of the Telegram update.
         **kwargs: Extra arguments passed to the scraper.
     """
     if job_id is None:
@@ -45,55 +52,64 @@ async def scrape_and_enrich(
 
     logger.info(f"[{job_id}] Starting scrape: url={url}, source={source}")
 
-    try:
-        # Build UrlMetadata and scrape
-        url_metadata = UrlMetadata(
-            url=url, source=source, content_type=content_type
-        )
-        service = InfoExtractService(
-            url_metadata=url_metadata,
-            store_telegraph=False,  # We handle enrichment separately
-            store_document=False,
-            store_database=settings.DATABASE_ON,
-            database_cache_ttl=-1 if force_refresh_cache else settings.DATABASE_CACHE_TTL,
-            celery_app=celery_app,
-            timeout=settings.DOWNLOAD_VIDEO_TIMEOUT,
-            **kwargs,
-        )
-        metadata_item = await service.get_item()
+    lane = ctx.get("lane", SCRAPE_LANE_INTERACTIVE)
+    enqueue_time = ctx.get("enqueue_time")
+    if enqueue_time is not None and ctx.get("job_try", 1) == 1:
+        observe(f"arq_queue_wait.{lane}", (datetime.now(timezone.utc) - enqueue_time).total_seconds())
 
-        # Skip enrichment if result came from cache
-        if not metadata_item.pop("_cached", False):
-            metadata_item = await enrichment.enrich(
-                metadata_item,
-                store_telegraph=store_telegraph,
-                store_document=store_document,
+    with stage("scrape_and_enrich", parent=trace_context, job_id=job_id, source=source, lane=lane):
+        try:
+            # Build UrlMetadata and scrape
+            url_metadata = UrlMetadata(
+                url=url, source=source, content_type=content_type
             )
+            service = InfoExtractService(
+                url_metadata=url_metadata,
+                store_telegraph=False,  # We handle enrichment separately
+                store_document=False,
+                store_database=settings.DATABASE_ON,
+                database_cache_ttl=-1 if force_refresh_cache else settings.DATABASE_CACHE_TTL,
+                cache_fields=DELIVERY_FIELDS,
+                celery_app=celery_app,
+                timeout=settings.DOWNLOAD_VIDEO_TIMEOUT,
+                **kwargs,
+            )
+            with stage("scrape", source=source):
+                metadata_item = await service.get_item()
+
+            # Skip enrichment if result came from cache
+            if not metadata_item.pop("_cached", False):
+                with stage("enrich"):
+                    metadata_item = await enrichment.enrich(
+                        metadata_item,
+                        store_telegraph=store_telegraph,
+                        store_document=store_document,
+                    )
 
-        logger.info(f"[{job_id}] Scrape completed successfully")
+            logger.info(f"[{job_id}] Scrape completed successfully")
 
-        # Push to outbox (per-bot queue key)
-        await outbox.push(
-            job_id=job_id,
-            chat_id=chat_id,
-            message_id=message_id,
-            metadata_item=metadata_item,
-            bot_id=bot_id,
-        )
+            # Push to outbox (per-bot queue key)
+            await outbox.push(
+                job_id=job_id,
+                chat_id=chat_id,
+                message_id=message_id,
+                metadata_item=metadata_item,
+                bot_id=bot_id,
+            )
 
-        return {"job_id": job_id, "status": "success"}
+            return {"job_id": job_id, "status": "success"}
 
-    except Exception as e:
-        logger.error(f"[{job_id}] Scrape failed: {e}")
-        logger.error(traceback.format_exc())
+        except Exception as e:
+            logger.error(f"[{job_id}] Scrape failed: {e}")
+            logger.error(traceback.format_exc())
 
-        # Push error to outbox so the bot can notify the user
-        await outbox.push(
-            job_id=job_id,
-            chat_id=chat_id,
-            message_id=message_id,
-            error=str(e),
-            bot_id=bot_id,
-        )
+            # Push error to outbox so the bot can notify the user
+            await outbox.push(
+                job_id=job_id,
+                chat_id=chat_id,
+                message_id=message_id,
+                error=str(e),
+                bot_id=bot_id,
+            )
 
-        return {"job_id": job_id, "status": "error", "error": str(e)}
+            return {"job_id": job_id, "status": "error", "error": str(e)}
@@ -2,10 +2,11 @@ import os
 import secrets
 from typing import Optional, Union
 
-from jinja2 import Environment, FileSystemLoader
 from pydantic import Field, computed_field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from fastfetchbot_shared.utils.template import create_template_environment
+
 
 class TelegramBotSettings(BaseSettings):
     model_config = SettingsConfigDict(extra="ignore")
@@ -65,9 +66,29 @@ class TelegramBotSettings(BaseSettings):
     OUTBOX_REDIS_URL: str = "redis://localhost:6379/3"
     OUTBOX_QUEUE_KEY: str = "scrape:outbox"
 
+    # Outbox stream consumer group (shared by all replicas of the same bot)
+    OUTBOX_CONSUMER_GROUP: str = "telegram-bot"
+    OUTBOX_CONSUMER_NAME: str = ""  # defaults to "{hostname}-{pid}"
+    OUTBOX_READ_COUNT: int = 10
+    OUTBOX_BLOCK_MS: int = 5000
+    OUTBOX_CLAIM_IDLE_MS: int = 60000  # reclaim entries pending longer than this
+    OUTBOX_MAX_DELIVERIES: int = 3  # attempts before moving to the dead-letter stream
+    OUTBOX_DLQ_MAXLEN: int = 10000
+
+    # Seconds to wait for a channel post's automatic forward into its discussion group
+    DISCUSSION_FORWARD_TIMEOUT: float = 10.0
+
+    # Chat metadata cache (get_chat results), seconds
+    CHAT_INFO_CACHE_TTL: int = 3600
+
     # User settings database
     SETTINGS_DATABASE_URL: str = "sqlite+aiosqlite:///data/fastfetchbot.db"
 
+    # User settings cache: per-replica LRU, plus Redis shared by replicas in queue mode
+    USER_SETTINGS_CACHE_SIZE: int = 10000
+    USER_SETTINGS_CACHE_TTL: int = 60  # seconds a local copy lives if no invalidation arrives
+    USER_SETTINGS_SHARED_TTL: int = 86400  # seconds in Redis
+
     # Template language
     TEMPLATE_LANGUAGE: str = "zh_CN"
 
@@ -103,9 +124,7 @@ settings = TelegramBotSettings()
 # Jinja2 template configuration
 current_directory = os.path.dirname(os.path.abspath(__file__))
 templates_directory = os.path.join(current_directory, "templates")
-JINJA2_ENV = Environment(
-    loader=FileSystemLoader(templates_directory), lstrip_blocks=True, trim_blocks=True
-)
+JINJA2_ENV = create_template_environment(templates_directory, cache_namespace="telegram-bot")
 
 
 # --- Parsed channel/ban list values ---
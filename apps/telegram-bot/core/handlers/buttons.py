@@ -8,6 +8,7 @@ from telegram.ext import (
 )
 
 from fastfetchbot_shared.models.metadata_item import MessageType
+from fastfetchbot_shared.utils.config import SCRAPE_LANE_INTERACTIVE, SCRAPE_LANE_BACKGROUND
 from core import api_client
 from core.services.message_sender import send_item_message
 from core.services.user_settings import get_force_refresh_cache
@@ -74,6 +75,7 @@ async def buttons_process(update: Update, context: CallbackContext) -> None:
                 chat_id=chat_id,
                 source=data.get("source", ""),
                 content_type=data.get("content_type", ""),
+                lane=SCRAPE_LANE_BACKGROUND if data["type"] == "channel" else SCRAPE_LANE_INTERACTIVE,
                 **extra_args,
             )
             await replying_message.delete()
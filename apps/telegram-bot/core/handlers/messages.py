@@ -3,6 +3,7 @@ import json
 import traceback
 
 from telegram import (
+    MessageOrigin,
     Update,
 )
 from telegram.constants import ParseMode
@@ -11,6 +12,8 @@ from telegram.ext import (
     ContextTypes,
 )
 
+from core.services import chat_info
+from core.services.discussion_forwards import record_forward
 from core.services.user_settings import ensure_user_settings
 from fastfetchbot_shared.utils.logger import logger
 from core.config import TELEBOT_DEBUG_CHANNEL
@@ -30,6 +33,25 @@ async def all_messages_process(update: Update, context: CallbackContext) -> None
             )
 
 
+async def my_chat_member_process(update: Update, context: CallbackContext) -> None:
+    """Drop cached chat info when the bot's membership or rights in a chat change."""
+    chat_member_update = update.my_chat_member
+    if chat_member_update is None:
+        return
+    await chat_info.invalidate(context.bot, chat_member_update.chat.id)
+
+
+async def automatic_forward_process(update: Update, context: CallbackContext) -> None:
+    """Record a channel post's automatic forward into its linked discussion group."""
+    message = update.message
+    if message is None or not message.is_automatic_forward:
+        return
+    origin = message.forward_origin
+    if origin is None or origin.type != MessageOrigin.CHANNEL:
+        return
+    await record_forward(origin.chat.id, origin.message_id, message.message_id)
+
+
 async def error_process(update: object, context: ContextTypes.DEFAULT_TYPE) -> None:
     logger.error("Exception while handling an update:", exc_info=context.error)
     tb_list = traceback.format_exception(
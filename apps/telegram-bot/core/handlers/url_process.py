@@ -8,9 +8,15 @@ from telegram.ext import (
 )
 
 from core.services.message_sender import send_item_message
-from core.services.user_settings import get_auto_fetch_in_dm, get_force_refresh_cache
-from fastfetchbot_shared.utils.config import SOCIAL_MEDIA_WEBSITE_PATTERNS, VIDEO_WEBSITE_PATTERNS
+from core.services.user_settings import get_user_settings
+from fastfetchbot_shared.utils.config import (
+    SOCIAL_MEDIA_WEBSITE_PATTERNS,
+    VIDEO_WEBSITE_PATTERNS,
+    SCRAPE_LANE_INTERACTIVE,
+    SCRAPE_LANE_BACKGROUND,
+)
 from fastfetchbot_shared.utils.logger import logger
+from fastfetchbot_shared.utils.telemetry import stage
 from core.config import (
     settings,
     TELEGRAM_CHANNEL_ID,
@@ -27,15 +33,16 @@ async def _get_url_metadata(url: str, ban_list: list | None = None) -> dict:
     In queue mode: calls the shared library's get_url_metadata directly
     (pure URL parsing, no network call needed).
     """
-    if settings.SCRAPE_MODE == "queue":
-        from fastfetchbot_shared.utils.parse import get_url_metadata as shared_get_url_metadata
+    with stage("url_metadata"):
+        if settings.SCRAPE_MODE == "queue":
+            from fastfetchbot_shared.utils.parse import get_url_metadata as shared_get_url_metadata
 
-        url_metadata = await shared_get_url_metadata(url, ban_list=ban_list)
-        return url_metadata.to_dict()
-    else:
-        from core import api_client
+            url_metadata = await shared_get_url_metadata(url, ban_list=ban_list)
+            return url_metadata.to_dict()
+        else:
+            from core import api_client
 
-        return await api_client.get_url_metadata(url, ban_list=ban_list)
+            return await api_client.get_url_metadata(url, ban_list=ban_list)
 
 
 async def _fetch_and_send(
@@ -45,6 +52,7 @@ async def _fetch_and_send(
     source: str = "",
     content_type: str = "",
     message=None,
+    lane: str = SCRAPE_LANE_INTERACTIVE,
     **kwargs,
 ) -> None:
     """Fetch an item via API or queue depending on SCRAPE_MODE.
@@ -56,6 +64,7 @@ async def _fetch_and_send(
         source: Pre-resolved source platform (e.g. "twitter").
         content_type: Pre-resolved content type (e.g. "social_media").
         message: Optional telegram Message for reply context.
+        lane: ARQ priority lane in queue mode; ignored in API mode.
         **kwargs: Extra arguments passed to the scraper.
     """
     if settings.SCRAPE_MODE == "queue":
@@ -67,12 +76,14 @@ async def _fetch_and_send(
             message_id=message_id if message_id is not None else (message.message_id if message else None),
             source=source,
             content_type=content_type,
+            lane=lane,
             **kwargs,
         )
     else:
         from core import api_client
 
-        metadata_item = await api_client.get_item(url=url, **kwargs)
+        with stage("api_get_item", source=source):
+            metadata_item = await api_client.get_item(url=url, **kwargs)
         await send_item_message(metadata_item, chat_id=chat_id, message=message)
 
 
@@ -80,10 +91,9 @@ async def https_url_process(update: Update, context: CallbackContext) -> None:
     message = update.message
 
     # Check user's preferences
-    user_id = message.from_user.id
-    auto_fetch = await get_auto_fetch_in_dm(user_id)
-    force_refresh = await get_force_refresh_cache(user_id)
-    if auto_fetch:
+    user_settings = await get_user_settings(message.from_user.id)
+    force_refresh = user_settings.force_refresh_cache
+    if user_settings.auto_fetch_in_dm:
         await _auto_fetch_urls(message, force_refresh_cache=force_refresh)
         return
 
@@ -312,6 +322,7 @@ async def https_url_auto_process(update: Update, context: CallbackContext) -> No
                 url=url_metadata["url"],
                 chat_id=message.chat_id,
                 message=message,
+                lane=SCRAPE_LANE_BACKGROUND,
                 source=url_metadata.get("source", ""),
                 content_type=url_metadata.get("content_type", ""),
             )
@@ -323,6 +334,7 @@ async def https_url_auto_process(update: Update, context: CallbackContext) -> No
                 url=url_metadata["url"],
                 chat_id=message.chat_id,
                 message=message,
+                lane=SCRAPE_LANE_BACKGROUND,
                 source=url_metadata.get("source", ""),
                 content_type=url_metadata.get("content_type", ""),
             )
@@ -331,6 +343,7 @@ async def https_url_auto_process(update: Update, context: CallbackContext) -> No
                 url=url_metadata["url"],
                 chat_id=message.chat_id,
                 message=message,
+                lane=SCRAPE_LANE_BACKGROUND,
                 source=url_metadata.get("source", ""),
                 content_type=url_metadata.get("content_type", ""),
             )
@@ -3,7 +3,9 @@ import uuid
 from arq.connections import ArqRedis, create_pool, RedisSettings
 
 from core.config import settings
+from fastfetchbot_shared.utils.config import SCRAPE_LANE_INTERACTIVE, SCRAPE_LANE_QUEUES
 from fastfetchbot_shared.utils.logger import logger
+from fastfetchbot_shared.utils.telemetry import inject_context, stage
 
 _arq_redis: ArqRedis | None = None
 _bot_id: int | None = None
@@ -51,26 +53,38 @@ async def enqueue_scrape(
     message_id: int | None = None,
     source: str = "",
     content_type: str = "",
+    lane: str = SCRAPE_LANE_INTERACTIVE,
     **kwargs,
 ) -> str:
     """Enqueue a scrape-and-enrich job to the ARQ worker.
 
+    *lane* picks the priority lane (see ``SCRAPE_LANE_QUEUES``). Each lane is a
+    separate ARQ queue, so bulk jobs never sit in front of interactive ones.
+
+    The current trace context travels with the job so the worker's spans
+    join the trace of the Telegram update.
+
     Returns the job_id (UUID string).
     """
     if _arq_redis is None or _bot_id is None:
         raise RuntimeError("Queue client not initialized. Call queue_client.init() first.")
+    if lane not in SCRAPE_LANE_QUEUES:
+        raise ValueError(f"Unknown scrape lane: {lane}")
 
     job_id = str(uuid.uuid4())
-    await _arq_redis.enqueue_job(
-        "scrape_and_enrich",
-        url=url,
-        chat_id=chat_id,
-        job_id=job_id,
-        message_id=message_id,
-        source=source,
-        content_type=content_type,
-        bot_id=_bot_id,
-        **kwargs,
-    )
-    logger.info(f"Enqueued scrape job: job_id={job_id}, url={url}")
+    with stage("enqueue", job_id=job_id, source=source, lane=lane):
+        await _arq_redis.enqueue_job(
+            "scrape_and_enrich",
+            _queue_name=SCRAPE_LANE_QUEUES[lane],
+            url=url,
+            chat_id=chat_id,
+            job_id=job_id,
+            message_id=message_id,
+            source=source,
+            content_type=content_type,
+            bot_id=_bot_id,
+            trace_context=inject_context(),
+            **kwargs,
+        )
+    logger.info(f"Enqueued scrape job: job_id={job_id}, lane={lane}, url={url}")
     return job_id
@@ -1,3 +1,4 @@
+import asyncio
 import mimetypes
 
 mimetypes.init()
@@ -12,18 +13,26 @@ from telegram.ext import (
     CommandHandler,
     MessageHandler,
     CallbackQueryHandler,
+    ChatMemberHandler,
     filters,
     InvalidCallbackData,
     AIORateLimiter,
+    SimpleUpdateProcessor,
 )
 
 from fastfetchbot_shared.utils.logger import logger
+from fastfetchbot_shared.utils.telemetry import stage
 from core.config import settings
 
 from core.handlers.url_process import https_url_process, https_url_auto_process
 from core.handlers.buttons import buttons_process, invalid_buttons
 from core.handlers.commands import start_command, settings_command, settings_callback
-from core.handlers.messages import all_messages_process, error_process
+from core.handlers.messages import (
+    all_messages_process,
+    automatic_forward_process,
+    my_chat_member_process,
+    error_process,
+)
 
 # Re-export for external consumers
 from core.services.message_sender import send_item_message  # noqa: F401
@@ -40,6 +49,38 @@ async def set_webhook() -> bool:
     )
 
 
+def _is_automatic_forward(update: object) -> bool:
+    message = getattr(update, "message", None)
+    return bool(message is not None and message.is_automatic_forward)
+
+
+class TracingUpdateProcessor(SimpleUpdateProcessor):
+    """Run each update's handlers inside a ``telegram_update`` root span.
+
+    Updates are still handled one at a time and in order, except automatic
+    forwards into a discussion group. send_item_message waits for those from
+    inside a handler, so they must not queue up behind that handler.
+    """
+
+    def __init__(self) -> None:
+        # More than one slot makes the Application hand each update over as a
+        # task; ordering is then enforced by the lock below.
+        super().__init__(max_concurrent_updates=2)
+        self._sequential = asyncio.Lock()
+
+    async def process_update(self, update, coroutine) -> None:
+        if _is_automatic_forward(update):
+            await self.do_process_update(update, coroutine)
+            return
+        async with self._sequential:
+            await self.do_process_update(update, coroutine)
+
+    async def do_process_update(self, update, coroutine) -> None:
+        update_id = getattr(update, "update_id", None)
+        with stage("telegram_update", update_id=update_id):
+            await coroutine
+
+
 if settings.TELEGRAM_BOT_TOKEN is not None:
     builder = (
         Application.builder()
@@ -52,6 +93,7 @@ if settings.TELEGRAM_BOT_TOKEN is not None:
         .base_file_url(settings.TELEBOT_API_SERVER_FILE)
         .local_mode(settings.TELEBOT_LOCAL_FILE_MODE)
         .rate_limiter(AIORateLimiter(max_retries=settings.TELEBOT_MAX_RETRY))
+        .concurrent_updates(TracingUpdateProcessor())
     )
     if settings.TELEGRAM_BOT_MODE == "webhook":
         builder = builder.updater(None)
@@ -61,6 +103,12 @@ else:
 
 
 async def startup() -> None:
+    from core.config import JINJA2_ENV
+    from fastfetchbot_shared.utils.headers import init_user_agent_pool
+    from fastfetchbot_shared.utils.template import precompile_templates
+
+    precompile_templates(JINJA2_ENV)
+    await asyncio.to_thread(init_user_agent_pool)
     await application.initialize()
     # initialize handlers
     all_messages_handler = MessageHandler(
@@ -97,6 +145,14 @@ async def startup() -> None:
     buttons_process_handler = CallbackQueryHandler(
         callback=buttons_process, pattern=dict
     )
+    automatic_forward_handler = MessageHandler(
+        filters=filters.IS_AUTOMATIC_FORWARD,
+        callback=automatic_forward_process,
+    )
+    my_chat_member_handler = ChatMemberHandler(
+        callback=my_chat_member_process,
+        chat_member_types=ChatMemberHandler.MY_CHAT_MEMBER,
+    )
     # add handlers
     application.add_handlers(
         [
@@ -108,8 +164,11 @@ async def startup() -> None:
             settings_callback_handler,
             invalid_buttons_handler,
             buttons_process_handler,
+            my_chat_member_handler,
         ]
     )
+    # separate group so it runs alongside all_messages_handler instead of being shadowed by it
+    application.add_handler(automatic_forward_handler, group=-1)
     application.add_error_handler(error_process)
     # Register bot menu commands
     await application.bot.set_my_commands(
@@ -121,11 +180,13 @@ async def startup() -> None:
     # Initialize queue mode if enabled
     if settings.SCRAPE_MODE == "queue":
         from core import queue_client
-        from core.services import outbox_consumer
+        from core.services import chat_info, outbox_consumer, user_settings
 
         bot_id = application.bot.id
         await queue_client.init(bot_id=bot_id)
         await outbox_consumer.start(bot_id=bot_id)
+        user_settings.start_invalidation_listener()
+        chat_info.start_invalidation_listener()
         logger.info(f"Queue mode enabled: ARQ client and outbox consumer started (bot_id={bot_id})")
 
     if application.post_init:
@@ -176,12 +237,20 @@ async def show_bot_info() -> None:
 
 
 async def shutdown() -> None:
+    from core.services import chat_info, discussion_forwards, user_settings
+    from fastfetchbot_shared.services.media_store import close_media_store
+
+    await chat_info.close()
+    await discussion_forwards.close()
+    await user_settings.close()
+    await close_media_store()
     # Shut down queue mode resources
     if settings.SCRAPE_MODE == "queue":
         from core import queue_client
-        from core.services import outbox_consumer
+        from core.services import file_id_index, outbox_consumer
 
         await outbox_consumer.stop()
+        await file_id_index.close()
         await queue_client.close()
         logger.info("Queue mode resources shut down")
 
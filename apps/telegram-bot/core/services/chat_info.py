@@ -0,0 +1,146 @@
+import asyncio
+import json
+import time
+import uuid
+from typing import Union
+
+import redis.asyncio as aioredis
+from telegram import Bot
+
+from core.config import settings
+from fastfetchbot_shared.utils.logger import logger
+
+CHAT_INFO_KEY_PREFIX = "chatinfo"
+CHAT_INFO_INVALIDATION_CHANNEL = "chatinfo:invalidate"
+_CACHE_MAX_SIZE = 10000
+
+# chat_id -> (expires_at, info). In queue mode the replica that invalidates a
+# chat publishes its id, and every other replica drops its local copy too.
+_cache: dict[Union[int, str], tuple[float, dict]] = {}
+_redis: aioredis.Redis | None = None
+_listener_task: asyncio.Task | None = None
+# Lets a replica skip its own invalidation messages
+_replica_id = uuid.uuid4().hex
+
+
+async def _get_redis() -> aioredis.Redis | None:
+    """Return the shared Redis connection in queue mode, None otherwise."""
+    global _redis
+    if settings.SCRAPE_MODE != "queue":
+        return None
+    if _redis is None:
+        _redis = aioredis.from_url(settings.OUTBOX_REDIS_URL, decode_responses=True)
+    return _redis
+
+
+def _store(chat_id: Union[int, str], info: dict, now: float) -> None:
+    if len(_cache) >= _CACHE_MAX_SIZE and chat_id not in _cache:
+        # Evict the oldest insertion; dicts keep insertion order
+        _cache.pop(next(iter(_cache)))
+    _cache[chat_id] = (now + settings.CHAT_INFO_CACHE_TTL, info)
+
+
+def _redis_key(bot_id: int, chat_id: Union[int, str]) -> str:
+    return f"{CHAT_INFO_KEY_PREFIX}:{bot_id}:{chat_id}"
+
+
+async def get_chat_info(bot: Bot, chat_id: Union[int, str]) -> dict:
+    """Return ``{"type", "linked_chat_id"}`` for a chat, served from cache when possible.
+
+    Lookup order is the in-process cache, then Redis (shared by all bot
+    replicas), then ``bot.get_chat``. Entries live for ``CHAT_INFO_CACHE_TTL``
+    seconds and are dropped early by :func:`invalidate`.
+    """
+    now = time.monotonic()
+    cached = _cache.get(chat_id)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    r = None
+    try:
+        r = await _get_redis()
+        if r is not None:
+            raw = await r.get(_redis_key(bot.id, chat_id))
+            if raw is not None:
+                info = json.loads(raw)
+                _store(chat_id, info, now)
+                return info
+    except Exception as e:
+        logger.warning(f"Chat info Redis lookup failed for {chat_id}: {e}")
+        r = None
+
+    chat = await bot.get_chat(chat_id=chat_id)
+    info = {"type": chat.type, "linked_chat_id": chat.linked_chat_id}
+    _store(chat_id, info, now)
+    if r is not None:
+        try:
+            await r.set(
+                _redis_key(bot.id, chat_id), json.dumps(info), ex=settings.CHAT_INFO_CACHE_TTL
+            )
+        except Exception as e:
+            logger.warning(f"Failed to share chat info for {chat_id}: {e}")
+    return info
+
+
+async def invalidate(bot: Bot, chat_id: Union[int, str]) -> None:
+    """Drop a chat from the local and shared caches, and from other replicas' local caches."""
+    _cache.pop(chat_id, None)
+    try:
+        r = await _get_redis()
+        if r is not None:
+            await r.delete(_redis_key(bot.id, chat_id))
+            await r.publish(CHAT_INFO_INVALIDATION_CHANNEL, f"{_replica_id}:{chat_id}")
+    except Exception as e:
+        logger.warning(f"Failed to invalidate shared chat info for {chat_id}: {e}")
+    logger.debug(f"Invalidated chat info cache for {chat_id}")
+
+
+def _handle_invalidation(data: str) -> None:
+    replica_id, _, chat_id = data.partition(":")
+    if replica_id == _replica_id:
+        return
+    # Numeric ids are cached as ints, @usernames as strings
+    _cache.pop(int(chat_id) if chat_id.lstrip("-").isdigit() else chat_id, None)
+
+
+async def _listen_for_invalidations() -> None:
+    while True:
+        try:
+            r = await _get_redis()
+            pubsub = r.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(CHAT_INFO_INVALIDATION_CHANNEL)
+                # Invalidations made while we were not subscribed were never seen
+                _cache.clear()
+                async for message in pubsub.listen():
+                    _handle_invalidation(message["data"])
+            finally:
+                await pubsub.aclose()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Chat info invalidation listener failed, reconnecting: {e}")
+            await asyncio.sleep(1)
+
+
+def start_invalidation_listener() -> None:
+    """Start dropping local entries that other replicas invalidate (queue mode)."""
+    global _listener_task
+    if _listener_task is None:
+        _listener_task = asyncio.create_task(_listen_for_invalidations())
+
+
+async def close() -> None:
+    """Stop the invalidation listener, clear the local cache and close Redis."""
+    global _redis, _listener_task
+    if _listener_task is not None:
+        _listener_task.cancel()
+        try:
+            await _listener_task
+        except asyncio.CancelledError:
+            pass
+        _listener_task = None
+    _cache.clear()
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
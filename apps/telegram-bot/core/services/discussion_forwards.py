@@ -0,0 +1,117 @@
+import asyncio
+from collections import OrderedDict
+
+import redis.asyncio as aioredis
+
+from core.config import settings
+from fastfetchbot_shared.utils.logger import logger
+
+# Telegram copies every post of a channel with a linked discussion group into
+# that group as an automatic forward. These registries map
+# (channel_chat_id, channel_message_id) to the forwarded message's id in the
+# discussion group, so replies can be threaded as soon as the forward arrives.
+#
+# In queue mode several bot replicas share one webhook, and the forward may
+# reach a different replica than the one waiting for it, so the forward is
+# handed over through a short-lived Redis list instead: the recording replica
+# pushes the id, the waiting replica pops it with BLPOP.
+
+FORWARD_KEY_PREFIX = "discussion_forward"
+_SEEN_MAX_SIZE = 1000
+_SEEN_TTL = 600  # seconds a forward nobody waited for is kept in Redis
+
+_pending: dict[tuple[int, int], asyncio.Future] = {}
+# Forwards that arrived before anyone started waiting for them
+_seen: OrderedDict[tuple[int, int], int] = OrderedDict()
+_redis: aioredis.Redis | None = None
+
+
+async def _get_redis() -> aioredis.Redis | None:
+    """Return the shared Redis connection in queue mode, None otherwise."""
+    global _redis
+    if settings.SCRAPE_MODE != "queue":
+        return None
+    if _redis is None:
+        _redis = aioredis.from_url(settings.OUTBOX_REDIS_URL, decode_responses=True)
+    return _redis
+
+
+def _redis_key(channel_id: int, channel_message_id: int) -> str:
+    return f"{FORWARD_KEY_PREFIX}:{channel_id}:{channel_message_id}"
+
+
+def _record_local(key: tuple[int, int], group_message_id: int) -> None:
+    future = _pending.pop(key, None)
+    if future is not None and not future.done():
+        future.set_result(group_message_id)
+        return
+    _seen[key] = group_message_id
+    _seen.move_to_end(key)
+    while len(_seen) > _SEEN_MAX_SIZE:
+        _seen.popitem(last=False)
+
+
+async def _wait_local(key: tuple[int, int], timeout: float) -> int | None:
+    if key in _seen:
+        return _seen.pop(key)
+    future = asyncio.get_running_loop().create_future()
+    _pending[key] = future
+    try:
+        return await asyncio.wait_for(future, timeout)
+    except asyncio.TimeoutError:
+        return None
+    finally:
+        _pending.pop(key, None)
+
+
+async def record_forward(channel_id: int, channel_message_id: int, group_message_id: int) -> None:
+    """Resolve the waiter for an automatic forward, or remember it for a later waiter."""
+    key = (channel_id, channel_message_id)
+    try:
+        r = await _get_redis()
+        if r is not None:
+            redis_key = _redis_key(channel_id, channel_message_id)
+            async with r.pipeline(transaction=True) as pipe:
+                pipe.rpush(redis_key, group_message_id)
+                pipe.expire(redis_key, _SEEN_TTL)
+                await pipe.execute()
+            return
+    except Exception as e:
+        logger.warning(f"Failed to share automatic forward of {channel_message_id}: {e}")
+    _record_local(key, group_message_id)
+
+
+async def wait_for_forward(
+    channel_id: int, channel_message_id: int, timeout: float
+) -> int | None:
+    """Wait until the discussion group receives the forward of a channel message.
+
+    Returns the forwarded message id in the discussion group, or ``None`` if it
+    did not arrive within *timeout* seconds.
+    """
+    try:
+        r = await _get_redis()
+        if r is not None:
+            popped = await r.blpop([_redis_key(channel_id, channel_message_id)], timeout=timeout)
+            result = int(popped[1]) if popped is not None else None
+        else:
+            result = await _wait_local((channel_id, channel_message_id), timeout)
+    except Exception as e:
+        logger.warning(f"Failed to wait for automatic forward of {channel_message_id}: {e}")
+        return None
+    if result is None:
+        logger.warning(
+            f"Automatic forward of channel message {channel_message_id} "
+            f"did not arrive within {timeout}s"
+        )
+    return result
+
+
+async def close() -> None:
+    """Clear the local registries and close the Redis connection."""
+    global _redis
+    _pending.clear()
+    _seen.clear()
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
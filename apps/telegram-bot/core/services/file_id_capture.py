@@ -5,6 +5,8 @@ import redis.asyncio as aioredis
 from telegram import Message
 
 from core.config import settings
+from core.services.file_id_index import record_file_ids
+from fastfetchbot_shared.services.media_store import get_media_store, media_extension
 from fastfetchbot_shared.utils.logger import logger
 
 FILEID_QUEUE_KEY = "fileid:updates"
@@ -34,19 +36,37 @@ def extract_file_id(message: Message, media_type: str) -> Optional[str]:
     return None
 
 
+async def store_media(info: dict) -> Optional[str]:
+    """Write media downloaded from the origin to the media store; returns its file_key."""
+    media = info.get("media")
+    media_store = get_media_store()
+    if media is None or media_store is None:
+        return None
+    try:
+        return await media_store.put(media.getvalue(), ext=media_extension(media.name))
+    except Exception:
+        logger.warning(f"Failed to store media {info['url']}")
+        return None
+
+
 async def capture_and_push_file_ids(
     uncached_info: list[dict],
     sent_messages: tuple[Message, ...],
     metadata_url: str,
+    bot_id: Optional[int] = None,
 ) -> None:
-    """Extract file_ids from sent messages and push updates to Redis for the async worker.
+    """Extract file_ids from sent messages, store downloaded media in the media store
+    and push both to Redis for the async worker.
 
     Args:
         uncached_info: list of {"url": str, "media_type": str} for items that were
-            downloaded (not served from cached file_id). Parallel to sent_messages —
+            downloaded (not served from cached file_id), with "media" when the download
+            should be written to the media store. Parallel to sent_messages —
             each entry corresponds to a message at the same position.
         sent_messages: tuple of Message objects returned by send_media_group.
         metadata_url: the original scraped page URL, used as the key for MongoDB lookup.
+        bot_id: the bot that sent the messages. Its file_id index is updated right away;
+            the worker persists the updates to MongoDB.
     """
     file_id_updates = []
 
@@ -56,22 +76,33 @@ async def capture_and_push_file_ids(
         if i >= len(sent_messages):
             break
         file_id = extract_file_id(sent_messages[i], info["media_type"])
-        if file_id:
-            file_id_updates.append({
-                "url": info["url"],
-                "media_type": info["media_type"],
-                "telegram_file_id": file_id,
-            })
+        file_key = await store_media(info)
+        if file_id or file_key:
+            update = {"url": info["url"], "media_type": info["media_type"]}
+            if file_id:
+                update["telegram_file_id"] = file_id
+            if file_key:
+                update["file_key"] = file_key
+            file_id_updates.append(update)
 
     if not file_id_updates:
         return
 
+    if bot_id is not None:
+        try:
+            await record_file_ids(bot_id, file_id_updates)
+        except Exception:
+            logger.warning(f"Failed to index file_ids of bot {bot_id}")
+
     try:
         r = await _get_redis()
-        payload = json.dumps({
+        payload = {
             "metadata_url": metadata_url,
             "file_id_updates": file_id_updates,
-        }, ensure_ascii=False)
+        }
+        if bot_id is not None:
+            payload["bot_id"] = bot_id
+        payload = json.dumps(payload, ensure_ascii=False)
         await r.lpush(FILEID_QUEUE_KEY, payload)
         logger.info(f"Pushed {len(file_id_updates)} file_id updates for {metadata_url}")
     except Exception:
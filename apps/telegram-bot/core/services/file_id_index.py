@@ -0,0 +1,55 @@
+from typing import Optional
+
+import redis.asyncio as aioredis
+
+from core.config import settings
+from fastfetchbot_shared.utils.file_id_index import index_entries, index_key, media_keys
+from fastfetchbot_shared.utils.logger import logger
+
+_redis: aioredis.Redis | None = None
+
+
+async def _get_redis() -> aioredis.Redis:
+    global _redis
+    if _redis is None:
+        _redis = aioredis.from_url(settings.OUTBOX_REDIS_URL, decode_responses=True)
+    return _redis
+
+
+async def lookup_file_ids(bot_id: int, media_files: list[dict]) -> list[Optional[str]]:
+    """Look up the file_id this bot has for each media item, in one round trip.
+
+    Returns a list parallel to media_files, with None for items the bot has not
+    uploaded yet. Redis errors count as misses, so the media is uploaded again.
+    """
+    item_keys = [
+        media_keys(item["media_type"], item.get("url"), item.get("file_key"))
+        for item in media_files
+    ]
+    fields = [key for keys in item_keys for key in keys]
+    if not fields:
+        return [None] * len(media_files)
+    try:
+        r = await _get_redis()
+        values = await r.hmget(index_key(bot_id), fields)
+    except Exception:
+        logger.warning(f"Failed to look up file_ids of bot {bot_id}")
+        return [None] * len(media_files)
+    found = dict(zip(fields, values))
+    return [next((found[key] for key in keys if found[key]), None) for keys in item_keys]
+
+
+async def record_file_ids(bot_id: int, file_id_updates: list[dict]) -> None:
+    """Add the file_ids of file_id updates to this bot's index."""
+    entries = index_entries(file_id_updates)
+    if not entries:
+        return
+    r = await _get_redis()
+    await r.hset(index_key(bot_id), mapping=entries)
+
+
+async def close() -> None:
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
@@ -1,6 +1,7 @@
 import asyncio
 import os
 import traceback
+from collections import OrderedDict
 from io import BytesIO
 from urllib.parse import urlparse
 from urllib.request import url2pathname
@@ -21,9 +22,14 @@ from fastfetchbot_shared.models.metadata_item import MessageType
 from fastfetchbot_shared.models.classes import NamedBytesIO
 from fastfetchbot_shared.utils.parse import telegram_message_html_trim
 from fastfetchbot_shared.utils.network import download_file_by_metadata_item
+from fastfetchbot_shared.services.media_store import get_media_store
 from fastfetchbot_shared.utils.image import Image, image_compressing, check_image_type
 from fastfetchbot_shared.utils.logger import logger
+from fastfetchbot_shared.utils.telemetry import stage
 from core.config import settings, JINJA2_ENV
+from core.services.chat_info import get_chat_info
+from core.services.discussion_forwards import wait_for_forward
+from core.services.file_id_index import lookup_file_ids
 from core.services.constants import (
     TELEGRAM_SINGLE_MESSAGE_MEDIA_LIMIT,
     TELEGRAM_FILE_UPLOAD_LIMIT,
@@ -37,6 +43,15 @@ template_text = TEMPLATE_TRANSLATION.get(
     settings.TEMPLATE_LANGUAGE, TEMPLATE_TRANSLATION["zh_CN"]
 )
 
+# Rendered captions keyed by the fields social_media_message.jinja2 reads, so
+# outbox redeliveries and retries of the same job skip trimming and rendering.
+CAPTION_CACHE_FIELDS = (
+    "message_type", "category", "title", "url", "text",
+    "telegraph_url", "author", "author_url", "message",
+)
+_CAPTION_CACHE_MAX_SIZE = 256
+_caption_cache: OrderedDict[tuple, str] = OrderedDict()
+
 
 def _get_application():
     """Lazy import to avoid circular dependency."""
@@ -71,18 +86,21 @@ async def send_item_message(
     ) and message:  # this function supports direct reply to a message even if the chat_id is None
         chat_id = message.chat.id
     discussion_chat_id = chat_id
-    the_chat = await application.bot.get_chat(chat_id=chat_id)
+    the_chat = await get_chat_info(application.bot, chat_id)
     logger.debug(f"the chat of sending message: {the_chat}")
-    if the_chat.type == "channel" and the_chat.linked_chat_id:
-        discussion_chat_id = the_chat.linked_chat_id
+    if the_chat["type"] == "channel" and the_chat["linked_chat_id"]:
+        discussion_chat_id = the_chat["linked_chat_id"]
+    # the bot-scoped file_id index is maintained through the queue mode worker
+    bot_id = application.bot.id if settings.SCRAPE_MODE == "queue" else None
     try:
         caption_text = message_formatting(data)
         if len(data["media_files"]) > 0:
             # if the message type is short and there are some media files, send media group
             reply_to_message_id = None
-            media_message_group, file_message_group, uncached_media_info = await media_files_packaging(
-                media_files=data["media_files"], data=data
-            )
+            with stage("media_download", media_files=len(data["media_files"])):
+                media_message_group, file_message_group, uncached_media_info = await media_files_packaging(
+                    media_files=data["media_files"], data=data, bot_id=bot_id
+                )
             if (
                     len(media_message_group) > 0
             ):  # if there are some media groups to send, send it
@@ -97,14 +115,15 @@ async def send_item_message(
                     logger.debug(
                         f"caption text: {caption_text},length={len(caption_text)}"
                     )
-                    sent_media_files_message = await application.bot.send_media_group(
-                        chat_id=chat_id,
-                        media=media_group,
-                        parse_mode=ParseMode.HTML,
-                        caption=caption_text,
-                        write_timeout=settings.TELEBOT_WRITE_TIMEOUT,
-                        reply_to_message_id=_reply_to,
-                    )
+                    with stage("telegram_upload", media_count=len(media_group)):
+                        sent_media_files_message = await application.bot.send_media_group(
+                            chat_id=chat_id,
+                            media=media_group,
+                            parse_mode=ParseMode.HTML,
+                            caption=caption_text,
+                            write_timeout=settings.TELEBOT_WRITE_TIMEOUT,
+                            reply_to_message_id=_reply_to,
+                        )
                     all_sent_messages.extend(sent_media_files_message)
                     if sent_media_files_message is tuple:
                         reply_to_message_id = sent_media_files_message[0].message_id
@@ -120,74 +139,89 @@ async def send_item_message(
                             uncached_info=uncached_media_info,
                             sent_messages=tuple(all_sent_messages),
                             metadata_url=data.get("url", ""),
+                            bot_id=bot_id,
                         )
                     )
                     task.add_done_callback(_log_file_id_task_exception)
             else:
-                sent_message = await application.bot.send_message(
-                    chat_id=chat_id,
-                    text=caption_text,
-                    parse_mode=ParseMode.HTML,
-                    reply_to_message_id=_reply_to,
-                    disable_web_page_preview=True
-                    if data["message_type"] == MessageType.SHORT
-                    else False,
-                    disable_notification=True,
-                )
+                with stage("telegram_send"):
+                    sent_message = await application.bot.send_message(
+                        chat_id=chat_id,
+                        text=caption_text,
+                        parse_mode=ParseMode.HTML,
+                        reply_to_message_id=_reply_to,
+                        disable_web_page_preview=True
+                        if data["message_type"] == MessageType.SHORT
+                        else False,
+                        disable_notification=True,
+                    )
             if discussion_chat_id != chat_id:
-                await asyncio.sleep(
-                    3
-                )  # wait for several seconds to avoid missing the target message
-                # if the chat is a channel, get the latest pinned message from the channel and reply to it
-                group_chat = await application.bot.get_chat(chat_id=discussion_chat_id)
-                logger.debug(f"the group chat: {group_chat}")
-                pinned_message = group_chat.pinned_message
-                logger.debug(f"the pinned message: {pinned_message}")
-                if len(media_message_group) > 0:
-                    if (
-                            pinned_message.forward_origin.message_id
-                            == sent_media_files_message[-1].message_id
-                    ):
-                        reply_to_message_id = (
-                                group_chat.pinned_message.id
-                                - len(sent_media_files_message)
-                                + 1
-                        )
-                    else:
-                        reply_to_message_id = group_chat.pinned_message.id + 1
-                elif pinned_message.forward_origin.message_id == sent_message.message_id:
-                    reply_to_message_id = group_chat.pinned_message.id
-                else:
-                    reply_to_message_id = group_chat.pinned_message.id + 1
+                # the channel post is auto-forwarded into the linked discussion group;
+                # reply to that forward once it arrives
+                channel_messages = (
+                    sent_media_files_message
+                    if len(media_message_group) > 0
+                    else (sent_message,)
+                )
+                reply_to_message_id = await wait_for_forward(
+                    channel_id=channel_messages[0].chat_id,
+                    channel_message_id=channel_messages[0].message_id,
+                    timeout=settings.DISCUSSION_FORWARD_TIMEOUT,
+                )
+                if reply_to_message_id is None:
+                    reply_to_message_id = await _guess_discussion_reply_target(
+                        application, discussion_chat_id, channel_messages
+                    )
             if (
                     len(file_message_group) > 0
             ):  # to send files, the files messages should be replied to the message sent before
                 logger.debug(f"reply_to_message_id: {reply_to_message_id}")
                 for file_group in file_message_group:
                     logger.debug(f"file group: {file_group}")
-                    await application.bot.send_media_group(
-                        chat_id=discussion_chat_id,
-                        media=file_group,
-                        reply_to_message_id=reply_to_message_id,
-                        parse_mode=ParseMode.HTML,
-                        disable_notification=True,
-                    )
+                    with stage("telegram_upload", media_count=len(file_group)):
+                        await application.bot.send_media_group(
+                            chat_id=discussion_chat_id,
+                            media=file_group,
+                            reply_to_message_id=reply_to_message_id,
+                            parse_mode=ParseMode.HTML,
+                            disable_notification=True,
+                        )
         else:
-            await application.bot.send_message(
-                chat_id=chat_id,
-                text=caption_text,
-                parse_mode=ParseMode.HTML,
-                reply_to_message_id=_reply_to,
-                disable_web_page_preview=True
-                if data["message_type"] == "short"
-                else False,
-                disable_notification=True,
-            )
+            with stage("telegram_send"):
+                await application.bot.send_message(
+                    chat_id=chat_id,
+                    text=caption_text,
+                    parse_mode=ParseMode.HTML,
+                    reply_to_message_id=_reply_to,
+                    disable_web_page_preview=True
+                    if data["message_type"] == "short"
+                    else False,
+                    disable_notification=True,
+                )
     except Exception:
         logger.exception("Failed to send item message")
         await send_debug_channel(traceback.format_exc())
 
 
+async def _guess_discussion_reply_target(
+        application, discussion_chat_id: Union[int, str], channel_messages: tuple
+) -> int:
+    """
+    Fallback when the automatic forward was not observed: infer the forwarded message id
+    from the discussion group's pinned message (the latest auto-forwarded channel post).
+    :param discussion_chat_id: the linked discussion group of the channel
+    :param channel_messages: the messages just sent to the channel, in order
+    :return: (int) the message id in the discussion group to reply to
+    """
+    group_chat = await application.bot.get_chat(chat_id=discussion_chat_id)
+    logger.debug(f"the group chat: {group_chat}")
+    pinned_message = group_chat.pinned_message
+    logger.debug(f"the pinned message: {pinned_message}")
+    if pinned_message.forward_origin.message_id == channel_messages[-1].message_id:
+        return pinned_message.id - len(channel_messages) + 1
+    return pinned_message.id + 1
+
+
 async def send_debug_channel(message: str) -> None:
     import html as html_module
     from core.config import TELEBOT_DEBUG_CHANNEL
@@ -206,33 +240,72 @@ def message_formatting(data: dict) -> str:
     :param data:
     :return: text (str) the formatted text for telegram bot api sending message.
     """
+    cache_key = tuple(str(data.get(field, "")) for field in CAPTION_CACHE_FIELDS)
+    text = _caption_cache.get(cache_key)
+    if text is not None:
+        _caption_cache.move_to_end(cache_key)
+        return text
     if data["message_type"] == "short":
         data["text"] = telegram_message_html_trim(data["text"])
     message_template = template
     text = message_template.render(data=data, template_text=template_text)
     logger.debug(f"message text: \n{text}")
+    _caption_cache[cache_key] = text
+    if len(_caption_cache) > _CAPTION_CACHE_MAX_SIZE:
+        _caption_cache.popitem(last=False)
     return text
 
 
-async def media_files_packaging(media_files: list, data: dict) -> tuple:
+async def _fetch_media(media_item: dict, data: dict, file_name: str = None, file_format: str = None) -> tuple:
+    """
+    Read a media item from the media store by its file_key, or download it from the origin.
+    :return: (tuple) (io_object, from_store)
+    """
+    file_key = media_item.get("file_key")
+    media_store = get_media_store()
+    if file_key and media_store is not None:
+        try:
+            content = await media_store.get(file_key)
+        except Exception:
+            logger.warning(f"Failed to read {file_key} from the media store")
+            content = None
+        if content is not None:
+            logger.debug(f"media store hit: {file_key}, url: {media_item['url']}")
+            return NamedBytesIO(content, name=file_name or os.path.basename(file_key)), True
+    io_object = await download_file_by_metadata_item(
+        media_item["url"], data=data, file_name=file_name, file_format=file_format
+    )
+    return io_object, False
+
+
+async def media_files_packaging(media_files: list, data: dict, bot_id: int = None) -> tuple:
     """
     Download the media files from data["media_files"] and package them into a list of media group or file group for
     sending them by send_media_group method or send_document method.
     :param data: (dict) metadata of the item
     :param media_files: (list) a list of media files,
+    :param bot_id: (int) the sending bot; when given, file_ids are read from its file_id index instead of
+        the media files' own telegram_file_id
     :return: (tuple) a tuple of (media_message_group, file_message_group, uncached_media_info)
         media_message_group: (list) a list of media groups, each is a list of InputMedia* items
         file_message_group: (list) a list of file groups, each is a list of InputMediaDocument items
         uncached_media_info: (list) parallel to flattened media groups — each entry is
             {"url": str, "media_type": str} for items that were downloaded (need file_id capture),
-            or None for items served from cached file_id
+            or None for items served from a cached file_id. Items downloaded from the origin while
+            the media store is enabled also carry "media": the downloaded NamedBytesIO to store.
+            Downloads over TELEGRAM_FILE_UPLOAD_LIMIT are not stored
     """
     media_counter, file_counter = 0, 0
     media_message_group, media_group, file_message_group, file_group = [], [], [], []
     uncached_media_info = []
+    if bot_id is not None:
+        # file_ids are only valid for the bot that uploaded the media
+        cached_file_ids = await lookup_file_ids(bot_id, media_files)
+    else:
+        cached_file_ids = [media_item.get("telegram_file_id") for media_item in media_files]
     for (
-            media_item
-    ) in media_files:  # To traverse all media items in the media files list
+            media_item, file_id
+    ) in zip(media_files, cached_file_ids):  # To traverse all media items in the media files list
         # check if we need to create a new media group
         if media_counter == TELEGRAM_SINGLE_MESSAGE_MEDIA_LIMIT:
             # the limitation of media item for a single telegram media group message is 10
@@ -245,7 +318,6 @@ async def media_files_packaging(media_files: list, data: dict) -> tuple:
             file_group = []
             file_counter = 0
         # Check for cached telegram file_id — skip download entirely if available
-        file_id = media_item.get("telegram_file_id")
         if file_id:
             media_type = media_item["media_type"]
             if media_type == "image":
@@ -269,17 +341,26 @@ async def media_files_packaging(media_files: list, data: dict) -> tuple:
                 media_item["media_type"] in ["image", "gif", "video"]
                 and data["message_type"] == "long"
         ):
+            origin_media = None
             # check the url validity
             url_parser = urlparse(media_item["url"])
             if url_parser.scheme in [
                 "http",
                 "https",
-            ]:  # if the url is a http url, download the file
+            ]:  # if the url is a http url, read it from the media store or download the file
                 file_format = "mp4" if media_item["media_type"] == "video" else None
                 try:
-                    io_object = await download_file_by_metadata_item(
-                        media_item["url"], data=data, file_format=file_format
+                    io_object, from_store = await _fetch_media(
+                        media_item, data=data, file_format=file_format
                     )
+                    # The download stays in memory until the background capture has
+                    # stored it, so only files up to the Bot API upload limit are kept
+                    if (
+                            not from_store
+                            and get_media_store() is not None
+                            and io_object.size <= TELEGRAM_FILE_UPLOAD_LIMIT
+                    ):
+                        origin_media = io_object
                 except Exception:
                     logger.warning(f"Skipping media download: {media_item['url']}")
                     continue
@@ -347,9 +428,7 @@ async def media_files_packaging(media_files: list, data: dict) -> tuple:
                         or img_height > settings.TELEGRAM_IMAGE_DIMENSION_LIMIT
                 ) and data["category"] not in ["xiaohongshu"]:
                     try:
-                        io_object = await download_file_by_metadata_item(
-                            url=image_url, data=data
-                        )
+                        io_object, _ = await _fetch_media(media_item, data=data)
                     except Exception:
                         logger.warning(f"Skipping document download: {image_url}")
                         continue
@@ -363,8 +442,8 @@ async def media_files_packaging(media_files: list, data: dict) -> tuple:
                         file_counter += 1
             elif media_item["media_type"] == "gif":
                 try:
-                    io_object = await download_file_by_metadata_item(
-                        url=media_item["url"],
+                    io_object, _ = await _fetch_media(
+                        media_item,
                         data=data,
                         file_name="gif_image-" + str(media_counter) + ".gif",
                     )
@@ -383,10 +462,13 @@ async def media_files_packaging(media_files: list, data: dict) -> tuple:
                     InputMediaDocument(io_object, parse_mode=ParseMode.HTML)
                 )
                 file_counter += 1
-            uncached_media_info.append({
+            media_info = {
                 "url": media_item["url"],
                 "media_type": media_item["media_type"],
-            })
+            }
+            if origin_media is not None:
+                media_info["media"] = origin_media
+            uncached_media_info.append(media_info)
             media_counter += 1
             logger.info(
                 f"get the {media_counter}th media item,type: {media_item['media_type']}, url: {media_item['url']}"
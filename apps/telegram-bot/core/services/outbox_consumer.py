@@ -1,15 +1,21 @@
 import asyncio
-import json
+import os
+import socket
+import time
 
 import redis.asyncio as aioredis
+from redis.exceptions import ResponseError
 
 from core.config import settings
 from core.services.message_sender import send_item_message, send_debug_channel
+from fastfetchbot_shared.utils import codec
 from fastfetchbot_shared.utils.logger import logger
+from fastfetchbot_shared.utils.telemetry import observe, stage
 
 _redis: aioredis.Redis | None = None
 _consumer_task: asyncio.Task | None = None
 _outbox_key: str | None = None
+_consumer_name: str | None = None
 
 
 async def _get_redis() -> aioredis.Redis:
@@ -20,70 +26,250 @@ async def _get_redis() -> aioredis.Redis:
     return _redis
 
 
+def _dlq_key(key: str) -> str:
+    return f"{key}:dlq"
+
+
+async def _migrate_legacy_list(r: aioredis.Redis, key: str) -> None:
+    """Move payloads left in a pre-stream outbox list onto the stream.
+
+    Older releases used ``LPUSH``/``BRPOP`` on the same key. A leftover list
+    would make every ``XADD`` fail with WRONGTYPE, so rename it aside and
+    re-append its entries oldest-first.
+    """
+    if await r.type(key) != "list":
+        return
+    legacy_key = f"{key}:legacy"
+    try:
+        await r.rename(key, legacy_key)
+    except ResponseError:
+        # Another replica migrated it first
+        return
+    raw_payloads = await r.lrange(legacy_key, 0, -1)
+    for raw_payload in reversed(raw_payloads):
+        await r.xadd(key, {"payload": raw_payload})
+    await r.delete(legacy_key)
+    logger.info(f"Migrated {len(raw_payloads)} legacy outbox payloads onto stream '{key}'")
+
+
+async def _ensure_group(r: aioredis.Redis, key: str) -> None:
+    """Create the consumer group (and the stream) if it does not exist yet."""
+    try:
+        await r.xgroup_create(key, settings.OUTBOX_CONSUMER_GROUP, id="0", mkstream=True)
+        logger.info(f"Created outbox consumer group '{settings.OUTBOX_CONSUMER_GROUP}' on '{key}'")
+    except ResponseError as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+
+
+async def _ack(r: aioredis.Redis, key: str, entry_id: str) -> None:
+    """Acknowledge and drop a delivered entry so XLEN reflects the backlog."""
+    await r.xack(key, settings.OUTBOX_CONSUMER_GROUP, entry_id)
+    await r.xdel(key, entry_id)
+
+
+async def _dead_letter(
+    r: aioredis.Redis, key: str, entry_id: str, raw_payload: str | None, reason: str
+) -> None:
+    """Move an entry to the dead-letter stream and acknowledge the original."""
+    await r.xadd(
+        _dlq_key(key),
+        {"payload": raw_payload or "", "entry_id": entry_id, "reason": reason},
+        maxlen=settings.OUTBOX_DLQ_MAXLEN,
+        approximate=True,
+    )
+    await _ack(r, key, entry_id)
+    logger.error(f"Moved outbox entry {entry_id} to dead-letter stream: {reason}")
+
+
+async def _dispatch(payload: dict) -> None:
+    """Deliver one decoded outbox payload as a span of the job's trace."""
+    job_id = payload.get("job_id", "unknown")
+    chat_id = payload.get("chat_id")
+    error = payload.get("error")
+
+    with stage("outbox_delivery", parent=payload.get("trace_context"), job_id=job_id):
+        if error:
+            logger.warning(f"[{job_id}] Scrape failed: {error}")
+            await send_debug_channel(
+                f"[Scrape Error] job_id={job_id}\nchat_id: {chat_id}\n\n{error}"
+            )
+        else:
+            metadata_item = payload.get("metadata_item")
+            if metadata_item and chat_id:
+                logger.info(f"[{job_id}] Delivering result to chat {chat_id}")
+                await send_item_message(
+                    metadata_item, chat_id=chat_id,
+                    message_id=payload.get("message_id"),
+                )
+            else:
+                logger.warning(f"[{job_id}] Invalid payload: missing metadata_item or chat_id")
+
+
+async def _handle_entry(
+    r: aioredis.Redis, key: str, entry_id: str, fields: dict | None
+) -> None:
+    """Decode, deliver and acknowledge a single stream entry.
+
+    Delivery errors propagate and leave the entry pending, so it is retried
+    by whichever replica reclaims it after ``OUTBOX_CLAIM_IDLE_MS``.
+    """
+    raw_payload = (fields or {}).get("payload")
+    # Stream IDs start with the XADD time in milliseconds
+    observe("outbox_wait", time.time() - int(entry_id.split("-")[0]) / 1000)
+    try:
+        payload = codec.decode(raw_payload)
+    except (TypeError, codec.DecodeError) as e:
+        await _dead_letter(r, key, entry_id, raw_payload, reason=f"malformed payload: {e}")
+        return
+    await _dispatch(payload)
+    await _ack(r, key, entry_id)
+
+
+async def _reclaim_pending(r: aioredis.Redis, key: str) -> None:
+    """Claim entries another consumer read but never acknowledged.
+
+    Entries that already reached ``OUTBOX_MAX_DELIVERIES`` attempts are moved to
+    the dead-letter stream instead of being delivered again.
+    """
+    pending = await r.xpending_range(
+        key,
+        settings.OUTBOX_CONSUMER_GROUP,
+        min="-",
+        max="+",
+        count=settings.OUTBOX_READ_COUNT,
+        idle=settings.OUTBOX_CLAIM_IDLE_MS,
+    )
+    if not pending:
+        return
+    deliveries = {p["message_id"]: p["times_delivered"] for p in pending}
+    claimed = await r.xclaim(
+        key,
+        settings.OUTBOX_CONSUMER_GROUP,
+        _consumer_name,
+        settings.OUTBOX_CLAIM_IDLE_MS,
+        list(deliveries),
+    )
+    for entry_id, fields in claimed:
+        if not fields:
+            # Entry was trimmed from the stream; nothing left to deliver
+            await _ack(r, key, entry_id)
+            continue
+        if deliveries.get(entry_id, 0) >= settings.OUTBOX_MAX_DELIVERIES:
+            await _dead_letter(
+                r, key, entry_id, fields.get("payload"),
+                reason=f"exceeded {settings.OUTBOX_MAX_DELIVERIES} deliveries",
+            )
+            continue
+        logger.warning(f"Reclaimed outbox entry {entry_id} (delivered {deliveries.get(entry_id)} times)")
+        try:
+            await _handle_entry(r, key, entry_id, fields)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Redelivery of outbox entry {entry_id} failed: {e}")
+
+
 async def _consume_loop() -> None:
-    """Background loop: BRPOP from the per-bot outbox queue and dispatch results."""
+    """Background loop: XREADGROUP from the per-bot outbox stream and dispatch results."""
     r = await _get_redis()
     key = _outbox_key or settings.OUTBOX_QUEUE_KEY
-    logger.info(f"Outbox consumer started, listening on '{key}'")
+    group_ready = False
+    last_reclaim: float | None = None
 
     while True:
         try:
-            # BRPOP blocks until a message is available (timeout=0 means block forever)
-            result = await r.brpop(key, timeout=0)
-            if result is None:
-                continue
+            if not group_ready:
+                await _migrate_legacy_list(r, key)
+                await _ensure_group(r, key)
+                group_ready = True
+                logger.info(
+                    f"Outbox consumer started, reading '{key}' as "
+                    f"{settings.OUTBOX_CONSUMER_GROUP}/{_consumer_name}"
+                )
 
-            _, raw_payload = result
-            payload = json.loads(raw_payload)
+            now = time.monotonic()
+            if last_reclaim is None or now - last_reclaim >= settings.OUTBOX_CLAIM_IDLE_MS / 1000:
+                last_reclaim = now
+                await _reclaim_pending(r, key)
 
-            job_id = payload.get("job_id", "unknown")
-            chat_id = payload.get("chat_id")
-            error = payload.get("error")
+            result = await r.xreadgroup(
+                settings.OUTBOX_CONSUMER_GROUP,
+                _consumer_name,
+                {key: ">"},
+                count=settings.OUTBOX_READ_COUNT,
+                block=settings.OUTBOX_BLOCK_MS,
+            )
+            if not result:
+                continue
 
-            if error:
-                logger.warning(f"[{job_id}] Scrape failed: {error}")
-                await send_debug_channel(
-                    f"[Scrape Error] job_id={job_id}\nchat_id: {chat_id}\n\n{error}"
-                )
-            else:
-                metadata_item = payload.get("metadata_item")
-                if metadata_item and chat_id:
-                    logger.info(f"[{job_id}] Delivering result to chat {chat_id}")
-                    await send_item_message(
-                        metadata_item, chat_id=chat_id,
-                        message_id=payload.get("message_id"),
-                    )
-                else:
-                    logger.warning(f"[{job_id}] Invalid payload: missing metadata_item or chat_id")
+            for _stream, entries in result:
+                for entry_id, fields in entries:
+                    try:
+                        await _handle_entry(r, key, entry_id, fields)
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as e:
+                        logger.error(f"Outbox entry {entry_id} failed, left pending for retry: {e}")
 
         except asyncio.CancelledError:
             logger.info("Outbox consumer cancelled, shutting down")
             break
         except Exception as e:
+            if "NOGROUP" in str(e):
+                # Stream or group was deleted underneath us; recreate it
+                group_ready = False
             logger.error(f"Outbox consumer error: {e}")
             # Brief pause before retrying to avoid tight error loops
             await asyncio.sleep(1)
 
 
+async def get_stats() -> dict:
+    """Return outbox stream metrics: backlog length, lag, pending and dead letters."""
+    r = await _get_redis()
+    key = _outbox_key or settings.OUTBOX_QUEUE_KEY
+    stats = {
+        "stream": key,
+        "group": settings.OUTBOX_CONSUMER_GROUP,
+        "length": await r.xlen(key),
+        "dead_letters": await r.xlen(_dlq_key(key)),
+        "pending": 0,
+        "lag": None,
+        "consumers": 0,
+    }
+    try:
+        groups = await r.xinfo_groups(key)
+    except ResponseError:
+        return stats
+    for group in groups:
+        if group.get("name") == settings.OUTBOX_CONSUMER_GROUP:
+            stats["pending"] = group.get("pending", 0)
+            stats["lag"] = group.get("lag")
+            stats["consumers"] = group.get("consumers", 0)
+    return stats
+
+
 async def start(bot_id: int) -> None:
     """Start the outbox consumer as a background asyncio task.
 
     Args:
         bot_id: Telegram bot user ID. Used to build the per-bot outbox key
-                so each bot only consumes its own results.
+                so each bot only consumes its own results. Replicas of the
+                same bot join one consumer group and share the stream.
     """
-    global _consumer_task, _outbox_key
+    global _consumer_task, _outbox_key, _consumer_name
     if _consumer_task is not None:
         logger.warning("Outbox consumer already running")
         return
     _outbox_key = f"{settings.OUTBOX_QUEUE_KEY}:{bot_id}"
+    _consumer_name = settings.OUTBOX_CONSUMER_NAME or f"{socket.gethostname()}-{os.getpid()}"
     _consumer_task = asyncio.create_task(_consume_loop())
-    logger.info(f"Outbox consumer task created for bot_id={bot_id}")
+    logger.info(f"Outbox consumer task created for bot_id={bot_id}, consumer={_consumer_name}")
 
 
 async def stop() -> None:
     """Stop the outbox consumer and close the Redis connection."""
-    global _consumer_task, _redis, _outbox_key
+    global _consumer_task, _redis, _outbox_key, _consumer_name
 
     if _consumer_task is not None:
         _consumer_task.cancel()
@@ -98,3 +284,4 @@ async def stop() -> None:
         await _redis.aclose()
         _redis = None
     _outbox_key = None
+    _consumer_name = None
@@ -1,36 +1,176 @@
+import asyncio
+import json
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+
+import redis.asyncio as aioredis
 from sqlalchemy import select
 
+from core.config import settings
 from fastfetchbot_shared.database.session import get_session
 from fastfetchbot_shared.database.models.user_setting import UserSetting
+from fastfetchbot_shared.utils.logger import logger
 
-# In-memory cache of user IDs known to have a settings row.
-# Resets on process restart — cheap way to avoid a DB query on every message.
-_known_user_ids: set[int] = set()
+USER_SETTINGS_KEY_PREFIX = "usersettings"
+USER_SETTINGS_INVALIDATION_CHANNEL = "usersettings:invalidate"
 
 
-async def ensure_user_settings(user_id: int) -> None:
-    """Create a UserSetting row with defaults if one doesn't exist yet."""
-    if user_id in _known_user_ids:
-        return
+@dataclass(frozen=True)
+class CachedUserSettings:
+    """All of a user's preferences, as served from the settings cache."""
+
+    auto_fetch_in_dm: bool = True
+    force_refresh_cache: bool = False
+    # Whether a UserSetting row exists in the database
+    persisted: bool = False
+
+
+# Bounded LRU of user_id -> (expires_at, settings). In queue mode a replica
+# that writes a user's settings publishes the user_id, and every other replica
+# drops its local copy. The local TTL still bounds staleness if a message is
+# lost, e.g. while a replica reconnects to Redis.
+_cache: OrderedDict[int, tuple[float, CachedUserSettings]] = OrderedDict()
+_redis: aioredis.Redis | None = None
+_listener_task: asyncio.Task | None = None
+# Lets a replica skip its own invalidation messages
+_replica_id = uuid.uuid4().hex
+
+
+async def _get_redis() -> aioredis.Redis | None:
+    """Return the shared Redis connection in queue mode, None otherwise."""
+    global _redis
+    if settings.SCRAPE_MODE != "queue":
+        return None
+    if _redis is None:
+        _redis = aioredis.from_url(settings.OUTBOX_REDIS_URL, decode_responses=True)
+    return _redis
+
+
+def _redis_key(user_id: int) -> str:
+    return f"{USER_SETTINGS_KEY_PREFIX}:{user_id}"
+
+
+def _from_row(user_setting: UserSetting) -> CachedUserSettings:
+    return CachedUserSettings(
+        auto_fetch_in_dm=bool(user_setting.auto_fetch_in_dm),
+        force_refresh_cache=bool(user_setting.force_refresh_cache),
+        persisted=True,
+    )
+
+
+def _cache_get(user_id: int) -> CachedUserSettings | None:
+    entry = _cache.get(user_id)
+    if entry is None:
+        return None
+    expires_at, user_settings = entry
+    if expires_at <= time.monotonic():
+        del _cache[user_id]
+        return None
+    _cache.move_to_end(user_id)
+    return user_settings
+
+
+def _cache_put(user_id: int, user_settings: CachedUserSettings) -> None:
+    _cache[user_id] = (time.monotonic() + settings.USER_SETTINGS_CACHE_TTL, user_settings)
+    _cache.move_to_end(user_id)
+    while len(_cache) > settings.USER_SETTINGS_CACHE_SIZE:
+        _cache.popitem(last=False)
+
+
+async def _store(user_id: int, user_settings: CachedUserSettings) -> None:
+    """Write a value through the local cache and, when available, Redis.
+
+    Used after a database write; other replicas are told to drop their local
+    copy instead of serving it until it expires.
+    """
+    _cache_put(user_id, user_settings)
+    try:
+        r = await _get_redis()
+        if r is not None:
+            await r.set(
+                _redis_key(user_id),
+                json.dumps(asdict(user_settings)),
+                ex=settings.USER_SETTINGS_SHARED_TTL,
+            )
+            await r.publish(USER_SETTINGS_INVALIDATION_CHANNEL, f"{_replica_id}:{user_id}")
+    except Exception as e:
+        logger.warning(f"Failed to share settings for user {user_id}: {e}")
+
+
+async def _fill(user_id: int, user_settings: CachedUserSettings) -> CachedUserSettings:
+    """Share a value read from the database after a cache miss.
+
+    The write uses ``SET NX``: a toggle on another replica may have stored a
+    newer value since the miss, and that value wins over the stale read.
+    """
+    try:
+        r = await _get_redis()
+        if r is not None:
+            key = _redis_key(user_id)
+            written = await r.set(
+                key,
+                json.dumps(asdict(user_settings)),
+                ex=settings.USER_SETTINGS_SHARED_TTL,
+                nx=True,
+            )
+            if not written:
+                raw = await r.get(key)
+                if raw is not None:
+                    user_settings = CachedUserSettings(**json.loads(raw))
+    except Exception as e:
+        logger.warning(f"Failed to share settings for user {user_id}: {e}")
+    _cache_put(user_id, user_settings)
+    return user_settings
+
+
+async def _load_from_db(user_id: int, create: bool = False) -> CachedUserSettings:
+    """Load all settings for a user in one query, optionally creating the row."""
     async with get_session() as session:
         result = await session.execute(
             select(UserSetting).where(UserSetting.telegram_user_id == user_id)
         )
-        if result.scalar_one_or_none() is None:
+        user_setting = result.scalar_one_or_none()
+        if user_setting is not None:
+            return _from_row(user_setting)
+        if create:
             session.add(UserSetting(telegram_user_id=user_id))
-    _known_user_ids.add(user_id)
+            return CachedUserSettings(persisted=True)
+    return CachedUserSettings()
+
+
+async def get_user_settings(user_id: int) -> CachedUserSettings:
+    """Return all of a user's settings: local LRU, then Redis, then the database."""
+    user_settings = _cache_get(user_id)
+    if user_settings is not None:
+        return user_settings
+
+    try:
+        r = await _get_redis()
+        if r is not None:
+            raw = await r.get(_redis_key(user_id))
+            if raw is not None:
+                user_settings = CachedUserSettings(**json.loads(raw))
+                _cache_put(user_id, user_settings)
+                return user_settings
+    except Exception as e:
+        logger.warning(f"Settings Redis lookup failed for user {user_id}: {e}")
+
+    return await _fill(user_id, await _load_from_db(user_id))
+
+
+async def ensure_user_settings(user_id: int) -> None:
+    """Create a UserSetting row with defaults if one doesn't exist yet."""
+    user_settings = await get_user_settings(user_id)
+    if user_settings.persisted:
+        return
+    await _store(user_id, await _load_from_db(user_id, create=True))
 
 
 async def get_auto_fetch_in_dm(user_id: int) -> bool:
     """Return the user's auto_fetch_in_dm preference. Defaults to True."""
-    async with get_session() as session:
-        result = await session.execute(
-            select(UserSetting.auto_fetch_in_dm).where(
-                UserSetting.telegram_user_id == user_id
-            )
-        )
-        value = result.scalar_one_or_none()
-    return value if value is not None else True
+    return (await get_user_settings(user_id)).auto_fetch_in_dm
 
 
 async def toggle_auto_fetch_in_dm(user_id: int) -> bool:
@@ -44,24 +184,19 @@ async def toggle_auto_fetch_in_dm(user_id: int) -> bool:
             # Safety fallback — ensure_user_settings should have been called,
             # but handle gracefully.
             user_setting = UserSetting(
-                telegram_user_id=user_id, auto_fetch_in_dm=False
+                telegram_user_id=user_id, auto_fetch_in_dm=False, force_refresh_cache=False
             )
             session.add(user_setting)
         else:
             user_setting.auto_fetch_in_dm = not user_setting.auto_fetch_in_dm
-        return user_setting.auto_fetch_in_dm
+        user_settings = _from_row(user_setting)
+    await _store(user_id, user_settings)
+    return user_settings.auto_fetch_in_dm
 
 
 async def get_force_refresh_cache(user_id: int) -> bool:
     """Return the user's force_refresh_cache preference. Defaults to False."""
-    async with get_session() as session:
-        result = await session.execute(
-            select(UserSetting.force_refresh_cache).where(
-                UserSetting.telegram_user_id == user_id
-            )
-        )
-        value = result.scalar_one_or_none()
-    return value if value is not None else False
+    return (await get_user_settings(user_id)).force_refresh_cache
 
 
 async def toggle_force_refresh_cache(user_id: int) -> bool:
@@ -73,9 +208,60 @@ async def toggle_force_refresh_cache(user_id: int) -> bool:
         user_setting = result.scalar_one_or_none()
         if user_setting is None:
             user_setting = UserSetting(
-                telegram_user_id=user_id, force_refresh_cache=True
+                telegram_user_id=user_id, auto_fetch_in_dm=True, force_refresh_cache=True
             )
             session.add(user_setting)
         else:
             user_setting.force_refresh_cache = not user_setting.force_refresh_cache
-        return user_setting.force_refresh_cache
+        user_settings = _from_row(user_setting)
+    await _store(user_id, user_settings)
+    return user_settings.force_refresh_cache
+
+
+def _handle_invalidation(data: str) -> None:
+    replica_id, _, user_id = data.partition(":")
+    if replica_id != _replica_id:
+        _cache.pop(int(user_id), None)
+
+
+async def _listen_for_invalidations() -> None:
+    while True:
+        try:
+            r = await _get_redis()
+            pubsub = r.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(USER_SETTINGS_INVALIDATION_CHANNEL)
+                # Writes made while we were not subscribed were never seen
+                _cache.clear()
+                async for message in pubsub.listen():
+                    _handle_invalidation(message["data"])
+            finally:
+                await pubsub.aclose()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Settings invalidation listener failed, reconnecting: {e}")
+            await asyncio.sleep(1)
+
+
+def start_invalidation_listener() -> None:
+    """Start dropping local entries that other replicas overwrite (queue mode)."""
+    global _listener_task
+    if _listener_task is None:
+        _listener_task = asyncio.create_task(_listen_for_invalidations())
+
+
+async def close() -> None:
+    """Stop the invalidation listener, clear the local cache and close Redis."""
+    global _redis, _listener_task
+    if _listener_task is not None:
+        _listener_task.cancel()
+        try:
+            await _listener_task
+        except asyncio.CancelledError:
+            pass
+        _listener_task = None
+    _cache.clear()
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
@@ -4,11 +4,12 @@ from contextlib import asynccontextmanager
 from starlette.applications import Starlette
 from starlette.routing import Route
 from starlette.requests import Request
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, Response
 
 from core.services.bot_app import process_telegram_update
 from core.services.message_sender import send_item_message
 from core.config import settings
+from fastfetchbot_shared.utils import telemetry
 from fastfetchbot_shared.utils.logger import logger
 
 
@@ -24,6 +25,7 @@ async def lifespan(app):
     from fastfetchbot_shared.database import init_db, close_db
 
     # -- startup --
+    telemetry.init_tracing("telegram-bot")
     await init_db()
     if settings.TELEGRAM_BOT_TOKEN:
         await startup()
@@ -43,6 +45,7 @@ async def lifespan(app):
     if settings.TELEGRAM_BOT_TOKEN:
         await shutdown()
     await close_db()
+    telemetry.shutdown_tracing()
 
 
 def _log_task_exception(task: asyncio.Task):
@@ -84,12 +87,31 @@ async def health(request: Request):
     return JSONResponse({"status": "healthy"})
 
 
+async def metrics(request: Request):
+    body, content_type = telemetry.render_metrics()
+    return Response(body, media_type=content_type)
+
+
+async def outbox_stats(request: Request):
+    if settings.SCRAPE_MODE != "queue":
+        return JSONResponse({"error": "outbox disabled"}, status_code=404)
+    from core.services import outbox_consumer
+
+    try:
+        return JSONResponse(await outbox_consumer.get_stats())
+    except Exception:
+        logger.exception("Failed to read outbox stats")
+        return JSONResponse({"error": "Internal server error"}, status_code=500)
+
+
 # Full webhook app (used in webhook mode)
 webhook_app = Starlette(
     routes=[
         Route("/webhook", telegram_webhook, methods=["POST"]),
         Route("/send_message", send_message_endpoint, methods=["POST"]),
         Route("/health", health, methods=["GET"]),
+        Route("/metrics", metrics, methods=["GET"]),
+        Route("/outbox/stats", outbox_stats, methods=["GET"]),
     ],
     lifespan=lifespan,
 )
@@ -99,6 +121,8 @@ callback_app = Starlette(
     routes=[
         Route("/send_message", send_message_endpoint, methods=["POST"]),
         Route("/health", health, methods=["GET"]),
+        Route("/metrics", metrics, methods=["GET"]),
+        Route("/outbox/stats", outbox_stats, methods=["GET"]),
     ],
     lifespan=lifespan,
 )
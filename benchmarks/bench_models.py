@@ -0,0 +1,110 @@
+"""Conversion and serialization cost of one metadata item.
+
+A scraped item crosses several boundaries per job: the scraper builds a
+``MetadataItem`` and returns ``to_dict()``, the worker writes it to the outbox
+stream, the bot reads it back, and the API returns it as a JSON response.
+For one representative item this measures the median time of:
+
+* ``from_dict`` / ``to_dict``: ``MetadataItem`` <-> dict;
+* ``encode``: the outbox/API encoding, ``json.dumps`` vs ``codec.encode``;
+* ``decode``: the outbox decoding, ``json.loads`` vs ``codec.decode``;
+* ``api_response``: FastAPI's default ``jsonable_encoder`` + ``json.dumps``
+  (when FastAPI is installed) vs ``codec.encode``.
+
+Usage::
+
+    uv run python benchmarks/bench_models.py [--json] [--iterations N] [--media-files N]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+from fastfetchbot_shared.models.metadata_item import MetadataItem
+from fastfetchbot_shared.utils import codec
+
+_PARAGRAPH = "<p>一段抓取的正文 with <b>markup</b> and a <a href='https://example.com'>link</a>.</p>"
+
+
+def sample_item(media_files: int) -> dict:
+    return {
+        "url": "https://example.com/post/1",
+        "telegraph_url": "",
+        "content": _PARAGRAPH * 60,
+        "text": "Short text 短文本 " * 20,
+        "media_files": [
+            {"media_type": "image", "url": f"https://example.com/{i}.jpg", "caption": f"图 {i}"}
+            for i in range(media_files)
+        ],
+        "author": "author",
+        "title": "An example title 标题",
+        "author_url": "https://example.com/author",
+        "category": "weibo",
+        "message_type": "long",
+    }
+
+
+def _median_us(func, iterations: int) -> float:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    return round(statistics.median(samples), 2)
+
+
+def run(iterations: int, media_files: int) -> dict:
+    item = sample_item(media_files)
+    model = MetadataItem.from_dict(item)
+    payload = {"job_id": "j1", "chat_id": 1, "message_id": None, "metadata_item": item, "error": None}
+    encoded = json.dumps(payload, ensure_ascii=False)
+    results = {
+        "from_dict": _median_us(lambda: MetadataItem.from_dict(item), iterations),
+        "to_dict": _median_us(model.to_dict, iterations),
+        "encode": {
+            "json": _median_us(lambda: json.dumps(payload, ensure_ascii=False), iterations),
+            "codec": _median_us(lambda: codec.encode(payload), iterations),
+        },
+        "decode": {
+            "json": _median_us(lambda: json.loads(encoded), iterations),
+            "codec": _median_us(lambda: codec.decode(encoded), iterations),
+        },
+        "api_response": {"codec": _median_us(lambda: codec.encode(item), iterations)},
+    }
+    try:
+        from fastapi.encoders import jsonable_encoder
+    except ImportError:
+        pass
+    else:
+        results["api_response"]["jsonable_encoder"] = _median_us(
+            lambda: json.dumps(jsonable_encoder(item), ensure_ascii=False).encode(), iterations
+        )
+    results["payload_bytes"] = len(codec.encode(payload))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--media-files", type=int, default=20, help="media files in the sample item")
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    args = parser.parse_args()
+
+    results = run(args.iterations, args.media_files)
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write(os.linesep)
+        return
+    print(f"[item] {args.media_files} media files, {results['payload_bytes']} bytes encoded")
+    print(f"    {'from_dict':<28} {results['from_dict']:>10.2f} us")
+    print(f"    {'to_dict':<28} {results['to_dict']:>10.2f} us")
+    for step in ("encode", "decode", "api_response"):
+        for encoder, us in results[step].items():
+            print(f"    {step + ' (' + encoder + ')':<28} {us:>10.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+"""Offline latency and memory benchmark for every platform scraper.
+
+Each case replays recorded platform responses (``benchmarks/fixtures``) through
+``InfoExtractService.get_item()``, the same entry point the API and the worker
+use, so URL routing, request building, JSON/HTML decoding, parsing and template
+rendering are all measured while no network is touched.
+
+Per case it reports:
+
+* ``p50_ms`` / ``p90_ms`` / ``p99_ms`` / ``mean_ms``: wall-clock latency of one
+  ``get_item()`` call;
+* ``peak_kib``: peak traced memory during one call, above the pre-call baseline;
+* ``retained_kib`` / ``retained_blocks``: memory and allocated blocks still
+  held after the call and a full GC, i.e. what a call leaves behind;
+* ``requests``: replayed HTTP requests per call.
+
+Usage::
+
+    uv run python benchmarks/bench_scrapers.py
+    uv run python benchmarks/bench_scrapers.py --json results/HEAD.json
+    uv run python benchmarks/bench_scrapers.py --compare results/main.json -k zhihu
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from replay import FIXTURES_DIR, ReplaySession  # noqa: E402
+
+# asyncpraw checks PyPI for a newer release on first use
+os.environ.setdefault("praw_check_for_updates", "False")
+
+_REDDIT_CREDENTIALS = {
+    "fastfetchbot_shared.services.scrapers.reddit.settings.REDDIT_CLIENT_ID": "bench",
+    "fastfetchbot_shared.services.scrapers.reddit.settings.REDDIT_CLIENT_SECRET": "bench",
+    "fastfetchbot_shared.services.scrapers.reddit.settings.REDDIT_USERNAME": "bench",
+    "fastfetchbot_shared.services.scrapers.reddit.settings.REDDIT_PASSWORD": "bench",
+}
+
+
+async def _no_dns_record(self, handle: str) -> None:
+    return None
+
+
+async def _no_delay(self) -> None:
+    return None
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    source: str
+    url: str
+    fixture: str
+    content_type: str = "social_media"
+    kwargs: dict = field(default_factory=dict)
+    # Dotted attribute path -> value, applied for the duration of the case
+    patches: dict = field(default_factory=dict)
+
+
+CASES = [
+    Case(
+        name="twitter135_thread",
+        source="twitter",
+        url="https://x.com/fastfetchbench/status/1800000000000000001",
+        fixture="twitter/twitter135_thread.json",
+        kwargs={"include_comments": False},
+        patches={
+            "fastfetchbot_shared.services.scrapers.twitter.ALL_SCRAPER": ["Twitter135"],
+            "fastfetchbot_shared.services.scrapers.twitter.settings.X_RAPIDAPI_KEY": "bench",
+        },
+    ),
+    Case(
+        name="twitter135_article",
+        source="twitter",
+        url="https://x.com/fastfetchbench/status/1800000000000000100",
+        fixture="twitter/twitter135_article.json",
+        patches={
+            "fastfetchbot_shared.services.scrapers.twitter.ALL_SCRAPER": ["Twitter135"],
+            "fastfetchbot_shared.services.scrapers.twitter.settings.X_RAPIDAPI_KEY": "bench",
+        },
+    ),
+    Case(
+        name="zhihu_answer_api",
+        source="zhihu",
+        url="https://www.zhihu.com/question/600000001/answer/3000000001",
+        fixture="zhihu/answer_api.json",
+    ),
+    Case(
+        name="zhihu_answer_html",
+        source="zhihu",
+        url="https://www.zhihu.com/question/600000001/answer/3000000001",
+        fixture="zhihu/answer_html.json",
+        kwargs={"method": "json"},
+        patches={"fastfetchbot_shared.services.scrapers.zhihu.ALL_METHODS": ["json"]},
+    ),
+    Case(
+        name="zhihu_article_api",
+        source="zhihu",
+        url="https://zhuanlan.zhihu.com/p/700000001",
+        fixture="zhihu/article_api.json",
+    ),
+    Case(
+        name="zhihu_pin_api",
+        source="zhihu",
+        url="https://www.zhihu.com/pin/1800000000000000001",
+        fixture="zhihu/pin_api.json",
+    ),
+    Case(
+        name="weibo_api",
+        source="weibo",
+        url="https://weibo.com/1000000001/5000000000000001",
+        fixture="weibo/api.json",
+    ),
+    Case(
+        name="weibo_longtext",
+        source="weibo",
+        url="https://weibo.com/1000000001/5000000000000002",
+        fixture="weibo/longtext.json",
+    ),
+    Case(
+        name="xiaohongshu_feed",
+        source="xiaohongshu",
+        url="https://www.xiaohongshu.com/explore/66aa00000000000001000001"
+            "?xsec_token=ABbench&xsec_source=pc_share",
+        fixture="xiaohongshu/feed.json",
+        patches={
+            "fastfetchbot_shared.services.scrapers.xiaohongshu.XHS_SIGN_SERVER_URL": "http://sign.bench",
+            "fastfetchbot_shared.services.scrapers.xiaohongshu.XHS_COOKIE_STRING": "a1=bench; web_session=bench",
+        },
+    ),
+    Case(
+        name="reddit_image_post",
+        source="reddit",
+        url="https://www.reddit.com/r/Python/comments/1bench1/benchmark_post/",
+        fixture="reddit/image_post.json",
+        patches={
+            **_REDDIT_CREDENTIALS,
+            # Measure a fetch on every call, not the submission cache
+            "fastfetchbot_shared.services.scrapers.reddit.settings.REDDIT_SUBMISSION_CACHE_TTL": 0,
+            # The shared client paces back-to-back requests by the replayed
+            # rate-limit headers; the calls here are back to back by design
+            "asyncprawcore.rate_limit.RateLimiter.delay": _no_delay,
+        },
+    ),
+    Case(
+        name="bluesky_thread",
+        source="bluesky",
+        url="https://bsky.app/profile/bench.bsky.social/post/3kbenchpost01",
+        fixture="bluesky/thread.json",
+        patches={
+            # DNS TXT lookups are not replayed; resolution falls back to the
+            # recorded /.well-known/atproto-did response
+            "atproto_identity.handle.resolver.AsyncHandleResolver.resolve_dns": _no_dns_record,
+            "fastfetchbot_shared.services.scrapers.scraper_manager.settings.BLUESKY_USERNAME": None,
+        },
+    ),
+    Case(
+        name="douban_note",
+        source="douban",
+        url="https://www.douban.com/note/800000001/",
+        fixture="douban/note.json",
+    ),
+    Case(
+        name="douban_movie_review",
+        source="douban",
+        url="https://movie.douban.com/review/900000001/",
+        fixture="douban/movie_review.json",
+    ),
+    Case(
+        name="wechat_article",
+        source="wechat",
+        url="https://mp.weixin.qq.com/s/FastFetchBenchArticle01",
+        fixture="wechat/article.json",
+    ),
+]
+
+
+async def _get_item(case: Case) -> dict:
+    from fastfetchbot_shared.models.url_metadata import UrlMetadata
+    from fastfetchbot_shared.services.scrapers.common import InfoExtractService
+
+    service = InfoExtractService(
+        UrlMetadata(url=case.url, source=case.source, content_type=case.content_type),
+        **case.kwargs,
+    )
+    return await service.get_item()
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_case(case: Case, iterations: int, warmup: int, memory_iterations: int) -> dict:
+    session = ReplaySession(FIXTURES_DIR / case.fixture)
+    with ExitStack() as stack:
+        stack.enter_context(session.install())
+        for target, value in case.patches.items():
+            stack.enter_context(mock.patch(target, value))
+
+        item = await _get_item(case)
+        if not item.get("title"):
+            raise RuntimeError(f"{case.name}: replay produced an empty item")
+        for _ in range(warmup):
+            await _get_item(case)
+
+        session.requests = 0
+        latencies = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            await _get_item(case)
+            latencies.append((time.perf_counter() - start) * 1000)
+        requests_per_call = session.requests / iterations
+
+        peaks, retained, retained_blocks = [], [], []
+        tracemalloc.start()
+        try:
+            for _ in range(memory_iterations):
+                gc.collect()
+                baseline, _ = tracemalloc.get_traced_memory()
+                baseline_blocks = sys.getallocatedblocks()
+                tracemalloc.reset_peak()
+                await _get_item(case)
+                _, peak = tracemalloc.get_traced_memory()
+                gc.collect()
+                current, _ = tracemalloc.get_traced_memory()
+                peaks.append(peak - baseline)
+                retained.append(current - baseline)
+                retained_blocks.append(sys.getallocatedblocks() - baseline_blocks)
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "platform": case.source,
+        "iterations": iterations,
+        "p50_ms": round(_percentile(latencies, 0.50), 3),
+        "p90_ms": round(_percentile(latencies, 0.90), 3),
+        "p99_ms": round(_percentile(latencies, 0.99), 3),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "peak_kib": round(statistics.median(peaks) / 1024, 1),
+        "retained_kib": round(statistics.median(retained) / 1024, 1),
+        "retained_blocks": int(statistics.median(retained_blocks)),
+        "requests": round(requests_per_call, 2),
+        "unmatched_requests": sorted(set(session.unmatched)),
+    }
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run(cases: list[Case], iterations: int, warmup: int, memory_iterations: int) -> dict:
+    results = {}
+    for case in cases:
+        try:
+            results[case.name] = await run_case(case, iterations, warmup, memory_iterations)
+        except Exception as e:
+            results[case.name] = {"platform": case.source, "error": f"{type(e).__name__}: {e}"}
+    return {
+        "meta": {
+            "revision": _git_revision(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "iterations": iterations,
+            "memory_iterations": memory_iterations,
+        },
+        "cases": results,
+    }
+
+
+def _print_table(report: dict, baseline: dict | None) -> None:
+    print(f"revision {report['meta']['revision']}, python {report['meta']['python']}, "
+          f"{report['meta']['iterations']} iterations")
+    header = f"{'case':<22} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'peak KiB':>9} {'kept KiB':>9} {'reqs':>5}"
+    print(header)
+    print("-" * len(header))
+    for name, result in report["cases"].items():
+        if "error" in result:
+            print(f"{name:<22} ERROR {result['error']}")
+            continue
+        line = (
+            f"{name:<22} {result['p50_ms']:>9.3f} {result['p90_ms']:>9.3f} {result['p99_ms']:>9.3f} "
+            f"{result['peak_kib']:>9.1f} {result['retained_kib']:>9.1f} {result['requests']:>5g}"
+        )
+        previous = (baseline or {}).get("cases", {}).get(name)
+        if previous and "error" not in previous and previous["p50_ms"]:
+            delta = (result["p50_ms"] - previous["p50_ms"]) / previous["p50_ms"] * 100
+            line += f"   p50 {delta:+.1f}% vs {baseline['meta']['revision']}"
+        print(line)
+        if result["unmatched_requests"]:
+            print(f"    unmatched: {', '.join(result['unmatched_requests'])}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", "--filter", default="", help="only run cases whose name contains this string")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--memory-iterations", type=int, default=5)
+    parser.add_argument("--json", metavar="PATH", help="write the results to PATH as JSON")
+    parser.add_argument("--compare", metavar="PATH", help="show p50 change against an earlier --json result")
+    args = parser.parse_args()
+
+    from fastfetchbot_shared.utils.logger import logger
+
+    logger.remove()
+    logger.add(sys.stderr, level="ERROR")
+    # asyncpraw never closes its aiohttp session
+    logging.getLogger("asyncio").setLevel(logging.CRITICAL)
+
+    cases = [case for case in CASES if args.filter in case.name]
+    report = asyncio.run(run(cases, args.iterations, args.warmup, args.memory_iterations))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    _print_table(report, baseline)
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""XHS signing cost against the local stand-in sign server.
+
+Runs the same burst of sign requests (``--concurrency`` at a time, as the
+comment crawler issues them) through:
+
+* ``per_request_client``: a new HTTP client and one round trip per signature,
+  what every post paid before ``XhsSigner``;
+* ``signer_single``: ``XhsSigner`` with batching and caching off;
+* ``signer_batched``: ``XhsSigner`` batching concurrent requests;
+* ``signer_cached``: the batched signer over requests that repeat, as a
+  retried or re-fetched post does.
+
+Per mode it reports the wall-clock time of the burst and how many HTTP
+requests and signatures the sign server handled.
+
+Usage::
+
+    uv run python benchmarks/bench_sign.py
+    uv run python benchmarks/bench_sign.py --requests 200 --concurrency 8 --rtt-ms 30
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from unittest import mock
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from sign_server import SIGN_PATH, SignServer  # noqa: E402
+
+from fastfetchbot_shared.services.scrapers.config import settings  # noqa: E402
+from fastfetchbot_shared.services.scrapers.xiaohongshu.signer import XhsSigner  # noqa: E402
+
+COOKIES = "a1=bench; web_session=bench"
+
+
+def _uris(count: int, distinct: int) -> list[str]:
+    return [f"/api/sns/web/v2/comment/sub/page?root_comment_id={i % distinct}" for i in range(count)]
+
+
+async def _burst(sign, uris: list[str], concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(uri: str) -> None:
+        async with semaphore:
+            await sign(uri)
+
+    await asyncio.gather(*(one(uri) for uri in uris))
+
+
+async def _per_request_client(endpoint: str, uris: list[str], concurrency: int) -> None:
+    async def sign(uri: str) -> None:
+        async with httpx.AsyncClient() as client:
+            resp = await client.post(
+                f"{endpoint}{SIGN_PATH}", json={"uri": uri, "data": None, "cookies": COOKIES}
+            )
+            resp.raise_for_status()
+
+    await _burst(sign, uris, concurrency)
+
+
+async def _signer(endpoint: str, uris: list[str], concurrency: int, batch: bool, ttl: float) -> None:
+    with mock.patch.object(settings, "XHS_SIGN_BATCH", batch), \
+            mock.patch.object(settings, "XHS_SIGN_CACHE_TTL", ttl):
+        signer = XhsSigner(endpoint)
+        try:
+            await _burst(lambda uri: signer.sign(uri, None, COOKIES), uris, concurrency)
+        finally:
+            await signer.close()
+
+
+async def run(args: argparse.Namespace) -> list[dict]:
+    server = SignServer(rtt_ms=args.rtt_ms, sign_ms=args.sign_ms)
+    srv = await server.start()
+    endpoint = f"http://127.0.0.1:{srv.sockets[0].getsockname()[1]}"
+    unique = _uris(args.requests, args.requests)
+    repeated = _uris(args.requests, max(args.requests // 4, 1))
+    modes = {
+        "per_request_client": lambda: _per_request_client(endpoint, unique, args.concurrency),
+        "signer_single": lambda: _signer(endpoint, unique, args.concurrency, batch=False, ttl=0),
+        "signer_batched": lambda: _signer(endpoint, unique, args.concurrency, batch=True, ttl=0),
+        "signer_cached": lambda: _signer(endpoint, repeated, args.concurrency, batch=True, ttl=30),
+    }
+    results = []
+    try:
+        for name, mode in modes.items():
+            server.requests = server.signatures = 0
+            start = time.perf_counter()
+            await mode()
+            results.append({
+                "mode": name,
+                "total_ms": round((time.perf_counter() - start) * 1000, 1),
+                "http_requests": server.requests,
+                "signatures": server.signatures,
+            })
+    finally:
+        srv.close()
+        await srv.wait_closed()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rtt-ms", type=float, default=20.0)
+    parser.add_argument("--sign-ms", type=float, default=2.0)
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    results = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'mode':<22}{'total_ms':>10}{'http_requests':>15}{'signatures':>12}")
+    for row in results:
+        print(f"{row['mode']:<22}{row['total_ms']:>10}{row['http_requests']:>15}{row['signatures']:>12}")
+
+
+if __name__ == "__main__":
+    main()
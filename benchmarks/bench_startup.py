@@ -0,0 +1,136 @@
+"""Import (cold-start) time of each app, from ``python -X importtime``.
+
+Every app entry module is imported in a fresh interpreter with
+``-X importtime`` and, per app, this reports:
+
+* ``import_ms``: cumulative import time of the entry module;
+* ``heaviest``: the top-level packages whose modules took the most import
+  time of their own (``importtime``'s self time, summed per package);
+* ``platform_libs``: heavy platform clients already imported at startup.
+
+With ``--warm-up`` it also times ``registry.warm_up()`` in a fresh
+interpreter: the import cost the API and the worker move to a background
+thread after startup.
+
+Run from the repository root with the apps' dependencies installed; each app
+is imported from its own directory, as its Dockerfile does.
+
+Usage::
+
+    uv run python benchmarks/bench_startup.py
+    uv run python benchmarks/bench_startup.py --json --top 15 --warm-up
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# app -> (working directory, entry module)
+APPS = {
+    "api": ("apps/api", "src.main"),
+    "async-worker": ("apps/async-worker", "async_worker.main"),
+    "telegram-bot": ("apps/telegram-bot", "core.main"),
+}
+
+PLATFORM_LIBS = ("twitter", "atproto", "asyncpraw", "playwright", "openai", "firecrawl", "uvloop")
+
+_REPORT_LOADED = (
+    "import sys; "
+    f"print(','.join(m for m in {PLATFORM_LIBS!r} if m in sys.modules))"
+)
+
+
+def _run(cwd: Path, code: str, importtime: bool = False) -> subprocess.CompletedProcess:
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(cwd), os.environ.get("PYTHONPATH")]))}
+    return subprocess.run(command + ["-c", code], cwd=cwd, env=env, capture_output=True, text=True)
+
+
+def _parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """``(module, self_us, cumulative_us)`` for every ``import time:`` line."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        rows.append((module.rstrip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def measure_app(name: str, top: int) -> dict:
+    directory, module = APPS[name]
+    cwd = ROOT / directory
+    result = _run(cwd, f"import {module}; {_REPORT_LOADED}", importtime=True)
+    if result.returncode != 0:
+        return {"error": result.stderr.strip().splitlines()[-1]}
+    rows = _parse_importtime(result.stderr)
+    entry = next(cumulative for mod, _, cumulative in rows if mod.strip() == module)
+    packages = {}
+    for mod, self_us, _ in rows:
+        package = mod.strip().split(".")[0]
+        packages[package] = packages.get(package, 0) + self_us
+    heaviest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+    loaded = result.stdout.strip().splitlines()[-1] if result.stdout.strip() else ""
+    return {
+        "import_ms": round(entry / 1000, 1),
+        "heaviest": {package: round(us / 1000, 1) for package, us in heaviest},
+        "platform_libs": [lib for lib in loaded.split(",") if lib],
+    }
+
+
+def measure_warm_up() -> dict:
+    code = (
+        "import time\n"
+        "from fastfetchbot_shared.services.scrapers import registry\n"
+        "start = time.perf_counter()\n"
+        "loaded = registry.warm_up()\n"
+        "print(round((time.perf_counter() - start) * 1000, 1), ','.join(loaded))\n"
+    )
+    result = _run(ROOT, code)
+    if result.returncode != 0:
+        return {"error": result.stderr.strip().splitlines()[-1]}
+    elapsed, loaded = result.stdout.strip().splitlines()[-1].split(" ", 1)
+    return {"warm_up_ms": float(elapsed), "categories": loaded.split(",")}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=8, help="heaviest packages listed per app")
+    parser.add_argument("--warm-up", action="store_true", help="also time preloading every scraper")
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    args = parser.parse_args()
+
+    results = {name: measure_app(name, args.top) for name in APPS}
+    if args.warm_up:
+        results["warm_up"] = measure_warm_up()
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write(os.linesep)
+        return
+    for name in APPS:
+        app = results[name]
+        if "error" in app:
+            print(f"[{name}] ERROR {app['error']}")
+            continue
+        print(f"[{name}] import: {app['import_ms']} ms, "
+              f"platform libs at startup: {', '.join(app['platform_libs']) or 'none'}")
+        for package, ms in app["heaviest"].items():
+            print(f"    {package:<28} {ms:>9} ms")
+    if args.warm_up:
+        warm_up = results["warm_up"]
+        if "error" in warm_up:
+            print(f"[warm-up] ERROR {warm_up['error']}")
+        else:
+            print(f"[warm-up] {warm_up['warm_up_ms']} ms in the background for "
+                  f"{len(warm_up['categories'])} scrapers")
+
+
+if __name__ == "__main__":
+    main()
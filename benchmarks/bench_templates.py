@@ -0,0 +1,161 @@
+"""Compile and render cost of every Jinja2 template.
+
+For each template directory this measures:
+
+* ``compile_ms``: parse + compile from source (no bytecode cache), what every
+  process start paid before the bytecode cache existed;
+* ``load_ms``: load from a warm ``FileSystemBytecodeCache``;
+* ``render_us``: median render time per template with representative data.
+
+Usage::
+
+    uv run python benchmarks/bench_templates.py [--json] [--iterations N]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+ROOT = Path(__file__).resolve().parents[1]
+TEMPLATE_DIRS = {
+    "scrapers": ROOT / "packages/shared/fastfetchbot_shared/services/scrapers/templates",
+    "telegram-bot": ROOT / "apps/telegram-bot/core/templates",
+}
+
+_LONG_HTML = "<p>" + "A paragraph of scraped content with <b>markup</b>. " * 40 + "</p>"
+
+# Superset of every field the templates read
+SAMPLE_DATA = {
+    "url": "https://example.com/post/1",
+    "telegraph_url": "https://telegra.ph/post-1",
+    "title": "An example title",
+    "author": "author",
+    "author_url": "https://example.com/author",
+    "category": "twitter",
+    "message_type": "short",
+    "message": "",
+    "text": "Short text " * 20,
+    "content": _LONG_HTML,
+    "raw_content": _LONG_HTML,
+    "html_content_text": _LONG_HTML,
+    "short_text": "Short text " * 20,
+    "created": "2024-01-01 00:00",
+    "created_at": "2024-01-01 00:00",
+    "updated": "2024-01-02 00:00",
+    "date": "2024-01-01",
+    "duration": "10:00",
+    "playback_data": "1000 views",
+    "description": "A video description",
+    "media_files": [
+        {"type": "image", "url": "https://example.com/1.jpg", "caption": ""},
+        {"type": "video", "url": "https://example.com/1.mp4", "caption": ""},
+    ],
+    "retweet_post": None,
+    "retweeted_info": None,
+    "douban_type": SimpleNamespace(value="note"),
+    "group_url": "",
+    "group_name": "",
+    "item_url": "",
+    "item_title": "",
+    "item_type": "",
+    "subreddit": "r/python",
+    "subreddit_url": "https://reddit.com/r/python",
+    "subreddit_name_prefixed": "r/python",
+    "comments_count": 10,
+    "score": 100,
+    "upvote_ratio": 0.9,
+    "source": "iPhone",
+    "reposts_count": 1,
+    "attitudes_count": 2,
+    "region_name": "",
+    "collected_count": 1,
+    "share_count": 1,
+    "comment_count": 1,
+    "like_count": 1,
+    "ip_location": "",
+    "zhihu_type": "answer",
+    "question_id": "1",
+    "question": None,
+    "upvote": 5,
+    "column": "",
+    "translated_zhihu_type": "回答",
+    "origin_pin_url": "",
+    "origin_pin_author": "",
+}
+TEMPLATE_TEXT = {"online_snapshot": "Online Snapshot", "original_webpage": "Original Webpage"}
+
+
+def _environment(directory: Path, bytecode_cache=None) -> Environment:
+    return Environment(
+        loader=FileSystemLoader(str(directory)),
+        lstrip_blocks=True,
+        trim_blocks=True,
+        auto_reload=False,
+        bytecode_cache=bytecode_cache,
+    )
+
+
+def _load_all_ms(directory: Path, bytecode_cache=None) -> float:
+    environment = _environment(directory, bytecode_cache)
+    start = time.perf_counter()
+    for name in environment.list_templates(extensions=["jinja2"]):
+        environment.get_template(name)
+    return (time.perf_counter() - start) * 1000
+
+
+def run(iterations: int) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for namespace, directory in TEMPLATE_DIRS.items():
+            bytecode_cache = FileSystemBytecodeCache(cache_dir, pattern=f"{namespace}-%s.cache")
+            compile_ms = _load_all_ms(directory)
+            _load_all_ms(directory, bytecode_cache)  # populate the cache
+            load_ms = _load_all_ms(directory, bytecode_cache)
+
+            environment = _environment(directory)
+            renders = {}
+            for name in environment.list_templates(extensions=["jinja2"]):
+                template = environment.get_template(name)
+                samples = []
+                for _ in range(iterations):
+                    start = time.perf_counter()
+                    template.render(data=SAMPLE_DATA, template_text=TEMPLATE_TEXT)
+                    samples.append((time.perf_counter() - start) * 1_000_000)
+                renders[name] = round(statistics.median(samples), 2)
+
+            results[namespace] = {
+                "compile_ms": round(compile_ms, 3),
+                "load_ms": round(load_ms, 3),
+                "render_us": renders,
+            }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    args = parser.parse_args()
+
+    results = run(args.iterations)
+    if args.json:
+        json.dump(results, sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write(os.linesep)
+        return
+    for namespace, result in results.items():
+        print(f"[{namespace}] compile from source: {result['compile_ms']} ms, "
+              f"load from bytecode cache: {result['load_ms']} ms")
+        for name, render_us in sorted(result["render_us"].items(), key=lambda kv: -kv[1]):
+            print(f"    {name:<36} {render_us:>10.2f} us/render")
+
+
+if __name__ == "__main__":
+    main()
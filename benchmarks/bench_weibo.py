@@ -0,0 +1,126 @@
+"""Parity and speed of Weibo's page decoding and text cleaning.
+
+Over the recorded Weibo fixtures (``benchmarks/fixtures/weibo``) this compares:
+
+* ``render_data``: the previous ``find``/``rfind`` slicing of the mobile detail
+  page against ``extract_render_data``'s single regex scan and in-place decode;
+* ``clean``: ``_weibo_html_text_clean_bs4`` against the default
+  ``_weibo_html_text_clean_lxml`` on every post text in the fixtures.
+
+``parity`` says whether both sides produced the same result. Cleaned text is
+compared the way ``_process_weibo_item`` uses it: after ``<br/>``
+normalization and with percent-encoded hrefs decoded, as lxml escapes
+non-ASCII characters in URLs.
+
+Usage::
+
+    uv run python benchmarks/bench_weibo.py [--json] [--iterations N]
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from urllib.parse import unquote
+
+from fastfetchbot_shared.services.scrapers.weibo.engine import extract_render_data
+from fastfetchbot_shared.services.scrapers.weibo.scraper import WeiboDataProcessor
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "weibo"
+
+
+def _slice_render_status(page: str) -> dict:
+    """The page decoding used before ``extract_render_data``."""
+    page = page[page.find('"status":'):]
+    page = page[: page.rfind('"hotScheme"')]
+    page = page[: page.rfind(",")]
+    page = page[: page.rfind("][0] || {};")]
+    return json.loads("{" + page, strict=False).get("status")
+
+
+def _texts() -> list[str]:
+    texts = []
+
+    def collect(node) -> None:
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key in ("text", "longTextContent") and isinstance(value, str):
+                    texts.append(value)
+                else:
+                    collect(value)
+        elif isinstance(node, list):
+            for value in node:
+                collect(value)
+
+    for path in sorted(FIXTURES.glob("*.json")):
+        collect(json.loads(path.read_text(encoding="utf-8")))
+    collect(extract_render_data((FIXTURES / "detail_page.html").read_text(encoding="utf-8")))
+    return texts
+
+
+def _normalize(text: str) -> str:
+    return unquote(text.replace("<br />", "<br>").replace("br/", "br"))
+
+
+def _median_us(function, argument, iterations: int) -> float:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        function(argument)
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    return round(statistics.median(samples), 2)
+
+
+def run(iterations: int) -> dict:
+    page = (FIXTURES / "detail_page.html").read_text(encoding="utf-8")
+    results = {
+        "render_data": {
+            "parity": _slice_render_status(page) == extract_render_data(page)["status"],
+            "slicing_us": _median_us(_slice_render_status, page, iterations),
+            "scan_us": _median_us(extract_render_data, page, iterations),
+        }
+    }
+
+    texts = _texts()
+    parity = []
+    for text in texts:
+        bs4_text, bs4_pics = WeiboDataProcessor._weibo_html_text_clean_bs4(text)
+        lxml_text, lxml_pics = WeiboDataProcessor._weibo_html_text_clean_lxml(text)
+        parity.append(_normalize(bs4_text) == _normalize(lxml_text) and bs4_pics == lxml_pics)
+    bs4_us = [_median_us(WeiboDataProcessor._weibo_html_text_clean_bs4, t, iterations) for t in texts]
+    lxml_us = [_median_us(WeiboDataProcessor._weibo_html_text_clean_lxml, t, iterations) for t in texts]
+    results["clean"] = {
+        "texts": len(texts),
+        "parity": f"{sum(parity)}/{len(texts)}",
+        "bs4_us": round(sum(bs4_us), 2),
+        "lxml_us": round(sum(lxml_us), 2),
+    }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    results = run(args.iterations)
+    if args.json:
+        json.dump(results, sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write(os.linesep)
+        return
+    render_data = results["render_data"]
+    print(f"[render_data] parity: {render_data['parity']}, slicing: {render_data['slicing_us']} us, "
+          f"single scan: {render_data['scan_us']} us")
+    clean = results["clean"]
+    print(f"[clean] {clean['texts']} texts, parity: {clean['parity']}, "
+          f"bs4: {clean['bs4_us']} us, lxml: {clean['lxml_us']} us (sum of per-text medians)")
+
+
+if __name__ == "__main__":
+    main()
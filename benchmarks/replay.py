@@ -0,0 +1,187 @@
+"""Offline HTTP replay for the scraper benchmarks.
+
+A fixture file lists recorded responses. While a :class:`ReplaySession` is
+installed it stands in for httpx's sync and async transports and for
+asyncprawcore's requestor, so every scraper runs its real request, decode and
+parse path without opening a socket.
+
+Fixture format::
+
+    {
+      "responses": [
+        {"method": "GET", "url": "https://host/path", "json": {...}},
+        {"method": "GET", "url": "/xrpc/app.bsky.feed.getPostThread", "json": {...}},
+        {"method": "GET", "url": "https://host/page", "body_file": "page.html",
+         "headers": {"content-type": "text/html; charset=utf-8"}}
+      ]
+    }
+
+``url`` is a prefix of the full request URL, or of the path alone when it
+starts with ``/``. The first matching entry wins. ``status`` defaults to 200;
+the body is one of ``json``, ``text`` or ``body_file`` (relative to the
+fixture file).
+"""
+
+import json
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from unittest import mock
+from urllib.parse import urlencode, urlsplit
+
+import httpx
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+
+@dataclass(frozen=True)
+class RecordedResponse:
+    method: str
+    url: str
+    status: int = 200
+    headers: dict = field(default_factory=dict)
+    body: bytes = b""
+
+    def matches(self, method: str, url: str) -> bool:
+        if method.upper() != self.method:
+            return False
+        if self.url.startswith("/"):
+            return urlsplit(url).path.startswith(self.url)
+        return url.startswith(self.url)
+
+
+def load_fixture(path: Path) -> list[RecordedResponse]:
+    with open(path, encoding="utf-8") as f:
+        raw = json.load(f)
+    responses = []
+    for entry in raw["responses"]:
+        headers = {k.lower(): v for k, v in entry.get("headers", {}).items()}
+        if "json" in entry:
+            body = json.dumps(entry["json"], ensure_ascii=False).encode("utf-8")
+            headers.setdefault("content-type", "application/json")
+        elif "body_file" in entry:
+            body = (path.parent / entry["body_file"]).read_bytes()
+        else:
+            body = entry.get("text", "").encode("utf-8")
+        responses.append(
+            RecordedResponse(
+                method=entry.get("method", "GET").upper(),
+                url=entry["url"],
+                status=entry.get("status", 200),
+                headers=headers,
+                body=body,
+            )
+        )
+    return responses
+
+
+class _ReplayClientResponse:
+    """The subset of ``aiohttp.ClientResponse`` that asyncprawcore reads."""
+
+    def __init__(self, recorded: RecordedResponse, method: str, url: str):
+        from multidict import CIMultiDict, CIMultiDictProxy
+
+        self.method = method
+        self.url = url
+        self.status = recorded.status
+        self.reason = "OK" if recorded.status < 400 else "Error"
+        self.headers = CIMultiDictProxy(CIMultiDict(recorded.headers))
+        self.history = ()
+        self._body = recorded.body
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def text(self, encoding: str = "utf-8") -> str:
+        return self._body.decode(encoding)
+
+    async def json(self, **kwargs):
+        return json.loads(self._body)
+
+    def release(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def __await__(self):
+        # asyncprawcore < 3 awaits ``Requestor.request``; later releases use it
+        # as an async context manager
+        yield from ()
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.release()
+
+
+class ReplaySession:
+    """Serve one fixture's recorded responses and count what was requested."""
+
+    def __init__(self, fixture_path: Path):
+        self.fixture_path = fixture_path
+        self.responses = load_fixture(fixture_path)
+        self.requests = 0
+        self.unmatched: list[str] = []
+
+    def lookup(self, method: str, url: str) -> RecordedResponse | None:
+        self.requests += 1
+        for recorded in self.responses:
+            if recorded.matches(method, url):
+                return recorded
+        self.unmatched.append(f"{method.upper()} {url}")
+        return None
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        recorded = self.lookup(request.method, str(request.url))
+        if recorded is None:
+            raise httpx.ConnectError(
+                f"No recorded response for {request.method} {request.url}", request=request
+            )
+        return httpx.Response(
+            recorded.status, headers=recorded.headers, content=recorded.body, request=request
+        )
+
+    def handle_reddit_request(self, method: str, url: str, **kwargs) -> _ReplayClientResponse:
+        params = kwargs.get("params")
+        full_url = f"{url}?{urlencode(params)}" if params else url
+        recorded = self.lookup(method, full_url)
+        if recorded is None:
+            raise ConnectionError(f"No recorded response for {method.upper()} {full_url}")
+        return _ReplayClientResponse(recorded, method.upper(), full_url)
+
+    @contextmanager
+    def install(self):
+        """Route all outgoing HTTP through this session for the duration of the block."""
+        session = self
+
+        def handle_request(transport, request):
+            return session.handle_request(request)
+
+        async def handle_async_request(transport, request):
+            return session.handle_request(request)
+
+        def reddit_request(requestor, *args, **kwargs):
+            method = args[0] if args else kwargs.pop("method")
+            url = args[1] if len(args) > 1 else kwargs.pop("url")
+            return session.handle_reddit_request(method, url, **kwargs)
+
+        patches = [
+            mock.patch.object(httpx.HTTPTransport, "handle_request", handle_request),
+            mock.patch.object(httpx.AsyncHTTPTransport, "handle_async_request", handle_async_request),
+        ]
+        try:
+            from asyncprawcore.requestor import Requestor
+        except ImportError:
+            pass
+        else:
+            patches.append(mock.patch.object(Requestor, "request", reddit_request))
+        for patcher in patches:
+            patcher.start()
+        try:
+            yield session
+        finally:
+            for patcher in reversed(patches):
+                patcher.stop()
@@ -0,0 +1,115 @@
+"""Local stand-in for the XHS sign server.
+
+Answers ``POST /signsrv/v1/xhs/sign`` and ``POST /signsrv/v1/xhs/sign/batch``
+with well-formed fake signatures, so the signing client can be benchmarked
+without the real server or a browser. Latency is simulated in two parts:
+
+* ``rtt_ms``: paid once per HTTP request (network and request overhead);
+* ``sign_ms``: paid per signature, one at a time, like the real server's
+  single JavaScript runtime.
+
+Usage::
+
+    uv run python benchmarks/sign_server.py --port 8989 --rtt-ms 20 --sign-ms 2
+    uv run python benchmarks/sign_server.py --no-batch   # batch endpoint answers 404
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import dataclass, field
+
+SIGN_PATH = "/signsrv/v1/xhs/sign"
+BATCH_SIGN_PATH = "/signsrv/v1/xhs/sign/batch"
+
+
+def fake_sign(payload: dict) -> dict:
+    digest = hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+    return {
+        "x_s": f"XYW_{digest[:32]}",
+        "x_t": str(int(time.time() * 1000)),
+        "x_s_common": digest[32:],
+        "x_b3_traceid": digest[:16],
+    }
+
+
+@dataclass
+class SignServer:
+    rtt_ms: float = 20.0
+    sign_ms: float = 2.0
+    batch: bool = True
+    requests: int = 0
+    signatures: int = 0
+    _engine: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    async def _sign(self, payloads: list[dict]) -> list[dict]:
+        signs = []
+        for payload in payloads:
+            async with self._engine:
+                await asyncio.sleep(self.sign_ms / 1000)
+            self.signatures += 1
+            signs.append(fake_sign(payload))
+        return signs
+
+    async def route(self, path: str, body: bytes) -> tuple[int, dict]:
+        self.requests += 1
+        await asyncio.sleep(self.rtt_ms / 1000)
+        if path == SIGN_PATH:
+            (sign,) = await self._sign([json.loads(body)])
+            return 200, {"isok": True, "msg": "ok", "data": sign}
+        if path == BATCH_SIGN_PATH and self.batch:
+            payloads = json.loads(body)["requests"]
+            return 200, {"isok": True, "msg": "ok", "data": await self._sign(payloads)}
+        return 404, {"isok": False, "msg": "not found"}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve HTTP/1.1 requests on one keep-alive connection."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                _, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                status, response = await self.route(path.split("?", 1)[0], body)
+                content = json.dumps(response).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Not Found'}\r\n"
+                    f"content-type: application/json\r\n"
+                    f"content-length: {len(content)}\r\n\r\n".encode("latin-1") + content
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> asyncio.Server:
+        return await asyncio.start_server(self.handle, host, port)
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    server = SignServer(rtt_ms=args.rtt_ms, sign_ms=args.sign_ms, batch=not args.no_batch)
+    async with await server.start(args.host, args.port) as srv:
+        print(f"Fake XHS sign server on http://{args.host}:{srv.sockets[0].getsockname()[1]}")
+        await srv.serve_forever()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8989)
+    parser.add_argument("--rtt-ms", type=float, default=20.0)
+    parser.add_argument("--sign-ms", type=float, default=2.0)
+    parser.add_argument("--no-batch", action="store_true", help="answer the batch endpoint with 404")
+    asyncio.run(_serve(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
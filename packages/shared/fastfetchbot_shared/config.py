@@ -20,6 +20,28 @@ class SharedSettings(BaseSettings):
 
     # Utils
     HTTP_REQUEST_TIMEOUT: int = 30
+    USER_AGENT_POOL_SIZE: int = 32  # browser profiles drawn once from fake_useragent
+
+    # MongoDB: content of at least this many bytes is stored zstd-compressed
+    # in the metadata_content collection; 0 keeps it inline
+    DATABASE_CONTENT_EXTERNAL_MIN_BYTES: int = 16384
+    DATABASE_CONTENT_ZSTD_LEVEL: int = 3
+
+    # Content-addressed media store: "s3" (S3-compatible, e.g. MinIO) or "local"; empty disables
+    MEDIA_STORE_BACKEND: str = ""
+    MEDIA_STORE_LOCAL_DIR: str = ""  # defaults to {WORK_DIR}/media_store
+    MEDIA_STORE_S3_BUCKET: str = ""
+    MEDIA_STORE_S3_PREFIX: str = "media"
+    MEDIA_STORE_S3_ENDPOINT_URL: str = ""
+    MEDIA_STORE_S3_REGION: str = ""
+
+    # Jinja2 templates
+    TEMPLATE_BYTECODE_CACHE_DIR: str = ""  # defaults to {TEMP_DIR}/fastfetchbot-jinja2
+    TEMPLATE_STRICT_UNDEFINED: bool = False
+
+    # Tracing: "otlp" (OTEL_EXPORTER_OTLP_* env vars) or "file"; empty disables
+    TRACE_EXPORTER: str = ""
+    TRACE_FILE_PATH: str = ""  # defaults to {LOG_FILE_PATH}/traces.jsonl
 
     # XHS (Xiaohongshu) shared configuration
     SIGN_SERVER_URL: str = "http://localhost:8989"
@@ -29,8 +51,14 @@ class SharedSettings(BaseSettings):
     def _resolve_derived(self) -> "SharedSettings":
         if not self.DOWNLOAD_DIR:
             self.DOWNLOAD_DIR = os.path.join(self.WORK_DIR, "download")
+        if not self.MEDIA_STORE_LOCAL_DIR:
+            self.MEDIA_STORE_LOCAL_DIR = os.path.join(self.WORK_DIR, "media_store")
         if not self.LOG_FILE_PATH:
             self.LOG_FILE_PATH = self.TEMP_DIR
+        if not self.TRACE_FILE_PATH:
+            self.TRACE_FILE_PATH = os.path.join(self.LOG_FILE_PATH, "traces.jsonl")
+        if not self.TEMPLATE_BYTECODE_CACHE_DIR:
+            self.TEMPLATE_BYTECODE_CACHE_DIR = os.path.join(self.TEMP_DIR, "fastfetchbot-jinja2")
         return self
 
 
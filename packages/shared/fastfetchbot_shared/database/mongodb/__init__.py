@@ -7,9 +7,12 @@ from fastfetchbot_shared.database.mongodb.connection import (
 from fastfetchbot_shared.database.mongodb.models.metadata import (
     DatabaseMediaFile,
     Metadata,
+    MetadataContent,
+    TelegramFileId,
 )
 from fastfetchbot_shared.database.mongodb.cache import (
     find_cached,
+    load_content,
     save_metadata,
 )
 
@@ -19,7 +22,10 @@ __all__ = [
     "save_instances",
     "MongoInitError",
     "find_cached",
+    "load_content",
     "save_metadata",
     "DatabaseMediaFile",
     "Metadata",
+    "MetadataContent",
+    "TelegramFileId",
 ]
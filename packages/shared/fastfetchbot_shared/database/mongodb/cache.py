@@ -1,53 +1,103 @@
 """MongoDB cache layer for scraped metadata.
 
 Provides URL-based cache lookup with TTL support and versioned saves.
+
+Cache reads return plain dicts straight from the collection, restricted to the
+requested fields, without building a Beanie document. ``content`` of at least
+``DATABASE_CONTENT_EXTERNAL_MIN_BYTES`` is stored zstd-compressed in the
+``metadata_content`` collection, so cached documents stay small, and it is
+only fetched when a read asks for ``content``.
 """
 
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Iterable, Optional
+
+import zstandard
+from bson import ObjectId
 
-from fastfetchbot_shared.database.mongodb.models.metadata import Metadata
+from fastfetchbot_shared.config import settings
+from fastfetchbot_shared.database.mongodb.models.metadata import Metadata, MetadataContent
 from fastfetchbot_shared.utils.logger import logger
+from fastfetchbot_shared.utils.parse import get_html_text_length
 
+# Read on every lookup: the TTL check and the external content reference
+_LOOKUP_FIELDS = ("timestamp", "version", "content_ref")
 
-async def find_cached(url: str, ttl_seconds: int) -> Optional[Metadata]:
-    """Look up the latest cached Metadata document for a URL.
+
+async def find_cached(
+        url: str, ttl_seconds: int, fields: Optional[Iterable[str]] = None
+) -> Optional[dict]:
+    """Look up the latest cached metadata for a URL.
 
     Args:
         url: The URL to look up.
         ttl_seconds: Maximum age in seconds. ``0`` disables expiry
             (always returns the cached document if it exists).
+        fields: Fields to return, e.g. ``DELIVERY_FIELDS``. ``None`` returns
+            every field. Externalized ``content`` is only loaded when requested.
 
     Returns:
-        The cached Metadata document, or ``None`` if no valid cache entry exists.
+        The cached metadata dict, or ``None`` if no valid cache entry exists.
     """
-    doc = await (
-        Metadata.find(Metadata.url == url)
-        .sort(-Metadata.version)
-        .limit(1)
-        .first_or_none()
+    fields = None if fields is None else set(fields)
+    projection = {"_id": 0}
+    if fields is not None:
+        projection.update({field: 1 for field in (*fields, *_LOOKUP_FIELDS)})
+    doc = await Metadata.get_pymongo_collection().find_one(
+        {"url": url}, projection, sort=[("version", -1)]
     )
     if doc is None:
         return None
 
     # ttl_seconds == 0 means never expire
     if ttl_seconds != 0:
-        age = datetime.utcnow() - doc.timestamp
+        age = datetime.utcnow() - doc["timestamp"]
         if age > timedelta(seconds=ttl_seconds):
             logger.info(
                 f"Cache expired for {url} (age={age}, ttl={ttl_seconds}s)"
             )
             return None
 
-    logger.info(f"Cache hit for {url} (version={doc.version})")
+    logger.info(f"Cache hit for {url} (version={doc['version']})")
+    content_ref = doc.pop("content_ref", None)
+    if content_ref is not None and (fields is None or "content" in fields):
+        doc["content"] = await load_content(content_ref)
+    if fields is not None:
+        doc = {field: value for field, value in doc.items() if field in fields}
     return doc
 
 
+async def load_content(content_ref: ObjectId) -> Optional[str]:
+    """Load and decompress ``content`` stored in the metadata_content collection."""
+    blob = await MetadataContent.get(content_ref)
+    if blob is None:
+        logger.warning(f"External content {content_ref} is missing")
+        return None
+    return zstandard.ZstdDecompressor().decompress(blob.data).decode()
+
+
+async def _externalize_content(doc: Metadata) -> None:
+    """Move large ``doc.content`` into a compressed MetadataContent document."""
+    min_bytes = settings.DATABASE_CONTENT_EXTERNAL_MIN_BYTES
+    if not min_bytes or not doc.content:
+        return
+    raw = doc.content.encode()
+    if len(raw) < min_bytes:
+        return
+    compressor = zstandard.ZstdCompressor(level=settings.DATABASE_CONTENT_ZSTD_LEVEL)
+    blob = MetadataContent.model_construct(id=ObjectId(), data=compressor.compress(raw), encoding="zstd")
+    await MetadataContent.insert(blob)
+    doc.content_length = get_html_text_length(doc.content)
+    doc.content = None
+    doc.content_ref = blob.id
+
+
 async def save_metadata(metadata_item: dict) -> Metadata:
     """Insert a new Metadata document with auto-incremented version.
 
     If a document with the same URL already exists, the new document's
     version is set to ``latest_version + 1``. Otherwise it starts at 1.
+    Large ``content`` is stored compressed in the metadata_content collection.
 
     Args:
         metadata_item: Scraper output dict (MetadataItem fields).
@@ -63,16 +113,14 @@ async def save_metadata(metadata_item: dict) -> Metadata:
     if not url or not url.strip():
         raise ValueError("metadata_item must contain a non-empty 'url'")
 
-    latest = await (
-        Metadata.find(Metadata.url == url)
-        .sort(-Metadata.version)
-        .limit(1)
-        .first_or_none()
+    latest = await Metadata.get_pymongo_collection().find_one(
+        {"url": url}, {"_id": 0, "version": 1}, sort=[("version", -1)]
     )
-    new_version = (latest.version + 1) if latest else 1
+    new_version = (latest["version"] + 1) if latest else 1
     metadata_item["version"] = new_version
 
     doc = Metadata.model_construct(**metadata_item)
+    await _externalize_content(doc)
     await Metadata.insert(doc)
 
     logger.info(f"Saved metadata for {url} (version={new_version})")
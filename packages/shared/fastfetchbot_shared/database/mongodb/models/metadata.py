@@ -4,8 +4,8 @@ from datetime import datetime
 
 from pydantic import Field
 from pydantic.dataclasses import dataclass as pydantic_dataclass
-from beanie import Document, Insert, before_event
-from pymongo import DESCENDING
+from beanie import Document, Insert, PydanticObjectId, before_event
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 from fastfetchbot_shared.models.metadata_item import MediaFile, MessageType
 from fastfetchbot_shared.utils.logger import logger
@@ -30,6 +30,8 @@ class Metadata(Document):
     text_length: Optional[int] = Field(ge=0)
     content: Optional[str] = None
     content_length: Optional[int] = Field(ge=0)
+    # Set when ``content`` is stored compressed in MetadataContent instead
+    content_ref: Optional[PydanticObjectId] = None
     category: Optional[str] = None
     source: Optional[str] = None
     media_files: Optional[list[DatabaseMediaFile]] = None
@@ -49,11 +51,12 @@ class Metadata(Document):
     @before_event(Insert)
     def prepare_for_insert(self):
         self.text_length = get_html_text_length(self.text)
-        self.content_length = get_html_text_length(self.content)
+        if self.content_ref is None:
+            self.content_length = get_html_text_length(self.content)
         if self.media_files:
             self.media_files = [
                 item if isinstance(item, DatabaseMediaFile)
-                else DatabaseMediaFile(**item if isinstance(item, dict) else item.__dict__)
+                else DatabaseMediaFile(**item if isinstance(item, dict) else asdict(item))
                 for item in self.media_files
             ]
 
@@ -63,4 +66,31 @@ class Metadata(Document):
         return Metadata(**obj)
 
 
-document_list = [Metadata]
+class MetadataContent(Document):
+    """Large ``Metadata.content``, compressed and kept out of the cached documents."""
+
+    data: bytes
+    encoding: str = "zstd"
+
+    class Settings:
+        name = "metadata_content"
+
+
+class TelegramFileId(Document):
+    """A Telegram file_id of a media item, valid only for the bot that uploaded it.
+
+    Persists the bot-scoped Redis index of ``fastfetchbot_shared.utils.file_id_index``."""
+
+    bot_id: int
+    media_key: str
+    file_id: str
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "telegram_file_ids"
+        indexes = [
+            IndexModel([("bot_id", ASCENDING), ("media_key", ASCENDING)], unique=True),
+        ]
+
+
+document_list = [Metadata, MetadataContent, TelegramFileId]
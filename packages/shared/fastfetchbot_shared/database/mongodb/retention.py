@@ -0,0 +1,149 @@
+"""Version retention for the Metadata collection.
+
+``save_metadata`` inserts a new version of a URL on every refresh. Compaction
+walks the ``(url, version)`` index, picks the versions a
+:class:`RetentionPolicy` no longer keeps and deletes them in batches with
+``delete_many``, together with their external content in
+``metadata_content``. The newest version of a URL is never deleted, so the
+cache keeps working whatever the policy.
+
+``compact(policy, dry_run=True)`` deletes nothing and reports what a
+compaction would reclaim.
+"""
+
+import heapq
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastfetchbot_shared.database.mongodb.models.metadata import Metadata, MetadataContent
+from fastfetchbot_shared.utils.logger import logger
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    keep_last: int = 0  # newest versions kept per URL; 0 keeps all
+    max_age: int = 0  # seconds; older versions are deleted, 0 disables
+
+    @property
+    def enabled(self) -> bool:
+        return self.keep_last > 0 or self.max_age > 0
+
+
+@dataclass(order=True)
+class UrlVersions:
+    versions: int
+    url: str = field(compare=False)
+    bytes: int = field(default=0, compare=False)
+    pruned: int = field(default=0, compare=False)
+    reclaimed_bytes: int = field(default=0, compare=False)
+
+
+@dataclass
+class RetentionReport:
+    dry_run: bool
+    urls: int = 0
+    versions: int = 0
+    bytes: int = 0
+    pruned: int = 0
+    reclaimed_bytes: int = 0
+    # URLs with the most versions, most first
+    top_urls: list[UrlVersions] = field(default_factory=list)
+
+
+def select_prunable(docs: list[dict], policy: RetentionPolicy, now: datetime) -> list[dict]:
+    """Versions of one URL (newest first) that *policy* does not keep."""
+    cutoff = now - timedelta(seconds=policy.max_age) if policy.max_age else None
+    return [
+        doc for index, doc in enumerate(docs)
+        if index > 0 and (
+            (policy.keep_last and index >= policy.keep_last)
+            or (cutoff is not None and doc["timestamp"] < cutoff)
+        )
+    ]
+
+
+def _versions_pipeline() -> list[dict]:
+    return [
+        # Walks the (url, version) index instead of sorting in memory
+        {"$sort": {"url": -1, "version": -1}},
+        {"$group": {
+            "_id": "$url",
+            "docs": {"$push": {
+                "_id": "$_id",
+                "version": "$version",
+                "timestamp": "$timestamp",
+                "content_ref": "$content_ref",
+                "size": {"$bsonSize": "$$ROOT"},
+            }},
+        }},
+    ]
+
+
+async def _content_bytes(content_refs: list) -> int:
+    cursor = await MetadataContent.get_pymongo_collection().aggregate([
+        {"$match": {"_id": {"$in": content_refs}}},
+        {"$group": {"_id": None, "bytes": {"$sum": {"$bsonSize": "$$ROOT"}}}},
+    ])
+    result = await cursor.to_list()
+    return result[0]["bytes"] if result else 0
+
+
+async def _delete_batch(ids: list, content_refs: list, dry_run: bool) -> int:
+    """Delete one batch of versions; returns the bytes of their external content."""
+    content_bytes = await _content_bytes(content_refs) if content_refs else 0
+    if not dry_run:
+        await Metadata.get_pymongo_collection().delete_many({"_id": {"$in": ids}})
+        if content_refs:
+            await MetadataContent.get_pymongo_collection().delete_many({"_id": {"$in": content_refs}})
+    return content_bytes
+
+
+async def compact(
+        policy: RetentionPolicy,
+        batch_size: int = 500,
+        dry_run: bool = False,
+        top: int = 20,
+        now: Optional[datetime] = None,
+) -> RetentionReport:
+    """Delete the versions *policy* does not keep, *batch_size* per ``delete_many``."""
+    now = now or datetime.utcnow()
+    report = RetentionReport(dry_run=dry_run)
+    top_urls: list[UrlVersions] = []
+    ids: list = []
+    content_refs: list = []
+
+    cursor = await Metadata.get_pymongo_collection().aggregate(_versions_pipeline(), allowDiskUse=True)
+    async for group in cursor:
+        docs = sorted(group["docs"], key=lambda doc: doc["version"], reverse=True)
+        stats = UrlVersions(versions=len(docs), url=group["_id"], bytes=sum(doc["size"] for doc in docs))
+        prunable = select_prunable(docs, policy, now) if policy.enabled else []
+        stats.pruned = len(prunable)
+        stats.reclaimed_bytes = sum(doc["size"] for doc in prunable)
+
+        report.urls += 1
+        report.versions += stats.versions
+        report.bytes += stats.bytes
+        report.pruned += stats.pruned
+        report.reclaimed_bytes += stats.reclaimed_bytes
+        if len(top_urls) < top:
+            heapq.heappush(top_urls, stats)
+        elif top:
+            heapq.heappushpop(top_urls, stats)
+
+        for doc in prunable:
+            ids.append(doc["_id"])
+            if doc.get("content_ref") is not None:
+                content_refs.append(doc["content_ref"])
+            if len(ids) >= batch_size:
+                report.reclaimed_bytes += await _delete_batch(ids, content_refs, dry_run)
+                ids, content_refs = [], []
+    if ids:
+        report.reclaimed_bytes += await _delete_batch(ids, content_refs, dry_run)
+
+    report.top_urls = sorted(top_urls, reverse=True)
+    logger.info(
+        f"Metadata retention{' (dry run)' if dry_run else ''}: {report.pruned}/{report.versions} "
+        f"versions of {report.urls} URLs pruned, {report.reclaimed_bytes} bytes reclaimed"
+    )
+    return report
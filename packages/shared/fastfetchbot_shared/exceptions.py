@@ -24,3 +24,7 @@ class FileExportError(FastFetchBotError):
 
 class ExternalServiceError(FastFetchBotError):
     """External service call failed (OpenAI, Inoreader, etc.)."""
+
+
+class CircuitOpenError(ExternalServiceError):
+    """External service skipped because its circuit breaker is open."""
@@ -8,6 +8,8 @@ from pydantic import BaseModel
 MetadataItem is a dataclass that represents a single item for our services. It would be saved in the database.
 The MetadataItem is used to send to the telegram bot. Users can use the metadata to define their own message template.
 If the program doesn't find the attribute in the dict_data, it will use the default value in case of KeyError.
+MediaFile uses __slots__: a long thread or album carries hundreds of them. Scrapers subclass MetadataItem and keep
+their platform state on the instance, so it stays a regular dataclass.
 """
 
 T = TypeVar("T")
@@ -30,13 +32,19 @@ def to_class(c: Type[T], x: Any) -> dict:
     return cast(Any, x).to_dict()
 
 
+# Fields the Telegram bot reads when delivering an item
+DELIVERY_FIELDS = (
+    "url", "title", "author", "author_url", "text", "media_files", "telegraph_url", "category", "message_type",
+)
+
+
 @unique
 class MessageType(str, Enum):
     SHORT = "short"
     LONG = "long"
 
 
-@dataclass
+@dataclass(slots=True)
 class MediaFile:
     media_type: str
     url: str
@@ -46,18 +54,15 @@ class MediaFile:
 
     @staticmethod
     def from_dict(obj: Any) -> "MediaFile":
-        assert isinstance(obj, dict)
-        media_type = from_str(obj.get("media_type"))
-        url = from_str(obj.get("url"))
-        caption = from_str(obj.get("caption"))
-        telegram_file_id = obj.get("telegram_file_id")
-        return MediaFile(media_type, url, caption=caption, telegram_file_id=telegram_file_id)
+        return MediaFile(
+            obj.get("media_type") or "",
+            obj.get("url") or "",
+            caption=obj.get("caption") or "",
+            telegram_file_id=obj.get("telegram_file_id"),
+        )
 
     def to_dict(self) -> dict:
-        result: dict = {}
-        result["media_type"] = from_str(self.media_type)
-        result["url"] = from_str(self.url)
-        result["caption"] = self.caption
+        result = {"media_type": self.media_type or "", "url": self.url or "", "caption": self.caption}
         if self.telegram_file_id is not None:
             result["telegram_file_id"] = self.telegram_file_id
         return result
@@ -78,45 +83,32 @@ class MetadataItem:
 
     @staticmethod
     def from_dict(obj: Any) -> "MetadataItem":
-        assert isinstance(obj, dict)
-        url = from_str(obj.get("url"))
-        telegraph_url = from_str(obj.get("telegraph_url"))
-        content = from_str(obj.get("content"))
-        text = from_str(obj.get("text"))
-        media_files = from_list(MediaFile.from_dict, obj.get("media_files"))
-        author = from_str(obj.get("author"))
-        title = from_str(obj.get("title"))
-        author_url = from_str(obj.get("author_url"))
-        category = from_str(obj.get("category"))
-        message_type = MessageType(obj.get("message_type"))
         return MetadataItem(
-            url,
-            telegraph_url,
-            content,
-            text,
-            media_files,
-            author,
-            title,
-            author_url,
-            category,
-            message_type,
+            obj.get("url") or "",
+            obj.get("telegraph_url") or "",
+            obj.get("content") or "",
+            obj.get("text") or "",
+            [MediaFile.from_dict(m) for m in obj["media_files"]],
+            obj.get("author") or "",
+            obj.get("title") or "",
+            obj.get("author_url") or "",
+            obj.get("category") or "",
+            MessageType(obj.get("message_type")),
         )
 
     def to_dict(self) -> dict:
-        result: dict = {
-            "url": from_str(self.url),
-            "telegraph_url": "", "content": from_str(self.content),
-            "text": from_str(self.text),
-            "media_files": from_list(
-                lambda x: to_class(MediaFile, x), self.media_files
-            ),
-            "author": from_str(self.author),
-            "title": from_str(self.title),
-            "author_url": from_str(self.author_url),
-            "category": from_str(self.category),
-            "message_type": self.message_type.value
+        return {
+            "url": self.url or "",
+            "telegraph_url": "",
+            "content": self.content or "",
+            "text": self.text or "",
+            "media_files": [m.to_dict() for m in self.media_files],
+            "author": self.author or "",
+            "title": self.title or "",
+            "author_url": self.author_url or "",
+            "category": self.category or "",
+            "message_type": self.message_type.value,
         }
-        return result
 
 
 def metadata_item_from_dict(s: Any) -> MetadataItem:
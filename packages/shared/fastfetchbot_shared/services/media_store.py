@@ -0,0 +1,202 @@
+"""Content-addressed media store.
+
+Media downloaded from the origin platforms is stored under the SHA-256 of its
+bytes and the key is saved as ``DatabaseMediaFile.file_key``, so a cache-hit
+redelivery without a usable Telegram ``file_id`` reads the media from the
+store instead of downloading it from the origin again.
+
+``MEDIA_STORE_BACKEND`` selects the backend: ``"s3"`` for any S3-compatible
+service (set ``MEDIA_STORE_S3_ENDPOINT_URL`` for MinIO), ``"local"`` for a
+directory, as used in development and tests. Empty disables the store.
+"""
+
+import asyncio
+import hashlib
+import mimetypes
+import os
+import re
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import AsyncExitStack
+from typing import Optional
+
+import aiofiles
+import aiofiles.os
+
+from fastfetchbot_shared.config import settings
+from fastfetchbot_shared.utils.logger import logger
+
+_EXTENSION_PATTERN = re.compile(r"^[a-z0-9]{1,5}$")
+
+
+def media_extension(file_name: Optional[str]) -> str:
+    """Lower-case extension of *file_name*, or ``""`` if it has no usable one."""
+    ext = os.path.splitext(file_name or "")[1].lstrip(".").lower()
+    return ext if _EXTENSION_PATTERN.match(ext) else ""
+
+
+def content_key(data: bytes, ext: str = "") -> str:
+    """Store key of *data*: its SHA-256, sharded by the first two hex digits."""
+    digest = hashlib.sha256(data).hexdigest()
+    key = f"{digest[:2]}/{digest}"
+    return f"{key}.{ext}" if ext else key
+
+
+class MediaStore(ABC):
+    """Immutable objects keyed by content; writing existing content is a no-op."""
+
+    async def put(self, data: bytes, ext: str = "") -> str:
+        """Store *data* and return its key."""
+        key = await asyncio.to_thread(content_key, data, ext)
+        if not await self.exists(key):
+            await self.write(key, data)
+            logger.info(f"Stored media {key} ({len(data)} bytes)")
+        return key
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """Content stored under *key*, or ``None`` if there is none."""
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    async def write(self, key: str, data: bytes) -> None:
+        ...
+
+    async def close(self) -> None:
+        pass
+
+
+class LocalMediaStore(MediaStore):
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, *key.split("/"))
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            async with aiofiles.open(self._path(key), mode="rb") as f:
+                return await f.read()
+        except FileNotFoundError:
+            return None
+
+    async def exists(self, key: str) -> bool:
+        return await aiofiles.os.path.exists(self._path(key))
+
+    async def write(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        await aiofiles.os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Readers never see a partial file
+        staging_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        async with aiofiles.open(staging_path, mode="wb") as f:
+            await f.write(data)
+        await aiofiles.os.replace(staging_path, path)
+
+
+class S3MediaStore(MediaStore):
+    """Credentials come from the standard ``AWS_*`` environment variables."""
+
+    def __init__(
+            self,
+            bucket: str,
+            prefix: str = "",
+            endpoint_url: Optional[str] = None,
+            region_name: Optional[str] = None,
+    ):
+        import aioboto3
+
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self._session = aioboto3.Session()
+        self._client_kwargs = {"endpoint_url": endpoint_url or None, "region_name": region_name or None}
+        self._exit_stack: Optional[AsyncExitStack] = None
+        self._client = None
+        self._lock = asyncio.Lock()
+
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    async def _get_client(self):
+        async with self._lock:
+            if self._client is None:
+                self._exit_stack = AsyncExitStack()
+                self._client = await self._exit_stack.enter_async_context(
+                    self._session.client("s3", **self._client_kwargs)
+                )
+        return self._client
+
+    @staticmethod
+    def _is_missing(error) -> bool:
+        return error.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound")
+
+    async def get(self, key: str) -> Optional[bytes]:
+        from botocore.exceptions import ClientError
+
+        s3 = await self._get_client()
+        try:
+            response = await s3.get_object(Bucket=self.bucket, Key=self._object_key(key))
+        except ClientError as e:
+            if self._is_missing(e):
+                return None
+            raise
+        async with response["Body"] as body:
+            return await body.read()
+
+    async def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        s3 = await self._get_client()
+        try:
+            await s3.head_object(Bucket=self.bucket, Key=self._object_key(key))
+        except ClientError as e:
+            if self._is_missing(e):
+                return False
+            raise
+        return True
+
+    async def write(self, key: str, data: bytes) -> None:
+        s3 = await self._get_client()
+        content_type = mimetypes.guess_type(key)[0] or "application/octet-stream"
+        await s3.put_object(
+            Bucket=self.bucket, Key=self._object_key(key), Body=data, ContentType=content_type
+        )
+
+    async def close(self) -> None:
+        if self._exit_stack is not None:
+            await self._exit_stack.aclose()
+            self._exit_stack = None
+            self._client = None
+
+
+def create_media_store(backend: str) -> MediaStore:
+    if backend == "local":
+        return LocalMediaStore(settings.MEDIA_STORE_LOCAL_DIR)
+    if backend == "s3":
+        return S3MediaStore(
+            bucket=settings.MEDIA_STORE_S3_BUCKET,
+            prefix=settings.MEDIA_STORE_S3_PREFIX,
+            endpoint_url=settings.MEDIA_STORE_S3_ENDPOINT_URL,
+            region_name=settings.MEDIA_STORE_S3_REGION,
+        )
+    raise ValueError(f"Unknown media store backend: {backend!r}")
+
+
+_store: Optional[MediaStore] = None
+
+
+def get_media_store() -> Optional[MediaStore]:
+    """The configured media store, or ``None`` when it is disabled."""
+    global _store
+    if _store is None and settings.MEDIA_STORE_BACKEND:
+        _store = create_media_store(settings.MEDIA_STORE_BACKEND)
+    return _store
+
+
+async def close_media_store() -> None:
+    global _store
+    if _store is not None:
+        await _store.close()
+        _store = None
@@ -1,22 +1,12 @@
-from fastfetchbot_shared.services.scrapers import (
-    twitter,
-    weibo,
-    bluesky,
-    reddit,
-    xiaohongshu,
-    zhihu,
-    douban,
-    instagram,
-    threads,
-    wechat,
-    general,
-)
-from fastfetchbot_shared.services.scrapers.common import InfoExtractService
-from fastfetchbot_shared.services.scrapers.scraper_manager import ScraperManager
+"""Platform scrapers.
 
-__all__ = [
-    "InfoExtractService",
-    "ScraperManager",
+Submodules and the names below are imported on first access, so importing a
+single module (e.g. ``scrapers.config``) does not load every platform client.
+"""
+
+import importlib
+
+_SUBMODULES = (
     "twitter",
     "weibo",
     "bluesky",
@@ -28,4 +18,22 @@ __all__ = [
     "threads",
     "wechat",
     "general",
+)
+_EXPORTS = {
+    "InfoExtractService": "fastfetchbot_shared.services.scrapers.common",
+    "ScraperManager": "fastfetchbot_shared.services.scrapers.scraper_manager",
+}
+
+__all__ = [
+    "InfoExtractService",
+    "ScraperManager",
+    *_SUBMODULES,
 ]
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name]), name)
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
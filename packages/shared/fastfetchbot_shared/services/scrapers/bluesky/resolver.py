@@ -0,0 +1,123 @@
+"""Cached, non-blocking Bluesky handle -> DID resolution.
+
+Handles are resolved with atproto's :class:`AsyncIdResolver` (DNS TXT, then
+``/.well-known/atproto-did``) on the event loop instead of the blocking
+resolver. Results are cached in process and, when ``BLUESKY_DID_REDIS_URL``
+is set, in Redis so the API and every worker share them:
+
+* resolved DIDs for ``BLUESKY_DID_CACHE_TTL`` seconds;
+* handles that do not resolve for ``BLUESKY_DID_NEGATIVE_TTL`` seconds, so a
+  dead handle is not looked up again for every link to it.
+
+Lookups that fail with an error are not cached. Concurrent lookups of the same
+handle share one resolution.
+"""
+
+import asyncio
+import time
+from typing import Dict, Optional, Tuple
+
+from atproto import AsyncIdResolver
+
+from fastfetchbot_shared.services.scrapers.config import settings
+from fastfetchbot_shared.utils.logger import logger
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # shared package installed without an app
+    aioredis = None
+
+DID_KEY_PREFIX = "bluesky:did"
+MAX_CACHED_HANDLES = 4096
+# Stored for handles that do not resolve
+NOT_FOUND = ""
+
+# handle -> (expires_at, did or NOT_FOUND)
+_cache: Dict[str, Tuple[float, str]] = {}
+_inflight: Dict[str, asyncio.Task] = {}
+_resolver: Optional[AsyncIdResolver] = None
+_redis = None
+
+
+def _get_resolver() -> AsyncIdResolver:
+    global _resolver
+    if _resolver is None:
+        _resolver = AsyncIdResolver(timeout=settings.BLUESKY_DID_RESOLVE_TIMEOUT)
+    return _resolver
+
+
+def _get_redis():
+    """Return the shared Redis connection, None when the cache is per process."""
+    global _redis
+    if not settings.BLUESKY_DID_REDIS_URL or aioredis is None:
+        return None
+    if _redis is None:
+        _redis = aioredis.from_url(settings.BLUESKY_DID_REDIS_URL, decode_responses=True)
+    return _redis
+
+
+def _store(handle: str, did: str) -> None:
+    now = time.monotonic()
+    if len(_cache) >= MAX_CACHED_HANDLES:
+        for key in [k for k, (expires_at, _) in _cache.items() if expires_at <= now]:
+            del _cache[key]
+        while len(_cache) >= MAX_CACHED_HANDLES:
+            del _cache[next(iter(_cache))]
+    ttl = settings.BLUESKY_DID_CACHE_TTL if did else settings.BLUESKY_DID_NEGATIVE_TTL
+    _cache[handle] = (now + ttl, did)
+
+
+async def _lookup(handle: str) -> str:
+    r = _get_redis()
+    if r is not None:
+        try:
+            cached = await r.get(f"{DID_KEY_PREFIX}:{handle}")
+        except Exception as e:
+            logger.warning(f"Failed to read Bluesky DID for {handle} from Redis: {e}")
+        else:
+            if cached is not None:
+                return cached
+
+    did = await _get_resolver().handle.resolve(handle) or NOT_FOUND
+    if not did:
+        logger.warning(f"Bluesky handle {handle} does not resolve to a DID")
+
+    if r is not None:
+        ttl = settings.BLUESKY_DID_CACHE_TTL if did else settings.BLUESKY_DID_NEGATIVE_TTL
+        try:
+            await r.set(f"{DID_KEY_PREFIX}:{handle}", did, ex=int(ttl))
+        except Exception as e:
+            logger.warning(f"Failed to store Bluesky DID for {handle} in Redis: {e}")
+    return did
+
+
+async def resolve_did(handle: str) -> Optional[str]:
+    """Return the DID for a Bluesky handle, None when it does not resolve.
+
+    A DID passed as the handle (``bsky.app/profile/did:plc:.../post/...``) is
+    returned as is.
+    """
+    if handle.startswith("did:"):
+        return handle
+    handle = handle.lower()
+    cached = _cache.get(handle)
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1] or None
+
+    task = _inflight.get(handle)
+    if task is None:
+        task = asyncio.create_task(_lookup(handle))
+        _inflight[handle] = task
+        task.add_done_callback(lambda _: _inflight.pop(handle, None))
+    try:
+        did = await asyncio.shield(task)
+    except Exception as e:
+        logger.warning(f"Failed to resolve Bluesky handle {handle}: {e}")
+        return None
+    _store(handle, did)
+    return did or None
+
+
+def reset() -> None:
+    """Forget every cached DID (Redis entries expire on their own)."""
+    _cache.clear()
@@ -1,7 +1,7 @@
 from typing import Optional
 from urllib.parse import urlparse
 
-from atproto import AsyncClient, IdResolver, AtUri
+from atproto import AsyncClient, AtUri
 from atproto_client.models.app.bsky.embed.record import ViewRecord
 from atproto_client.models.app.bsky.feed.defs import ThreadViewPost, PostView
 
@@ -10,6 +10,7 @@ from fastfetchbot_shared.models.metadata_item import MediaFile, MessageType
 from fastfetchbot_shared.services.scrapers.scraper import Scraper, DataProcessor
 from fastfetchbot_shared.services.scrapers.bluesky import Bluesky
 from fastfetchbot_shared.services.scrapers.bluesky.config import BLUESKY_HOST, BLUESKY_MAX_LENGTH
+from fastfetchbot_shared.services.scrapers.bluesky.resolver import resolve_did
 from fastfetchbot_shared.utils.logger import logger
 from fastfetchbot_shared.utils.parse import wrap_text_into_html
 
@@ -25,7 +26,16 @@ class BlueskyPost:
         bluesky_path = bluesky_url_parser.path
         self.handle: Optional[str] = bluesky_path.split("/")[2]
         self.post_rkey: Optional[str] = bluesky_path.split("/")[-1]
-        self.did: str = BlueskyScraper.id_resolver.handle.resolve(self.handle)
+        self.did: Optional[str] = None
+
+    async def resolve(self) -> None:
+        self.did = await resolve_did(self.handle)
+
+    @property
+    def at_uri(self) -> Optional[str]:
+        if not self.did:
+            return None
+        return f"at://{self.did}/app.bsky.feed.post/{self.post_rkey}"
 
 
 class BlueskyDataProcessor(DataProcessor):
@@ -162,7 +172,6 @@ class BlueskyDataProcessor(DataProcessor):
 
 
 class BlueskyScraper(Scraper):
-    id_resolver = IdResolver()
 
     def __init__(self, username: Optional[str] = None, password: Optional[str] = None):
         self.client: AsyncClient = AsyncClient()
@@ -177,14 +186,18 @@ class BlueskyScraper(Scraper):
 
     async def get_processor_by_url(self, url: str) -> BlueskyDataProcessor:
         bluesky_post = BlueskyPost(url)
+        await bluesky_post.resolve()
         bluesky_post_data = await self._request_post_data(bluesky_post)
         return BlueskyDataProcessor(url, bluesky_post_data)
 
     async def _request_post_data(self, bluesky_post: BlueskyPost) -> ThreadViewPost:
-        profile_identify = bluesky_post.did or bluesky_post.handle
         try:
-            post_data = await self.client.get_post(profile_identify=profile_identify, post_rkey=bluesky_post.post_rkey)
-            post_uri = post_data.uri
+            post_uri = bluesky_post.at_uri
+            if post_uri is None:
+                # Unresolved handle: let the PDS resolve it while looking up the post
+                post_data = await self.client.get_post(profile_identify=bluesky_post.handle,
+                                                       post_rkey=bluesky_post.post_rkey)
+                post_uri = post_data.uri
             post_thread_data = await self.client.get_post_thread(uri=post_uri)
             return post_thread_data.thread
         except Exception as e:
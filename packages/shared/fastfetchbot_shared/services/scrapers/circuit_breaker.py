@@ -0,0 +1,212 @@
+"""Circuit breakers for external scraper backends.
+
+Each backend (a RapidAPI host, the XHS sign server, Firecrawl, Zyte, ...)
+gets a :class:`CircuitBreaker` from :func:`get_breaker`. Calls made through
+:func:`circuit` are recorded in a rolling time window; once enough of them
+fail or take longer than ``CIRCUIT_BREAKER_SLOW_SECONDS``, the circuit opens
+and calls are refused with :class:`CircuitOpenError` for
+``CIRCUIT_BREAKER_OPEN_SECONDS`` instead of waiting for the backend's
+timeout. After that a single half-open probe decides whether it closes
+again.
+
+When ``CIRCUIT_BREAKER_REDIS_URL`` is set, opening a circuit is published to
+Redis so the API and every worker stop calling the backend at once. Redis
+comes with the apps (``redis`` via ``celery[redis]`` and ``arq``); without it
+breakers are per process.
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from fastfetchbot_shared.exceptions import CircuitOpenError
+from fastfetchbot_shared.services.scrapers.config import settings
+from fastfetchbot_shared.utils import telemetry
+from fastfetchbot_shared.utils.logger import logger
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # shared package installed without an app
+    aioredis = None
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+CIRCUIT_KEY_PREFIX = "circuit"
+# How often a breaker looks for a circuit opened by another process
+REMOTE_SYNC_SECONDS = 1.0
+
+_redis = None
+
+
+def _get_redis():
+    """Return the shared Redis connection, None when breakers are per process."""
+    global _redis
+    if not settings.CIRCUIT_BREAKER_REDIS_URL or aioredis is None:
+        return None
+    if _redis is None:
+        _redis = aioredis.from_url(settings.CIRCUIT_BREAKER_REDIS_URL, decode_responses=True)
+    return _redis
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker over a rolling window of calls."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = CLOSED
+        self.opened_until = 0.0
+        # (finished_at, failed, seconds)
+        self.calls: deque[tuple[float, bool, float]] = deque()
+        self._probing = False
+        self._synced_at = 0.0
+
+    def _prune(self, now: float) -> None:
+        while self.calls and self.calls[0][0] < now - settings.CIRCUIT_BREAKER_WINDOW:
+            self.calls.popleft()
+
+    @property
+    def error_rate(self) -> float:
+        if not self.calls:
+            return 0.0
+        return sum(failed for _, failed, _ in self.calls) / len(self.calls)
+
+    def latency(self, percentile: float) -> Optional[float]:
+        if not self.calls:
+            return None
+        ordered = sorted(seconds for _, _, seconds in self.calls)
+        return ordered[min(int(percentile * len(ordered)), len(ordered) - 1)]
+
+    def _set_state(self, state: str) -> None:
+        if state != self.state:
+            logger.warning(f"Circuit {self.name}: {self.state} -> {state}")
+        self.state = state
+        telemetry.set_circuit_state(self.name, STATE_VALUES[state])
+
+    async def _sync_remote(self, now: float) -> None:
+        r = _get_redis()
+        if r is None or now - self._synced_at < REMOTE_SYNC_SECONDS:
+            return
+        self._synced_at = now
+        try:
+            raw = await r.get(f"{CIRCUIT_KEY_PREFIX}:{self.name}")
+        except Exception as e:
+            logger.warning(f"Failed to read circuit {self.name} from Redis: {e}")
+            return
+        if raw is not None and float(raw) > self.opened_until:
+            self.opened_until = float(raw)
+            self._set_state(OPEN)
+
+    async def _publish_open(self) -> None:
+        r = _get_redis()
+        if r is None:
+            return
+        try:
+            await r.set(
+                f"{CIRCUIT_KEY_PREFIX}:{self.name}",
+                self.opened_until,
+                px=int(settings.CIRCUIT_BREAKER_OPEN_SECONDS * 1000),
+            )
+        except Exception as e:
+            logger.warning(f"Failed to publish circuit {self.name} to Redis: {e}")
+
+    async def allow(self) -> bool:
+        """Whether a call may go ahead; in half-open state only one probe at a time."""
+        now = time.time()
+        await self._sync_remote(now)
+        if self.state == OPEN:
+            if now < self.opened_until:
+                return False
+            self._set_state(HALF_OPEN)
+            self._probing = False
+        if self.state == HALF_OPEN:
+            if self._probing:
+                return False
+            self._probing = True
+        return True
+
+    def cancel(self) -> None:
+        """Forget a permitted call that was cancelled before it finished."""
+        self._probing = False
+
+    async def record(self, seconds: float, ok: bool) -> None:
+        now = time.time()
+        failed = not ok or seconds >= settings.CIRCUIT_BREAKER_SLOW_SECONDS
+        if self.state == HALF_OPEN:
+            self._probing = False
+            if failed:
+                await self._open(now)
+            else:
+                self.calls.clear()
+                self._set_state(CLOSED)
+            return
+        self.calls.append((now, failed, seconds))
+        self._prune(now)
+        if (
+                self.state == CLOSED
+                and len(self.calls) >= settings.CIRCUIT_BREAKER_MIN_CALLS
+                and self.error_rate >= settings.CIRCUIT_BREAKER_FAILURE_RATE
+        ):
+            await self._open(now)
+
+    async def _open(self, now: float) -> None:
+        self.opened_until = now + settings.CIRCUIT_BREAKER_OPEN_SECONDS
+        self._set_state(OPEN)
+        await self._publish_open()
+
+    def snapshot(self) -> dict:
+        self._prune(time.time())
+        return {
+            "state": self.state,
+            "calls": len(self.calls),
+            "error_rate": round(self.error_rate, 3),
+            "latency_p50": self.latency(0.5),
+            "latency_p95": self.latency(0.95),
+            "opened_until": self.opened_until if self.state != CLOSED else None,
+        }
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Return the process-wide breaker for a backend, e.g. ``"twitter:Twitter135"``."""
+    if name not in _breakers:
+        _breakers[name] = CircuitBreaker(name)
+    return _breakers[name]
+
+
+def breaker_states() -> dict[str, dict]:
+    """State, error rate and latency of every breaker used in this process."""
+    return {name: breaker.snapshot() for name, breaker in sorted(_breakers.items())}
+
+
+def reset() -> None:
+    """Drop all breakers (their Redis keys expire on their own)."""
+    _breakers.clear()
+
+
+@asynccontextmanager
+async def circuit(name: str) -> AsyncIterator[CircuitBreaker]:
+    """Run one call to backend *name* through its breaker.
+
+    Raises:
+        CircuitOpenError: Immediately, when the circuit is open.
+    """
+    breaker = get_breaker(name)
+    if not await breaker.allow():
+        raise CircuitOpenError(f"Circuit for {name} is open")
+    start = time.perf_counter()
+    try:
+        yield breaker
+    except asyncio.CancelledError:
+        breaker.cancel()
+        raise
+    except Exception:
+        await breaker.record(time.perf_counter() - start, ok=False)
+        raise
+    await breaker.record(time.perf_counter() - start, ok=True)
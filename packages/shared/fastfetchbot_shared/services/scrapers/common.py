@@ -1,18 +1,8 @@
-from typing import Optional, Any
+from typing import Optional, Any, Iterable
 
 from fastfetchbot_shared.models.url_metadata import UrlMetadata
 from fastfetchbot_shared.exceptions import ScraperError
-from fastfetchbot_shared.services.scrapers import (
-    twitter,
-    wechat,
-    reddit,
-    weibo,
-    zhihu,
-    douban,
-    instagram,
-    xiaohongshu,
-    threads,
-)
+from fastfetchbot_shared.services.scrapers import registry
 from fastfetchbot_shared.services.scrapers.scraper_manager import ScraperManager
 from fastfetchbot_shared.utils.logger import logger
 
@@ -35,17 +25,8 @@ class InfoExtractService(object):
         from fastfetchbot_shared.services.file_export.video_download import VideoDownloader
         return VideoDownloader
 
-    service_classes: dict = {
-        "twitter": twitter.Twitter,
-        "threads": threads.Threads,
-        "reddit": reddit.Reddit,
-        "weibo": weibo.Weibo,
-        "wechat": wechat.Wechat,
-        "instagram": instagram.Instagram,
-        "douban": douban.Douban,
-        "zhihu": zhihu.Zhihu,
-        "xiaohongshu": xiaohongshu.Xiaohongshu,
-    }
+    # Category -> scraper class, or its "module:Class" path imported on first use
+    service_classes: dict = dict(registry.SCRAPER_CLASSES)
 
     def __init__(
             self,
@@ -55,6 +36,7 @@ class InfoExtractService(object):
             store_telegraph: Optional[bool] = True,
             store_document: Optional[bool] = False,
             database_cache_ttl: int = -1,
+            cache_fields: Optional[Iterable[str]] = None,
             **kwargs,
     ):
         url_metadata = url_metadata.to_dict()
@@ -67,6 +49,8 @@ class InfoExtractService(object):
         self.store_telegraph = store_telegraph
         self.store_document = store_document
         self.database_cache_ttl = database_cache_ttl
+        # Fields returned on a cache hit; None returns the whole item
+        self.cache_fields = cache_fields
 
     @property
     def category(self) -> str:
@@ -75,7 +59,10 @@ class InfoExtractService(object):
     def _resolve_scraper_class(self, category: str):
         """Look up scraper class, falling back to lazy VideoDownloader for video platforms."""
         if category in self.service_classes:
-            return self.service_classes[category]
+            scraper_cls = self.service_classes[category]
+            if isinstance(scraper_cls, str):
+                scraper_cls = registry.load(scraper_cls)
+            return scraper_cls
         if category in ("youtube", "bilibili"):
             return self._get_video_downloader()
         raise ScraperError(f"No scraper registered for category: {category}")
@@ -86,12 +73,11 @@ class InfoExtractService(object):
             try:
                 from fastfetchbot_shared.database.mongodb.cache import find_cached
 
-                cached = await find_cached(self.url, self.database_cache_ttl)
+                cached = await find_cached(self.url, self.database_cache_ttl, fields=self.cache_fields)
                 if cached is not None:
                     logger.info("Cache hit, returning cached metadata")
-                    result = cached.model_dump(mode="json", exclude={"id"})
-                    result["_cached"] = True
-                    return result
+                    cached["_cached"] = True
+                    return cached
             except Exception as e:
                 logger.error(f"Cache lookup failed, proceeding with scrape: {e}")
 
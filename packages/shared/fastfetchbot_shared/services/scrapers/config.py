@@ -3,13 +3,13 @@ import os
 import tempfile
 from typing import Optional
 
-from jinja2 import Environment, FileSystemLoader
 from pydantic import computed_field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 from fastfetchbot_shared.utils.cookie import read_json_cookies_to_string
 from fastfetchbot_shared.utils.logger import logger
 from fastfetchbot_shared.utils.pydantic_types import _parse_comma_list, _parse_optional_comma_list
+from fastfetchbot_shared.utils.template import create_template_environment
 
 
 class ScrapersSettings(BaseSettings):
@@ -36,10 +36,20 @@ class ScrapersSettings(BaseSettings):
     TWITTER_USERNAME: Optional[str] = None
     TWITTER_CT0: Optional[str] = None
     TWITTER_AUTH_TOKEN: Optional[str] = None
+    # Extra twitter-api-client sessions as comma-separated "ct0:auth_token" pairs
+    TWITTER_COOKIE_SETS: str = ""
+    TWITTER_SESSION_RATE_LIMIT: int = 150  # TweetDetail requests per session per window
+    TWITTER_SESSION_RATE_WINDOW: int = 900  # seconds
+    TWITTER_SESSION_COOLDOWN: float = 30.0  # seconds after a failure, doubling per failure
+    TWITTER_SESSION_TIMEOUT: float = 20.0
 
     # Bluesky
     BLUESKY_USERNAME: Optional[str] = None
     BLUESKY_PASSWORD: Optional[str] = None
+    BLUESKY_DID_CACHE_TTL: int = 86400  # seconds a resolved handle -> DID is reused
+    BLUESKY_DID_NEGATIVE_TTL: int = 300  # seconds a handle that does not resolve is remembered
+    BLUESKY_DID_RESOLVE_TIMEOUT: float = 5.0
+    BLUESKY_DID_REDIS_URL: str = ""  # empty = DIDs are cached per process
 
     # Weibo (cookie loaded externally)
     WEIBO_COOKIES: Optional[str] = None
@@ -53,6 +63,8 @@ class ScrapersSettings(BaseSettings):
     XHS_IP_PROXY_LIST: str = ""
     XHS_ENABLE_IP_PROXY: bool = False
     XHS_SAVE_LOGIN_STATE: bool = True
+    XHS_SIGN_CACHE_TTL: float = 30.0  # seconds a signature is reused for an identical request
+    XHS_SIGN_BATCH: bool = True  # send concurrent sign requests to the batch endpoint
 
     # Zhihu
     FXZHIHU_HOST: str = "fxzhihu.com"
@@ -63,6 +75,9 @@ class ScrapersSettings(BaseSettings):
     REDDIT_CLIENT_SECRET: Optional[str] = None
     REDDIT_PASSWORD: Optional[str] = None
     REDDIT_USERNAME: Optional[str] = None
+    REDDIT_SUBMISSION_CACHE_TTL: int = 300  # seconds a fetched submission is reused
+    REDDIT_BATCH_SUBMISSIONS: bool = True  # fetch concurrently requested submissions in one info() call
+    REDDIT_BATCH_WINDOW: float = 0.0  # seconds a submission request waits for others to batch with
 
     # OpenAI
     OPENAI_API_KEY: Optional[str] = None
@@ -83,6 +98,25 @@ class ScrapersSettings(BaseSettings):
     # Telegraph (comma-separated string; access parsed list via computed property)
     TELEGRAPH_TOKEN_LIST: str = ""
 
+    # Scraper modules are imported on first use; warm-up preloads them after startup
+    SCRAPER_WARMUP: bool = True
+    # Comma-separated categories to preload (e.g. "twitter,weibo,general"); empty = all
+    SCRAPER_WARMUP_CATEGORIES: str = ""
+
+    # Hedged fallback requests (Twitter, Instagram, Zhihu backends)
+    HEDGE_PERCENTILE: float = 0.9  # latency percentile after which the next backend starts
+    HEDGE_DEFAULT_DELAY: float = 3.0  # seconds, until a backend has latency samples
+    HEDGE_MIN_DELAY: float = 0.2
+    HEDGE_WINDOW: int = 50  # recent calls per backend used for ordering and delays
+
+    # Circuit breakers for external scraper backends
+    CIRCUIT_BREAKER_FAILURE_RATE: float = 0.5
+    CIRCUIT_BREAKER_MIN_CALLS: int = 5  # calls in the window before the error rate counts
+    CIRCUIT_BREAKER_WINDOW: int = 60  # seconds
+    CIRCUIT_BREAKER_OPEN_SECONDS: int = 30
+    CIRCUIT_BREAKER_SLOW_SECONDS: float = 20.0  # slower calls count as failures
+    CIRCUIT_BREAKER_REDIS_URL: str = ""  # empty = breakers are per process
+
     @model_validator(mode="after")
     def _resolve_derived(self) -> "ScrapersSettings":
         if not self.DOWNLOAD_DIR:
@@ -109,11 +143,27 @@ class ScrapersSettings(BaseSettings):
         """Parse TELEGRAPH_TOKEN_LIST comma-separated string into a list, None if empty."""
         return _parse_optional_comma_list(self.TELEGRAPH_TOKEN_LIST)
 
+    @computed_field
+    @property
+    def scraper_warmup_categories(self) -> list[str]:
+        """Parse SCRAPER_WARMUP_CATEGORIES comma-separated string into a list."""
+        return _parse_comma_list(self.SCRAPER_WARMUP_CATEGORIES)
+
     @computed_field
     @property
     def TWITTER_COOKIES(self) -> dict[str, Optional[str]]:
         return {"ct0": self.TWITTER_CT0, "auth_token": self.TWITTER_AUTH_TOKEN}
 
+    @computed_field
+    @property
+    def twitter_cookie_sets(self) -> list[dict[str, Optional[str]]]:
+        """Cookie sets for the twitter-api-client pool, TWITTER_COOKIES when none are listed."""
+        cookie_sets = []
+        for pair in _parse_comma_list(self.TWITTER_COOKIE_SETS):
+            ct0, _, auth_token = pair.partition(":")
+            cookie_sets.append({"ct0": ct0.strip(), "auth_token": auth_token.strip()})
+        return cookie_sets or [self.TWITTER_COOKIES]
+
     @computed_field
     @property
     def XIAOHONGSHU_COOKIES(self) -> dict[str, Optional[str]]:
@@ -139,9 +189,7 @@ settings = ScrapersSettings()
 
 # Templates & Jinja2
 templates_directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
-JINJA2_ENV = Environment(
-    loader=FileSystemLoader(templates_directory), lstrip_blocks=True, trim_blocks=True
-)
+JINJA2_ENV = create_template_environment(templates_directory, cache_namespace="scrapers")
 
 
 # --- Cookie file loading (standalone functions) ---
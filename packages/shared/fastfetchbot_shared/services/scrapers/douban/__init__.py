@@ -7,7 +7,8 @@ from bs4 import BeautifulSoup
 from lxml import etree
 
 from fastfetchbot_shared.utils.parse import get_html_text_length, wrap_text_into_html
-from fastfetchbot_shared.utils.network import get_selector, HEADERS
+from fastfetchbot_shared.utils.headers import build_headers
+from fastfetchbot_shared.utils.network import get_selector
 from fastfetchbot_shared.utils.logger import logger
 from fastfetchbot_shared.models.metadata_item import MetadataItem, MediaFile, MessageType
 from fastfetchbot_shared.services.scrapers.config import JINJA2_ENV
@@ -58,8 +59,7 @@ class Douban(MetadataItem):
         self.raw_content: Optional[str] = None
         self.date: Optional[str] = None
         # reqeust fields
-        self.headers = HEADERS
-        self.headers["Cookie"] = kwargs.get("cookie", "")
+        self.headers = build_headers(extra={"Cookie": kwargs.get("cookie", "")})
 
     async def get_item(self) -> dict:
         await self.get_douban()
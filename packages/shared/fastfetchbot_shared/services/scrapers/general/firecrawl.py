@@ -1,5 +1,6 @@
 from typing import Optional
 
+from fastfetchbot_shared.services.scrapers.circuit_breaker import circuit
 from fastfetchbot_shared.services.scrapers.config import settings
 from fastfetchbot_shared.services.scrapers.general.base import BaseGeneralDataProcessor, BaseGeneralScraper
 from fastfetchbot_shared.services.scrapers.general.firecrawl_client import FirecrawlClient
@@ -72,13 +73,14 @@ class FirecrawlDataProcessor(BaseGeneralDataProcessor):
 
     async def _get_page_content_legacy(self) -> None:
         """Original flow: markdown + HTML with OpenAI cleaning."""
-        result = await self._client.scrape_url(
-            url=self.url,
-            formats=["markdown", "html"],
-            only_main_content=True,
-            exclude_tags=FIRECRAWL_EXCLUDE_TAGS,
-            wait_for=settings.firecrawl_wait_for_int,
-        )
+        async with circuit("general:firecrawl"):
+            result = await self._client.scrape_url(
+                url=self.url,
+                formats=["markdown", "html"],
+                only_main_content=True,
+                exclude_tags=FIRECRAWL_EXCLUDE_TAGS,
+                wait_for=settings.firecrawl_wait_for_int,
+            )
         await self._process_firecrawl_result(result)
 
     async def _get_page_content_json(self) -> None:
@@ -88,13 +90,14 @@ class FirecrawlDataProcessor(BaseGeneralDataProcessor):
             "schema": ExtractedArticle,
             "prompt": FIRECRAWL_EXTRACTION_PROMPT,
         }
-        result = await self._client.scrape_url(
-            url=self.url,
-            formats=["markdown", "html", json_format],
-            only_main_content=True,
-            exclude_tags=FIRECRAWL_EXCLUDE_TAGS,
-            wait_for=settings.firecrawl_wait_for_int,
-        )
+        async with circuit("general:firecrawl"):
+            result = await self._client.scrape_url(
+                url=self.url,
+                formats=["markdown", "html", json_format],
+                only_main_content=True,
+                exclude_tags=FIRECRAWL_EXCLUDE_TAGS,
+                wait_for=settings.firecrawl_wait_for_int,
+            )
 
         json_data = result.get("json")
         if json_data and isinstance(json_data, dict):
@@ -1,5 +1,6 @@
 from zyte_api import AsyncZyteAPI
 
+from fastfetchbot_shared.services.scrapers.circuit_breaker import circuit
 from fastfetchbot_shared.services.scrapers.config import settings
 from fastfetchbot_shared.services.scrapers.general.base import BaseGeneralDataProcessor, BaseGeneralScraper
 from fastfetchbot_shared.services.scrapers.scraper import DataProcessor
@@ -22,14 +23,15 @@ class ZyteDataProcessor(BaseGeneralDataProcessor):
 
         try:
             client = AsyncZyteAPI(api_key=settings.ZYTE_API_KEY)
-            result = await client.get(
-                {
-                    "url": self.url,
-                    "browserHtml": True,
-                    "article": True,
-                    "articleOptions": {"extractFrom": "browserHtml"},
-                }
-            )
+            async with circuit("general:zyte"):
+                result = await client.get(
+                    {
+                        "url": self.url,
+                        "browserHtml": True,
+                        "article": True,
+                        "articleOptions": {"extractFrom": "browserHtml"},
+                    }
+                )
             await self._process_zyte_result(result)
         except Exception as e:
             logger.error(f"Failed to scrape URL with Zyte: {e}")
@@ -0,0 +1,180 @@
+"""Hedged requests across a scraper's fallback backends.
+
+Instead of waiting for each backend to fail before trying the next one,
+:class:`HedgedExecutor` starts the next backend once the running one has
+taken longer than its usual latency (``HEDGE_PERCENTILE`` of its recent
+calls), keeps the first valid result and cancels the rest. A cancelled
+backend that had already run past its hedge delay counts as failed. Backends are
+tried in order of their recent success rate and latency, so a backend that
+has started failing or slowing down drops behind the healthy ones, and
+backends whose circuit breaker is open are skipped without being called.
+
+Each scraper gets its executor from :func:`get_executor` so the statistics
+persist across requests.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Optional
+
+from fastfetchbot_shared.exceptions import CircuitOpenError
+from fastfetchbot_shared.services.scrapers.circuit_breaker import CircuitBreaker, get_breaker
+from fastfetchbot_shared.services.scrapers.config import settings
+from fastfetchbot_shared.utils.logger import logger
+
+
+class BackendStats:
+    """Outcomes and latencies of a backend's last ``window`` calls."""
+
+    def __init__(self, window: int):
+        self.latencies: deque[float] = deque(maxlen=window)
+        self.outcomes: deque[bool] = deque(maxlen=window)
+
+    def record(self, seconds: float, ok: bool) -> None:
+        self.outcomes.append(ok)
+        if ok:
+            self.latencies.append(seconds)
+
+    @property
+    def success_rate(self) -> float:
+        # Laplace smoothing: an untried backend scores 0.5, one failure does not bury it
+        return (sum(self.outcomes) + 1) / (len(self.outcomes) + 2)
+
+    def latency(self, percentile: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(int(percentile * len(ordered)), len(ordered) - 1)]
+
+
+class HedgedExecutor:
+    """Run a fallback chain of backends with hedging and adaptive ordering."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.stats: dict[str, BackendStats] = {}
+
+    def _stats(self, backend: str) -> BackendStats:
+        if backend not in self.stats:
+            self.stats[backend] = BackendStats(settings.HEDGE_WINDOW)
+        return self.stats[backend]
+
+    def _breaker(self, backend: str) -> CircuitBreaker:
+        return get_breaker(f"{self.name}:{backend}")
+
+    def order(self, backends: list[str]) -> list[str]:
+        """Sort backends by expected time to a valid result, keeping the given order on ties."""
+
+        def expected_cost(backend: str) -> float:
+            stats = self._stats(backend)
+            latency = stats.latency(0.5)
+            if latency is None:
+                latency = settings.HEDGE_DEFAULT_DELAY
+            return latency / stats.success_rate
+
+        return sorted(backends, key=expected_cost)
+
+    def hedge_delay(self, backend: str) -> float:
+        """Seconds to wait on *backend* before starting the next one as well."""
+        latency = self._stats(backend).latency(settings.HEDGE_PERCENTILE)
+        if latency is None:
+            return settings.HEDGE_DEFAULT_DELAY
+        return max(latency, settings.HEDGE_MIN_DELAY)
+
+    async def run(
+            self,
+            backends: dict[str, Callable[[], Awaitable[Any]]],
+            validate: Callable[[Any], bool] = None,
+    ) -> tuple[str, Any]:
+        """Return ``(backend, result)`` from the first backend with a valid result.
+
+        Args:
+            backends: Backend name to a zero-argument coroutine function, in
+                the preferred order when there are no statistics yet.
+            validate: Rejects a result that returned without raising but is
+                unusable; the backend then counts as failed.
+
+        Raises:
+            The last backend's exception when every backend fails,
+            ``ValueError`` when the last failure was a rejected result, or
+            ``CircuitOpenError`` when every circuit is open.
+        """
+        queue = self.order(list(backends))
+        running: dict[asyncio.Task, tuple[str, float]] = {}
+        won = False
+        last_error: BaseException = CircuitOpenError(f"All {self.name} backend circuits are open")
+
+        async def start_next() -> None:
+            while queue:
+                backend = queue.pop(0)
+                if not await self._breaker(backend).allow():
+                    logger.info(f"{self.name}: skipping {backend}, circuit open")
+                    continue
+                task = asyncio.create_task(backends[backend]())
+                # Mark exceptions of losing backends as retrieved; they are logged when handled
+                task.add_done_callback(lambda t: t.cancelled() or t.exception())
+                running[task] = (backend, time.perf_counter())
+                return
+
+        await start_next()
+        try:
+            while running:
+                timeout = None
+                if queue:
+                    newest_backend = list(running.values())[-1][0]
+                    timeout = self.hedge_delay(newest_backend)
+                done, _ = await asyncio.wait(
+                    running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    logger.info(f"{self.name}: hedging with {queue[0]}")
+                    await start_next()
+                    continue
+                for task in done:
+                    backend, started = running.pop(task)
+                    elapsed = time.perf_counter() - started
+                    error = task.exception()
+                    if error is None and (validate is None or validate(task.result())):
+                        self._stats(backend).record(elapsed, ok=True)
+                        await self._breaker(backend).record(elapsed, ok=True)
+                        won = True
+                        return backend, task.result()
+                    self._stats(backend).record(elapsed, ok=False)
+                    await self._breaker(backend).record(elapsed, ok=False)
+                    if error is not None:
+                        logger.warning(f"{self.name} backend {backend} failed: {error!r}")
+                        last_error = error
+                    else:
+                        logger.warning(f"{self.name} backend {backend} returned an invalid result")
+                        last_error = ValueError(f"Invalid result from {self.name} backend {backend}")
+                    # A failed backend is replaced right away, as in a plain fallback chain
+                    await start_next()
+            raise last_error
+        finally:
+            now = time.perf_counter()
+            for task, (backend, started) in running.items():
+                task.cancel()
+                elapsed = now - started
+                # A backend that lost after outrunning its hedge delay has slowed down
+                if won and elapsed > self.hedge_delay(backend):
+                    self._stats(backend).record(elapsed, ok=False)
+                    await self._breaker(backend).record(elapsed, ok=False)
+                else:
+                    self._breaker(backend).cancel()
+
+
+_executors: dict[str, HedgedExecutor] = {}
+
+
+def get_executor(name: str) -> HedgedExecutor:
+    """Return the process-wide executor for a scraper's fallback chain."""
+    if name not in _executors:
+        _executors[name] = HedgedExecutor(name)
+    return _executors[name]
+
+
+def reset_stats() -> None:
+    """Forget all backend statistics."""
+    for executor in _executors.values():
+        executor.stats.clear()
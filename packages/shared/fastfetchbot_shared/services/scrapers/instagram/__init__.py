@@ -1,16 +1,19 @@
 # TODO: https://rapidapi.com/arraybobo/api/instagram-scraper-2022
+import functools
 import re
 from typing import Any, Optional
 from urllib.parse import urlparse
 
 from html import escape
 
+from fastfetchbot_shared.exceptions import ScraperError, ScraperParseError
 from fastfetchbot_shared.models.metadata_item import MetadataItem, MessageType, MediaFile
 from fastfetchbot_shared.utils.network import get_response
 from fastfetchbot_shared.utils.parse import get_html_text_length
 from fastfetchbot_shared.utils.logger import logger
 from .config import API_HEADERS_LIST, ALL_SCRAPERS
 from fastfetchbot_shared.services.scrapers.config import settings
+from fastfetchbot_shared.services.scrapers.hedge import get_executor
 
 
 class Instagram(MetadataItem):
@@ -50,53 +53,49 @@ class Instagram(MetadataItem):
         self._process_ins_info(ins_info)
 
     async def _get_post_info(self) -> dict:
-        ins_info = {}
-        for scraper in ALL_SCRAPERS:
-            self.scraper = scraper
-            self.host = API_HEADERS_LIST[self.scraper]["host"]
-            self.headers = {
-                "X-RapidAPI-Key": settings.X_RAPIDAPI_KEY,
-                "X-RapidAPI-Host": API_HEADERS_LIST[self.scraper]["top_domain"],
-                "content-type": "application/octet-stream",
-            }
-            params_value = self.url if self.scraper == "looter2" else self.post_id
-            self.params = {API_HEADERS_LIST[self.scraper]["params"]: params_value}
-            response = await get_response(
-                url=self.host, headers=self.headers, params=self.params
-            )
-            if response.status_code != 200:
-                logger.error(
-                    "get_ins_post_item error: %s %s", self.scraper, response.status_code
-                )
-                continue
-            else:
-                ins_data = response.json()
-                logger.debug("get_ins_post_item: %s %s", self.params, ins_data)
-                if type(ins_data) == dict and "graphql" in ins_data:
-                    ins_data = ins_data["graphql"]["shortcode_media"]
-                elif type(ins_data) == dict and "data" in ins_data:
-                    ins_data = ins_data["data"]
-                elif (
-                    type(ins_data) == dict
-                    and "status" in ins_data
-                    and ins_data["status"] is False
-                ):
-                    logger.warning(f"get_ins_post_item error: {self.scraper}")
-                    continue
-                elif type(ins_data) == str and "400" in ins_data:
-                    logger.warning(f"get_ins_post_item error: {self.scraper} {ins_data}")
-                    continue
-            if (
-                self.scraper == "looter2"
-                or self.scraper == "ins191"
-                or self.scraper == "ins130"
-            ):
-                ins_info = self._get_ins_post_looter2(ins_data)
-            elif self.scraper == "ins28" or self.scraper == "scraper2" or self.scraper == "api2":
-                ins_info = self._get_ins_post_ins28_scraper2(ins_data)
-            break
+        backends = {
+            scraper: functools.partial(self._get_post_info_from, scraper)
+            for scraper in ALL_SCRAPERS
+        }
+        try:
+            self.scraper, ins_info = await get_executor("instagram").run(backends)
+        except Exception:
+            logger.error("get_ins_post_item error: all scrapers failed")
+            return {}
         return ins_info
 
+    async def _get_post_info_from(self, scraper: str) -> dict:
+        host = API_HEADERS_LIST[scraper]["host"]
+        headers = {
+            "X-RapidAPI-Key": settings.X_RAPIDAPI_KEY,
+            "X-RapidAPI-Host": API_HEADERS_LIST[scraper]["top_domain"],
+            "content-type": "application/octet-stream",
+        }
+        params_value = self.url if scraper == "looter2" else self.post_id
+        params = {API_HEADERS_LIST[scraper]["params"]: params_value}
+        response = await get_response(url=host, headers=headers, params=params)
+        if response.status_code != 200:
+            raise ScraperError(f"get_ins_post_item error: {scraper} {response.status_code}")
+        ins_data = response.json()
+        logger.debug("get_ins_post_item: %s %s", params, ins_data)
+        if type(ins_data) == dict and "graphql" in ins_data:
+            ins_data = ins_data["graphql"]["shortcode_media"]
+        elif type(ins_data) == dict and "data" in ins_data:
+            ins_data = ins_data["data"]
+        elif (
+            type(ins_data) == dict
+            and "status" in ins_data
+            and ins_data["status"] is False
+        ):
+            raise ScraperParseError(f"get_ins_post_item error: {scraper}")
+        elif type(ins_data) == str and "400" in ins_data:
+            raise ScraperParseError(f"get_ins_post_item error: {scraper} {ins_data}")
+        if scraper == "looter2" or scraper == "ins191" or scraper == "ins130":
+            return self._get_ins_post_looter2(ins_data)
+        elif scraper == "ins28" or scraper == "scraper2" or scraper == "api2":
+            return self._get_ins_post_ins28_scraper2(ins_data)
+        return {}
+
     def _process_ins_info(self, ins_info: dict):
         self.__dict__.update(ins_info)
         self.title = self.author + "'s Instagram post"
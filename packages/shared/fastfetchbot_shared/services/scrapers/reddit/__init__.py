@@ -1,13 +1,12 @@
 import re
 from typing import Optional, Any
 
-import asyncpraw
 from bs4 import BeautifulSoup
 
 from fastfetchbot_shared.models.metadata_item import MetadataItem, MessageType, MediaFile
 from fastfetchbot_shared.services.scrapers.config import settings, JINJA2_ENV
 from fastfetchbot_shared.utils.parse import unix_timestamp_to_utc, get_html_text_length
-from fastfetchbot_shared.utils.network import get_redirect_url
+from fastfetchbot_shared.services.scrapers.reddit.client import get_submission, resolve_share_url
 
 short_text_template = JINJA2_ENV.get_template("reddit_short_text.jinja2")
 content_template = JINJA2_ENV.get_template("reddit_content.jinja2")
@@ -25,21 +24,12 @@ class Reddit(MetadataItem):
         return self.to_dict()
 
     async def get_reddit(self) -> None:
-        self.url = await get_redirect_url(self.url)
+        self.url = await resolve_share_url(self.url)
         reddit_data = await self._get_reddit_data()
         await self._process_reddit_data(reddit_data)
 
     async def _get_reddit_data(self) -> dict:
-        reddit_user_agent = f"testscript by u/{settings.REDDIT_USERNAME}"
-        reddit = asyncpraw.Reddit(
-            client_id=settings.REDDIT_CLIENT_ID,
-            client_secret=settings.REDDIT_CLIENT_SECRET,
-            password=settings.REDDIT_PASSWORD,
-            user_agent=reddit_user_agent,
-            username=settings.REDDIT_USERNAME,
-        )
-        submission = await reddit.submission(url=self.url)
-        return submission.__dict__
+        return await get_submission(self.url)
 
     async def _process_reddit_data(self, reddit_data) -> None:
         self.url = "https://www.reddit.com" + reddit_data["permalink"]
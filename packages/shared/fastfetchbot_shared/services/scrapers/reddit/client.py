@@ -0,0 +1,218 @@
+"""Process-wide Reddit API client.
+
+One ``asyncpraw.Reddit`` instance serves every Reddit link, so its OAuth
+token is fetched once and refreshed by asyncpraw when it expires, instead of
+on every link. On top of it:
+
+* ``/s/`` share links are expanded with one persistent HTTP client and the
+  result is remembered (a share link always points to the same post); other
+  links are not requested at all before the API call;
+* fetched submissions are reused for ``REDDIT_SUBMISSION_CACHE_TTL`` seconds;
+* with ``REDDIT_BATCH_SUBMISSIONS``, submissions requested at the same time
+  (waiting up to ``REDDIT_BATCH_WINDOW`` seconds for each other) are fetched
+  with a single ``info()`` call, and :func:`fetch_submissions` loads a known
+  list of links, e.g. an Inoreader batch, the same way.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import asyncpraw
+import httpx
+from asyncpraw.exceptions import InvalidURL
+from asyncpraw.models import Submission
+
+from fastfetchbot_shared.exceptions import ScraperParseError
+from fastfetchbot_shared.services.scrapers.config import settings
+from fastfetchbot_shared.utils.logger import logger
+from fastfetchbot_shared.utils.network import get_redirect_url
+
+# Fullnames accepted by one /api/info request
+INFO_BATCH_SIZE = 100
+MAX_CACHED_SHARE_LINKS = 1024
+MAX_CACHED_SUBMISSIONS = 512
+REDDIT_HOSTS = ("reddit.com", "redd.it")
+
+_reddit: Optional[asyncpraw.Reddit] = None
+_http: Optional[httpx.AsyncClient] = None
+_share_links: "OrderedDict[str, str]" = OrderedDict()
+# submission id -> (expires_at, submission data)
+_submissions: Dict[str, Tuple[float, dict]] = {}
+_pending: List[Tuple[str, asyncio.Future]] = []
+
+
+def get_reddit_client() -> asyncpraw.Reddit:
+    """Return the process-wide Reddit client, creating it on first use."""
+    global _reddit
+    if _reddit is None:
+        _reddit = asyncpraw.Reddit(
+            client_id=settings.REDDIT_CLIENT_ID,
+            client_secret=settings.REDDIT_CLIENT_SECRET,
+            password=settings.REDDIT_PASSWORD,
+            user_agent=f"testscript by u/{settings.REDDIT_USERNAME}",
+            username=settings.REDDIT_USERNAME,
+        )
+    return _reddit
+
+
+async def close_reddit_client() -> None:
+    """Close the Reddit client and the share-link HTTP client."""
+    global _reddit, _http
+    reddit, http = _reddit, _http
+    _reddit = _http = None
+    _submissions.clear()
+    if reddit is not None:
+        await reddit.close()
+    if http is not None:
+        await http.aclose()
+
+
+def is_reddit_url(url: str) -> bool:
+    host = urlparse(url).hostname or ""
+    return host in REDDIT_HOSTS or host.endswith(".reddit.com")
+
+
+def is_share_link(url: str) -> bool:
+    return "/s/" in urlparse(url).path
+
+
+async def resolve_share_url(url: str) -> str:
+    """Expand a ``/s/`` share link to the submission URL; other URLs are returned as is."""
+    global _http
+    if not is_share_link(url):
+        return url
+    if url in _share_links:
+        _share_links.move_to_end(url)
+        return _share_links[url]
+    if _http is None:
+        _http = httpx.AsyncClient()
+    resolved = await get_redirect_url(url, client=_http)
+    if resolved != url:
+        _share_links[url] = resolved
+        if len(_share_links) > MAX_CACHED_SHARE_LINKS:
+            _share_links.popitem(last=False)
+    return resolved
+
+
+def submission_id(url: str) -> str:
+    try:
+        return Submission.id_from_url(url)
+    except InvalidURL as e:
+        raise ScraperParseError(f"Not a Reddit submission URL: {url}") from e
+
+
+def _cached(sid: str) -> Optional[dict]:
+    cached = _submissions.get(sid)
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+    return None
+
+
+def _store(sid: str, data: dict) -> None:
+    now = time.monotonic()
+    if len(_submissions) >= MAX_CACHED_SUBMISSIONS:
+        for key in [k for k, (expires_at, _) in _submissions.items() if expires_at <= now]:
+            del _submissions[key]
+        while len(_submissions) >= MAX_CACHED_SUBMISSIONS:
+            del _submissions[next(iter(_submissions))]
+    _submissions[sid] = (now + settings.REDDIT_SUBMISSION_CACHE_TTL, data)
+
+
+async def _fetch_one(sid: str) -> dict:
+    submission = await get_reddit_client().submission(id=sid)
+    data = submission.__dict__
+    _store(sid, data)
+    return data
+
+
+async def _fetch_info(sids: List[str]) -> Dict[str, dict]:
+    """Fetch submissions with one ``info()`` call per ``INFO_BATCH_SIZE`` ids."""
+    reddit = get_reddit_client()
+    fetched = {}
+    for start in range(0, len(sids), INFO_BATCH_SIZE):
+        fullnames = [f"t3_{sid}" for sid in sids[start:start + INFO_BATCH_SIZE]]
+        async for submission in reddit.info(fullnames=fullnames):
+            data = submission.__dict__
+            fetched[data["id"]] = data
+            _store(data["id"], data)
+    return fetched
+
+
+async def fetch_submissions(urls: Iterable[str]) -> Dict[str, dict]:
+    """Load the submissions behind *urls* into the cache with as few API calls as possible.
+
+    Share links are expanded first; URLs that are not Reddit submissions are
+    skipped. Returns the submission data by submission id.
+    """
+    sids = []
+    for url in urls:
+        if not is_reddit_url(url):
+            continue
+        try:
+            sid = submission_id(await resolve_share_url(url))
+        except ScraperParseError:
+            continue
+        if sid not in sids:
+            sids.append(sid)
+    result = {sid: data for sid in sids if (data := _cached(sid)) is not None}
+    missing = [sid for sid in sids if sid not in result]
+    if len(missing) == 1:
+        result[missing[0]] = await _fetch_one(missing[0])
+    elif missing:
+        result.update(await _fetch_info(missing))
+    return result
+
+
+async def _flush() -> None:
+    if settings.REDDIT_BATCH_WINDOW > 0:
+        await asyncio.sleep(settings.REDDIT_BATCH_WINDOW)
+    else:
+        # Let the other coroutines scheduled in this loop iteration queue their requests
+        await asyncio.sleep(0)
+    batch = _pending[:]
+    _pending.clear()
+    sids = list(dict.fromkeys(sid for sid, _ in batch))
+    try:
+        if len(sids) == 1:
+            fetched = {sids[0]: await _fetch_one(sids[0])}
+        else:
+            logger.debug(f"Fetching {len(sids)} Reddit submissions in one info() call")
+            fetched = await _fetch_info(sids)
+    except Exception as e:
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(e)
+        return
+    for sid, future in batch:
+        if future.done():
+            continue
+        if sid in fetched:
+            future.set_result(fetched[sid])
+        else:
+            future.set_exception(ScraperParseError(f"Reddit submission {sid} not found"))
+
+
+async def get_submission(url: str) -> dict:
+    """Return the data of the submission at *url* (``Submission.__dict__``)."""
+    sid = submission_id(url)
+    cached = _cached(sid)
+    if cached is not None:
+        return cached
+    if not settings.REDDIT_BATCH_SUBMISSIONS:
+        return await _fetch_one(sid)
+    future = asyncio.get_running_loop().create_future()
+    _pending.append((sid, future))
+    if len(_pending) == 1:
+        flush = asyncio.create_task(_flush())
+        # Exceptions reach the callers through their futures
+        flush.add_done_callback(lambda t: t.cancelled() or t.exception())
+    return await future
+
+
+def reset() -> None:
+    """Forget cached submissions and share links."""
+    _submissions.clear()
+    _share_links.clear()
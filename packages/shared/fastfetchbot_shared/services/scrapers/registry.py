@@ -0,0 +1,102 @@
+"""Category -> scraper import paths, loaded on first use.
+
+Platform modules pull in heavy clients (twitter-api-client, atproto,
+asyncpraw, playwright, openai), so nothing is imported until a category is
+scraped. With ``SCRAPER_WARMUP`` the API and the worker import them in a
+background thread after startup (:func:`start_warm_up`), so the first link of
+a platform does not pay for the import either.
+
+Paths are ``"package.module:Attribute"``.
+"""
+
+import asyncio
+import importlib
+import sys
+from typing import Iterable, Optional
+
+from fastfetchbot_shared.services.scrapers.config import settings
+from fastfetchbot_shared.utils.logger import logger
+
+_SCRAPERS = "fastfetchbot_shared.services.scrapers"
+
+# Scrapers built per URL by InfoExtractService
+SCRAPER_CLASSES: dict[str, str] = {
+    "twitter": f"{_SCRAPERS}.twitter:Twitter",
+    "threads": f"{_SCRAPERS}.threads:Threads",
+    "reddit": f"{_SCRAPERS}.reddit:Reddit",
+    "weibo": f"{_SCRAPERS}.weibo:Weibo",
+    "wechat": f"{_SCRAPERS}.wechat:Wechat",
+    "instagram": f"{_SCRAPERS}.instagram:Instagram",
+    "douban": f"{_SCRAPERS}.douban:Douban",
+    "zhihu": f"{_SCRAPERS}.zhihu:Zhihu",
+    "xiaohongshu": f"{_SCRAPERS}.xiaohongshu:Xiaohongshu",
+}
+
+# Long-lived scrapers held by ScraperManager
+MANAGED_SCRAPERS: dict[str, str] = {
+    "bluesky": f"{_SCRAPERS}.bluesky.scraper:BlueskyScraper",
+    "weibo": f"{_SCRAPERS}.weibo.scraper:WeiboScraper",
+    "general": f"{_SCRAPERS}.general.scraper:GeneralScraper",
+}
+
+# Module -> coroutine function releasing its pooled clients on shutdown
+CLOSE_HOOKS: dict[str, str] = {
+    f"{_SCRAPERS}.twitter.session_pool": "close_session_pool",
+    f"{_SCRAPERS}.xiaohongshu.signer": "close_signers",
+    f"{_SCRAPERS}.weibo.engine": "close_weibo_sessions",
+    f"{_SCRAPERS}.reddit.client": "close_reddit_client",
+}
+
+_warm_up_task: Optional[asyncio.Task] = None
+
+
+def load(path: str):
+    """Import ``"module:Attribute"`` and return the attribute."""
+    module_name, _, attribute = path.partition(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def warm_up(categories: Optional[Iterable[str]] = None) -> list[str]:
+    """Import the scrapers of *categories* (all by default); returns the categories loaded.
+
+    A scraper whose optional dependencies are missing is logged and skipped.
+    """
+    wanted = set(categories) if categories else set(SCRAPER_CLASSES) | set(MANAGED_SCRAPERS)
+    loaded = []
+    for registry in (SCRAPER_CLASSES, MANAGED_SCRAPERS):
+        for category, path in registry.items():
+            if category not in wanted:
+                continue
+            try:
+                load(path)
+            except Exception as e:
+                logger.warning(f"Could not preload the {category} scraper: {e}")
+                continue
+            if category not in loaded:
+                loaded.append(category)
+    return loaded
+
+
+def start_warm_up() -> Optional[asyncio.Task]:
+    """Preload the scrapers selected by ``SCRAPER_WARMUP_CATEGORIES`` in a background thread."""
+    global _warm_up_task
+    if not settings.SCRAPER_WARMUP:
+        return None
+    if _warm_up_task is None or _warm_up_task.done():
+        categories = settings.scraper_warmup_categories
+        _warm_up_task = asyncio.create_task(asyncio.to_thread(warm_up, categories))
+        _warm_up_task.add_done_callback(_log_warm_up)
+    return _warm_up_task
+
+
+def _log_warm_up(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is None:
+        logger.info(f"Preloaded scrapers: {', '.join(task.result())}")
+
+
+async def close_loaded_scrapers() -> None:
+    """Run the shutdown hook of every scraper module that was imported."""
+    for module_name, hook in CLOSE_HOOKS.items():
+        module = sys.modules.get(module_name)
+        if module is not None:
+            await getattr(module, hook)()
@@ -1,18 +1,21 @@
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from fastfetchbot_shared.utils.logger import logger
 from fastfetchbot_shared.exceptions import ScraperError
-from fastfetchbot_shared.services.scrapers.bluesky.scraper import BlueskyScraper
-from fastfetchbot_shared.services.scrapers.weibo.scraper import WeiboScraper
-from fastfetchbot_shared.services.scrapers.general.scraper import GeneralScraper
+from fastfetchbot_shared.services.scrapers import registry
 from fastfetchbot_shared.services.scrapers.config import settings
 
+if TYPE_CHECKING:
+    from fastfetchbot_shared.services.scrapers.bluesky.scraper import BlueskyScraper
+    from fastfetchbot_shared.services.scrapers.weibo.scraper import WeiboScraper
+    from fastfetchbot_shared.services.scrapers.general.scraper import GeneralScraper
+
 
 class ScraperManager:
 
-    bluesky_scraper: Optional[BlueskyScraper] = None
-    weibo_scraper: Optional[WeiboScraper] = None
-    general_scraper: Optional[GeneralScraper] = None
+    bluesky_scraper: Optional["BlueskyScraper"] = None
+    weibo_scraper: Optional["WeiboScraper"] = None
+    general_scraper: Optional["GeneralScraper"] = None
 
     scrapers = {"bluesky": bluesky_scraper,
                 "weibo": weibo_scraper,
@@ -44,17 +47,20 @@ class ScraperManager:
             raise ScraperError(f"Scraper {category} is not supported")
 
     @classmethod
-    async def init_bluesky_scraper(cls) -> BlueskyScraper:
+    async def init_bluesky_scraper(cls) -> "BlueskyScraper":
+        BlueskyScraper = registry.load(registry.MANAGED_SCRAPERS["bluesky"])
         cls.bluesky_scraper = BlueskyScraper(username=settings.BLUESKY_USERNAME, password=settings.BLUESKY_PASSWORD)
         await cls.bluesky_scraper.init()
         return cls.bluesky_scraper
 
     @classmethod
-    async def init_weibo_scraper(cls) -> WeiboScraper:
+    async def init_weibo_scraper(cls) -> "WeiboScraper":
+        WeiboScraper = registry.load(registry.MANAGED_SCRAPERS["weibo"])
         cls.weibo_scraper = WeiboScraper()
         return cls.weibo_scraper
 
     @classmethod
-    async def init_general_scraper(cls) -> GeneralScraper:
+    async def init_general_scraper(cls) -> "GeneralScraper":
+        GeneralScraper = registry.load(registry.MANAGED_SCRAPERS["general"])
         cls.general_scraper = GeneralScraper()
         return cls.general_scraper
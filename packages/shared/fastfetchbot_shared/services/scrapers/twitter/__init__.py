@@ -1,5 +1,5 @@
 # TODO: https://rapidapi.com/Glavier/api/twitter135
-import asyncio
+import functools
 from urllib.parse import urlparse
 from typing import Dict, List, Optional, Any, Tuple
 
@@ -9,7 +9,6 @@ import jmespath
 from fastfetchbot_shared.models.metadata_item import MetadataItem, MediaFile, MessageType
 from fastfetchbot_shared.utils.parse import get_html_text_length, wrap_text_into_html
 from fastfetchbot_shared.exceptions import ScraperError, ScraperParseError
-from twitter.scraper import Scraper
 from .config import (
     ALL_SCRAPER,
     ALL_SINGLE_SCRAPER,
@@ -18,6 +17,8 @@ from .config import (
     SHORT_LIMIT,
 )
 from fastfetchbot_shared.services.scrapers.config import settings
+from fastfetchbot_shared.services.scrapers.hedge import get_executor
+from fastfetchbot_shared.services.scrapers.twitter.session_pool import get_session_pool
 from fastfetchbot_shared.utils.logger import logger
 
 
@@ -64,26 +65,23 @@ class Twitter(MetadataItem):
 
     async def _get_response_tweet_data(self) -> Dict:
         scrapers = ALL_SCRAPER if self.instruction == "threads" else ALL_SINGLE_SCRAPER
+        backends = {}
         for scraper in scrapers:
-            self.scraper = scraper
-            try:
-                if self.scraper.startswith("Twitter"):
-                    tweet_data = await self._rapidapi_get_response_tweet_data()
-                    return tweet_data
-                elif self.scraper == "api-client":
-                    tweet_data = await self._api_client_get_response_tweet_data()
-                    return tweet_data
-            except Exception:
-                logger.exception(f"Twitter scraper {self.scraper} failed")
-                continue
-        raise ScraperError("No valid response from all Twitter scrapers")
-
-    async def _rapidapi_get_response_tweet_data(self) -> Dict:
+            if scraper.startswith("Twitter"):
+                backends[scraper] = functools.partial(self._rapidapi_get_response_tweet_data, scraper)
+            elif scraper == "api-client":
+                backends[scraper] = self._api_client_get_response_tweet_data
+        try:
+            self.scraper, tweet_data = await get_executor("twitter").run(backends)
+        except Exception as e:
+            logger.exception("All Twitter scrapers failed")
+            raise ScraperError("No valid response from all Twitter scrapers") from e
+        return tweet_data
+
+    async def _rapidapi_get_response_tweet_data(self, scraper: Optional[str] = None) -> Dict:
+        host, headers, params = self._get_request_headers(scraper or self.scraper)
         async with httpx.AsyncClient() as client:
-            self._get_request_headers()
-            response = await client.get(
-                url=self.host, headers=self.headers, params=self.params
-            )
+            response = await client.get(url=host, headers=headers, params=params)
             if response.status_code == 200:
                 tweet_data = response.json()
                 if (
@@ -100,15 +98,9 @@ class Twitter(MetadataItem):
                 raise ScraperParseError("Invalid response from Twitter API")
 
     async def _api_client_get_response_tweet_data(self) -> Dict:
-        scraper = Scraper(
-            save=False,
-            pbar=False,
-            debug=0,
-            cookies=settings.TWITTER_COOKIES
-        )
-        tweet_data = await asyncio.to_thread(scraper.tweets_details, [int(self.tid)], limit=1)
+        tweet_data = await get_session_pool().tweet_detail(int(self.tid))
         logger.debug(tweet_data)
-        return tweet_data[0]
+        return tweet_data
 
     def _process_tweet(self, tweet_data: Dict):
         # if self.scraper == "api-client":
@@ -304,17 +296,19 @@ class Twitter(MetadataItem):
 
         return "".join(html_parts), media_files
 
-    def _get_request_headers(self):
-        self.host = SCRAPER_INFO[self.scraper]["host"]
-        self.headers = {
+    def _get_request_headers(self, scraper: str) -> Tuple[str, dict, dict]:
+        """Return the RapidAPI host, headers and params of *scraper* for this tweet."""
+        host = SCRAPER_INFO[scraper]["host"]
+        headers = {
             "X-RapidAPI-Key": settings.X_RAPIDAPI_KEY,
-            "X-RapidAPI-Host": SCRAPER_INFO[self.scraper]["top_domain"]
+            "X-RapidAPI-Host": SCRAPER_INFO[scraper]["top_domain"]
                                + X_RAPIDAPI_HOST,
             "content-type": "application/octet-stream",
         }
-        self.params = {
-            SCRAPER_INFO[self.scraper]["params"]: self.tid,
+        params = {
+            SCRAPER_INFO[scraper]["params"]: self.tid,
         }
+        return host, headers, params
 
 
 def _find_article_media_url(article: Dict, media_id: str) -> str:
@@ -0,0 +1,195 @@
+"""Pool of long-lived twitter-api-client sessions.
+
+``twitter.scraper.Scraper`` only has a blocking interface that opens a new
+HTTP client (and event loop) for every call. The pool keeps one ``Scraper``
+per cookie set in ``TWITTER_COOKIE_SETS`` (or the single
+``TWITTER_CT0``/``TWITTER_AUTH_TOKEN`` pair) together with a persistent
+``httpx.AsyncClient``, and issues ``TweetDetail`` queries through the
+library's async query path on the caller's loop.
+
+Requests go to the least busy session that is under its rate limit, counted
+locally over ``TWITTER_SESSION_RATE_WINDOW`` and taken from the
+``x-rate-limit-*`` headers Twitter returns. A session whose request fails
+is rested for ``TWITTER_SESSION_COOLDOWN`` seconds, doubling with each
+consecutive failure, and reopened with a fresh client afterwards. Requests
+still running on the failed client may fail with it; they count as one
+failure, and the client is closed once the last of them has finished.
+"""
+
+import time
+from collections import deque
+from typing import Optional
+
+import httpx
+from twitter.constants import Operation, static_variables, target_features, target_field_toggles
+from twitter.scraper import Scraper
+from twitter.util import get_headers
+
+from fastfetchbot_shared.exceptions import ScraperError, ScraperParseError
+from fastfetchbot_shared.services.scrapers.config import settings
+from fastfetchbot_shared.utils.logger import logger
+
+# Operation name twitter-api-client stores rate limit headers under
+TWEET_DETAIL = Operation.TweetDetail[-1]
+
+
+class ApiClientSession:
+    """One cookie set with its ``Scraper`` and persistent HTTP client."""
+
+    def __init__(self, name: str, cookies: dict[str, Optional[str]]):
+        self.name = name
+        self.cookies = cookies
+        self.scraper: Optional[Scraper] = None
+        self.client: Optional[httpx.AsyncClient] = None
+        # clients dropped after a failure, closed once nothing is in flight
+        self.retired: list[httpx.AsyncClient] = []
+        # start times of requests in the current rate window
+        self.requests: deque[float] = deque()
+        self.in_flight = 0
+        self.failures = 0
+        self.cooldown_until = 0.0
+
+    def open(self) -> None:
+        self.scraper = Scraper(save=False, pbar=False, debug=0, cookies=self.cookies)
+        self.client = httpx.AsyncClient(
+            headers=get_headers(self.scraper.session),
+            cookies=self.scraper.session.cookies,
+            timeout=settings.TWITTER_SESSION_TIMEOUT,
+        )
+
+    async def close(self) -> None:
+        if self.client is not None:
+            self.retired.append(self.client)
+        self.scraper = None
+        self.client = None
+        while self.retired:
+            await self.retired.pop().aclose()
+
+    def load(self, now: float) -> int:
+        """Requests made in the current rate window."""
+        while self.requests and self.requests[0] <= now - settings.TWITTER_SESSION_RATE_WINDOW:
+            self.requests.popleft()
+        return len(self.requests)
+
+    def available(self, now: float) -> bool:
+        if now < self.cooldown_until:
+            return False
+        if self.load(now) >= settings.TWITTER_SESSION_RATE_LIMIT:
+            return False
+        limits = self.scraper.rate_limits.get(TWEET_DETAIL, {}) if self.scraper else {}
+        if limits.get("x-rate-limit-remaining") == 0:
+            return now >= limits.get("x-rate-limit-reset", 0)
+        return True
+
+    async def tweet_detail(self, tweet_id: int) -> dict:
+        # the same variables, features and field toggles Scraper.tweets_details sends
+        response = await self.scraper._query(
+            self.client,
+            Operation.TweetDetail,
+            focalTweetId=tweet_id,
+            **static_variables,
+            features=target_features,
+            fieldToggles=target_field_toggles,
+        )
+        if response.status_code != 200:
+            raise ScraperParseError(
+                f"twitter-api-client {self.name} returned status {response.status_code}"
+            )
+        tweet_data = response.json()
+        if not isinstance(tweet_data, dict) or "data" not in tweet_data:
+            raise ScraperParseError(f"Invalid response from twitter-api-client {self.name}")
+        return tweet_data
+
+    def fail(self, client: Optional[httpx.AsyncClient], now: float) -> None:
+        """Rest the session after a request on *client* failed.
+
+        Only the first failure on a client counts; later ones come from
+        requests that were already running on it.
+        """
+        if client is not self.client:
+            return
+        self.failures += 1
+        cooldown = min(
+            settings.TWITTER_SESSION_COOLDOWN * 2 ** (self.failures - 1),
+            settings.TWITTER_SESSION_RATE_WINDOW,
+        )
+        self.cooldown_until = now + cooldown
+        logger.warning(f"twitter-api-client {self.name} failed, resting for {cooldown:.0f}s")
+        if client is not None:
+            self.retired.append(client)
+        self.scraper = None
+        self.client = None
+
+    async def release(self) -> None:
+        """Finish a request, closing retired clients once none is in flight."""
+        self.in_flight -= 1
+        if self.in_flight == 0:
+            while self.retired:
+                await self.retired.pop().aclose()
+
+
+class ApiClientPool:
+    """Spread ``TweetDetail`` queries across long-lived sessions."""
+
+    def __init__(self, cookie_sets: list[dict[str, Optional[str]]]):
+        self.sessions = [
+            ApiClientSession(f"session-{i}", cookies) for i, cookies in enumerate(cookie_sets)
+        ]
+
+    def warm(self) -> None:
+        """Open every session that is not resting."""
+        now = time.time()
+        for session in self.sessions:
+            if session.client is None and now >= session.cooldown_until:
+                session.open()
+
+    def _pick(self, now: float) -> ApiClientSession:
+        candidates = [session for session in self.sessions if session.available(now)]
+        if not candidates:
+            raise ScraperError("No twitter-api-client session available")
+        return min(candidates, key=lambda session: (session.in_flight, session.load(now)))
+
+    async def tweet_detail(self, tweet_id: int) -> dict:
+        """Return the raw ``TweetDetail`` response, as ``Scraper.tweets_details`` did."""
+        now = time.time()
+        session = self._pick(now)
+        session.requests.append(now)
+        session.in_flight += 1
+        client = session.client
+        try:
+            if client is None:
+                session.open()
+                client = session.client
+            tweet_data = await session.tweet_detail(tweet_id)
+        except Exception:
+            session.fail(client, time.time())
+            raise
+        finally:
+            await session.release()
+        if client is session.client:
+            session.failures = 0
+        return tweet_data
+
+    async def close(self) -> None:
+        for session in self.sessions:
+            await session.close()
+
+
+_pool: Optional[ApiClientPool] = None
+
+
+def get_session_pool() -> ApiClientPool:
+    """Return the process-wide pool, opening its sessions on first use."""
+    global _pool
+    if _pool is None:
+        _pool = ApiClientPool(settings.twitter_cookie_sets)
+        _pool.warm()
+    return _pool
+
+
+async def close_session_pool() -> None:
+    """Close every session's HTTP client."""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
@@ -5,7 +5,8 @@ from bs4 import BeautifulSoup, NavigableString
 
 from fastfetchbot_shared.models.metadata_item import MetadataItem, MediaFile, MessageType
 from fastfetchbot_shared.utils.logger import logger
-from fastfetchbot_shared.utils.network import get_selector, HEADERS
+from fastfetchbot_shared.utils.headers import build_headers
+from fastfetchbot_shared.utils.network import get_selector
 
 
 class Wechat(MetadataItem):
@@ -34,7 +35,7 @@ class Wechat(MetadataItem):
         pass
 
     async def _get_response_wechat_data(self) -> Dict:
-        wechat_data = await get_selector(self.url, headers=HEADERS)
+        wechat_data = await get_selector(self.url, headers=build_headers())
         wechat_data = self._wechat_data_parse(wechat_data)
         return wechat_data
 
@@ -3,3 +3,5 @@ AJAX_LONGTEXT_HOST = "https://weibo.com/ajax/statuses/longtext?id="
 WEIBO_WEB_HOST = "https://m.weibo.cn/detail/"
 WEIBO_HOST = "https://weibo.com"
 WEIBO_TEXT_LIMIT = 700
+# Visitor SUB cookie accepted by the ajax API without logging in
+WEIBO_GUEST_COOKIES = "SUB=_2AkMR47Mlf8NxqwFRmfocxG_lbox2wg7EieKnv0L-JRMxHRl-yT9yqhFdtRB6OmOdyoia9pKPkqoHRRmSBA_WNPaHuybH"
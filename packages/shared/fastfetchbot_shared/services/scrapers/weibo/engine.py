@@ -0,0 +1,53 @@
+"""HTTP sessions and page decoding shared by every Weibo request.
+
+Weibo is fetched from two sources: the ajax API and the mobile detail page
+(m.weibo.cn), whose status JSON is embedded in the page as
+``var $render_data = [{...}][0] || {};``. Both go through one pooled
+:class:`httpx.AsyncClient` per cookie set from :func:`get_session`, so a post,
+its long text and its retweet reuse the same connections.
+"""
+
+import json
+import re
+from typing import Optional
+
+import httpx
+
+_sessions: dict[str, httpx.AsyncClient] = {}
+
+RENDER_DATA_PATTERN = re.compile(r"\$render_data\s*=\s*\[\s*")
+# Weibo leaves raw control characters in its JSON strings
+_render_data_decoder = json.JSONDecoder(strict=False)
+
+
+def get_session(cookies: Optional[str] = "") -> httpx.AsyncClient:
+    """Return the process-wide session sending *cookies*."""
+    cookies = cookies or ""
+    if cookies not in _sessions:
+        headers = {"Cookie": cookies} if cookies else None
+        _sessions[cookies] = httpx.AsyncClient(headers=headers)
+    return _sessions[cookies]
+
+
+async def close_weibo_sessions() -> None:
+    """Close every pooled Weibo session."""
+    sessions = list(_sessions.values())
+    _sessions.clear()
+    for session in sessions:
+        await session.aclose()
+
+
+def extract_render_data(page: str) -> Optional[dict]:
+    """Decode the ``$render_data`` object of a mobile detail page.
+
+    The object is decoded in place from where the assignment starts, without
+    slicing the page. Returns None when the page has no ``$render_data``.
+
+    Raises:
+        json.JSONDecodeError: When the embedded object is not valid JSON.
+    """
+    match = RENDER_DATA_PATTERN.search(page)
+    if match is None:
+        return None
+    render_data, _ = _render_data_decoder.raw_decode(page, match.end())
+    return render_data
@@ -1,16 +1,17 @@
-import json
+import functools
 from typing import Optional, Any, Union
 from urllib.parse import urlparse
 
-import httpx
 import jmespath
 from bs4 import BeautifulSoup
 from lxml import html
 
 from fastfetchbot_shared.models.metadata_item import MetadataItem, MediaFile, MessageType
 from fastfetchbot_shared.exceptions import ScraperError, ScraperNetworkError, ScraperParseError
+from fastfetchbot_shared.services.scrapers.hedge import get_executor
 from fastfetchbot_shared.services.scrapers.scraper import Scraper, DataProcessor
 from fastfetchbot_shared.services.scrapers.weibo import Weibo
+from fastfetchbot_shared.services.scrapers.weibo.engine import extract_render_data, get_session
 from fastfetchbot_shared.utils.network import get_response_json, get_random_user_agent
 from fastfetchbot_shared.utils.parse import get_html_text_length, wrap_text_into_html
 from .config import (
@@ -19,6 +20,7 @@ from .config import (
     WEIBO_WEB_HOST,
     WEIBO_HOST,
     WEIBO_TEXT_LIMIT,
+    WEIBO_GUEST_COOKIES,
 )
 from fastfetchbot_shared.services.scrapers.config import JINJA2_ENV, WEIBO_COOKIES
 from fastfetchbot_shared.utils.logger import logger
@@ -26,6 +28,9 @@ from fastfetchbot_shared.utils.logger import logger
 short_text_template = JINJA2_ENV.get_template("weibo_short_text.jinja2")
 content_template = JINJA2_ENV.get_template("weibo_content.jinja2")
 
+# Card placeholder image Weibo inserts into post text
+TIMELINE_CARD_IMAGE = "https://h5.sinaimg.cn/upload/2015/09/25/3/timeline_card_small_web_default.png"
+
 
 class WeiboDataProcessor(DataProcessor):
 
@@ -43,6 +48,7 @@ class WeiboDataProcessor(DataProcessor):
         self.url = url
         self.method = method
         self.text = ""
+        self.cookies = cookies or ""
         self.headers = {"User-Agent": user_agent, "Cookie": cookies if cookies else ""}
         self.url_parser = urlparse(url)
         self.id = self.url_parser.path.split("/")[-1]
@@ -58,19 +64,21 @@ class WeiboDataProcessor(DataProcessor):
         await self._get_weibo()
 
     async def _get_weibo(self) -> None:
-        weibo_info = None
-        # Priority 1: API with SUB cookie and isGetLongText=true
+        """
+        Get the weibo info from the API (with SUB cookie and isGetLongText=true) or the webpage.
+        The webpage is hedged: it is fetched as well once the API is slower than usual.
+        """
+        backends = {
+            method: functools.partial(self._get_weibo_info, method=method)
+            for method in ("api", "webpage")
+        }
         try:
-            weibo_info = await self._get_weibo_info(method="api")
-        except ScraperNetworkError as e:
-            logger.warning(f"Failed to get weibo info by api: {e}")
-        # Priority 2: webpage scraping
-        if weibo_info is None:
-            try:
-                weibo_info = await self._get_weibo_info(method="webpage")
-            except ScraperNetworkError as e:
-                logger.error(f"All weibo fetch methods failed. Last error: {e}")
-                raise
+            _, weibo_info = await get_executor("weibo").run(
+                backends, validate=lambda info: bool(info and info.get("id"))
+            )
+        except Exception as e:
+            logger.error(f"All weibo fetch methods failed. Last error: {e}")
+            raise
         try:
             await self._process_weibo_item(weibo_info)
         except Exception as e:
@@ -94,21 +102,17 @@ class WeiboDataProcessor(DataProcessor):
 
     async def _get_weibo_info_webpage(self) -> dict:
         url = WEIBO_WEB_HOST + self.id
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=self.headers)
-            if response.status_code == 302:  # redirect
-                new_url = response.headers["Location"]
-                response = await client.get(new_url, headers=self.headers)
-        html_string = response.text
-        html_string = html_string[html_string.find('"status":'):]
-        html_string = html_string[: html_string.rfind('"hotScheme"')]
-        html_string = html_string[: html_string.rfind(",")]
-        html_string = html_string[: html_string.rfind("][0] || {};")]
-        html_string = "{" + html_string
+        client = get_session(self.cookies)
+        response = await client.get(url, headers=self.headers)
+        if response.status_code == 302:  # redirect
+            new_url = response.headers["Location"]
+            response = await client.get(new_url, headers=self.headers)
         try:
-            js = json.loads(html_string, strict=False)
-            logger.debug(f"weibo webpage info: {js}")
-            weibo_info = js.get("status")
+            render_data = extract_render_data(response.text)
+            if render_data is None:
+                raise ScraperParseError("No $render_data in the weibo page")
+            logger.debug(f"weibo webpage info: {render_data}")
+            weibo_info = render_data.get("status") or {}
         except Exception as e:
             logger.error(f"Failed to get weibo info by webpage scraping: {e}")
             weibo_info = {}
@@ -118,14 +122,10 @@ class WeiboDataProcessor(DataProcessor):
         """Fetch weibo info using the API with SUB cookie and isGetLongText=true."""
         url = self.ajax_url + "&isGetLongText=true"
         headers = {"referer": WEIBO_HOST}
-        cookies = {
-            "SUB": "_2AkMR47Mlf8NxqwFRmfocxG_lbox2wg7EieKnv0L-JRMxHRl-yT9yqhFdtRB6OmOdyoia9pKPkqoHRRmSBA_WNPaHuybH",
-        }
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, headers=headers, cookies=cookies)
-                response.raise_for_status()
-                ajax_json = response.json()
+            response = await get_session(WEIBO_GUEST_COOKIES).get(url, headers=headers)
+            response.raise_for_status()
+            ajax_json = response.json()
             if not ajax_json or ajax_json.get("ok") == 0:
                 raise ScraperParseError("Weibo API returned ok=0 or empty response")
             logger.debug(f"weibo info by api: {ajax_json}")
@@ -137,7 +137,7 @@ class WeiboDataProcessor(DataProcessor):
 
     async def _get_long_weibo_info_api(self) -> dict:
         ajax_json = await get_response_json(
-            self.ajax_longtext_url, headers=self.headers
+            self.ajax_longtext_url, headers=self.headers, client=get_session(self.cookies)
         )
         logger.debug(f"weibo ajax_json info by api: {ajax_json}")
         return ajax_json
@@ -464,7 +464,7 @@ class WeiboDataProcessor(DataProcessor):
             return live_photo_list
 
     @staticmethod
-    def _weibo_html_text_clean(text, method="bs4"):
+    def _weibo_html_text_clean(text, method="lxml"):
         if method == "bs4":
             return WeiboDataProcessor._weibo_html_text_clean_bs4(text)
         elif method == "lxml":
@@ -480,7 +480,7 @@ class WeiboDataProcessor(DataProcessor):
             alt_text = img.get("alt", "")
             img.replace_with(alt_text)
         for image in soup.find_all("image"):
-            if image.get("src") == "https://h5.sinaimg.cn/upload/2015/09/25/3/timeline_card_small_web_default.png":
+            if image.get("src") == TIMELINE_CARD_IMAGE:
                 image.replace_with("")
         for a in soup.find_all("a"):
             href = a.get("href", "")
@@ -502,20 +502,37 @@ class WeiboDataProcessor(DataProcessor):
 
     @staticmethod
     def _weibo_html_text_clean_lxml(text):
-        selector = html.fromstring(text)
-        # remove all img tags and replace with alt text
-        for img in selector.xpath("//img"):
-            alt_text = img.get("alt", "")
-            # get innerhtml pure text of the parent tag
-            parent_text = img.getparent().text_content() if img.getparent() else ""
-            replace_text = alt_text + parent_text
-            text_node = html.fromstring(replace_text)
-            img.addprevious(text_node)
-            img.getparent().remove(img)
-            # make text_node become pure text
-            text_node.text = text_node.text_content()
-        # return the html document after cleaning
-        return html.tostring(selector, encoding="unicode")
+        """
+        Same cleaning as _weibo_html_text_clean_bs4 on lxml's C parser. The output only differs
+        in serialization details: non-ASCII characters in hrefs are percent-encoded and
+        non-void unknown tags are closed explicitly.
+        """
+        fw_pics = []
+        root = html.fragment_fromstring(text, create_parent="div")
+        for img in list(root.iter("img")):
+            img.tail = img.get("alt", "") + (img.tail or "")
+            img.drop_tree()
+        for image in list(root.iter("image")):
+            if image.get("src") == TIMELINE_CARD_IMAGE:
+                image.drop_tree()
+        for a in list(root.iter("a")):
+            href = a.get("href", "")
+            if href.startswith("https://m.weibo.cn/search"):
+                a.drop_tag()
+                continue
+            if a.text_content() == "查看图片":
+                fw_pics.append(a.get("href"))
+            if "/n/" in href and a.get("usercard"):
+                a.set("href", "https://weibo.com" + href)
+        for span in list(root.iter("span")):
+            span.drop_tag()
+        # serialize the wrapper and strip its <div></div>
+        res = (
+            html.tostring(root, encoding="unicode")[5:-6]
+            .replace('href="//', 'href="http://')
+            .replace('href="/n/', 'href="http://weibo.com/n/')
+        )
+        return res, fw_pics
 
 
 class WeiboScraper(Scraper):
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import re
 from typing import Any, Dict, List, Optional
@@ -10,9 +11,12 @@ import httpx
 from fastfetchbot_shared.config import settings as shared_settings
 from fastfetchbot_shared.utils.logger import logger
 from fastfetchbot_shared.exceptions import ScraperError, ScraperParseError, ExternalServiceError
+from fastfetchbot_shared.services.scrapers.xiaohongshu.signer import get_signer
 
 XHS_API_URL = "https://edith.xiaohongshu.com"
 XHS_WEB_URL = "https://www.xiaohongshu.com"
+# Sub-comment pages of different root comments fetched at the same time
+XHS_COMMENT_CONCURRENCY = 4
 
 
 def parse_xhs_note_url(note_url: str) -> Dict[str, str]:
@@ -49,6 +53,7 @@ class XhsSinglePostAdapter:
             cookies: str,
             sign_server_endpoint: str = "",
             timeout: float = 20.0,
+            comment_concurrency: int = XHS_COMMENT_CONCURRENCY,
     ):
         self.cookies = cookies.strip()
         self.sign_server_endpoint = (sign_server_endpoint or shared_settings.SIGN_SERVER_URL).rstrip("/")
@@ -59,6 +64,9 @@ class XhsSinglePostAdapter:
             )
         self.timeout = timeout
         self._http = httpx.AsyncClient(timeout=timeout, follow_redirects=True)
+        # Shared by all adapters, so the sign server connection outlives one post
+        self._signer = get_signer(self.sign_server_endpoint)
+        self._comment_semaphore = asyncio.Semaphore(comment_concurrency)
 
     async def close(self) -> None:
         await self._http.aclose()
@@ -93,20 +101,7 @@ class XhsSinglePostAdapter:
         }
 
     async def _sign_headers(self, uri: str, data: Optional[Any] = None) -> Dict[str, str]:
-        payload = {"uri": uri, "data": data, "cookies": self.cookies}
-        resp = await self._http.post(
-            f"{self.sign_server_endpoint}/signsrv/v1/xhs/sign",
-            json=payload,
-        )
-        resp.raise_for_status()
-        body = resp.json()
-        if not body.get("isok"):
-            raise ExternalServiceError(f"XHS sign server returned error: {body}")
-        sign = body.get("data", {}) or {}
-        required = ["x_s", "x_t", "x_s_common", "x_b3_traceid"]
-        missing = [key for key in required if key not in sign]
-        if missing:
-            raise ExternalServiceError(f"XHS sign response missing fields: {missing}")
+        sign = await self._signer.sign(uri, data, self.cookies)
         headers = self._base_headers()
         headers.update(
             {
@@ -277,43 +272,57 @@ class XhsSinglePostAdapter:
         comments: List[Dict[str, Any]] = []
         cursor = ""
         has_more = True
+        sub_tasks: List[asyncio.Task] = []
 
-        while has_more:
-            params: Dict[str, Any] = {
-                "note_id": note_id,
-                "cursor": cursor,
-                "top_comment_id": "",
-                "image_formats": "jpg,webp,avif",
-            }
-            if xsec_token:
-                params["xsec_token"] = xsec_token
-
-            payload = await self._signed_get("/api/sns/web/v2/comment/page", params=params)
-            raw_comments = payload.get("comments", []) or []
-            for item in raw_comments:
-                comments.append(
-                    self._normalize_comment(
-                        note_id=note_id,
-                        note_xsec_token=xsec_token,
-                        raw=item,
-                        root_comment_id="",
-                    )
-                )
+        try:
+            while has_more:
+                params: Dict[str, Any] = {
+                    "note_id": note_id,
+                    "cursor": cursor,
+                    "top_comment_id": "",
+                    "image_formats": "jpg,webp,avif",
+                }
+                if xsec_token:
+                    params["xsec_token"] = xsec_token
+
+                payload = await self._signed_get("/api/sns/web/v2/comment/page", params=params)
+                raw_comments = payload.get("comments", []) or []
+                # Page every thread of this page at once; results are merged in comment order
                 if include_sub_comments:
-                    comments.extend(
-                        await self._fetch_sub_comments(
+                    sub_tasks = [
+                        asyncio.create_task(
+                            self._fetch_sub_comments(
+                                note_id=note_id,
+                                root_comment=item,
+                                xsec_token=xsec_token,
+                                limit=max_comments,
+                            )
+                        )
+                        for item in raw_comments
+                    ]
+                for index, item in enumerate(raw_comments):
+                    comments.append(
+                        self._normalize_comment(
                             note_id=note_id,
-                            root_comment=item,
-                            xsec_token=xsec_token,
+                            note_xsec_token=xsec_token,
+                            raw=item,
+                            root_comment_id="",
                         )
                     )
-                if max_comments > 0 and len(comments) >= max_comments:
-                    return comments[:max_comments]
-
-            has_more = bool(payload.get("has_more", False))
-            cursor = str(payload.get("cursor", "") or "")
-            if not cursor and has_more:
-                break
+                    if include_sub_comments:
+                        comments.extend(await sub_tasks[index])
+                    if max_comments > 0 and len(comments) >= max_comments:
+                        return comments[:max_comments]
+
+                has_more = bool(payload.get("has_more", False))
+                cursor = str(payload.get("cursor", "") or "")
+                if not cursor and has_more:
+                    break
+        finally:
+            # Threads past max_comments or after a failure are no longer needed
+            for task in sub_tasks:
+                task.cancel()
+            await asyncio.gather(*sub_tasks, return_exceptions=True)
 
         return comments
 
@@ -322,6 +331,7 @@ class XhsSinglePostAdapter:
             note_id: str,
             root_comment: Dict[str, Any],
             xsec_token: str,
+            limit: int = 0,
     ) -> List[Dict[str, Any]]:
         results: List[Dict[str, Any]] = []
         inline_sub_comments = root_comment.get("sub_comments", []) or []
@@ -339,7 +349,7 @@ class XhsSinglePostAdapter:
 
         has_more = bool(root_comment.get("sub_comment_has_more", False))
         cursor = str(root_comment.get("sub_comment_cursor", "") or "")
-        while has_more:
+        while has_more and not (limit > 0 and len(results) >= limit):
             params: Dict[str, Any] = {
                 "note_id": note_id,
                 "root_comment_id": root_comment_id,
@@ -348,7 +358,8 @@ class XhsSinglePostAdapter:
             }
             if xsec_token:
                 params["xsec_token"] = xsec_token
-            payload = await self._signed_get("/api/sns/web/v2/comment/sub/page", params=params)
+            async with self._comment_semaphore:
+                payload = await self._signed_get("/api/sns/web/v2/comment/sub/page", params=params)
             sub_comments = payload.get("comments", []) or []
             for item in sub_comments:
                 results.append(
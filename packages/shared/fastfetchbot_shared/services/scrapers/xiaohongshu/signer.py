@@ -0,0 +1,201 @@
+"""Client for the XHS sign server.
+
+Every signed XHS API call needs ``x-s``/``x-t`` headers from the sign server.
+:class:`XhsSigner` keeps one persistent HTTP connection per sign server and
+avoids round trips where it can:
+
+* signatures are memoized per ``(uri, data, cookies)`` for
+  ``XHS_SIGN_CACHE_TTL`` seconds, and identical requests in flight share one
+  call;
+* sign requests issued concurrently (sub-comment threads, parallel posts) are
+  sent together to the batch endpoint when ``XHS_SIGN_BATCH`` is on. A server
+  without the batch endpoint (404/405/501) is remembered and signed one
+  request at a time from then on.
+
+Batch protocol: ``POST /signsrv/v1/xhs/sign/batch`` with
+``{"requests": [<sign payload>, ...]}`` answers
+``{"isok": true, "data": [<sign or null>, ...]}`` in request order.
+``benchmarks/sign_server.py`` implements both endpoints locally.
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from fastfetchbot_shared.exceptions import ExternalServiceError
+from fastfetchbot_shared.services.scrapers.circuit_breaker import circuit
+from fastfetchbot_shared.services.scrapers.config import settings
+from fastfetchbot_shared.utils.logger import logger
+
+SIGN_PATH = "/signsrv/v1/xhs/sign"
+BATCH_SIGN_PATH = "/signsrv/v1/xhs/sign/batch"
+REQUIRED_SIGN_FIELDS = ("x_s", "x_t", "x_s_common", "x_b3_traceid")
+# Statuses meaning the sign server has no batch endpoint
+BATCH_UNSUPPORTED_STATUSES = {404, 405, 501}
+MAX_BATCH_SIZE = 16
+MAX_CACHED_SIGNATURES = 1024
+
+
+def _check_sign(sign: Any) -> Dict[str, str]:
+    sign = sign or {}
+    missing = [key for key in REQUIRED_SIGN_FIELDS if key not in sign]
+    if missing:
+        raise ExternalServiceError(f"XHS sign response missing fields: {missing}")
+    return sign
+
+
+class XhsSigner:
+    """Persistent, caching and batching client for one sign server."""
+
+    def __init__(self, endpoint: str, timeout: float = 20.0):
+        self.endpoint = endpoint.rstrip("/")
+        self._http = httpx.AsyncClient(timeout=timeout)
+        # key -> (expires_at, sign)
+        self._cache: Dict[str, Tuple[float, Dict[str, str]]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._flushes: set[asyncio.Task] = set()
+        self.batch_supported: Optional[bool] = None if settings.XHS_SIGN_BATCH else False
+
+    async def close(self) -> None:
+        await self._http.aclose()
+
+    async def sign(self, uri: str, data: Optional[Any], cookies: str) -> Dict[str, str]:
+        """Return the sign fields (``x_s``, ``x_t``, ...) for one XHS request."""
+        payload = {"uri": uri, "data": data, "cookies": cookies}
+        key = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        if key in self._inflight:
+            return await asyncio.shield(self._inflight[key])
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            sign = await self._request(payload)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark as retrieved when no identical request was waiting on it
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+        self._store(key, sign)
+        future.set_result(sign)
+        return sign
+
+    def _store(self, key: str, sign: Dict[str, str]) -> None:
+        now = time.monotonic()
+        if len(self._cache) >= MAX_CACHED_SIGNATURES:
+            self._cache = {k: v for k, v in self._cache.items() if v[0] > now}
+            while len(self._cache) >= MAX_CACHED_SIGNATURES:
+                del self._cache[next(iter(self._cache))]
+        self._cache[key] = (now + settings.XHS_SIGN_CACHE_TTL, sign)
+
+    async def _request(self, payload: Dict[str, Any]) -> Dict[str, str]:
+        if self.batch_supported is False:
+            return await self._sign_one(payload)
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((payload, future))
+        if len(self._pending) == 1:
+            self._schedule_flush()
+        return await future
+
+    def _schedule_flush(self) -> None:
+        task = asyncio.create_task(self._flush())
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self) -> None:
+        # Let the other coroutines scheduled in this loop iteration queue their requests
+        await asyncio.sleep(0)
+        batch, self._pending = self._pending[:MAX_BATCH_SIZE], self._pending[MAX_BATCH_SIZE:]
+        if self._pending:
+            self._schedule_flush()
+        payloads = [payload for payload, _ in batch]
+        try:
+            if len(batch) == 1 or self.batch_supported is False:
+                results = await asyncio.gather(
+                    *(self._sign_one(payload) for payload in payloads), return_exceptions=True
+                )
+            else:
+                results = await self._sign_batch(payloads)
+        except Exception as e:
+            results = [e] * len(batch)
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, asyncio.CancelledError):
+                future.cancel()
+            elif isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def _sign_one(self, payload: Dict[str, Any]) -> Dict[str, str]:
+        async with circuit("xhs:sign_server"):
+            resp = await self._http.post(f"{self.endpoint}{SIGN_PATH}", json=payload)
+            resp.raise_for_status()
+            body = resp.json()
+        if not body.get("isok"):
+            raise ExternalServiceError(f"XHS sign server returned error: {body}")
+        return _check_sign(body.get("data"))
+
+    async def _sign_batch(self, payloads: List[Dict[str, Any]]) -> List[Any]:
+        async with circuit("xhs:sign_server"):
+            resp = await self._http.post(
+                f"{self.endpoint}{BATCH_SIGN_PATH}", json={"requests": payloads}
+            )
+            if resp.status_code in BATCH_UNSUPPORTED_STATUSES:
+                unsupported = True
+            else:
+                unsupported = False
+                resp.raise_for_status()
+                body = resp.json()
+        if unsupported:
+            logger.info(f"XHS sign server {self.endpoint} has no batch endpoint, signing singly")
+            self.batch_supported = False
+            return await asyncio.gather(
+                *(self._sign_one(payload) for payload in payloads), return_exceptions=True
+            )
+        self.batch_supported = True
+        if not body.get("isok"):
+            raise ExternalServiceError(f"XHS sign server returned error: {body}")
+        signs = body.get("data") or []
+        if len(signs) != len(payloads):
+            raise ExternalServiceError(
+                f"XHS sign server returned {len(signs)} signatures for {len(payloads)} requests"
+            )
+        results: List[Any] = []
+        for sign in signs:
+            try:
+                results.append(_check_sign(sign))
+            except ExternalServiceError as e:
+                results.append(e)
+        return results
+
+
+_signers: Dict[str, XhsSigner] = {}
+
+
+def get_signer(endpoint: str) -> XhsSigner:
+    """Return the process-wide signer for a sign server."""
+    endpoint = endpoint.rstrip("/")
+    if endpoint not in _signers:
+        _signers[endpoint] = XhsSigner(endpoint)
+    return _signers[endpoint]
+
+
+async def close_signers() -> None:
+    """Close every signer's HTTP connection."""
+    signers = list(_signers.values())
+    _signers.clear()
+    for signer in signers:
+        await signer.close()
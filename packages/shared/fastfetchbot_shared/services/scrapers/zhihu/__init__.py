@@ -1,3 +1,5 @@
+import copy
+import functools
 import json
 import re
 from typing import Dict, Optional, Any
@@ -19,6 +21,7 @@ from fastfetchbot_shared.utils.network import get_selector, get_redirect_url, ge
 from fastfetchbot_shared.models.metadata_item import MetadataItem, MediaFile, MessageType
 from fastfetchbot_shared.exceptions import ScraperError, ScraperParseError
 from fastfetchbot_shared.services.scrapers.config import settings, JINJA2_ENV
+from fastfetchbot_shared.services.scrapers.hedge import get_executor
 from .config import (
     SHORT_LIMIT,
     ZHIHU_COLUMNS_API_HOST,
@@ -157,34 +160,21 @@ class Zhihu(MetadataItem):
     async def _get_zhihu_item(self) -> None:
         """
         Get zhihu item via the corresponding method according to the zhihu type.
+        The methods in ALL_METHODS are hedged: a slow method gets company from the next one.
         """
         await self._check_zhihu_type()
-        function_dict = {
-            "answer": self._get_zhihu_answer,
-            "article": self._get_zhihu_article,
-            "status": self._get_zhihu_status,
-            "unknown": None,
+        backends = {
+            method: functools.partial(self._get_zhihu_item_by, method)
+            for method in ALL_METHODS
         }
-        for method in ALL_METHODS:
-            try:
-                if self.method not in ALL_METHODS:
-                    self.method = "api"
-                else:
-                    self.method = method
-                await self._get_request_url()
-                await function_dict[self.zhihu_type]()
-                if self.title != "":
-                    break
-            except Exception as e:
-                logger.exception(f"Zhihu scraper method {method} failed")
-                if method == ALL_METHODS[-1]:
-                    logger.error("All Zhihu scraper methods failed")
-                    raise
-                else:
-                    logger.warning(
-                        f"zhihu {self.zhihu_type} {self.method} failed, try the next method"
-                    )
-                continue
+        try:
+            _, attempt = await get_executor("zhihu").run(
+                backends, validate=lambda item: item.title != ""
+            )
+        except Exception:
+            logger.error("All Zhihu scraper methods failed")
+            raise
+        self.__dict__.update(attempt.__dict__)
         self._zhihu_short_text_process()
         self._zhihu_content_process()
         self.message_type = (
@@ -193,6 +183,25 @@ class Zhihu(MetadataItem):
             else MessageType.SHORT
         )
 
+    async def _get_zhihu_item_by(self, method: str) -> "Zhihu":
+        """
+        Fetch the item with one method on a copy of this scraper, so that methods
+        running at the same time do not overwrite each other's fields.
+        """
+        attempt = copy.copy(self)
+        attempt.headers = dict(self.headers)
+        attempt.media_files = []
+        attempt.method = method
+        function_dict = {
+            "answer": attempt._get_zhihu_answer,
+            "article": attempt._get_zhihu_article,
+            "status": attempt._get_zhihu_status,
+            "unknown": None,
+        }
+        await attempt._get_request_url()
+        await function_dict[attempt.zhihu_type]()
+        return attempt
+
     async def _check_zhihu_type(self) -> None:
         """
         Check the zhihu type of the url. The zhihu type can be one of the following:
@@ -0,0 +1,27 @@
+"""JSON encoding for metadata items crossing a process boundary.
+
+The outbox stream and the API responses carry the same scraped item dicts.
+msgspec encodes dicts, dataclasses such as ``MediaFile``, enums and datetimes
+directly into UTF-8 bytes, without the ``json.dumps`` pass over Python
+objects or pydantic's ``jsonable_encoder``.
+"""
+
+from typing import Any
+
+import msgspec
+
+DecodeError = msgspec.DecodeError
+EncodeError = msgspec.EncodeError
+
+_encoder = msgspec.json.Encoder()
+_decoder = msgspec.json.Decoder()
+
+
+def encode(obj: Any) -> bytes:
+    """UTF-8 JSON for *obj*; non-ASCII text is kept as is (``ensure_ascii=False``)."""
+    return _encoder.encode(obj)
+
+
+def decode(data: bytes | str) -> Any:
+    """Parse JSON *data*; raises :data:`DecodeError` when it is malformed."""
+    return _decoder.decode(data)
@@ -58,3 +58,17 @@ BANNED_PATTERNS = [
     r"linkin\.com\/in\/[A-Za-z0-9]+",
     r"telegra\.ph"
 ]
+
+"""
+ARQ scrape job lanes, highest priority first. Each lane is its own ARQ queue;
+the interactive lane keeps ARQ's default queue name so jobs enqueued by
+older bot releases are still picked up.
+"""
+SCRAPE_LANE_INTERACTIVE = "interactive"  # DM requests and button presses
+SCRAPE_LANE_BACKGROUND = "background"  # group auto-fetches and channel sends
+SCRAPE_LANE_BULK = "bulk"  # feed ingestion and other batch pushes
+SCRAPE_LANE_QUEUES = {
+    SCRAPE_LANE_INTERACTIVE: "arq:queue",
+    SCRAPE_LANE_BACKGROUND: "arq:queue:background",
+    SCRAPE_LANE_BULK: "arq:queue:bulk",
+}
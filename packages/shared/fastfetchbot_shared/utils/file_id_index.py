@@ -0,0 +1,46 @@
+"""Keys of the bot-scoped Telegram file_id index.
+
+A Telegram file_id is only valid for the bot that uploaded the file, so the
+index maps ``(bot_id, media key)`` to a file_id, whichever Metadata document
+the media item came from. An item is indexed under its media URL and, once it
+is in the media store, under its content hash (``file_key``), so the same file
+shared by different posts is found either way.
+
+The telegram bot reads and writes the Redis hash ``fileid:index:{bot_id}``;
+the async worker persists the entries to the ``telegram_file_ids`` MongoDB
+collection and restores the hash from it when Redis has lost it.
+"""
+
+from typing import Optional
+
+FILEID_INDEX_KEY = "fileid:index:{bot_id}"
+
+
+def index_key(bot_id: int) -> str:
+    return FILEID_INDEX_KEY.format(bot_id=bot_id)
+
+
+def media_keys(media_type: str, url: Optional[str] = None, file_key: Optional[str] = None) -> list[str]:
+    """Index fields of a media item, content hash first.
+
+    The media type is part of the key: the file_id of a photo can not be sent
+    as a document, and vice versa.
+    """
+    keys = []
+    if file_key:
+        keys.append(f"{media_type}:key:{file_key}")
+    if url:
+        keys.append(f"{media_type}:url:{url}")
+    return keys
+
+
+def index_entries(updates: list[dict]) -> dict[str, str]:
+    """Index fields and file_ids of file_id updates (see ``file_id_capture``)."""
+    entries = {}
+    for update in updates:
+        file_id = update.get("telegram_file_id")
+        if not file_id:
+            continue
+        for key in media_keys(update["media_type"], update.get("url"), update.get("file_key")):
+            entries[key] = file_id
+    return entries
@@ -0,0 +1,115 @@
+"""Browser-like request headers from a User-Agent pool built once per process.
+
+``fake_useragent.UserAgent()`` parses its browser database on every
+construction, so the pool is built from it once (on first use, or at startup
+with :func:`init_user_agent_pool`) and requests pick from it. Each pooled
+:class:`BrowserProfile` carries the headers a real browser sends with that
+User-Agent (``sec-ch-ua`` client hints for Chromium browsers, none for
+Firefox and Safari), so a request never pairs a Firefox UA with Chrome hints.
+
+:func:`build_headers` returns a new dict per request; the shared pieces are
+read-only, so concurrent requests cannot leak Referer, Accept or cookies into
+each other.
+"""
+
+import random
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+from fastfetchbot_shared.config import settings
+from fastfetchbot_shared.utils.logger import logger
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36"
+)
+ACCEPT_HTML = (
+    "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,"
+    "*/*;q=0.8,application/signed-exchange;v=b3;q=0.7"
+)
+ACCEPT_IMAGE = "image/avif,image/webp,*/*"
+
+# Headers a platform needs on top of the browser profile
+PLATFORM_HEADERS: Mapping[str, Mapping[str, str]] = MappingProxyType({
+    "reddit": MappingProxyType({"Accept": ACCEPT_IMAGE}),
+})
+
+_CHROMIUM_BRANDS = {"Chrome": "Google Chrome", "Edge": "Microsoft Edge"}
+_CLIENT_HINT_PLATFORMS = {"Windows": "Windows", "Mac OS X": "macOS", "Linux": "Linux", "Chrome OS": "Chrome OS"}
+
+
+@dataclass(frozen=True)
+class BrowserProfile:
+    user_agent: str
+    headers: Mapping[str, str]
+
+
+def make_profile(user_agent: str, browser: str = "", version: str = "", os_name: str = "") -> BrowserProfile:
+    """Profile for *user_agent*, with client hints when *browser* is Chromium-based."""
+    headers = {"User-Agent": user_agent}
+    brand = _CHROMIUM_BRANDS.get(browser)
+    major = version.split(".")[0]
+    if brand and major.isdigit():
+        headers["sec-ch-ua"] = f'"Chromium";v="{major}", "{brand}";v="{major}", "Not.A/Brand";v="99"'
+        headers["sec-ch-ua-mobile"] = "?0"
+        headers["sec-ch-ua-platform"] = f'"{_CLIENT_HINT_PLATFORMS.get(os_name, os_name)}"'
+    return BrowserProfile(user_agent=user_agent, headers=MappingProxyType(headers))
+
+
+DEFAULT_PROFILE = make_profile(DEFAULT_USER_AGENT, "Chrome", "135.0.0.0", "Windows")
+
+_pool: Optional[tuple[BrowserProfile, ...]] = None
+_pool_lock = threading.Lock()
+
+
+def _build_pool(size: int) -> tuple[BrowserProfile, ...]:
+    from fake_useragent import UserAgent
+
+    user_agents = UserAgent(browsers=["Chrome", "Edge", "Firefox", "Safari"], platforms=["desktop"])
+    profiles = {}
+    for _ in range(size):
+        entry = user_agents.getRandom
+        profiles[entry["useragent"]] = make_profile(
+            entry["useragent"], entry.get("browser", ""), entry.get("browser_version", ""), entry.get("os", "")
+        )
+    return tuple(profiles.values())
+
+
+def init_user_agent_pool() -> tuple[BrowserProfile, ...]:
+    """Build the pool if it does not exist yet; falls back to :data:`DEFAULT_PROFILE`."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            try:
+                _pool = _build_pool(settings.USER_AGENT_POOL_SIZE) or (DEFAULT_PROFILE,)
+            except Exception as e:
+                logger.warning(f"Could not build the User-Agent pool, using the default one: {e}")
+                _pool = (DEFAULT_PROFILE,)
+        return _pool
+
+
+def random_profile() -> BrowserProfile:
+    return random.choice(_pool or init_user_agent_pool())
+
+
+def random_user_agent() -> str:
+    return random_profile().user_agent
+
+
+def build_headers(
+        platform: Optional[str] = None,
+        referer: Optional[str] = None,
+        extra: Optional[Mapping[str, str]] = None,
+        accept: str = ACCEPT_HTML,
+) -> dict[str, str]:
+    """A new header dict: a pooled browser profile, *accept*, the *platform* headers, *referer* and *extra*."""
+    headers = {**random_profile().headers, "Accept": accept}
+    if platform:
+        headers.update(PLATFORM_HEADERS.get(platform, {}))
+    if referer:
+        headers["Referer"] = referer
+    if extra:
+        headers.update(extra)
+    return headers
@@ -1,17 +1,17 @@
 import asyncio
 import os
 import uuid
+from types import MappingProxyType
 from typing import Optional
 
 import aiofiles
 import httpx
 
 from lxml import etree
-from fake_useragent import UserAgent
-from playwright.async_api import async_playwright
 
 from fastfetchbot_shared.models.classes import NamedBytesIO
 from fastfetchbot_shared.config import settings
+from fastfetchbot_shared.utils.headers import ACCEPT_HTML, DEFAULT_USER_AGENT, build_headers, random_user_agent
 from fastfetchbot_shared.utils.image import check_image_type
 from fastfetchbot_shared.utils.logger import logger
 
@@ -80,18 +80,24 @@ async def get_selector(
         return selector
 
 
-async def get_redirect_url(url: str, headers: Optional[dict] = None) -> str:
+async def get_redirect_url(
+        url: str, headers: Optional[dict] = None, client: httpx.AsyncClient = None
+) -> str:
     if not headers:
         headers = HEADERS
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(url, headers=headers, timeout=settings.HTTP_REQUEST_TIMEOUT)
-        if resp.status_code == 302 or resp.status_code == 301:
-            return resp.headers["Location"]
-        else:
-            return url
+    if client is None:
+        async with httpx.AsyncClient() as client:
+            return await get_redirect_url(url, headers=headers, client=client)
+    resp = await client.get(url, headers=headers, timeout=settings.HTTP_REQUEST_TIMEOUT)
+    if resp.status_code == 302 or resp.status_code == 301:
+        return resp.headers["Location"]
+    else:
+        return url
 
 
 async def get_content_async(url):
+    from playwright.async_api import async_playwright
+
     async with async_playwright() as p:
         browser = await p.firefox.launch()
         context = await browser.new_context(viewport={"width": 1920, "height": 1080})
@@ -140,15 +146,12 @@ async def download_file_by_metadata_item(
     :return:
     """
     try:
-        if headers is None:
-            headers = HEADERS
-        headers["User-Agent"] = get_random_user_agent()
-        headers["referer"] = data["url"]
-        if data["category"] in ["reddit"]:
-            headers["Accept"] = "image/avif,image/webp,*/*"
+        request_headers = build_headers(
+            platform=data.get("category"), referer=data.get("url"), extra=headers
+        )
         async with httpx.AsyncClient() as client:
             response = await client.get(
-                url=url, headers=headers, timeout=settings.HTTP_REQUEST_TIMEOUT
+                url=url, headers=request_headers, timeout=settings.HTTP_REQUEST_TIMEOUT
             )
             # if redirect 302, get the final url
             if response.status_code == 302 or response.status_code == 301:
@@ -172,7 +175,8 @@ async def download_file_to_local(
         headers: dict = None,
         referer: str = None,
 ) -> str:
-    io_object = await download_file_by_metadata_item(url=url, data={}, file_name=file_name, headers=headers)
+    data = {"url": referer} if referer else {}
+    io_object = await download_file_by_metadata_item(url=url, data=data, file_name=file_name, headers=headers)
     ext = await check_image_type(io_object)
     io_object.seek(0)
     file_name = file_name + uuid.uuid4().hex + "." + ext
@@ -185,15 +189,14 @@ async def download_file_to_local(
 
 
 def get_random_user_agent() -> str:
-    ua = UserAgent()
-    return ua.random
+    return random_user_agent()
 
 
 """
-default headers
+default headers, read-only; use build_headers() for a per-request copy
 """
 
-HEADERS = {
-    "User-Agent": get_random_user_agent(),
-    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
-}
+HEADERS = MappingProxyType({
+    "User-Agent": DEFAULT_USER_AGENT,
+    "Accept": ACCEPT_HTML,
+})
@@ -0,0 +1,173 @@
+"""Per-stage tracing and latency metrics for the bot, the API and the worker.
+
+Every pipeline stage runs inside :func:`stage`, which opens an OpenTelemetry
+span and observes the ``fastfetchbot_stage_duration_seconds`` histogram.
+Trace context crosses the ARQ queue and the outbox stream as a W3C
+``traceparent`` carrier dict, produced by :func:`inject_context` and passed
+back to :func:`stage` as *parent* on the other side.
+
+OpenTelemetry and ``prometheus_client`` come with the ``telemetry`` extra.
+Without them spans are skipped and ``/metrics`` is empty, but :func:`stage`
+can still be used unconditionally.
+"""
+
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Iterator, Optional
+
+from fastfetchbot_shared.config import settings
+from fastfetchbot_shared.utils.logger import logger
+
+try:
+    from opentelemetry import propagate, trace
+except ImportError:  # telemetry extra not installed
+    propagate = None
+    trace = None
+
+try:
+    import prometheus_client
+except ImportError:  # telemetry extra not installed
+    prometheus_client = None
+
+TRACER_NAME = "fastfetchbot"
+
+# Stages range from a Redis round trip to a ten-minute video download
+STAGE_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0,
+)
+
+if prometheus_client is not None:
+    STAGE_DURATION = prometheus_client.Histogram(
+        "fastfetchbot_stage_duration_seconds",
+        "Wall-clock duration of each pipeline stage.",
+        ["stage", "status"],
+        buckets=STAGE_BUCKETS,
+    )
+    CIRCUIT_STATE = prometheus_client.Gauge(
+        "fastfetchbot_circuit_state",
+        "Circuit breaker state per scraper backend: 0 closed, 1 half-open, 2 open.",
+        ["backend"],
+    )
+else:
+    STAGE_DURATION = None
+    CIRCUIT_STATE = None
+
+_tracer_provider = None
+
+
+def init_tracing(service_name: str) -> None:
+    """Install a tracer provider exporting to ``TRACE_EXPORTER``.
+
+    ``otlp`` sends spans over OTLP/HTTP (configured by the standard
+    ``OTEL_EXPORTER_OTLP_*`` variables); ``file`` appends one JSON span per
+    line to ``TRACE_FILE_PATH``. Anything else leaves tracing disabled.
+    """
+    global _tracer_provider
+    exporter_name = settings.TRACE_EXPORTER.lower()
+    if not exporter_name or _tracer_provider is not None:
+        return
+    if trace is None:
+        logger.warning(f"TRACE_EXPORTER={exporter_name} but opentelemetry is not installed")
+        return
+
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+
+    if exporter_name == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        exporter = OTLPSpanExporter()
+    elif exporter_name == "file":
+        os.makedirs(os.path.dirname(settings.TRACE_FILE_PATH) or ".", exist_ok=True)
+        exporter = ConsoleSpanExporter(
+            out=open(settings.TRACE_FILE_PATH, "a", encoding="utf-8"),
+            formatter=lambda span: span.to_json(indent=None) + os.linesep,
+        )
+    else:
+        logger.warning(f"Unknown TRACE_EXPORTER '{exporter_name}', tracing disabled")
+        return
+
+    provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    _tracer_provider = provider
+    logger.info(f"Tracing enabled for {service_name}, exporting to {exporter_name}")
+
+
+def shutdown_tracing() -> None:
+    """Flush buffered spans and release the exporter."""
+    global _tracer_provider
+    if _tracer_provider is not None:
+        _tracer_provider.shutdown()
+        _tracer_provider = None
+
+
+def inject_context() -> dict:
+    """Serialize the current trace context into a carrier dict for another process."""
+    carrier: dict = {}
+    if propagate is not None:
+        propagate.inject(carrier)
+    return carrier
+
+
+def observe(stage_name: str, seconds: float, status: str = "ok") -> None:
+    """Record a stage duration measured outside :func:`stage` (e.g. queue wait)."""
+    if STAGE_DURATION is not None:
+        STAGE_DURATION.labels(stage=stage_name, status=status).observe(max(seconds, 0.0))
+
+
+def set_circuit_state(backend: str, value: int) -> None:
+    """Publish a circuit breaker state change (see ``services.scrapers.circuit_breaker``)."""
+    if CIRCUIT_STATE is not None:
+        CIRCUIT_STATE.labels(backend=backend).set(value)
+
+
+@contextmanager
+def stage(stage_name: str, parent: Optional[dict] = None, **attributes) -> Iterator:
+    """Run a block as one traced, timed pipeline stage.
+
+    Args:
+        stage_name: Span name and ``stage`` label of the histogram.
+        parent: Carrier from :func:`inject_context` when the stage continues a
+            trace started in another process; the current context otherwise.
+        **attributes: Span attributes; ``None`` values are dropped.
+
+    Yields the span (a no-op span when tracing is disabled).
+    """
+    if trace is None:
+        span_context = nullcontext(None)
+    else:
+        span_context = trace.get_tracer(TRACER_NAME).start_as_current_span(
+            stage_name,
+            context=propagate.extract(parent) if parent else None,
+            attributes={k: v for k, v in attributes.items() if v is not None},
+        )
+    status = "ok"
+    start = time.perf_counter()
+    try:
+        with span_context as span:
+            yield span
+    except Exception:
+        status = "error"
+        raise
+    finally:
+        observe(stage_name, time.perf_counter() - start, status)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Return the Prometheus exposition body and its content type."""
+    if prometheus_client is None:
+        return b"", "text/plain; version=0.0.4; charset=utf-8"
+    return prometheus_client.generate_latest(), prometheus_client.CONTENT_TYPE_LATEST
+
+
+def start_metrics_server(port: int) -> None:
+    """Serve ``/metrics`` from a background thread, for processes without an HTTP server."""
+    if prometheus_client is None:
+        logger.warning("METRICS_PORT is set but prometheus_client is not installed")
+        return
+    prometheus_client.start_http_server(port)
+    logger.info(f"Prometheus metrics served on :{port}/metrics")
@@ -0,0 +1,62 @@
+import os
+from typing import Optional
+
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    StrictUndefined,
+    Undefined,
+)
+
+from fastfetchbot_shared.config import settings
+from fastfetchbot_shared.utils.logger import logger
+
+
+def create_template_environment(
+    templates_directory: str,
+    cache_namespace: str,
+    strict_undefined: Optional[bool] = None,
+) -> Environment:
+    """Build a Jinja2 environment with a filesystem bytecode cache.
+
+    Compiled templates are written to ``TEMPLATE_BYTECODE_CACHE_DIR`` so later
+    process starts load bytecode instead of re-parsing the sources.
+    *cache_namespace* keeps each template directory's cache files apart.
+    Templates are never edited at runtime, so ``auto_reload`` is off and
+    ``get_template`` skips the per-call mtime check.
+
+    With *strict_undefined* (default: ``TEMPLATE_STRICT_UNDEFINED``), a
+    reference to a missing variable raises instead of rendering as empty.
+    """
+    if strict_undefined is None:
+        strict_undefined = settings.TEMPLATE_STRICT_UNDEFINED
+    bytecode_cache = None
+    try:
+        os.makedirs(settings.TEMPLATE_BYTECODE_CACHE_DIR, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(
+            directory=settings.TEMPLATE_BYTECODE_CACHE_DIR,
+            pattern=f"{cache_namespace}-%s.cache",
+        )
+    except OSError as e:
+        logger.warning(f"Jinja2 bytecode cache disabled: {e}")
+    return Environment(
+        loader=FileSystemLoader(templates_directory),
+        lstrip_blocks=True,
+        trim_blocks=True,
+        auto_reload=False,
+        bytecode_cache=bytecode_cache,
+        undefined=StrictUndefined if strict_undefined else Undefined,
+    )
+
+
+def precompile_templates(environment: Environment) -> int:
+    """Load every template once so the first render pays no compile cost.
+
+    Returns the number of templates loaded.
+    """
+    names = environment.list_templates(extensions=["jinja2"])
+    for name in names:
+        environment.get_template(name)
+    logger.debug(f"Precompiled {len(names)} Jinja2 templates")
+    return len(names)
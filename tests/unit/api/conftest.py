@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# Add the api app directory to sys.path so 'src' is importable
+_app_dir = Path(__file__).resolve().parents[3] / "apps" / "api"
+if str(_app_dir) not in sys.path:
+    sys.path.insert(0, str(_app_dir))
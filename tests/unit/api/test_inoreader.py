@@ -0,0 +1,367 @@
+"""Tests for apps/api/src/services/inoreader (token cache and ingestion pipeline)"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+import src.services.inoreader as inoreader
+from src.services.inoreader import Inoreader
+from src.services.inoreader import process, sync
+from src.services.inoreader.sync import SyncState
+
+FETCH_SUBMISSIONS = "fastfetchbot_shared.services.scrapers.reddit.client.fetch_submissions"
+LOGIN_BODY = "SID=unused\nLSID=unused\nAuth={token}\n"
+
+
+def _response(status_code=200, text=""):
+    resp = MagicMock()
+    resp.status_code = status_code
+    resp.text = text
+    return resp
+
+
+def _items(*timestamps):
+    return [
+        {"id": f"item-{ts}", "aurl": f"https://example.com/{ts}", "category": "news", "timestamp": ts}
+        for ts in timestamps
+    ]
+
+
+@pytest.fixture(autouse=True)
+def reset_token_cache():
+    inoreader._auth_token = None
+    yield
+    inoreader._auth_token = None
+
+
+@pytest.fixture
+def client():
+    client = MagicMock()
+    client.post = AsyncMock(return_value=_response(text=LOGIN_BODY.format(token="t1")))
+    client.get = AsyncMock(return_value=_response())
+    return client
+
+
+# ---------------------------------------------------------------------------
+# Token cache
+# ---------------------------------------------------------------------------
+
+
+class TestAuthToken:
+    @pytest.mark.asyncio
+    async def test_logs_in_once_for_several_calls(self, client):
+        await Inoreader.get_api_info(url="https://example.com/a", client=client)
+        await Inoreader.mark_all_as_read(stream_id="s", timestamp=1, client=client)
+
+        client.post.assert_awaited_once()
+        headers = client.get.call_args.kwargs["headers"]
+        assert headers["Authorization"] == "GoogleLogin auth=t1"
+
+    @pytest.mark.asyncio
+    async def test_expired_token_logs_in_again(self, client):
+        await Inoreader.get_auth_token(client)
+        inoreader._auth_token = (0.0, "t1")
+
+        await Inoreader.get_auth_token(client)
+
+        assert client.post.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_401_refreshes_token_and_retries(self, client):
+        client.post.side_effect = [
+            _response(text=LOGIN_BODY.format(token="t1")),
+            _response(text=LOGIN_BODY.format(token="t2")),
+        ]
+        client.get.side_effect = [_response(status_code=401), _response()]
+
+        resp = await Inoreader.get_api_info(url="https://example.com/a", client=client)
+
+        assert resp.status_code == 200
+        assert client.get.call_args.kwargs["headers"]["Authorization"] == "GoogleLogin auth=t2"
+        assert inoreader._auth_token[1] == "t2"
+
+    @pytest.mark.asyncio
+    async def test_does_not_mutate_shared_headers(self, client):
+        await Inoreader.get_api_info(url="https://example.com/a", client=client)
+
+        assert "Authorization" not in inoreader.HEADERS
+
+
+# ---------------------------------------------------------------------------
+# process_inoreader_data
+# ---------------------------------------------------------------------------
+
+
+class TestProcessInoreaderData:
+    @pytest.mark.asyncio
+    async def test_delivers_in_feed_order_and_marks_read_once(self, client):
+        delays = {100: 0.03, 200: 0.0, 300: 0.01}
+
+        async def extract(item, use_inoreader_content):
+            await asyncio.sleep(delays[item["timestamp"]])
+            return {"url": item["aurl"]}
+
+        callback = AsyncMock()
+        with patch.object(process, "_extract_item", side_effect=extract), \
+                patch.object(Inoreader, "mark_all_as_read", new_callable=AsyncMock) as mark:
+            await process.process_inoreader_data(
+                _items(100, 200, 300), True, "chan", stream_id="s",
+                message_callback=callback, client=client,
+            )
+
+        assert [c.args[0]["url"] for c in callback.await_args_list] == [
+            "https://example.com/100", "https://example.com/200", "https://example.com/300",
+        ]
+        mark.assert_awaited_once_with(stream_id="s", timestamp=301, client=client)
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, client):
+        running = 0
+        peak = 0
+
+        async def extract(item, use_inoreader_content):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {}
+
+        with patch.object(process, "_extract_item", side_effect=extract), \
+                patch.object(process.settings, "INOREADER_CONCURRENCY", 2):
+            await process.process_inoreader_data(
+                _items(1, 2, 3, 4, 5), True, "chan",
+                message_callback=AsyncMock(), client=client,
+            )
+
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_failure_marks_only_delivered_items(self, client):
+        async def extract(item, use_inoreader_content):
+            if item["timestamp"] == 200:
+                raise RuntimeError("scrape failed")
+            return {}
+
+        callback = AsyncMock()
+        with patch.object(process, "_extract_item", side_effect=extract), \
+                patch.object(Inoreader, "mark_all_as_read", new_callable=AsyncMock) as mark:
+            with pytest.raises(RuntimeError):
+                await process.process_inoreader_data(
+                    _items(100, 200, 300), True, "chan", stream_id="s",
+                    message_callback=callback, client=client,
+                )
+
+        assert callback.await_count == 1
+        mark.assert_awaited_once_with(stream_id="s", timestamp=101, client=client)
+
+    @pytest.mark.asyncio
+    async def test_default_callback_reuses_client(self, client):
+        client.post = AsyncMock(return_value=_response())
+        with patch.object(process, "_extract_item", new_callable=AsyncMock, return_value={"url": "u"}):
+            await process.process_inoreader_data(_items(1, 2), True, "chan", client=client)
+
+        assert client.post.await_count == 2
+        assert json.loads(client.post.call_args.kwargs["content"]) == {"data": {"url": "u"}, "chat_id": "chan"}
+        assert client.post.call_args.kwargs["headers"] == {"Content-Type": "application/json"}
+
+    @pytest.mark.asyncio
+    async def test_reddit_submissions_are_prefetched(self, client):
+        with patch.object(process, "_extract_item", new_callable=AsyncMock, return_value={}), \
+                patch(FETCH_SUBMISSIONS, new_callable=AsyncMock) as prefetch:
+            await process.process_inoreader_data(
+                _items(1, 2), False, "chan", message_callback=AsyncMock(), client=client,
+            )
+
+        assert list(prefetch.await_args.args[0]) == ["https://example.com/1", "https://example.com/2"]
+
+    @pytest.mark.asyncio
+    async def test_prefetch_failure_does_not_stop_the_run(self, client):
+        callback = AsyncMock()
+        with patch.object(process, "_extract_item", new_callable=AsyncMock, return_value={}), \
+                patch(FETCH_SUBMISSIONS, new_callable=AsyncMock, side_effect=ConnectionError("reddit down")):
+            await process.process_inoreader_data(
+                _items(1, 2), False, "chan", message_callback=callback, client=client,
+            )
+
+        assert callback.await_count == 2
+
+
+class TestQueueMode:
+    @pytest.fixture
+    def queue_mode(self):
+        with patch.object(process.settings, "INOREADER_SCRAPE_MODE", "queue"), \
+                patch.object(process.settings, "TELEGRAM_BOT_ID", 777), \
+                patch.object(process.queue_client, "_arq_redis", MagicMock(enqueue_job=AsyncMock())) as arq:
+            yield arq
+
+    @pytest.mark.asyncio
+    async def test_items_go_to_bulk_lane_and_count_as_delivered(self, client, queue_mode):
+        items = [
+            {"id": "a", "aurl": "https://twitter.com/u/status/1", "category": "news", "timestamp": 100},
+            {"id": "b", "aurl": "https://www.reddit.com/r/x/comments/abc/t/", "category": "news", "timestamp": 200},
+        ]
+        callback = AsyncMock()
+        with patch.object(process, "_extract_item", new_callable=AsyncMock) as extract, \
+                patch(FETCH_SUBMISSIONS, new_callable=AsyncMock) as prefetch, \
+                patch.object(Inoreader, "mark_all_as_read", new_callable=AsyncMock) as mark:
+            await process.process_inoreader_data(
+                items, False, "chan", stream_id="s", message_callback=callback, client=client,
+            )
+
+        extract.assert_not_awaited()
+        prefetch.assert_not_awaited()
+        callback.assert_not_awaited()
+        calls = queue_mode.enqueue_job.await_args_list
+        assert [c.kwargs["url"] for c in calls] == [item["aurl"] for item in items]
+        assert {c.kwargs["_queue_name"] for c in calls} == {"arq:queue:bulk"}
+        assert {c.kwargs["bot_id"] for c in calls} == {777}
+        assert {c.kwargs["chat_id"] for c in calls} == {"chan"}
+        mark.assert_awaited_once_with(stream_id="s", timestamp=201, client=client)
+
+    @pytest.mark.asyncio
+    async def test_unknown_links_are_scraped_here(self, client, queue_mode):
+        callback = AsyncMock()
+        with patch.object(process, "_extract_item", new_callable=AsyncMock, return_value={"url": "u"}):
+            await process.process_inoreader_data(
+                _items(1), False, "chan", message_callback=callback, client=client,
+            )
+
+        queue_mode.enqueue_job.assert_not_awaited()
+        callback.assert_awaited_once_with({"url": "u"}, "chan")
+
+    @pytest.mark.asyncio
+    async def test_inoreader_content_is_never_queued(self, client, queue_mode):
+        callback = AsyncMock()
+        items = [{"id": "a", "aurl": "https://twitter.com/u/status/1", "category": "news", "timestamp": 1}]
+        with patch.object(process, "_extract_item", new_callable=AsyncMock, return_value={"url": "u"}):
+            await process.process_inoreader_data(
+                items, True, "chan", message_callback=callback, client=client,
+            )
+
+        queue_mode.enqueue_job.assert_not_awaited()
+        callback.assert_awaited_once()
+
+
+class TestReadWatermark:
+    def test_nothing_delivered(self):
+        assert process._read_watermark([], _items(1)) is None
+
+    def test_capped_at_oldest_pending_item(self):
+        assert process._read_watermark(_items(100, 300), _items(200)) == 200
+
+
+# ---------------------------------------------------------------------------
+# Incremental sync
+# ---------------------------------------------------------------------------
+
+
+class TestSyncState:
+    def test_same_second_items_are_told_apart_by_id(self):
+        state = SyncState()
+        first, second = _items(100, 100)
+        second["id"] = "other"
+
+        state.advance(first)
+
+        assert state.is_delivered(first)
+        assert not state.is_delivered(second)
+        assert state.is_delivered(_items(99)[0])
+        assert not state.is_delivered(_items(101)[0])
+
+    @pytest.mark.asyncio
+    async def test_round_trips_through_redis(self):
+        store = {}
+        redis = MagicMock()
+        redis.get = AsyncMock(side_effect=lambda key: store.get(key))
+        redis.set = AsyncMock(side_effect=lambda key, value: store.__setitem__(key, value))
+        with patch.object(sync, "_get_redis", AsyncMock(return_value=redis)):
+            await sync.save_state("feed/1", SyncState(timestamp=5, ids=["a"], continuation="c1"))
+            state = await sync.load_state("feed/1")
+
+        assert "inoreader:sync:feed/1" in store
+        assert state == SyncState(timestamp=5, ids=["a"], continuation="c1")
+
+    @pytest.mark.asyncio
+    async def test_load_without_redis_returns_fresh_state(self):
+        with patch.object(sync.settings, "INOREADER_SYNC_REDIS_URL", ""):
+            assert await sync.load_state("feed/1") == SyncState()
+
+
+class TestSyncInoreaderStream:
+    @pytest.fixture
+    def saved(self):
+        """In-memory stand-in for the Redis state store."""
+        states = {}
+
+        async def save(stream_id, state):
+            states[stream_id] = SyncState(state.timestamp, list(state.ids), state.continuation)
+
+        async def load(stream_id):
+            return states.get(stream_id, SyncState())
+
+        with patch.object(sync, "save_state", side_effect=save), \
+                patch.object(sync, "load_state", side_effect=load):
+            yield states
+
+    @pytest.mark.asyncio
+    async def test_pages_through_all_new_items(self, client, saved):
+        pages = [(_items(1, 2), "c1"), (_items(3), None)]
+        delivered = []
+
+        async def process_data(data, *args, on_delivered=None, **kwargs):
+            for item in data:
+                delivered.append(item["timestamp"])
+                await on_delivered(item)
+
+        with patch.object(Inoreader, "get_api_page", new_callable=AsyncMock, side_effect=pages) as get_page, \
+                patch.object(process, "process_inoreader_data", side_effect=process_data):
+            await process.sync_inoreader_stream("tag", "news", None, {}, True, "chan", client=client)
+
+        assert delivered == [1, 2, 3]
+        assert "c" not in get_page.await_args_list[0].kwargs["params"]
+        assert get_page.await_args_list[1].kwargs["params"]["c"] == "c1"
+        (state,) = saved.values()
+        assert state == SyncState(timestamp=3, ids=["item-3"], continuation=None)
+
+    @pytest.mark.asyncio
+    async def test_resumes_after_failure_without_redelivering(self, client, saved):
+        delivered = []
+        fail = True
+
+        async def process_data(data, *args, on_delivered=None, **kwargs):
+            nonlocal fail
+            for item in data:
+                if item["timestamp"] == 2 and fail:
+                    fail = False
+                    raise RuntimeError("callback failed")
+                delivered.append(item["timestamp"])
+                await on_delivered(item)
+
+        with patch.object(Inoreader, "get_api_page", new_callable=AsyncMock,
+                          side_effect=[(_items(1, 2), "c1"), (_items(1, 2), "c1"), (_items(3), None)]) as get_page, \
+                patch.object(process, "process_inoreader_data", side_effect=process_data):
+            with pytest.raises(RuntimeError):
+                await process.sync_inoreader_stream("tag", "news", None, {}, True, "chan", client=client)
+            await process.sync_inoreader_stream("tag", "news", None, {}, True, "chan", client=client)
+
+        assert delivered == [1, 2, 3]
+        assert get_page.await_args_list[1].kwargs["params"]["ot"] == 0
+
+    @pytest.mark.asyncio
+    async def test_rejected_continuation_falls_back_to_watermark(self, client, saved):
+        saved[Inoreader.get_stream_id("tag", "news")] = SyncState(timestamp=10, ids=["item-10"], continuation="stale")
+        rejected = httpx.HTTPStatusError("gone", request=MagicMock(), response=MagicMock())
+
+        with patch.object(Inoreader, "get_api_page", new_callable=AsyncMock,
+                          side_effect=[rejected, ([], None)]) as get_page, \
+                patch.object(process, "process_inoreader_data", new_callable=AsyncMock) as process_data:
+            await process.sync_inoreader_stream("tag", "news", None, {}, True, "chan", client=client)
+
+        retry_params = get_page.await_args_list[1].kwargs["params"]
+        assert "c" not in retry_params
+        assert retry_params["ot"] == 9
+        process_data.assert_not_awaited()
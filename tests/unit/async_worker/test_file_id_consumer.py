@@ -127,6 +127,45 @@ class TestProcessFileIdUpdate:
         assert mock_mf.telegram_file_id == "AgACAgI123"
         mock_doc.save.assert_awaited_once()
 
+    @pytest.mark.asyncio
+    async def test_sets_file_key(self):
+        from async_worker.services.file_id_consumer import _process_file_id_update
+
+        mock_mf = MagicMock()
+        mock_mf.url = "https://vid.com/v.mp4"
+        mock_mf.telegram_file_id = "BAACAgI456"
+        mock_mf.file_key = None
+
+        mock_doc = MagicMock()
+        mock_doc.media_files = [mock_mf]
+        mock_doc.save = AsyncMock()
+
+        mock_query = MagicMock()
+        mock_query.sort = MagicMock(return_value=mock_query)
+        mock_query.limit = MagicMock(return_value=mock_query)
+        mock_query.first_or_none = AsyncMock(return_value=mock_doc)
+
+        with patch(
+            "fastfetchbot_shared.database.mongodb.models.metadata.Metadata"
+        ) as MockMetadata:
+            MockMetadata.find = MagicMock(return_value=mock_query)
+            MockMetadata.url = "url"
+
+            await _process_file_id_update({
+                "metadata_url": "https://example.com/post/1",
+                "file_id_updates": [
+                    {
+                        "url": "https://vid.com/v.mp4",
+                        "media_type": "video",
+                        "file_key": "ab/abc.mp4",
+                    },
+                ],
+            })
+
+        assert mock_mf.file_key == "ab/abc.mp4"
+        assert mock_mf.telegram_file_id == "BAACAgI456"
+        mock_doc.save.assert_awaited_once()
+
     @pytest.mark.asyncio
     async def test_skips_already_set_file_id(self):
         from async_worker.services.file_id_consumer import _process_file_id_update
@@ -285,6 +324,145 @@ class TestProcessFileIdUpdate:
         mock_doc.save.assert_awaited_once()
 
 
+# ---------------------------------------------------------------------------
+# bot-scoped file_id index
+# ---------------------------------------------------------------------------
+
+
+class _Cursor:
+    def __init__(self, items):
+        self._items = items
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for item in self._items:
+            yield item
+
+
+class _FakeHashRedis:
+    """Just enough of a Redis client for pipelined HSETNX."""
+
+    def __init__(self, hashes=None):
+        self.hashes = hashes or {}
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self._redis = redis
+        self._commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def hsetnx(self, key, field, value):
+        self._commands.append((key, field, value))
+
+    async def execute(self):
+        results = []
+        for key, field, value in self._commands:
+            fields = self._redis.hashes.setdefault(key, {})
+            results.append(int(field not in fields))
+            fields.setdefault(field, value)
+        self._commands = []
+        return results
+
+
+TELEGRAM_FILE_ID = "fastfetchbot_shared.database.mongodb.models.metadata.TelegramFileId"
+
+
+class TestFileIdIndex:
+    @pytest.mark.asyncio
+    async def test_persists_index_entries_of_the_bot(self):
+        from async_worker.services.file_id_consumer import _process_file_id_update
+
+        collection = MagicMock()
+        collection.bulk_write = AsyncMock()
+        mock_query = MagicMock()
+        mock_query.sort = MagicMock(return_value=mock_query)
+        mock_query.limit = MagicMock(return_value=mock_query)
+        mock_query.first_or_none = AsyncMock(return_value=None)
+
+        with patch(
+            "fastfetchbot_shared.database.mongodb.models.metadata.Metadata"
+        ) as MockMetadata, patch(TELEGRAM_FILE_ID) as MockTelegramFileId:
+            MockMetadata.find = MagicMock(return_value=mock_query)
+            MockTelegramFileId.get_pymongo_collection = MagicMock(return_value=collection)
+
+            await _process_file_id_update({
+                "metadata_url": "https://example.com/post/1",
+                "bot_id": 42,
+                "file_id_updates": [
+                    {
+                        "url": "https://img.com/1.jpg",
+                        "media_type": "image",
+                        "telegram_file_id": "AgACAgI123",
+                        "file_key": "ab/abc.jpg",
+                    },
+                ],
+            })
+
+        operations = collection.bulk_write.await_args.args[0]
+        assert [op._filter for op in operations] == [
+            {"bot_id": 42, "media_key": "image:key:ab/abc.jpg"},
+            {"bot_id": 42, "media_key": "image:url:https://img.com/1.jpg"},
+        ]
+        assert all(op._upsert for op in operations)
+        assert operations[0]._doc["$set"]["file_id"] == "AgACAgI123"
+
+    @pytest.mark.asyncio
+    async def test_restores_lost_index_from_mongodb(self):
+        from async_worker.services import file_id_consumer as fic
+
+        collection = MagicMock()
+        collection.distinct = AsyncMock(return_value=[42])
+        collection.find = MagicMock(return_value=_Cursor([
+            {"media_key": "image:url:https://img.com/1.jpg", "file_id": "AgAC1"},
+            {"media_key": "image:url:https://img.com/2.jpg", "file_id": "AgAC2"},
+        ]))
+        r = _FakeHashRedis()
+
+        with patch(TELEGRAM_FILE_ID) as MockTelegramFileId, \
+                patch.object(fic, "_RESTORE_BATCH_SIZE", 1):
+            MockTelegramFileId.get_pymongo_collection = MagicMock(return_value=collection)
+            await fic._restore_file_id_index(r)
+
+        assert collection.find.call_args.args[0] == {"bot_id": 42}
+        assert r.hashes == {"fileid:index:42": {
+            "image:url:https://img.com/1.jpg": "AgAC1",
+            "image:url:https://img.com/2.jpg": "AgAC2",
+        }}
+
+    @pytest.mark.asyncio
+    async def test_fills_missing_fields_of_partial_index(self):
+        from async_worker.services import file_id_consumer as fic
+
+        collection = MagicMock()
+        collection.distinct = AsyncMock(return_value=[42])
+        collection.find = MagicMock(return_value=_Cursor([
+            {"media_key": "image:url:https://img.com/1.jpg", "file_id": "AgAC1-old"},
+            {"media_key": "image:url:https://img.com/2.jpg", "file_id": "AgAC2"},
+        ]))
+        # Recreated by the bot after Redis lost its data
+        r = _FakeHashRedis({"fileid:index:42": {"image:url:https://img.com/1.jpg": "AgAC1-new"}})
+
+        with patch(TELEGRAM_FILE_ID) as MockTelegramFileId:
+            MockTelegramFileId.get_pymongo_collection = MagicMock(return_value=collection)
+            await fic._restore_file_id_index(r)
+
+        assert r.hashes["fileid:index:42"] == {
+            "image:url:https://img.com/1.jpg": "AgAC1-new",
+            "image:url:https://img.com/2.jpg": "AgAC2",
+        }
+
+
 # ---------------------------------------------------------------------------
 # _consume_loop
 # ---------------------------------------------------------------------------
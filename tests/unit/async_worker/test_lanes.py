@@ -0,0 +1,201 @@
+"""Tests for apps/async-worker/async_worker/lanes.py and the lane workers in main.py"""
+
+import asyncio
+
+import pytest
+
+from async_worker.lanes import Lane, LaneCapacity, LaneSemaphore, parse_lanes
+
+
+def _lanes(*specs):
+    return [Lane(name=name, queue_name=f"q:{name}", weight=weight, reserved=reserved)
+            for name, weight, reserved in specs]
+
+
+async def _try_acquire(capacity: LaneCapacity, name: str) -> bool:
+    """Acquire a slot if one is available right away."""
+    try:
+        await asyncio.wait_for(capacity.acquire(name), timeout=0.01)
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+
+# ---------------------------------------------------------------------------
+# parse_lanes
+# ---------------------------------------------------------------------------
+
+
+class TestParseLanes:
+    def test_parses_entries_in_order(self):
+        lanes = parse_lanes("interactive:6:4, background:3:2,bulk:1:1", max_jobs=10)
+
+        assert [lane.name for lane in lanes] == ["interactive", "background", "bulk"]
+        assert lanes[0].queue_name == "arq:queue"
+        assert lanes[2] == Lane(name="bulk", queue_name="arq:queue:bulk", weight=1, reserved=1)
+
+    def test_unknown_lane_raises(self):
+        with pytest.raises(ValueError, match="Unknown scrape lane"):
+            parse_lanes("interactive:1:1,urgent:1:1", max_jobs=10)
+
+    def test_reservations_above_max_jobs_raise(self):
+        with pytest.raises(ValueError, match="reserves more"):
+            parse_lanes("interactive:1:8,bulk:1:4", max_jobs=10)
+
+    def test_zero_weight_raises(self):
+        with pytest.raises(ValueError, match="weight"):
+            parse_lanes("bulk:0:1", max_jobs=10)
+
+
+# ---------------------------------------------------------------------------
+# LaneCapacity
+# ---------------------------------------------------------------------------
+
+
+class TestLaneCapacity:
+    @pytest.mark.asyncio
+    async def test_reserved_slots_survive_bulk_backlog(self):
+        capacity = LaneCapacity(_lanes(("interactive", 6, 2), ("bulk", 1, 1)), max_jobs=5)
+
+        # Bulk takes its reserved slot and every shared slot
+        assert [await _try_acquire(capacity, "bulk") for _ in range(4)] == [True, True, True, False]
+        # Interactive still starts on its reservation
+        assert await _try_acquire(capacity, "interactive")
+        assert await _try_acquire(capacity, "interactive")
+        assert not await _try_acquire(capacity, "interactive")
+
+    @pytest.mark.asyncio
+    async def test_release_wakes_waiter(self):
+        capacity = LaneCapacity(_lanes(("interactive", 1, 0)), max_jobs=1)
+        await capacity.acquire("interactive")
+
+        waiter = asyncio.create_task(capacity.acquire("interactive"))
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        capacity.release("interactive")
+        await asyncio.wait_for(waiter, timeout=1)
+        assert capacity.running["interactive"] == 1
+
+    @pytest.mark.asyncio
+    async def test_shared_slots_go_to_lane_furthest_below_its_weight(self):
+        capacity = LaneCapacity(_lanes(("interactive", 3, 0), ("bulk", 1, 0)), max_jobs=4)
+        for _ in range(4):
+            await capacity.acquire("bulk")
+
+        # Both lanes queue up for the next free slots
+        interactive = [asyncio.create_task(capacity.acquire("interactive")) for _ in range(3)]
+        bulk = [asyncio.create_task(capacity.acquire("bulk")) for _ in range(3)]
+        await asyncio.sleep(0)
+
+        for _ in range(3):
+            capacity.release("bulk")
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+
+        assert sum(task.done() for task in interactive) == 3
+        assert not any(task.done() for task in bulk)
+        for task in bulk:
+            task.cancel()
+
+    @pytest.mark.asyncio
+    async def test_semaphore_adapter_delegates(self):
+        capacity = LaneCapacity(_lanes(("interactive", 1, 1)), max_jobs=1)
+        sem = LaneSemaphore(capacity, "interactive")
+
+        assert await sem.acquire() is True
+        assert capacity.running["interactive"] == 1
+        sem.release()
+        assert capacity.running["interactive"] == 0
+
+
+# ---------------------------------------------------------------------------
+# create_lane_workers
+# ---------------------------------------------------------------------------
+
+
+class TestCreateLaneWorkers:
+    @pytest.mark.asyncio
+    async def test_one_worker_per_lane_sharing_capacity(self):
+        from async_worker.main import create_lane_workers
+
+        capacity = LaneCapacity(parse_lanes("interactive:6:4,bulk:1:1", max_jobs=10), max_jobs=10)
+        workers = create_lane_workers(capacity)
+
+        assert [w.queue_name for w in workers] == ["arq:queue", "arq:queue:bulk"]
+        assert [w.max_jobs for w in workers] == [9, 6]
+        assert all(isinstance(w.sem, LaneSemaphore) and w.sem.capacity is capacity for w in workers)
+        assert workers[1].ctx["lane"] == "bulk"
+
+
+# ---------------------------------------------------------------------------
+# run_lanes
+# ---------------------------------------------------------------------------
+
+
+class _FakeWorker:
+    """Stands in for an ARQ Worker: runs until handle_sig, or crashes when told to."""
+
+    def __init__(self, crash: Exception | None = None):
+        self.crash = crash
+        self.main_task = None
+        self.closed = False
+
+    async def _main(self):
+        await asyncio.sleep(0)
+        if self.crash is not None:
+            raise self.crash
+        await asyncio.Event().wait()
+
+    async def async_run(self):
+        self.main_task = asyncio.get_running_loop().create_task(self._main())
+        await self.main_task
+
+    def handle_sig(self, signum):
+        if self.main_task is not None:
+            self.main_task.cancel()
+
+    async def close(self):
+        self.closed = True
+
+
+class TestRunLanes:
+    @pytest.fixture
+    def hooks(self):
+        from unittest.mock import AsyncMock, patch
+
+        with patch("async_worker.main.WorkerSettings.on_startup", new_callable=AsyncMock), \
+             patch("async_worker.main.WorkerSettings.on_shutdown", new_callable=AsyncMock) as shutdown, \
+             patch("async_worker.main.settings.ARQ_LANES", "interactive:6:4,bulk:1:1"), \
+             patch("async_worker.main.settings.ARQ_MAX_JOBS", 10):
+            yield shutdown
+
+    @pytest.mark.asyncio
+    async def test_crashed_lane_stops_the_others_and_raises(self, hooks):
+        from unittest.mock import patch
+        from async_worker.main import run_lanes
+
+        healthy, crashing = _FakeWorker(), _FakeWorker(crash=RuntimeError("redis gone"))
+        with patch("async_worker.main.create_lane_workers", return_value=[healthy, crashing]):
+            with pytest.raises(RuntimeError, match="redis gone"):
+                await asyncio.wait_for(run_lanes(), timeout=1)
+
+        assert healthy.main_task.cancelled()
+        assert healthy.closed and crashing.closed
+        hooks.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_signal_shutdown_returns_cleanly(self, hooks):
+        from unittest.mock import patch
+        from async_worker.main import run_lanes
+
+        workers = [_FakeWorker(), _FakeWorker()]
+        with patch("async_worker.main.create_lane_workers", return_value=workers):
+            running = asyncio.create_task(run_lanes())
+            await asyncio.sleep(0.01)
+            for worker in workers:
+                worker.handle_sig(None)
+            await asyncio.wait_for(running, timeout=1)
+
+        assert all(worker.closed for worker in workers)
+        hooks.assert_awaited_once()
@@ -25,7 +25,7 @@ def reset_outbox_module():
 def mock_redis():
     """Create a mock async Redis instance."""
     r = AsyncMock()
-    r.lpush = AsyncMock()
+    r.xadd = AsyncMock(return_value="1-0")
     r.aclose = AsyncMock()
     return r
 
@@ -84,10 +84,10 @@ class TestPush:
                 bot_id=123,
             )
 
-        mock_redis.lpush.assert_awaited_once()
-        args = mock_redis.lpush.call_args
+        mock_redis.xadd.assert_awaited_once()
+        args = mock_redis.xadd.call_args
         queue_key = args[0][0]
-        payload = json.loads(args[0][1])
+        payload = json.loads(args[0][1]["payload"])
 
         assert "123" in queue_key  # per-bot queue key
         assert payload["job_id"] == "j1"
@@ -95,6 +95,11 @@ class TestPush:
         assert payload["message_id"] == 99
         assert payload["metadata_item"] == {"title": "Test", "content": "hi"}
         assert payload["error"] is None
+        # Trace context rides along so delivery joins the job's trace
+        assert isinstance(payload["trace_context"], dict)
+        # Stream is capped so a stalled consumer cannot grow it unbounded
+        assert args.kwargs["approximate"] is True
+        assert args.kwargs["maxlen"] > 0
 
     @pytest.mark.asyncio
     async def test_push_without_bot_id_uses_base_key(self, mock_redis):
@@ -110,7 +115,7 @@ class TestPush:
                 metadata_item={"title": "Test"},
             )
 
-        args = mock_redis.lpush.call_args
+        args = mock_redis.xadd.call_args
         queue_key = args[0][0]
         # Without bot_id, should use the plain OUTBOX_QUEUE_KEY
         assert ":" not in queue_key.split("outbox")[-1]
@@ -130,7 +135,7 @@ class TestPush:
                 bot_id=456,
             )
 
-        payload = json.loads(mock_redis.lpush.call_args[0][1])
+        payload = json.loads(mock_redis.xadd.call_args[0][1]["payload"])
         assert payload["error"] == "something broke"
         assert payload["metadata_item"] is None
 
@@ -148,8 +153,8 @@ class TestPush:
                 metadata_item={"title": "\u4e2d\u6587\u6807\u9898", "emoji": "\U0001f600"},
             )
 
-        raw = mock_redis.lpush.call_args[0][1]
-        # ensure_ascii=False means unicode should be preserved
+        raw = mock_redis.xadd.call_args[0][1]["payload"].decode()
+        # Unicode is written as UTF-8, not escaped
         assert "\u4e2d\u6587\u6807\u9898" in raw
         assert "\U0001f600" in raw
 
@@ -163,7 +168,7 @@ class TestPush:
 
             await push(job_id="j4", chat_id=1)
 
-        payload = json.loads(mock_redis.lpush.call_args[0][1])
+        payload = json.loads(mock_redis.xadd.call_args[0][1]["payload"])
         assert payload["message_id"] is None
 
 
@@ -0,0 +1,103 @@
+"""Tests for apps/async-worker/async_worker/services/retention.py"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from async_worker.services import retention
+from fastfetchbot_shared.database.mongodb.retention import RetentionPolicy
+
+COMPACT = "fastfetchbot_shared.database.mongodb.retention.compact"
+
+
+@pytest.fixture(autouse=True)
+def reset_module_state():
+    retention._redis = None
+    retention._task = None
+    yield
+    retention._redis = None
+    retention._task = None
+
+
+@pytest.fixture
+def mock_redis():
+    r = AsyncMock()
+    r.set = AsyncMock(return_value=True)
+    with patch("async_worker.services.retention.aioredis.from_url", return_value=r):
+        yield r
+
+
+@pytest.fixture
+def retention_settings():
+    with patch.object(retention.settings, "METADATA_RETENTION_KEEP_LAST", 3), \
+            patch.object(retention.settings, "METADATA_RETENTION_MAX_AGE", 0), \
+            patch.object(retention.settings, "METADATA_RETENTION_INTERVAL", 600), \
+            patch.object(retention.settings, "METADATA_RETENTION_BATCH_SIZE", 100):
+        yield retention.settings
+
+
+class TestRunOnce:
+    @pytest.mark.asyncio
+    async def test_compacts_when_lock_is_taken(self, mock_redis, retention_settings):
+        with patch(COMPACT, new_callable=AsyncMock) as mock_compact:
+            assert await retention.run_once() is True
+
+        mock_redis.set.assert_awaited_once()
+        assert mock_redis.set.await_args.kwargs == {"nx": True, "ex": 600}
+        mock_compact.assert_awaited_once_with(RetentionPolicy(keep_last=3), batch_size=100)
+
+    @pytest.mark.asyncio
+    async def test_skips_when_another_replica_holds_the_lock(self, mock_redis, retention_settings):
+        mock_redis.set.return_value = None
+        with patch(COMPACT, new_callable=AsyncMock) as mock_compact:
+            assert await retention.run_once() is False
+
+        mock_compact.assert_not_awaited()
+
+
+class TestStartStop:
+    @pytest.mark.asyncio
+    async def test_start_and_stop(self, mock_redis, retention_settings):
+        with patch(COMPACT, new_callable=AsyncMock) as mock_compact:
+            await retention.start()
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            task = retention._task
+            await retention.stop()
+
+        mock_compact.assert_awaited_once()
+        assert task.cancelled()
+        assert retention._task is None
+        mock_redis.aclose.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_run_does_not_stop_the_loop(self, mock_redis, retention_settings):
+        with patch(COMPACT, new_callable=AsyncMock, side_effect=RuntimeError("mongo down")), \
+                patch.object(retention.settings, "METADATA_RETENTION_INTERVAL", 0.01):
+            await retention._get_redis()
+            task = asyncio.create_task(retention._retention_loop())
+            await asyncio.sleep(0.05)
+            assert not task.done()
+            task.cancel()
+
+    @pytest.mark.asyncio
+    async def test_disabled_policy_starts_nothing(self, retention_settings):
+        with patch.object(retention.settings, "METADATA_RETENTION_KEEP_LAST", 0):
+            await retention.start()
+
+        assert retention._task is None
+
+    def test_off_by_default(self):
+        from async_worker.config import AsyncWorkerSettings
+
+        fields = AsyncWorkerSettings.model_fields
+        assert fields["METADATA_RETENTION_KEEP_LAST"].default == 0
+        assert fields["METADATA_RETENTION_MAX_AGE"].default == 0
+
+    @pytest.mark.asyncio
+    async def test_zero_interval_starts_nothing(self, retention_settings):
+        with patch.object(retention.settings, "METADATA_RETENTION_INTERVAL", 0):
+            await retention.start()
+
+        assert retention._task is None
@@ -8,6 +8,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
 from async_worker.tasks.scrape import scrape_and_enrich
+from fastfetchbot_shared.models.metadata_item import DELIVERY_FIELDS
 
 
 # ---------------------------------------------------------------------------
@@ -98,6 +99,7 @@ class TestForceRefreshCache:
 
             call_kwargs = MockCls.call_args.kwargs
             assert call_kwargs["database_cache_ttl"] == 86400
+            assert call_kwargs["cache_fields"] == DELIVERY_FIELDS
 
     @pytest.mark.asyncio
     async def test_default_force_refresh_is_false(
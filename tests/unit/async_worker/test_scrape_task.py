@@ -119,6 +119,19 @@ class TestScrapeAndEnrichSuccess:
         assert "celery_app" in call_kwargs
         assert "timeout" in call_kwargs
 
+    @pytest.mark.asyncio
+    async def test_trace_context_not_forwarded_to_scraper(
+        self, ctx, mock_info_extract, mock_enrichment, mock_outbox
+    ):
+        MockCls, _ = mock_info_extract
+        await scrape_and_enrich(
+            ctx,
+            url="u",
+            chat_id=1,
+            trace_context={"traceparent": "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"},
+        )
+        assert "trace_context" not in MockCls.call_args.kwargs
+
     @pytest.mark.asyncio
     async def test_disables_telegraph_and_document_for_scraping(
         self, ctx, mock_info_extract, mock_enrichment, mock_outbox
@@ -23,14 +23,20 @@ class TestWorkerStartup:
              patch(
                  "async_worker.services.file_id_consumer.start",
                  new_callable=AsyncMock,
-             ) as mock_fic_start:
+             ) as mock_fic_start, \
+             patch(
+                 "async_worker.services.retention.start",
+                 new_callable=AsyncMock,
+             ) as mock_retention_start:
             mock_settings.DATABASE_ON = True
             mock_settings.MONGODB_URL = "mongodb://localhost:27017"
+            mock_settings.METRICS_PORT = 0
 
             await WorkerSettings.on_startup({})
 
         mock_init.assert_awaited_once_with("mongodb://localhost:27017")
         mock_fic_start.assert_awaited_once()
+        mock_retention_start.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_init_mongodb_skipped_when_database_off(self):
@@ -40,11 +46,23 @@ class TestWorkerStartup:
                  new_callable=AsyncMock,
              ) as mock_init:
             mock_settings.DATABASE_ON = False
+            mock_settings.METRICS_PORT = 0
 
             await WorkerSettings.on_startup({})
 
         mock_init.assert_not_awaited()
 
+    @pytest.mark.asyncio
+    async def test_metrics_server_started_on_configured_port(self):
+        with patch("async_worker.main.settings") as mock_settings, \
+             patch("fastfetchbot_shared.utils.telemetry.start_metrics_server") as mock_serve:
+            mock_settings.DATABASE_ON = False
+            mock_settings.METRICS_PORT = 10452
+
+            await WorkerSettings.on_startup({})
+
+        mock_serve.assert_called_once_with(10452)
+
 
 # ---------------------------------------------------------------------------
 # on_shutdown
@@ -62,13 +80,18 @@ class TestWorkerShutdown:
              patch(
                  "async_worker.services.file_id_consumer.stop",
                  new_callable=AsyncMock,
-             ) as mock_fic_stop:
+             ) as mock_fic_stop, \
+             patch(
+                 "async_worker.services.retention.stop",
+                 new_callable=AsyncMock,
+             ) as mock_retention_stop:
             mock_settings.DATABASE_ON = True
             mock_settings.file_id_consumer_ready = True
 
             await WorkerSettings.on_shutdown({})
 
         mock_fic_stop.assert_awaited_once()
+        mock_retention_stop.assert_awaited_once()
         mock_close.assert_awaited_once()
 
     @pytest.mark.asyncio
@@ -84,3 +107,32 @@ class TestWorkerShutdown:
             await WorkerSettings.on_shutdown({})
 
         mock_close.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_scraper_sessions_closed(self):
+        with patch("async_worker.main.settings") as mock_settings, \
+             patch(
+                 "fastfetchbot_shared.services.scrapers.twitter.session_pool.close_session_pool",
+                 new_callable=AsyncMock,
+             ) as mock_close_pool, \
+             patch(
+                 "fastfetchbot_shared.services.scrapers.xiaohongshu.signer.close_signers",
+                 new_callable=AsyncMock,
+             ) as mock_close_signers, \
+             patch(
+                 "fastfetchbot_shared.services.scrapers.weibo.engine.close_weibo_sessions",
+                 new_callable=AsyncMock,
+             ) as mock_close_weibo, \
+             patch(
+                 "fastfetchbot_shared.services.scrapers.reddit.client.close_reddit_client",
+                 new_callable=AsyncMock,
+             ) as mock_close_reddit:
+            mock_settings.DATABASE_ON = False
+            mock_settings.file_id_consumer_ready = False
+
+            await WorkerSettings.on_shutdown({})
+
+        mock_close_pool.assert_awaited_once()
+        mock_close_signers.assert_awaited_once()
+        mock_close_weibo.assert_awaited_once()
+        mock_close_reddit.assert_awaited_once()
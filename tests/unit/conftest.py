@@ -31,6 +31,26 @@ def sample_metadata_item_dict():
     }
 
 
+@pytest.fixture(autouse=True)
+def reset_hedge_stats():
+    """Forget backend statistics and circuits so fallback order is deterministic per test."""
+    yield
+    from fastfetchbot_shared.services.scrapers import circuit_breaker
+    from fastfetchbot_shared.services.scrapers.hedge import reset_stats
+
+    reset_stats()
+    circuit_breaker.reset()
+
+
+@pytest.fixture(autouse=True)
+def no_scraper_warm_up():
+    """Keep app startup hooks from preloading every scraper in a background thread."""
+    from fastfetchbot_shared.services.scrapers.config import settings
+
+    with patch.object(settings, "SCRAPER_WARMUP", False):
+        yield
+
+
 @pytest.fixture(autouse=True)
 def reset_scraper_manager():
     """Reset ScraperManager class-level state after each test."""
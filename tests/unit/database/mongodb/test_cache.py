@@ -4,6 +4,16 @@ from datetime import datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from bson import ObjectId
+
+from fastfetchbot_shared.config import settings
+from fastfetchbot_shared.database.mongodb.cache import (
+    _externalize_content,
+    find_cached,
+    load_content,
+    save_metadata,
+)
+from fastfetchbot_shared.database.mongodb.models.metadata import Metadata
 
 
 # ---------------------------------------------------------------------------
@@ -11,25 +21,44 @@ import pytest
 # ---------------------------------------------------------------------------
 
 
-def _make_mock_metadata(url="https://example.com", version=1, timestamp=None):
-    """Create a mock Metadata document."""
-    doc = MagicMock()
-    doc.url = url
-    doc.version = version
-    doc.timestamp = timestamp or datetime.utcnow()
-    return doc
+def _make_cached(url="https://example.com", version=1, timestamp=None, **fields):
+    """A raw cached metadata document, as returned by the collection."""
+    return {
+        "url": url,
+        "version": version,
+        "timestamp": timestamp or datetime.utcnow(),
+        **fields,
+    }
+
+
+@pytest.fixture
+def collection():
+    """Patch Metadata's pymongo collection; find_one returns None by default."""
+    mock_collection = MagicMock()
+    mock_collection.find_one = AsyncMock(return_value=None)
+    with patch(
+        "fastfetchbot_shared.database.mongodb.cache.Metadata.get_pymongo_collection",
+        return_value=mock_collection,
+    ):
+        yield mock_collection
 
 
-def _make_find_chain(result):
-    """Build a mock chain for Metadata.find().sort().limit().first_or_none()."""
-    mock_first = AsyncMock(return_value=result)
-    mock_limit = MagicMock()
-    mock_limit.first_or_none = mock_first
-    mock_sort = MagicMock()
-    mock_sort.limit.return_value = mock_limit
-    mock_find = MagicMock()
-    mock_find.sort.return_value = mock_sort
-    return mock_find
+@pytest.fixture
+def metadata_insert():
+    with patch(
+        "fastfetchbot_shared.database.mongodb.cache.Metadata.insert",
+        new_callable=AsyncMock,
+    ) as mock_insert:
+        yield mock_insert
+
+
+@pytest.fixture
+def content_insert():
+    with patch(
+        "fastfetchbot_shared.database.mongodb.cache.MetadataContent.insert",
+        new_callable=AsyncMock,
+    ) as mock_insert:
+        yield mock_insert
 
 
 # ---------------------------------------------------------------------------
@@ -39,72 +68,117 @@ def _make_find_chain(result):
 
 class TestFindCached:
     @pytest.mark.asyncio
-    async def test_returns_none_when_no_document_found(self):
-        mock_find = _make_find_chain(None)
+    async def test_returns_none_when_no_document_found(self, collection):
+        result = await find_cached("https://example.com", ttl_seconds=3600)
 
-        with patch(
-            "fastfetchbot_shared.database.mongodb.cache.Metadata"
-        ) as MockMetadata:
-            MockMetadata.find.return_value = mock_find.sort.return_value.__class__()
-            # Simpler approach: patch the full chain
-            MockMetadata.find.return_value = mock_find
+        assert result is None
+        collection.find_one.assert_awaited_once_with(
+            {"url": "https://example.com"}, {"_id": 0}, sort=[("version", -1)]
+        )
 
-            from fastfetchbot_shared.database.mongodb.cache import find_cached
+    @pytest.mark.asyncio
+    async def test_returns_document_when_ttl_zero(self, collection):
+        """ttl_seconds=0 means never expire — always return cached doc."""
+        doc = _make_cached(timestamp=datetime.utcnow() - timedelta(days=365))
+        collection.find_one.return_value = doc
 
-            result = await find_cached("https://example.com", ttl_seconds=3600)
+        result = await find_cached("https://example.com", ttl_seconds=0)
 
-        assert result is None
+        assert result == doc
 
     @pytest.mark.asyncio
-    async def test_returns_document_when_ttl_zero(self):
-        """ttl_seconds=0 means never expire — always return cached doc."""
-        doc = _make_mock_metadata(timestamp=datetime.utcnow() - timedelta(days=365))
-        mock_find = _make_find_chain(doc)
+    async def test_returns_document_within_ttl(self, collection):
+        doc = _make_cached(timestamp=datetime.utcnow() - timedelta(seconds=30))
+        collection.find_one.return_value = doc
 
-        with patch(
-            "fastfetchbot_shared.database.mongodb.cache.Metadata"
-        ) as MockMetadata:
-            MockMetadata.find.return_value = mock_find
+        result = await find_cached("https://example.com", ttl_seconds=3600)
+
+        assert result == doc
 
-            from fastfetchbot_shared.database.mongodb.cache import find_cached
+    @pytest.mark.asyncio
+    async def test_returns_none_when_ttl_expired(self, collection):
+        collection.find_one.return_value = _make_cached(
+            timestamp=datetime.utcnow() - timedelta(seconds=7200)
+        )
 
-            result = await find_cached("https://example.com", ttl_seconds=0)
+        result = await find_cached("https://example.com", ttl_seconds=3600)
 
-        assert result is doc
+        assert result is None
 
     @pytest.mark.asyncio
-    async def test_returns_document_within_ttl(self):
-        doc = _make_mock_metadata(timestamp=datetime.utcnow() - timedelta(seconds=30))
-        mock_find = _make_find_chain(doc)
+    async def test_projects_requested_fields(self, collection):
+        collection.find_one.return_value = _make_cached(
+            title="Cached", text="short", content_ref=ObjectId()
+        )
 
         with patch(
-            "fastfetchbot_shared.database.mongodb.cache.Metadata"
-        ) as MockMetadata:
-            MockMetadata.find.return_value = mock_find
+            "fastfetchbot_shared.database.mongodb.cache.load_content",
+            new_callable=AsyncMock,
+        ) as mock_load_content:
+            result = await find_cached("https://example.com", 0, fields=["title", "text"])
+
+        assert result == {"title": "Cached", "text": "short"}
+        assert collection.find_one.call_args.args[1] == {
+            "_id": 0, "title": 1, "text": 1, "timestamp": 1, "version": 1, "content_ref": 1,
+        }
+        mock_load_content.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_loads_external_content_when_requested(self, collection):
+        content_ref = ObjectId()
+        collection.find_one.return_value = _make_cached(content=None, content_ref=content_ref)
 
-            from fastfetchbot_shared.database.mongodb.cache import find_cached
+        with patch(
+            "fastfetchbot_shared.database.mongodb.cache.load_content",
+            new_callable=AsyncMock,
+            return_value="<p>long</p>",
+        ) as mock_load_content:
+            result = await find_cached("https://example.com", 0, fields=["url", "content"])
 
-            result = await find_cached("https://example.com", ttl_seconds=3600)
+        assert result == {"url": "https://example.com", "content": "<p>long</p>"}
+        mock_load_content.assert_awaited_once_with(content_ref)
 
-        assert result is doc
 
+class TestExternalContent:
     @pytest.mark.asyncio
-    async def test_returns_none_when_ttl_expired(self):
-        doc = _make_mock_metadata(
-            timestamp=datetime.utcnow() - timedelta(seconds=7200)
-        )
-        mock_find = _make_find_chain(doc)
+    async def test_round_trip(self, content_insert):
+        content = "<p>" + "A long paragraph of scraped content. " * 1000 + "</p>"
+        doc = Metadata.model_construct(url="https://example.com", content=content)
+
+        with patch.object(settings, "DATABASE_CONTENT_EXTERNAL_MIN_BYTES", 1024):
+            await _externalize_content(doc)
+
+        blob = content_insert.await_args.args[0]
+        assert len(blob.data) < len(content) // 10
+        assert doc.content is None
+        assert doc.content_ref == blob.id
+        assert doc.content_length == len(content) - len("<p></p>")
 
         with patch(
-            "fastfetchbot_shared.database.mongodb.cache.Metadata"
-        ) as MockMetadata:
-            MockMetadata.find.return_value = mock_find
+            "fastfetchbot_shared.database.mongodb.cache.MetadataContent.get",
+            new_callable=AsyncMock,
+            return_value=blob,
+        ):
+            assert await load_content(doc.content_ref) == content
 
-            from fastfetchbot_shared.database.mongodb.cache import find_cached
+    @pytest.mark.asyncio
+    async def test_small_content_stays_inline(self, content_insert):
+        doc = Metadata.model_construct(url="https://example.com", content="<p>short</p>")
 
-            result = await find_cached("https://example.com", ttl_seconds=3600)
+        await _externalize_content(doc)
 
-        assert result is None
+        assert doc.content == "<p>short</p>"
+        assert doc.content_ref is None
+        content_insert.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_missing_blob(self):
+        with patch(
+            "fastfetchbot_shared.database.mongodb.cache.MetadataContent.get",
+            new_callable=AsyncMock,
+            return_value=None,
+        ):
+            assert await load_content(ObjectId()) is None
 
 
 # ---------------------------------------------------------------------------
@@ -114,83 +188,55 @@ class TestFindCached:
 
 class TestSaveMetadata:
     @pytest.mark.asyncio
-    async def test_first_save_uses_version_1(self):
-        mock_find = _make_find_chain(None)  # No existing doc
-
-        with patch(
-            "fastfetchbot_shared.database.mongodb.cache.Metadata"
-        ) as MockMetadata:
-            MockMetadata.find.return_value = mock_find
-            mock_constructed = MagicMock()
-            MockMetadata.model_construct.return_value = mock_constructed
-            MockMetadata.insert = AsyncMock()
-
-            from fastfetchbot_shared.database.mongodb.cache import save_metadata
-
-            item = {"url": "https://example.com", "title": "Test"}
-            result = await save_metadata(item)
+    async def test_first_save_uses_version_1(self, collection, metadata_insert):
+        item = {"url": "https://example.com", "title": "Test"}
+        result = await save_metadata(item)
 
         assert item["version"] == 1
-        MockMetadata.model_construct.assert_called_once()
-        MockMetadata.insert.assert_awaited_once_with(mock_constructed)
-        assert result is mock_constructed
+        metadata_insert.assert_awaited_once_with(result)
+        assert result.version == 1
+        assert result.title == "Test"
 
     @pytest.mark.asyncio
-    async def test_increments_version_from_existing(self):
-        existing_doc = _make_mock_metadata(version=3)
-        mock_find = _make_find_chain(existing_doc)
-
-        with patch(
-            "fastfetchbot_shared.database.mongodb.cache.Metadata"
-        ) as MockMetadata:
-            MockMetadata.find.return_value = mock_find
-            mock_constructed = MagicMock()
-            MockMetadata.model_construct.return_value = mock_constructed
-            MockMetadata.insert = AsyncMock()
+    async def test_increments_version_from_existing(self, collection, metadata_insert):
+        collection.find_one.return_value = {"version": 3}
 
-            from fastfetchbot_shared.database.mongodb.cache import save_metadata
-
-            item = {"url": "https://example.com", "title": "Test"}
-            await save_metadata(item)
+        item = {"url": "https://example.com", "title": "Test"}
+        await save_metadata(item)
 
         assert item["version"] == 4
 
     @pytest.mark.asyncio
-    async def test_uses_url_from_metadata_item(self):
-        mock_find = _make_find_chain(None)
+    async def test_uses_url_from_metadata_item(self, collection, metadata_insert):
+        item = {"url": "https://specific.com/path", "title": "Test"}
+        await save_metadata(item)
 
-        with patch(
-            "fastfetchbot_shared.database.mongodb.cache.Metadata"
-        ) as MockMetadata:
-            MockMetadata.find.return_value = mock_find
-            MockMetadata.model_construct.return_value = MagicMock()
-            MockMetadata.insert = AsyncMock()
+        collection.find_one.assert_awaited_once_with(
+            {"url": "https://specific.com/path"}, {"_id": 0, "version": 1}, sort=[("version", -1)]
+        )
 
-            from fastfetchbot_shared.database.mongodb.cache import save_metadata
+    @pytest.mark.asyncio
+    async def test_large_content_is_externalized(self, collection, metadata_insert, content_insert):
+        item = {"url": "https://example.com", "title": "Test", "content": "x" * 20000}
 
-            item = {"url": "https://specific.com/path", "title": "Test"}
-            await save_metadata(item)
+        with patch.object(settings, "DATABASE_CONTENT_EXTERNAL_MIN_BYTES", 16384):
+            result = await save_metadata(item)
 
-        # Verify the find was called (to look up existing version)
-        MockMetadata.find.assert_called()
+        assert result.content is None
+        assert result.content_ref == content_insert.await_args.args[0].id
+        assert item["content"] == "x" * 20000
 
     @pytest.mark.asyncio
     async def test_missing_url_raises_value_error(self):
-        from fastfetchbot_shared.database.mongodb.cache import save_metadata
-
         with pytest.raises(ValueError, match="non-empty 'url'"):
             await save_metadata({"title": "No URL"})
 
     @pytest.mark.asyncio
     async def test_empty_url_raises_value_error(self):
-        from fastfetchbot_shared.database.mongodb.cache import save_metadata
-
         with pytest.raises(ValueError, match="non-empty 'url'"):
             await save_metadata({"url": "", "title": "Empty URL"})
 
     @pytest.mark.asyncio
     async def test_whitespace_only_url_raises_value_error(self):
-        from fastfetchbot_shared.database.mongodb.cache import save_metadata
-
         with pytest.raises(ValueError, match="non-empty 'url'"):
             await save_metadata({"url": "   ", "title": "Whitespace URL"})
@@ -11,11 +11,13 @@ most tests, since we're testing business logic not Beanie integration.
 from unittest.mock import patch
 
 import pytest
+from bson import ObjectId
 
 from fastfetchbot_shared.models.metadata_item import MediaFile, MessageType
 from fastfetchbot_shared.database.mongodb.models.metadata import (
     DatabaseMediaFile,
     Metadata,
+    MetadataContent,
     document_list,
 )
 
@@ -77,6 +79,7 @@ def _make_metadata(**kwargs):
 class TestMetadataModel:
     def test_document_list_contains_metadata(self):
         assert Metadata in document_list
+        assert MetadataContent in document_list
 
     def test_default_field_values(self):
         m = _make_metadata()
@@ -135,6 +138,11 @@ class TestPrepareForInsert:
             m.prepare_for_insert()
         assert m.content_length == len("<div>Some content</div>")
 
+    def test_keeps_content_length_of_external_content(self):
+        m = _make_metadata(content=None, content_length=1200, content_ref=ObjectId())
+        m.prepare_for_insert()
+        assert m.content_length == 1200
+
     def test_preserves_existing_database_media_files(self):
         dmf = DatabaseMediaFile(
             media_type="photo",
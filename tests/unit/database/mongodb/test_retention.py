@@ -0,0 +1,139 @@
+"""Tests for packages/shared/fastfetchbot_shared/database/mongodb/retention.py"""
+
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from bson import ObjectId
+
+from fastfetchbot_shared.database.mongodb.retention import (
+    RetentionPolicy,
+    compact,
+    select_prunable,
+)
+
+NOW = datetime(2024, 6, 1)
+
+
+def _versions(count, days_apart=1, size=100, content_ref=None):
+    """Version docs of one URL as grouped by the pipeline, newest first."""
+    return [
+        {
+            "_id": ObjectId(),
+            "version": count - i,
+            "timestamp": NOW - timedelta(days=i * days_apart),
+            "content_ref": content_ref,
+            "size": size,
+        }
+        for i in range(count)
+    ]
+
+
+class _Cursor:
+    def __init__(self, items):
+        self._items = items
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for item in self._items:
+            yield item
+
+    async def to_list(self):
+        return list(self._items)
+
+
+@pytest.fixture
+def collections():
+    """Patch the Metadata and MetadataContent pymongo collections."""
+    metadata = MagicMock()
+    metadata.delete_many = AsyncMock()
+    content = MagicMock()
+    content.delete_many = AsyncMock()
+    content.aggregate = AsyncMock(return_value=_Cursor([{"_id": None, "bytes": 5000}]))
+    with patch(
+        "fastfetchbot_shared.database.mongodb.retention.Metadata.get_pymongo_collection",
+        return_value=metadata,
+    ), patch(
+        "fastfetchbot_shared.database.mongodb.retention.MetadataContent.get_pymongo_collection",
+        return_value=content,
+    ):
+        yield metadata, content
+
+
+def _groups(metadata, groups):
+    metadata.aggregate = AsyncMock(return_value=_Cursor(
+        [{"_id": url, "docs": list(reversed(docs))} for url, docs in groups.items()]
+    ))
+
+
+class TestSelectPrunable:
+    def test_keep_last(self):
+        docs = _versions(5)
+        assert select_prunable(docs, RetentionPolicy(keep_last=2), NOW) == docs[2:]
+
+    def test_max_age(self):
+        docs = _versions(5, days_apart=10)
+        assert select_prunable(docs, RetentionPolicy(max_age=15 * 86400), NOW) == docs[2:]
+
+    def test_newest_version_is_always_kept(self):
+        docs = _versions(3, days_apart=100)
+        docs[0]["timestamp"] = NOW - timedelta(days=365)
+        assert select_prunable(docs, RetentionPolicy(keep_last=1, max_age=1), NOW) == docs[1:]
+
+
+class TestCompact:
+    @pytest.mark.asyncio
+    async def test_deletes_in_batches(self, collections):
+        metadata, content = collections
+        docs_a, docs_b = _versions(4), _versions(3)
+        _groups(metadata, {"https://a.com": docs_a, "https://b.com": docs_b, "https://c.com": _versions(1)})
+
+        report = await compact(RetentionPolicy(keep_last=1), batch_size=3, now=NOW)
+
+        deleted = [c.args[0]["_id"]["$in"] for c in metadata.delete_many.await_args_list]
+        assert deleted == [
+            [d["_id"] for d in docs_a[1:]],
+            [d["_id"] for d in docs_b[1:]],
+        ]
+        assert (report.urls, report.versions, report.pruned) == (3, 8, 5)
+        assert report.reclaimed_bytes == 500
+        assert [(u.url, u.versions, u.pruned) for u in report.top_urls] == [
+            ("https://a.com", 4, 3), ("https://b.com", 3, 2), ("https://c.com", 1, 0),
+        ]
+        content.delete_many.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_deletes_external_content(self, collections):
+        metadata, content = collections
+        content_ref = ObjectId()
+        _groups(metadata, {"https://a.com": _versions(2, content_ref=content_ref)})
+
+        report = await compact(RetentionPolicy(keep_last=1), now=NOW)
+
+        content.delete_many.assert_awaited_once_with({"_id": {"$in": [content_ref]}})
+        assert report.reclaimed_bytes == 100 + 5000
+
+    @pytest.mark.asyncio
+    async def test_dry_run_reports_without_deleting(self, collections):
+        metadata, content = collections
+        _groups(metadata, {"https://a.com": _versions(6), "https://b.com": _versions(2)})
+
+        report = await compact(RetentionPolicy(keep_last=2), dry_run=True, top=1, now=NOW)
+
+        metadata.delete_many.assert_not_awaited()
+        assert report.dry_run
+        assert report.pruned == 4
+        assert report.reclaimed_bytes == 400
+        assert [u.url for u in report.top_urls] == ["https://a.com"]
+
+    @pytest.mark.asyncio
+    async def test_disabled_policy_only_reports(self, collections):
+        metadata, _ = collections
+        _groups(metadata, {"https://a.com": _versions(6)})
+
+        report = await compact(RetentionPolicy(), now=NOW)
+
+        metadata.delete_many.assert_not_awaited()
+        assert (report.versions, report.pruned) == (6, 0)
@@ -159,25 +159,32 @@ class TestBlueskyConfig:
 
 class TestBlueskyPost:
 
-    @patch("fastfetchbot_shared.services.scrapers.bluesky.scraper.BlueskyScraper")
-    def test_init_parses_url(self, mock_scraper_cls):
-        """BlueskyPost should parse handle, post_rkey, and resolve DID."""
-        mock_resolver = MagicMock()
-        mock_resolver.handle.resolve.return_value = "did:plc:resolved"
-        mock_scraper_cls.id_resolver = mock_resolver
-
-        # Patch at class level before import
-        with patch(
-            "fastfetchbot_shared.services.scrapers.bluesky.scraper.BlueskyScraper.id_resolver",
-            mock_resolver,
-        ):
-            from fastfetchbot_shared.services.scrapers.bluesky.scraper import BlueskyPost
+    def test_init_parses_url(self):
+        """BlueskyPost should parse handle and post_rkey without any network lookup."""
+        from fastfetchbot_shared.services.scrapers.bluesky.scraper import BlueskyPost
 
+        post = BlueskyPost("https://bsky.app/profile/alice.bsky.social/post/rkey123")
+        assert post.handle == "alice.bsky.social"
+        assert post.post_rkey == "rkey123"
+        assert post.bluesky_host == "bsky.app"
+        assert post.did is None
+        assert post.at_uri is None
+
+    @pytest.mark.asyncio
+    async def test_resolve_sets_did_and_at_uri(self):
+        """resolve() should look up the DID asynchronously and build the post AT URI."""
+        from fastfetchbot_shared.services.scrapers.bluesky.scraper import BlueskyPost
+
+        with patch(
+            "fastfetchbot_shared.services.scrapers.bluesky.scraper.resolve_did",
+            AsyncMock(return_value="did:plc:resolved"),
+        ) as mock_resolve:
             post = BlueskyPost("https://bsky.app/profile/alice.bsky.social/post/rkey123")
-            assert post.handle == "alice.bsky.social"
-            assert post.post_rkey == "rkey123"
-            assert post.bluesky_host == "bsky.app"
-            assert post.did == "did:plc:resolved"
+            await post.resolve()
+
+        mock_resolve.assert_awaited_once_with("alice.bsky.social")
+        assert post.did == "did:plc:resolved"
+        assert post.at_uri == "at://did:plc:resolved/app.bsky.feed.post/rkey123"
 
 
 # ---------------------------------------------------------------------------
@@ -533,25 +540,19 @@ class TestBlueskyScraper:
 
     @pytest.mark.asyncio
     async def test_get_processor_by_url(self):
-        """get_processor_by_url should return a BlueskyDataProcessor."""
+        """get_processor_by_url should resolve the DID and fetch the thread in one call."""
         from fastfetchbot_shared.services.scrapers.bluesky.scraper import (
             BlueskyScraper,
             BlueskyDataProcessor,
         )
 
-        mock_resolver = MagicMock()
-        mock_resolver.handle.resolve.return_value = "did:plc:resolved"
-
         with patch(
             "fastfetchbot_shared.services.scrapers.bluesky.scraper.AsyncClient"
-        ) as mock_client_cls, patch.object(
-            BlueskyScraper, "id_resolver", mock_resolver
+        ) as mock_client_cls, patch(
+            "fastfetchbot_shared.services.scrapers.bluesky.scraper.resolve_did",
+            AsyncMock(return_value="did:plc:resolved"),
         ):
             mock_client = AsyncMock()
-            mock_post_data = MagicMock()
-            mock_post_data.uri = "at://did:plc:resolved/app.bsky.feed.post/rkey123"
-            mock_client.get_post.return_value = mock_post_data
-
             mock_thread_data = MagicMock()
             mock_thread_data.thread = _make_thread()
             mock_client.get_post_thread.return_value = mock_thread_data
@@ -563,25 +564,20 @@ class TestBlueskyScraper:
                 "https://bsky.app/profile/alice.bsky.social/post/rkey123"
             )
             assert isinstance(processor, BlueskyDataProcessor)
+            mock_client.get_post.assert_not_awaited()
+            mock_client.get_post_thread.assert_awaited_once_with(
+                uri="at://did:plc:resolved/app.bsky.feed.post/rkey123"
+            )
 
     @pytest.mark.asyncio
-    async def test_request_post_data_uses_did_when_available(self):
-        """_request_post_data should use did as profile_identify when available."""
-        from fastfetchbot_shared.services.scrapers.bluesky.scraper import BlueskyScraper
-
-        mock_resolver = MagicMock()
-        mock_resolver.handle.resolve.return_value = "did:plc:resolved"
+    async def test_request_post_data_builds_uri_from_did(self):
+        """_request_post_data should skip get_post when the DID is known."""
+        from fastfetchbot_shared.services.scrapers.bluesky.scraper import BlueskyScraper, BlueskyPost
 
         with patch(
             "fastfetchbot_shared.services.scrapers.bluesky.scraper.AsyncClient"
-        ) as mock_client_cls, patch.object(
-            BlueskyScraper, "id_resolver", mock_resolver
-        ):
+        ) as mock_client_cls:
             mock_client = AsyncMock()
-            mock_post_data = MagicMock()
-            mock_post_data.uri = "at://did:plc:resolved/app.bsky.feed.post/rkey123"
-            mock_client.get_post.return_value = mock_post_data
-
             mock_thread_response = MagicMock()
             mock_thread_response.thread = _make_thread()
             mock_client.get_post_thread.return_value = mock_thread_response
@@ -590,22 +586,20 @@ class TestBlueskyScraper:
 
             scraper = BlueskyScraper()
 
-            from fastfetchbot_shared.services.scrapers.bluesky.scraper import BlueskyPost
-
-            bluesky_post = MagicMock(spec=BlueskyPost)
+            bluesky_post = BlueskyPost("https://bsky.app/profile/alice.bsky.social/post/rkey123")
             bluesky_post.did = "did:plc:resolved"
-            bluesky_post.handle = "alice.bsky.social"
-            bluesky_post.post_rkey = "rkey123"
 
             result = await scraper._request_post_data(bluesky_post)
-            mock_client.get_post.assert_awaited_once_with(
-                profile_identify="did:plc:resolved", post_rkey="rkey123"
+            assert result is mock_thread_response.thread
+            mock_client.get_post.assert_not_awaited()
+            mock_client.get_post_thread.assert_awaited_once_with(
+                uri="at://did:plc:resolved/app.bsky.feed.post/rkey123"
             )
 
     @pytest.mark.asyncio
     async def test_request_post_data_uses_handle_when_no_did(self):
-        """_request_post_data should fall back to handle when did is empty."""
-        from fastfetchbot_shared.services.scrapers.bluesky.scraper import BlueskyScraper
+        """_request_post_data should fall back to get_post by handle when the DID is unknown."""
+        from fastfetchbot_shared.services.scrapers.bluesky.scraper import BlueskyScraper, BlueskyPost
 
         with patch(
             "fastfetchbot_shared.services.scrapers.bluesky.scraper.AsyncClient"
@@ -623,15 +617,13 @@ class TestBlueskyScraper:
 
             scraper = BlueskyScraper()
 
-            bluesky_post = MagicMock()
-            bluesky_post.did = ""  # falsy
-            bluesky_post.handle = "alice.bsky.social"
-            bluesky_post.post_rkey = "rkey123"
+            bluesky_post = BlueskyPost("https://bsky.app/profile/alice.bsky.social/post/rkey123")
 
             result = await scraper._request_post_data(bluesky_post)
             mock_client.get_post.assert_awaited_once_with(
                 profile_identify="alice.bsky.social", post_rkey="rkey123"
             )
+            mock_client.get_post_thread.assert_awaited_once_with(uri=mock_post_data.uri)
 
     @pytest.mark.asyncio
     async def test_request_post_data_exception_handling(self):
@@ -648,7 +640,7 @@ class TestBlueskyScraper:
             scraper = BlueskyScraper()
 
             bluesky_post = MagicMock()
-            bluesky_post.did = "did:plc:abc"
+            bluesky_post.at_uri = None
             bluesky_post.handle = "alice"
             bluesky_post.post_rkey = "rkey123"
 
@@ -0,0 +1,122 @@
+"""Tests for packages/shared/fastfetchbot_shared/services/scrapers/bluesky/resolver.py"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from fastfetchbot_shared.services.scrapers.bluesky import resolver
+
+
+@pytest.fixture(autouse=True)
+def fresh_resolver():
+    resolver.reset()
+    with patch.object(resolver.settings, "BLUESKY_DID_CACHE_TTL", 86400), \
+            patch.object(resolver.settings, "BLUESKY_DID_NEGATIVE_TTL", 300), \
+            patch.object(resolver, "_redis", None), \
+            patch.object(resolver.settings, "BLUESKY_DID_REDIS_URL", ""):
+        yield
+    resolver.reset()
+
+
+@pytest.fixture
+def id_resolver():
+    mock = MagicMock()
+    mock.handle.resolve = AsyncMock(return_value="did:plc:alice")
+    with patch.object(resolver, "_resolver", mock):
+        yield mock
+
+
+class TestResolveDid:
+    @pytest.mark.asyncio
+    async def test_resolved_did_is_cached(self, id_resolver):
+        assert await resolver.resolve_did("Alice.bsky.social") == "did:plc:alice"
+        assert await resolver.resolve_did("alice.bsky.social") == "did:plc:alice"
+
+        id_resolver.handle.resolve.assert_awaited_once_with("alice.bsky.social")
+
+    @pytest.mark.asyncio
+    async def test_did_is_returned_without_lookup(self, id_resolver):
+        assert await resolver.resolve_did("did:plc:bob") == "did:plc:bob"
+        id_resolver.handle.resolve.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_unresolvable_handle_is_negatively_cached(self, id_resolver):
+        id_resolver.handle.resolve.return_value = None
+
+        assert await resolver.resolve_did("gone.example") is None
+        assert await resolver.resolve_did("gone.example") is None
+
+        assert id_resolver.handle.resolve.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_looked_up_again(self, id_resolver):
+        with patch.object(resolver.settings, "BLUESKY_DID_CACHE_TTL", 0):
+            await resolver.resolve_did("alice.bsky.social")
+            await resolver.resolve_did("alice.bsky.social")
+
+        assert id_resolver.handle.resolve.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached(self, id_resolver):
+        id_resolver.handle.resolve.side_effect = [OSError("dns down"), "did:plc:alice"]
+
+        assert await resolver.resolve_did("alice.bsky.social") is None
+        assert await resolver.resolve_did("alice.bsky.social") == "did:plc:alice"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_share_one_resolution(self, id_resolver):
+        async def slow_resolve(handle):
+            await asyncio.sleep(0.01)
+            return "did:plc:alice"
+
+        id_resolver.handle.resolve.side_effect = slow_resolve
+
+        results = await asyncio.gather(*(resolver.resolve_did("alice.bsky.social") for _ in range(3)))
+
+        assert results == ["did:plc:alice"] * 3
+        assert id_resolver.handle.resolve.await_count == 1
+
+
+class TestRedisCache:
+    @pytest.fixture
+    def redis(self):
+        r = MagicMock()
+        r.get = AsyncMock(return_value=None)
+        r.set = AsyncMock()
+        with patch.object(resolver, "_get_redis", return_value=r):
+            yield r
+
+    @pytest.mark.asyncio
+    async def test_did_from_redis_skips_resolution(self, id_resolver, redis):
+        redis.get.return_value = "did:plc:shared"
+
+        assert await resolver.resolve_did("alice.bsky.social") == "did:plc:shared"
+
+        redis.get.assert_awaited_once_with("bluesky:did:alice.bsky.social")
+        id_resolver.handle.resolve.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_negative_entry_from_redis(self, id_resolver, redis):
+        redis.get.return_value = ""
+
+        assert await resolver.resolve_did("gone.example") is None
+        id_resolver.handle.resolve.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_results_are_published_with_ttl(self, id_resolver, redis):
+        await resolver.resolve_did("alice.bsky.social")
+        id_resolver.handle.resolve.return_value = None
+        await resolver.resolve_did("gone.example")
+
+        assert redis.set.await_args_list[0].args == ("bluesky:did:alice.bsky.social", "did:plc:alice")
+        assert redis.set.await_args_list[0].kwargs == {"ex": 86400}
+        assert redis.set.await_args_list[1].args == ("bluesky:did:gone.example", "")
+        assert redis.set.await_args_list[1].kwargs == {"ex": 300}
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_fall_back_to_resolution(self, id_resolver, redis):
+        redis.get.side_effect = ConnectionError("redis down")
+        redis.set.side_effect = ConnectionError("redis down")
+
+        assert await resolver.resolve_did("alice.bsky.social") == "did:plc:alice"
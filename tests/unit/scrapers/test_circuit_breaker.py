@@ -0,0 +1,230 @@
+"""Tests for packages/shared/fastfetchbot_shared/services/scrapers/circuit_breaker.py"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from fastfetchbot_shared.exceptions import CircuitOpenError
+from fastfetchbot_shared.services.scrapers import circuit_breaker
+from fastfetchbot_shared.services.scrapers.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    circuit,
+    get_breaker,
+)
+from fastfetchbot_shared.services.scrapers.hedge import HedgedExecutor
+
+
+@pytest.fixture(autouse=True)
+def breaker_settings():
+    with patch.object(circuit_breaker.settings, "CIRCUIT_BREAKER_FAILURE_RATE", 0.5), \
+            patch.object(circuit_breaker.settings, "CIRCUIT_BREAKER_MIN_CALLS", 3), \
+            patch.object(circuit_breaker.settings, "CIRCUIT_BREAKER_WINDOW", 60), \
+            patch.object(circuit_breaker.settings, "CIRCUIT_BREAKER_OPEN_SECONDS", 30), \
+            patch.object(circuit_breaker.settings, "CIRCUIT_BREAKER_SLOW_SECONDS", 5.0), \
+            patch.object(circuit_breaker.settings, "CIRCUIT_BREAKER_REDIS_URL", ""):
+        yield
+
+
+async def _fail(breaker: CircuitBreaker, times: int) -> None:
+    for _ in range(times):
+        await breaker.record(0.1, ok=False)
+
+
+# ---------------------------------------------------------------------------
+# CircuitBreaker
+# ---------------------------------------------------------------------------
+
+
+class TestCircuitBreaker:
+    @pytest.mark.asyncio
+    async def test_opens_once_min_calls_fail(self):
+        breaker = CircuitBreaker("test")
+        await _fail(breaker, 2)
+        assert breaker.state == CLOSED
+
+        await _fail(breaker, 1)
+        assert breaker.state == OPEN
+        assert await breaker.allow() is False
+
+    @pytest.mark.asyncio
+    async def test_stays_closed_below_failure_rate(self):
+        breaker = CircuitBreaker("test")
+        for ok in (True, True, False, True):
+            await breaker.record(0.1, ok=ok)
+
+        assert breaker.state == CLOSED
+
+    @pytest.mark.asyncio
+    async def test_slow_calls_count_as_failures(self):
+        breaker = CircuitBreaker("test")
+        for _ in range(3):
+            await breaker.record(6.0, ok=True)
+
+        assert breaker.state == OPEN
+
+    @pytest.mark.asyncio
+    async def test_half_open_allows_single_probe_and_closes_on_success(self):
+        breaker = CircuitBreaker("test")
+        await _fail(breaker, 3)
+        breaker.opened_until = 0.0
+
+        assert await breaker.allow() is True
+        assert breaker.state == HALF_OPEN
+        assert await breaker.allow() is False
+
+        await breaker.record(0.1, ok=True)
+        assert breaker.state == CLOSED
+        assert len(breaker.calls) == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker("test")
+        await _fail(breaker, 3)
+        breaker.opened_until = 0.0
+
+        assert await breaker.allow() is True
+        await breaker.record(0.1, ok=False)
+
+        assert breaker.state == OPEN
+        assert await breaker.allow() is False
+
+    @pytest.mark.asyncio
+    async def test_cancelled_probe_frees_half_open_slot(self):
+        breaker = CircuitBreaker("test")
+        await _fail(breaker, 3)
+        breaker.opened_until = 0.0
+
+        assert await breaker.allow() is True
+        breaker.cancel()
+        assert await breaker.allow() is True
+
+    @pytest.mark.asyncio
+    async def test_snapshot_reports_state_and_error_rate(self):
+        breaker = get_breaker("snapshot-test")
+        await breaker.record(0.2, ok=True)
+        await breaker.record(0.4, ok=False)
+
+        state = circuit_breaker.breaker_states()["snapshot-test"]
+        assert state["state"] == CLOSED
+        assert state["calls"] == 2
+        assert state["error_rate"] == 0.5
+        assert state["opened_until"] is None
+
+
+# ---------------------------------------------------------------------------
+# Redis sharing
+# ---------------------------------------------------------------------------
+
+
+class TestRedisSharing:
+    @pytest.mark.asyncio
+    async def test_opening_is_published(self):
+        redis = AsyncMock()
+        redis.get.return_value = None
+        with patch.object(circuit_breaker, "_get_redis", return_value=redis):
+            breaker = CircuitBreaker("shared")
+            await _fail(breaker, 3)
+
+        redis.set.assert_awaited_once()
+        args, kwargs = redis.set.call_args
+        assert args[0] == "circuit:shared"
+        assert args[1] == breaker.opened_until
+        assert kwargs["px"] == 30000
+
+    @pytest.mark.asyncio
+    async def test_circuit_opened_elsewhere_is_picked_up(self):
+        redis = AsyncMock()
+        redis.get.return_value = "9999999999.0"
+        with patch.object(circuit_breaker, "_get_redis", return_value=redis):
+            breaker = CircuitBreaker("shared")
+            assert await breaker.allow() is False
+
+        assert breaker.state == OPEN
+        redis.get.assert_awaited_once_with("circuit:shared")
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_are_ignored(self):
+        redis = AsyncMock()
+        redis.get.side_effect = ConnectionError("down")
+        redis.set.side_effect = ConnectionError("down")
+        with patch.object(circuit_breaker, "_get_redis", return_value=redis):
+            breaker = CircuitBreaker("shared")
+            assert await breaker.allow() is True
+            await _fail(breaker, 3)
+
+        assert breaker.state == OPEN
+
+
+# ---------------------------------------------------------------------------
+# circuit()
+# ---------------------------------------------------------------------------
+
+
+class TestCircuitContext:
+    @pytest.mark.asyncio
+    async def test_records_outcomes(self):
+        async with circuit("ctx"):
+            pass
+        with pytest.raises(RuntimeError):
+            async with circuit("ctx"):
+                raise RuntimeError("boom")
+
+        assert [failed for _, failed, _ in get_breaker("ctx").calls] == [False, True]
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_raises_without_calling(self):
+        await _fail(get_breaker("ctx"), 3)
+        called = False
+
+        with pytest.raises(CircuitOpenError):
+            async with circuit("ctx"):
+                called = True
+
+        assert called is False
+
+
+# ---------------------------------------------------------------------------
+# Hedged fallback chains
+# ---------------------------------------------------------------------------
+
+
+class TestHedgeIntegration:
+    @pytest.mark.asyncio
+    async def test_open_backend_is_skipped(self):
+        calls = []
+
+        def backend(name):
+            async def run():
+                calls.append(name)
+                return name
+
+            return run
+
+        await _fail(get_breaker("chain:a"), 3)
+        result = await HedgedExecutor("chain").run({"a": backend("a"), "b": backend("b")})
+
+        assert result == ("b", "b")
+        assert calls == ["b"]
+
+    @pytest.mark.asyncio
+    async def test_all_open_raises_circuit_open_error(self):
+        async def never():
+            raise AssertionError("should not be called")
+
+        await _fail(get_breaker("chain:a"), 3)
+        with pytest.raises(CircuitOpenError):
+            await HedgedExecutor("chain").run({"a": never})
+
+    @pytest.mark.asyncio
+    async def test_failures_feed_the_breaker(self):
+        async def down():
+            raise RuntimeError("down")
+
+        for _ in range(3):
+            with pytest.raises(RuntimeError):
+                await HedgedExecutor("chain").run({"a": down})
+
+        assert get_breaker("chain:a").state == OPEN
@@ -64,8 +64,7 @@ class TestGetItemCacheLookup:
     @pytest.mark.asyncio
     async def test_cache_hit_returns_cached_result(self, make_service):
         """When cache has a valid entry, return it with _cached=True."""
-        mock_cached_doc = MagicMock()
-        mock_cached_doc.model_dump.return_value = {
+        cached = {
             "title": "Cached Title",
             "url": "https://example.com/post/1",
             "media_files": [],
@@ -76,14 +75,26 @@ class TestGetItemCacheLookup:
         with patch(
             "fastfetchbot_shared.database.mongodb.cache.find_cached",
             new_callable=AsyncMock,
-            return_value=mock_cached_doc,
+            return_value=cached,
         ):
             result = await svc.get_item()
 
         assert result["_cached"] is True
         assert result["title"] == "Cached Title"
-        mock_cached_doc.model_dump.assert_called_once_with(
-            mode="json", exclude={"id"}
+
+    @pytest.mark.asyncio
+    async def test_cache_fields_are_passed_to_find_cached(self, make_service):
+        svc = make_service(cache_fields=("url", "title"))
+
+        with patch(
+            "fastfetchbot_shared.database.mongodb.cache.find_cached",
+            new_callable=AsyncMock,
+            return_value={"url": "https://example.com/post/1", "title": "t"},
+        ) as mock_find_cached:
+            await svc.get_item()
+
+        mock_find_cached.assert_awaited_once_with(
+            "https://example.com/post/1", 3600, fields=("url", "title")
         )
 
     @pytest.mark.asyncio
@@ -176,22 +187,16 @@ class TestGetItemCacheLookup:
     @pytest.mark.asyncio
     async def test_cache_ttl_zero_passes_to_find_cached(self, make_service):
         """TTL=0 means 'never expire', should still call find_cached with ttl=0."""
-        mock_cached_doc = MagicMock()
-        mock_cached_doc.model_dump.return_value = {
-            "title": "Never Expired",
-            "url": "https://example.com/post/1",
-        }
-
         svc = make_service(store_database=True, database_cache_ttl=0)
 
         with patch(
             "fastfetchbot_shared.database.mongodb.cache.find_cached",
             new_callable=AsyncMock,
-            return_value=mock_cached_doc,
+            return_value={"title": "Never Expired", "url": "https://example.com/post/1"},
         ) as mock_find_cached:
             result = await svc.get_item()
 
         mock_find_cached.assert_awaited_once_with(
-            "https://example.com/post/1", 0
+            "https://example.com/post/1", 0, fields=None
         )
         assert result["_cached"] is True
@@ -0,0 +1,207 @@
+"""Tests for packages/shared/fastfetchbot_shared/services/scrapers/hedge.py"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from fastfetchbot_shared.services.scrapers import hedge
+from fastfetchbot_shared.services.scrapers.hedge import BackendStats, HedgedExecutor
+
+
+@pytest.fixture(autouse=True)
+def fast_hedging():
+    with patch.object(hedge.settings, "HEDGE_DEFAULT_DELAY", 0.05), \
+            patch.object(hedge.settings, "HEDGE_MIN_DELAY", 0.01), \
+            patch.object(hedge.settings, "HEDGE_PERCENTILE", 0.9), \
+            patch.object(hedge.settings, "HEDGE_WINDOW", 50):
+        yield
+
+
+def _backend(result=None, delay=0.0, error=None, calls=None, name=None):
+    async def run():
+        if calls is not None:
+            calls.append(name)
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return result
+
+    return run
+
+
+# ---------------------------------------------------------------------------
+# BackendStats
+# ---------------------------------------------------------------------------
+
+
+class TestBackendStats:
+    def test_untried_backend_has_neutral_success_rate(self):
+        assert BackendStats(10).success_rate == 0.5
+
+    def test_latency_percentile_ignores_failures(self):
+        stats = BackendStats(10)
+        for seconds in (0.1, 0.2, 0.3, 0.4):
+            stats.record(seconds, ok=True)
+        stats.record(9.0, ok=False)
+
+        assert stats.latency(0.5) == 0.3
+        assert stats.latency(0.9) == 0.4
+
+    def test_window_drops_old_calls(self):
+        stats = BackendStats(2)
+        stats.record(0.1, ok=False)
+        stats.record(0.1, ok=True)
+        stats.record(0.1, ok=True)
+
+        assert list(stats.outcomes) == [True, True]
+
+
+# ---------------------------------------------------------------------------
+# HedgedExecutor.run
+# ---------------------------------------------------------------------------
+
+
+class TestRun:
+    @pytest.mark.asyncio
+    async def test_first_backend_wins_without_hedging(self):
+        calls = []
+        executor = HedgedExecutor("test")
+
+        result = await executor.run({
+            "a": _backend("A", calls=calls, name="a"),
+            "b": _backend("B", calls=calls, name="b"),
+        })
+
+        assert result == ("a", "A")
+        assert calls == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_slow_backend_is_hedged_and_cancelled(self):
+        cancelled = asyncio.Event()
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        executor = HedgedExecutor("test")
+        result = await asyncio.wait_for(
+            executor.run({"slow": slow, "fast": _backend("F")}), timeout=1
+        )
+        await asyncio.sleep(0)
+
+        assert result == ("fast", "F")
+        assert cancelled.is_set()
+
+    @pytest.mark.asyncio
+    async def test_hanging_backend_drops_behind(self):
+        calls = []
+        executor = HedgedExecutor("test")
+        backends = {
+            "a": _backend("A", delay=10, calls=calls, name="a"),
+            "b": _backend("B", calls=calls, name="b"),
+        }
+
+        result = await asyncio.wait_for(executor.run(backends), timeout=1)
+
+        assert result == ("b", "B")
+        assert calls == ["a", "b"]
+        assert list(executor.stats["a"].outcomes) == [False]
+        assert executor.order(["a", "b"]) == ["b", "a"]
+
+        calls.clear()
+        assert await executor.run(backends) == ("b", "B")
+        assert calls == ["b"]
+
+    @pytest.mark.asyncio
+    async def test_loser_within_hedge_delay_is_not_penalised(self):
+        executor = HedgedExecutor("test")
+        result = await asyncio.wait_for(
+            executor.run({"a": _backend("A", delay=0.07), "b": _backend("B", delay=10)}),
+            timeout=1,
+        )
+
+        assert result == ("a", "A")
+        assert "b" not in executor.stats or not executor.stats["b"].outcomes
+
+    @pytest.mark.asyncio
+    async def test_failure_starts_next_backend_immediately(self):
+        executor = HedgedExecutor("test")
+        with patch.object(hedge.settings, "HEDGE_DEFAULT_DELAY", 10):
+            result = await asyncio.wait_for(
+                executor.run({"a": _backend(error=RuntimeError("down")), "b": _backend("B")}),
+                timeout=1,
+            )
+
+        assert result == ("b", "B")
+
+    @pytest.mark.asyncio
+    async def test_invalid_result_counts_as_failure(self):
+        executor = HedgedExecutor("test")
+
+        result = await executor.run(
+            {"a": _backend(""), "b": _backend("B")}, validate=bool
+        )
+
+        assert result == ("b", "B")
+        assert list(executor.stats["a"].outcomes) == [False]
+
+    @pytest.mark.asyncio
+    async def test_all_failing_raises_last_error(self):
+        executor = HedgedExecutor("test")
+
+        with pytest.raises(KeyError):
+            await executor.run({
+                "a": _backend(error=RuntimeError("a")),
+                "b": _backend(error=KeyError("b")),
+            })
+
+
+# ---------------------------------------------------------------------------
+# Ordering and hedge delays
+# ---------------------------------------------------------------------------
+
+
+class TestOrdering:
+    def test_keeps_given_order_without_stats(self):
+        assert HedgedExecutor("test").order(["a", "b", "c"]) == ["a", "b", "c"]
+
+    def test_failing_backend_drops_behind(self):
+        executor = HedgedExecutor("test")
+        for _ in range(3):
+            executor._stats("a").record(0.05, ok=False)
+            executor._stats("b").record(0.05, ok=True)
+
+        assert executor.order(["a", "b"]) == ["b", "a"]
+
+    def test_slow_backend_drops_behind(self):
+        executor = HedgedExecutor("test")
+        for _ in range(3):
+            executor._stats("a").record(2.0, ok=True)
+            executor._stats("b").record(0.1, ok=True)
+
+        assert executor.order(["a", "b"]) == ["b", "a"]
+
+    def test_hedge_delay_follows_percentile_with_floor(self):
+        executor = HedgedExecutor("test")
+        assert executor.hedge_delay("a") == 0.05
+
+        executor._stats("a").record(0.001, ok=True)
+        assert executor.hedge_delay("a") == 0.01
+
+        for _ in range(9):
+            executor._stats("a").record(0.5, ok=True)
+        assert executor.hedge_delay("a") == 0.5
+
+
+class TestRegistry:
+    def test_get_executor_is_shared_and_reset_clears_stats(self):
+        executor = hedge.get_executor("registry-test")
+        executor._stats("a").record(0.1, ok=True)
+
+        assert hedge.get_executor("registry-test") is executor
+        hedge.reset_stats()
+        assert executor.stats == {}
@@ -65,16 +65,19 @@ def _patch_reddit_templates():
 
 
 @pytest.fixture
-def _patch_asyncpraw():
-    with patch("fastfetchbot_shared.services.scrapers.reddit.asyncpraw") as mock_praw:
-        yield mock_praw
+def _patch_get_submission():
+    with patch(
+        "fastfetchbot_shared.services.scrapers.reddit.get_submission",
+        new_callable=AsyncMock,
+    ) as m:
+        yield m
 
 
 @pytest.fixture
-def _patch_redirect_url():
-    """Patch get_redirect_url where reddit module imports it."""
+def _patch_resolve_share_url():
+    """Patch resolve_share_url where reddit module imports it."""
     with patch(
-        "fastfetchbot_shared.services.scrapers.reddit.get_redirect_url",
+        "fastfetchbot_shared.services.scrapers.reddit.resolve_share_url",
         new_callable=AsyncMock,
     ) as m:
         yield m
@@ -99,19 +102,13 @@ class TestRedditInit:
 class TestRedditGetItem:
 
     @pytest.mark.asyncio
-    async def test_get_item_returns_dict(self, _patch_asyncpraw, _patch_redirect_url):
+    async def test_get_item_returns_dict(self, _patch_get_submission, _patch_resolve_share_url):
         from fastfetchbot_shared.services.scrapers.reddit import Reddit
 
-        _patch_redirect_url.return_value = "https://www.reddit.com/r/test/comments/abc/post/"
+        _patch_resolve_share_url.return_value = "https://www.reddit.com/r/test/comments/abc/post/"
+        _patch_get_submission.return_value = _make_reddit_data()
 
-        mock_submission = MagicMock()
-        mock_submission.__dict__ = _make_reddit_data()
-
-        mock_reddit_instance = AsyncMock()
-        mock_reddit_instance.submission = AsyncMock(return_value=mock_submission)
-        _patch_asyncpraw.Reddit.return_value = mock_reddit_instance
-
-        r = Reddit("https://redd.it/abc")
+        r = Reddit("https://www.reddit.com/r/test/s/abc")
         result = await r.get_item()
 
         assert isinstance(result, dict)
@@ -122,40 +119,34 @@ class TestRedditGetItem:
 class TestRedditGetReddit:
 
     @pytest.mark.asyncio
-    async def test_get_reddit_calls_redirect_and_process(self, _patch_asyncpraw, _patch_redirect_url):
+    async def test_get_reddit_resolves_share_link_and_processes(
+        self, _patch_get_submission, _patch_resolve_share_url
+    ):
         from fastfetchbot_shared.services.scrapers.reddit import Reddit
 
-        _patch_redirect_url.return_value = "https://www.reddit.com/r/test/comments/abc/post/"
-
-        mock_submission = MagicMock()
-        mock_submission.__dict__ = _make_reddit_data()
-        mock_reddit_instance = AsyncMock()
-        mock_reddit_instance.submission = AsyncMock(return_value=mock_submission)
-        _patch_asyncpraw.Reddit.return_value = mock_reddit_instance
+        _patch_resolve_share_url.return_value = "https://www.reddit.com/r/test/comments/abc/post/"
+        _patch_get_submission.return_value = _make_reddit_data()
 
-        r = Reddit("https://redd.it/abc")
+        r = Reddit("https://www.reddit.com/r/test/s/abc")
         await r.get_reddit()
 
-        _patch_redirect_url.assert_awaited_once()
+        _patch_resolve_share_url.assert_awaited_once_with("https://www.reddit.com/r/test/s/abc")
+        _patch_get_submission.assert_awaited_once_with("https://www.reddit.com/r/test/comments/abc/post/")
         assert r.title == "Test Post"
 
 
 class TestRedditGetRedditData:
 
     @pytest.mark.asyncio
-    async def test_get_reddit_data_creates_praw_client(self, _patch_asyncpraw):
+    async def test_get_reddit_data_uses_shared_client(self, _patch_get_submission):
         from fastfetchbot_shared.services.scrapers.reddit import Reddit
 
-        mock_submission = MagicMock()
-        mock_submission.__dict__ = {"test": "data"}
-        mock_reddit_instance = AsyncMock()
-        mock_reddit_instance.submission = AsyncMock(return_value=mock_submission)
-        _patch_asyncpraw.Reddit.return_value = mock_reddit_instance
+        _patch_get_submission.return_value = {"test": "data"}
 
         r = Reddit("https://www.reddit.com/r/test/comments/abc/post/")
         result = await r._get_reddit_data()
 
-        _patch_asyncpraw.Reddit.assert_called_once()
+        _patch_get_submission.assert_awaited_once_with("https://www.reddit.com/r/test/comments/abc/post/")
         assert result == {"test": "data"}
 
 
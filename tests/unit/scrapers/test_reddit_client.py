@@ -0,0 +1,180 @@
+"""Tests for packages/shared/fastfetchbot_shared/services/scrapers/reddit/client.py"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from fastfetchbot_shared.exceptions import ScraperParseError
+from fastfetchbot_shared.services.scrapers.reddit import client
+
+POST_URL = "https://www.reddit.com/r/test/comments/{}/post/"
+
+
+def _submission(sid):
+    submission = MagicMock()
+    submission.__dict__ = {"id": sid, "title": f"post {sid}"}
+    return submission
+
+
+@pytest.fixture(autouse=True)
+def fresh_client():
+    client.reset()
+    with patch.object(client, "_reddit", None), \
+            patch.object(client, "_http", None), \
+            patch.object(client.settings, "REDDIT_SUBMISSION_CACHE_TTL", 300), \
+            patch.object(client.settings, "REDDIT_BATCH_SUBMISSIONS", True), \
+            patch.object(client.settings, "REDDIT_BATCH_WINDOW", 0.0):
+        yield
+    client.reset()
+
+
+@pytest.fixture
+def reddit():
+    mock = MagicMock()
+    mock.submission = AsyncMock(side_effect=lambda id: _submission(id))
+
+    async def info(fullnames):
+        for fullname in fullnames:
+            yield _submission(fullname[len("t3_"):])
+
+    mock.info = MagicMock(side_effect=info)
+    mock.close = AsyncMock()
+    with patch.object(client.asyncpraw, "Reddit", return_value=mock) as reddit_class:
+        mock.reddit_class = reddit_class
+        yield mock
+
+
+class TestRedditClient:
+    def test_client_is_shared(self, reddit):
+        assert client.get_reddit_client() is client.get_reddit_client()
+        reddit.reddit_class.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_close_reddit_client(self, reddit):
+        client.get_reddit_client()
+        await client.close_reddit_client()
+
+        reddit.close.assert_awaited_once()
+        assert client._reddit is None
+
+
+class TestResolveShareUrl:
+    @pytest.mark.asyncio
+    async def test_share_link_is_resolved_once(self):
+        with patch.object(
+            client, "get_redirect_url", new_callable=AsyncMock, return_value=POST_URL.format("abc")
+        ) as redirect:
+            for _ in range(2):
+                assert await client.resolve_share_url("https://www.reddit.com/r/test/s/XyZ") == POST_URL.format("abc")
+
+        redirect.assert_awaited_once()
+        assert redirect.await_args.kwargs["client"] is client._http
+        await client.close_reddit_client()
+
+    @pytest.mark.asyncio
+    async def test_submission_url_is_not_requested(self):
+        with patch.object(client, "get_redirect_url", new_callable=AsyncMock) as redirect:
+            assert await client.resolve_share_url(POST_URL.format("abc")) == POST_URL.format("abc")
+
+        redirect.assert_not_awaited()
+
+
+class TestGetSubmission:
+    @pytest.mark.asyncio
+    async def test_single_request_fetches_by_id(self, reddit):
+        assert await client.get_submission(POST_URL.format("abc")) == {"id": "abc", "title": "post abc"}
+
+        reddit.submission.assert_awaited_once_with(id="abc")
+        reddit.info.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_submission_is_cached(self, reddit):
+        await client.get_submission(POST_URL.format("abc"))
+        await client.get_submission("https://redd.it/abc")
+
+        reddit.submission.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_expired_submission_is_fetched_again(self, reddit):
+        with patch.object(client.settings, "REDDIT_SUBMISSION_CACHE_TTL", 0):
+            await client.get_submission(POST_URL.format("abc"))
+            await client.get_submission(POST_URL.format("abc"))
+
+        assert reddit.submission.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_info_call(self, reddit):
+        results = await asyncio.gather(
+            *(client.get_submission(POST_URL.format(sid)) for sid in ("a1", "b2", "a1", "c3"))
+        )
+
+        assert [r["id"] for r in results] == ["a1", "b2", "a1", "c3"]
+        reddit.info.assert_called_once_with(fullnames=["t3_a1", "t3_b2", "t3_c3"])
+        reddit.submission.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_batching_disabled(self, reddit):
+        with patch.object(client.settings, "REDDIT_BATCH_SUBMISSIONS", False):
+            await asyncio.gather(*(client.get_submission(POST_URL.format(sid)) for sid in ("a1", "b2")))
+
+        assert reddit.submission.await_count == 2
+        reddit.info.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_missing_submission_in_batch(self, reddit):
+        async def info(fullnames):
+            yield _submission("a1")
+
+        reddit.info.side_effect = info
+
+        found, missing = await asyncio.gather(
+            client.get_submission(POST_URL.format("a1")),
+            client.get_submission(POST_URL.format("b2")),
+            return_exceptions=True,
+        )
+
+        assert found["id"] == "a1"
+        assert isinstance(missing, ScraperParseError)
+
+    @pytest.mark.asyncio
+    async def test_fetch_error_reaches_every_caller(self, reddit):
+        reddit.submission.side_effect = ConnectionError("reddit down")
+
+        with pytest.raises(ConnectionError):
+            await client.get_submission(POST_URL.format("abc"))
+        assert client._pending == []
+
+    @pytest.mark.asyncio
+    async def test_not_a_submission_url(self, reddit):
+        with pytest.raises(ScraperParseError):
+            await client.get_submission("https://www.reddit.com/r/test/")
+
+
+class TestFetchSubmissions:
+    @pytest.mark.asyncio
+    async def test_batch_is_fetched_in_one_call_and_cached(self, reddit):
+        urls = [POST_URL.format("a1"), "https://example.com/a2", "https://redd.it/b2", POST_URL.format("a1")]
+
+        fetched = await client.fetch_submissions(urls)
+
+        assert sorted(fetched) == ["a1", "b2"]
+        reddit.info.assert_called_once_with(fullnames=["t3_a1", "t3_b2"])
+        assert await client.get_submission(POST_URL.format("b2")) == fetched["b2"]
+        reddit.submission.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_large_batches_are_chunked(self, reddit):
+        with patch.object(client, "INFO_BATCH_SIZE", 2):
+            await client.fetch_submissions(POST_URL.format(f"s{i}") for i in range(5))
+
+        assert reddit.info.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_cached_submissions_are_skipped(self, reddit):
+        await client.get_submission(POST_URL.format("a1"))
+
+        await client.fetch_submissions([POST_URL.format("a1"), POST_URL.format("b2")])
+
+        assert reddit.submission.await_args_list[-1].kwargs == {"id": "b2"}
+        reddit.info.assert_not_called()
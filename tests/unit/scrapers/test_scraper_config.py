@@ -212,6 +212,17 @@ class TestCustomEnvVars:
         assert cfg.settings.TWITTER_CT0 == "ct0val"
         assert cfg.settings.TWITTER_AUTH_TOKEN == "authval"
         assert cfg.settings.TWITTER_COOKIES == {"ct0": "ct0val", "auth_token": "authval"}
+        assert cfg.settings.twitter_cookie_sets == [{"ct0": "ct0val", "auth_token": "authval"}]
+
+    def test_twitter_cookie_sets(self):
+        cfg = _reload_config(
+            env_overrides={"TWITTER_COOKIE_SETS": "ct0a:autha, ct0b:authb"},
+            path_exists_side_effect=lambda p: False,
+        )
+        assert cfg.settings.twitter_cookie_sets == [
+            {"ct0": "ct0a", "auth_token": "autha"},
+            {"ct0": "ct0b", "auth_token": "authb"},
+        ]
 
     def test_custom_bluesky_vars(self):
         cfg = _reload_config(
@@ -141,7 +141,7 @@ class TestInitBlueskyScraperDirect:
         mock_instance.init = AsyncMock()
 
         with patch(
-            "fastfetchbot_shared.services.scrapers.scraper_manager.BlueskyScraper",
+            "fastfetchbot_shared.services.scrapers.bluesky.scraper.BlueskyScraper",
             return_value=mock_instance,
         ) as MockCls, patch(
             "fastfetchbot_shared.services.scrapers.config.settings.BLUESKY_USERNAME",
@@ -168,7 +168,7 @@ class TestInitWeiboScraperDirect:
         mock_instance = MagicMock()
 
         with patch(
-            "fastfetchbot_shared.services.scrapers.scraper_manager.WeiboScraper",
+            "fastfetchbot_shared.services.scrapers.weibo.scraper.WeiboScraper",
             return_value=mock_instance,
         ) as MockCls:
             result = await ScraperManager.init_weibo_scraper()
@@ -188,7 +188,7 @@ class TestInitGeneralScraperDirect:
         mock_instance = MagicMock()
 
         with patch(
-            "fastfetchbot_shared.services.scrapers.scraper_manager.GeneralScraper",
+            "fastfetchbot_shared.services.scrapers.general.scraper.GeneralScraper",
             return_value=mock_instance,
         ) as MockCls:
             result = await ScraperManager.init_general_scraper()
@@ -0,0 +1,95 @@
+"""Tests for packages/shared/fastfetchbot_shared/services/scrapers/registry.py"""
+
+import subprocess
+import sys
+import types
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+import fastfetchbot_shared.services.scrapers as scrapers
+from fastfetchbot_shared.services.scrapers import registry
+from fastfetchbot_shared.services.scrapers.common import InfoExtractService
+
+
+class TestLazyImports:
+    def test_config_does_not_load_platform_modules(self):
+        code = (
+            "import sys\n"
+            "import fastfetchbot_shared.services.scrapers.config\n"
+            "import fastfetchbot_shared.services.scrapers.common\n"
+            "loaded = [m for m in ('asyncpraw', 'atproto', 'twitter', 'openai', 'playwright') if m in sys.modules]\n"
+            "print(','.join(loaded))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip() == ""
+
+    def test_package_attributes_are_loaded_on_access(self):
+        assert scrapers.InfoExtractService is InfoExtractService
+        assert scrapers.reddit.Reddit is registry.load(registry.SCRAPER_CLASSES["reddit"])
+
+    def test_unknown_attribute(self):
+        with pytest.raises(AttributeError):
+            scrapers.not_a_scraper
+
+    def test_every_registered_path_resolves(self):
+        for path in [*registry.SCRAPER_CLASSES.values(), *registry.MANAGED_SCRAPERS.values()]:
+            assert isinstance(registry.load(path), type)
+
+    def test_info_extract_service_loads_class_from_path(self, make_url_metadata):
+        svc = InfoExtractService(make_url_metadata(source="zhihu"))
+        assert svc._resolve_scraper_class("zhihu").__name__ == "Zhihu"
+
+
+class TestWarmUp:
+    def test_loads_selected_categories(self):
+        with patch.object(registry, "load") as load:
+            assert registry.warm_up(["weibo", "reddit"]) == ["reddit", "weibo"]
+
+        assert [c.args[0] for c in load.call_args_list] == [
+            registry.SCRAPER_CLASSES["reddit"],
+            registry.SCRAPER_CLASSES["weibo"],
+            registry.MANAGED_SCRAPERS["weibo"],
+        ]
+
+    def test_missing_dependency_is_skipped(self):
+        def load(path):
+            if path == registry.SCRAPER_CLASSES["twitter"]:
+                raise ImportError("No module named 'twitter'")
+
+        with patch.object(registry, "load", side_effect=load):
+            loaded = registry.warm_up()
+
+        assert "twitter" not in loaded
+        assert "general" in loaded
+
+    @pytest.mark.asyncio
+    async def test_start_warm_up_runs_in_background(self):
+        with patch.object(registry.settings, "SCRAPER_WARMUP", True), \
+                patch.object(registry.settings, "SCRAPER_WARMUP_CATEGORIES", "zhihu, douban"), \
+                patch.object(registry, "warm_up", return_value=["zhihu", "douban"]) as warm_up:
+            task = registry.start_warm_up()
+            assert registry.start_warm_up() is task
+            assert await task == ["zhihu", "douban"]
+
+        warm_up.assert_called_once_with(["zhihu", "douban"])
+
+    def test_start_warm_up_disabled(self):
+        assert registry.start_warm_up() is None
+
+
+class TestCloseLoadedScrapers:
+    @pytest.mark.asyncio
+    async def test_only_loaded_modules_are_closed(self):
+        loaded = types.ModuleType("loaded_scraper")
+        loaded.close = AsyncMock()
+        hooks = {"loaded_scraper": "close", "never_imported_scraper": "close"}
+
+        with patch.dict(registry.CLOSE_HOOKS, hooks, clear=True), \
+                patch.dict(sys.modules, {"loaded_scraper": loaded}):
+            await registry.close_loaded_scrapers()
+
+        loaded.close.assert_awaited_once()
+        assert "never_imported_scraper" not in sys.modules
@@ -228,7 +228,7 @@ class TestGetResponseTweetData:
         tw = Twitter(url="https://twitter.com/user/status/1", instruction="single")
         call_count = 0
 
-        async def side_effect():
+        async def side_effect(scraper):
             nonlocal call_count
             call_count += 1
             if call_count == 1:
@@ -403,13 +403,13 @@ class TestApiClientGetResponseTweetData:
     async def test_api_client(self):
         from fastfetchbot_shared.services.scrapers.twitter import Twitter
         tw = Twitter(url="https://twitter.com/user/status/123")
-        mock_scraper_instance = MagicMock()
-        mock_scraper_instance.tweets_details.return_value = [{"data": "tweet_detail"}]
+        mock_pool = MagicMock()
+        mock_pool.tweet_detail = AsyncMock(return_value={"data": "tweet_detail"})
 
-        with patch("fastfetchbot_shared.services.scrapers.twitter.Scraper", return_value=mock_scraper_instance):
-            with patch("asyncio.to_thread", new_callable=AsyncMock, return_value=[{"data": "tweet_detail"}]):
-                result = await tw._api_client_get_response_tweet_data()
+        with patch("fastfetchbot_shared.services.scrapers.twitter.get_session_pool", return_value=mock_pool):
+            result = await tw._api_client_get_response_tweet_data()
         assert result == {"data": "tweet_detail"}
+        mock_pool.tweet_detail.assert_awaited_once_with(123)
 
 
 # ---------------------------------------------------------------------------
@@ -1202,21 +1202,19 @@ class TestGetRequestHeaders:
     def test_sets_headers_and_params(self):
         from fastfetchbot_shared.services.scrapers.twitter import Twitter
         tw = Twitter(url="https://twitter.com/user/status/42")
-        tw.scraper = "Twitter135"
-        tw._get_request_headers()
-        assert tw.host == "https://twitter135.p.rapidapi.com/v2/TweetDetail/"
-        assert "X-RapidAPI-Key" in tw.headers
-        assert "X-RapidAPI-Host" in tw.headers
-        assert tw.headers["X-RapidAPI-Host"] == "twitter135.p.rapidapi.com"
-        assert tw.params == {"id": "42"}
+        host, headers, params = tw._get_request_headers("Twitter135")
+        assert host == "https://twitter135.p.rapidapi.com/v2/TweetDetail/"
+        assert "X-RapidAPI-Key" in headers
+        assert "X-RapidAPI-Host" in headers
+        assert headers["X-RapidAPI-Host"] == "twitter135.p.rapidapi.com"
+        assert params == {"id": "42"}
 
     def test_twitter154_headers(self):
         from fastfetchbot_shared.services.scrapers.twitter import Twitter
         tw = Twitter(url="https://twitter.com/user/status/55")
-        tw.scraper = "Twitter154"
-        tw._get_request_headers()
-        assert tw.host == "https://twitter154.p.rapidapi.com/tweet/details/"
-        assert tw.params == {"tweet_id": "55"}
+        host, _, params = tw._get_request_headers("Twitter154")
+        assert host == "https://twitter154.p.rapidapi.com/tweet/details/"
+        assert params == {"tweet_id": "55"}
 
 
 # ---------------------------------------------------------------------------
@@ -72,7 +72,7 @@ class TestRapidapiResponseValidation:
             MockClient.return_value.__aenter__ = AsyncMock(return_value=mock_client)
             MockClient.return_value.__aexit__ = AsyncMock(return_value=False)
 
-            with patch.object(tw, "_get_request_headers"):
+            with patch.object(tw, "_get_request_headers", return_value=("https://host", {}, {})):
                 with pytest.raises(ScraperParseError, match="Invalid response"):
                     await tw._rapidapi_get_response_tweet_data()
 
@@ -92,6 +92,6 @@ class TestRapidapiResponseValidation:
             MockClient.return_value.__aenter__ = AsyncMock(return_value=mock_client)
             MockClient.return_value.__aexit__ = AsyncMock(return_value=False)
 
-            with patch.object(tw, "_get_request_headers"):
+            with patch.object(tw, "_get_request_headers", return_value=("https://host", {}, {})):
                 with pytest.raises(ScraperParseError, match="Invalid response"):
                     await tw._rapidapi_get_response_tweet_data()
@@ -0,0 +1,202 @@
+"""Tests for packages/shared/fastfetchbot_shared/services/scrapers/twitter/session_pool.py"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from twitter.constants import static_variables, target_features, target_field_toggles
+
+from fastfetchbot_shared.exceptions import ScraperError, ScraperParseError
+from fastfetchbot_shared.services.scrapers.twitter import session_pool
+from fastfetchbot_shared.services.scrapers.twitter.session_pool import (
+    TWEET_DETAIL,
+    ApiClientPool,
+)
+
+MODULE = "fastfetchbot_shared.services.scrapers.twitter.session_pool"
+
+
+def _response(status_code=200, body=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = {"data": {"tweet": 1}} if body is None else body
+    return response
+
+
+@pytest.fixture(autouse=True)
+def pool_settings():
+    with patch.object(session_pool.settings, "TWITTER_SESSION_RATE_LIMIT", 2), \
+            patch.object(session_pool.settings, "TWITTER_SESSION_RATE_WINDOW", 900), \
+            patch.object(session_pool.settings, "TWITTER_SESSION_COOLDOWN", 30.0):
+        yield
+
+
+@pytest.fixture
+def scrapers():
+    """Patch Scraper so each session gets its own mock with an async _query."""
+    created = []
+
+    def make_scraper(**kwargs):
+        scraper = MagicMock()
+        scraper.rate_limits = {}
+        scraper._query = AsyncMock(return_value=_response())
+        scraper.cookies = kwargs["cookies"]
+        created.append(scraper)
+        return scraper
+
+    def make_client(**kwargs):
+        client = MagicMock()
+        client.aclose = AsyncMock()
+        return client
+
+    with patch(f"{MODULE}.Scraper", side_effect=make_scraper), \
+            patch(f"{MODULE}.get_headers", return_value={}), \
+            patch(f"{MODULE}.httpx.AsyncClient", side_effect=make_client):
+        yield created
+
+
+def _pool(count=2) -> ApiClientPool:
+    pool = ApiClientPool([{"ct0": f"ct0-{i}", "auth_token": f"auth-{i}"} for i in range(count)])
+    pool.warm()
+    return pool
+
+
+class TestApiClientPool:
+    @pytest.mark.asyncio
+    async def test_sessions_are_reused(self, scrapers):
+        pool = _pool(count=1)
+
+        await pool.tweet_detail(1)
+        await pool.tweet_detail(2)
+
+        assert len(scrapers) == 1
+        assert scrapers[0]._query.await_count == 2
+        kwargs = scrapers[0]._query.call_args.kwargs
+        assert kwargs["focalTweetId"] == 2
+        assert kwargs["features"] == target_features
+        assert kwargs["fieldToggles"] == target_field_toggles
+        for name, value in static_variables.items():
+            assert kwargs[name] == value
+
+    @pytest.mark.asyncio
+    async def test_requests_spread_across_sessions(self, scrapers):
+        pool = _pool(count=2)
+
+        await pool.tweet_detail(1)
+        await pool.tweet_detail(2)
+
+        assert [s._query.await_count for s in scrapers] == [1, 1]
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_sessions_are_skipped(self, scrapers):
+        pool = _pool(count=1)
+        await pool.tweet_detail(1)
+        await pool.tweet_detail(2)
+
+        with pytest.raises(ScraperError, match="No twitter-api-client session"):
+            await pool.tweet_detail(3)
+
+    @pytest.mark.asyncio
+    async def test_server_rate_limit_headers_are_honoured(self, scrapers):
+        pool = _pool(count=2)
+        scrapers[0].rate_limits[TWEET_DETAIL] = {
+            "x-rate-limit-remaining": 0,
+            "x-rate-limit-reset": 9999999999,
+        }
+
+        await pool.tweet_detail(1)
+
+        assert scrapers[0]._query.await_count == 0
+        assert scrapers[1]._query.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_session_rests_and_is_reopened(self, scrapers):
+        pool = _pool(count=1)
+        scrapers[0]._query.return_value = _response(status_code=403)
+
+        with pytest.raises(ScraperParseError):
+            await pool.tweet_detail(1)
+
+        session = pool.sessions[0]
+        assert session.client is None
+        assert session.failures == 1
+        with pytest.raises(ScraperError):
+            await pool.tweet_detail(2)
+
+        session.cooldown_until = 0.0
+        result = await pool.tweet_detail(3)
+        assert result == {"data": {"tweet": 1}}
+        assert len(scrapers) == 2
+        assert session.failures == 0
+
+    @pytest.mark.asyncio
+    async def test_concurrent_failures_count_once(self, scrapers):
+        pool = _pool(count=1)
+        session = pool.sessions[0]
+        client = session.client
+        release = asyncio.Event()
+
+        async def hang_then_fail(*args, **kwargs):
+            await release.wait()
+            return _response(status_code=500)
+
+        scrapers[0]._query.side_effect = hang_then_fail
+        first = asyncio.create_task(pool.tweet_detail(1))
+        second = asyncio.create_task(pool.tweet_detail(2))
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(first, second, return_exceptions=True)
+
+        assert all(isinstance(r, ScraperParseError) for r in results)
+        assert session.failures == 1
+        assert session.client is None
+        client.aclose.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_client_closes_after_last_request(self, scrapers):
+        pool = _pool(count=1)
+        session = pool.sessions[0]
+        client = session.client
+        release = asyncio.Event()
+
+        async def slow(*args, **kwargs):
+            await release.wait()
+            return _response()
+
+        scrapers[0]._query.side_effect = slow
+        running = asyncio.create_task(pool.tweet_detail(1))
+        await asyncio.sleep(0)
+
+        session.fail(client, 0.0)
+        assert session.client is None
+        client.aclose.assert_not_awaited()
+
+        release.set()
+        assert await running == {"data": {"tweet": 1}}
+        client.aclose.assert_awaited_once()
+        assert session.failures == 1
+
+    @pytest.mark.asyncio
+    async def test_response_without_data_is_rejected(self, scrapers):
+        pool = _pool(count=1)
+        scrapers[0]._query.return_value = _response(body={"errors": [{"message": "nope"}]})
+
+        with pytest.raises(ScraperParseError):
+            await pool.tweet_detail(1)
+
+
+class TestModulePool:
+    @pytest.mark.asyncio
+    async def test_get_and_close(self, scrapers):
+        with patch.object(session_pool, "_pool", None), \
+                patch.object(session_pool.settings, "TWITTER_COOKIE_SETS", "a:b,c:d"):
+            pool = session_pool.get_session_pool()
+            assert session_pool.get_session_pool() is pool
+            assert [s.cookies for s in scrapers] == [
+                {"ct0": "a", "auth_token": "b"},
+                {"ct0": "c", "auth_token": "d"},
+            ]
+
+            await session_pool.close_session_pool()
+            assert session_pool._pool is None
+            assert all(s.client is None for s in pool.sessions)
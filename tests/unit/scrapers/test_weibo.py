@@ -16,6 +16,7 @@ _get_videos (page_info extraction, fallback keys), _get_mix_media (pic, video,
 live_photo, gif types), _string_to_int, _get_live_photo,
 _weibo_html_text_clean (bs4/lxml dispatch), _weibo_html_text_clean_bs4,
 _weibo_html_text_clean_lxml, WeiboScraper.get_processor_by_url.
+The pooled sessions and page decoding in weibo/engine.py are covered in test_weibo_engine.py.
 """
 
 import json
@@ -214,9 +215,15 @@ class TestWeiboHtmlTextClean:
 
     def test_lxml_method(self):
         from fastfetchbot_shared.services.scrapers.weibo.scraper import WeiboDataProcessor
-        result = WeiboDataProcessor._weibo_html_text_clean("<p>Hello</p>", method="lxml")
+        result, pics = WeiboDataProcessor._weibo_html_text_clean("<p>Hello</p>", method="lxml")
         assert "Hello" in result
 
+    def test_lxml_is_default(self):
+        from fastfetchbot_shared.services.scrapers.weibo.scraper import WeiboDataProcessor
+        with patch.object(WeiboDataProcessor, "_weibo_html_text_clean_lxml", return_value=("x", [])) as mock_clean:
+            assert WeiboDataProcessor._weibo_html_text_clean("<p>Hello</p>") == ("x", [])
+        mock_clean.assert_called_once_with("<p>Hello</p>")
+
     def test_invalid_method_raises(self):
         from fastfetchbot_shared.services.scrapers.weibo.scraper import WeiboDataProcessor
         with pytest.raises(ScraperError, match="method must be bs4 or lxml"):
@@ -296,13 +303,69 @@ class TestWeiboHtmlTextCleanLxml:
     def test_img_replaced_with_alt(self):
         from fastfetchbot_shared.services.scrapers.weibo.scraper import WeiboDataProcessor
         html = '<div><img alt="emoji" src="https://img.com/e.png">text</div>'
-        result = WeiboDataProcessor._weibo_html_text_clean_lxml(html)
-        assert "emoji" in result
+        result, pics = WeiboDataProcessor._weibo_html_text_clean_lxml(html)
+        assert result == "<div>emojitext</div>"
 
     def test_plain_text(self):
         from fastfetchbot_shared.services.scrapers.weibo.scraper import WeiboDataProcessor
-        result = WeiboDataProcessor._weibo_html_text_clean_lxml("<p>Simple text</p>")
-        assert "Simple text" in result
+        result, pics = WeiboDataProcessor._weibo_html_text_clean_lxml("Simple &amp; text")
+        assert result == "Simple &amp; text"
+        assert pics == []
+
+    def test_image_tag_timeline_card_removed(self):
+        from fastfetchbot_shared.services.scrapers.weibo.scraper import WeiboDataProcessor
+        html = 'a<image src="https://h5.sinaimg.cn/upload/2015/09/25/3/timeline_card_small_web_default.png">'
+        result, pics = WeiboDataProcessor._weibo_html_text_clean_lxml(html)
+        assert result == "a"
+
+    def test_search_link_unwrapped(self):
+        from fastfetchbot_shared.services.scrapers.weibo.scraper import WeiboDataProcessor
+        html = 'see <a href="https://m.weibo.cn/search?q=test">#test#</a> now'
+        result, pics = WeiboDataProcessor._weibo_html_text_clean_lxml(html)
+        assert result == "see #test# now"
+
+    def test_view_image_link_extracted(self):
+        from fastfetchbot_shared.services.scrapers.weibo.scraper import WeiboDataProcessor
+        html = '<a href="https://img.com/big.jpg">查看图片</a>'
+        result, pics = WeiboDataProcessor._weibo_html_text_clean_lxml(html)
+        assert pics == ["https://img.com/big.jpg"]
+
+    def test_usercard_link_updated(self):
+        from fastfetchbot_shared.services.scrapers.weibo.scraper import WeiboDataProcessor
+        html = '<a href="/n/someone" usercard="id=123">@someone</a>'
+        result, pics = WeiboDataProcessor._weibo_html_text_clean_lxml(html)
+        assert 'href="https://weibo.com/n/someone"' in result
+
+    def test_span_unwrapped(self):
+        from fastfetchbot_shared.services.scrapers.weibo.scraper import WeiboDataProcessor
+        html = 'a<span class="url-icon"><img alt="[doge]" src="d.png"></span>b'
+        result, pics = WeiboDataProcessor._weibo_html_text_clean_lxml(html)
+        assert result == "a[doge]b"
+
+    def test_relative_hrefs_fixed(self):
+        from fastfetchbot_shared.services.scrapers.weibo.scraper import WeiboDataProcessor
+        html = '<a href="//example.com/path">link</a><a href="/n/user">@user</a>'
+        result, pics = WeiboDataProcessor._weibo_html_text_clean_lxml(html)
+        assert 'href="http://example.com/path"' in result
+        assert 'href="http://weibo.com/n/user"' in result
+
+    def test_matches_bs4_cleaner(self):
+        """Both cleaners produce the same text once <br/> is normalized as _process_weibo_item does."""
+        from fastfetchbot_shared.services.scrapers.weibo.scraper import WeiboDataProcessor
+        html = (
+            '开头<a href="https://m.weibo.cn/search?containerid=1">#话题#</a>'
+            '<span class="url-icon"><img alt="[doge]" src="https://face.t.sinajs.cn/d.png" /></span>'
+            '<a href="/n/someone" usercard="name=someone">@someone</a><br /><br />'
+            '<a href="https://wx1.sinaimg.cn/large/1.jpg">查看图片</a> 1 &lt; 2 &amp; 3'
+        )
+        bs4_result, bs4_pics = WeiboDataProcessor._weibo_html_text_clean_bs4(html)
+        lxml_result, lxml_pics = WeiboDataProcessor._weibo_html_text_clean_lxml(html)
+
+        def normalize(text):
+            return text.replace("<br />", "<br>").replace("br/", "br")
+
+        assert normalize(lxml_result) == normalize(bs4_result)
+        assert lxml_pics == bs4_pics
 
 
 # ---------------------------------------------------------------------------
@@ -846,10 +909,10 @@ class TestGetWeiboInfoWebpage:
             from fastfetchbot_shared.services.scrapers.weibo.scraper import WeiboDataProcessor
             wp = WeiboDataProcessor(url="https://m.weibo.cn/detail/123")
 
-        # Build HTML that matches the real Weibo page structure.
-        # The status JSON is inside a JS array: [{...}], so after all parsing
-        # steps, we get valid JSON. Key: extra `}]` after the status object.
-        html_body = 'prefix "status":{"id":"123","text":"hello"}}],"hotScheme":"x"'
+        html_body = (
+            '<script>var $render_data = [{"status":{"id":"123","text":"hello"},'
+            '"hotScheme":"x"}][0] || {};\nvar config = {"hotScheme":"y"};</script>'
+        )
 
         mock_resp = MagicMock()
         mock_resp.status_code = 200
@@ -857,10 +920,8 @@ class TestGetWeiboInfoWebpage:
 
         mock_client = AsyncMock()
         mock_client.get.return_value = mock_resp
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=False)
 
-        with patch("fastfetchbot_shared.services.scrapers.weibo.scraper.httpx.AsyncClient", return_value=mock_client):
+        with patch("fastfetchbot_shared.services.scrapers.weibo.scraper.get_session", return_value=mock_client):
             result = await wp._get_weibo_info_webpage()
         assert result.get("id") == "123"
 
@@ -879,14 +940,12 @@ class TestGetWeiboInfoWebpage:
 
         final_resp = MagicMock()
         final_resp.status_code = 200
-        final_resp.text = '"status":{"id":"123"}}],"hotScheme":"x"'
+        final_resp.text = 'var $render_data = [{"status":{"id":"123"},"hotScheme":"x"}][0] || {};'
 
         mock_client = AsyncMock()
         mock_client.get.side_effect = [redirect_resp, final_resp]
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=False)
 
-        with patch("fastfetchbot_shared.services.scrapers.weibo.scraper.httpx.AsyncClient", return_value=mock_client):
+        with patch("fastfetchbot_shared.services.scrapers.weibo.scraper.get_session", return_value=mock_client):
             result = await wp._get_weibo_info_webpage()
         assert result.get("id") == "123"
 
@@ -901,16 +960,36 @@ class TestGetWeiboInfoWebpage:
 
         mock_resp = MagicMock()
         mock_resp.status_code = 200
-        mock_resp.text = '"status":NOT_VALID_JSON,"hotScheme":"x"'
+        mock_resp.text = 'var $render_data = [{"status":NOT_VALID_JSON,"hotScheme":"x"}][0] || {};'
+
+        mock_client = AsyncMock()
+        mock_client.get.return_value = mock_resp
+
+        with patch("fastfetchbot_shared.services.scrapers.weibo.scraper.get_session", return_value=mock_client):
+            result = await wp._get_weibo_info_webpage()
+        assert result == {}
+
+
+    @pytest.mark.asyncio
+    async def test_page_without_render_data(self):
+        with patch("fastfetchbot_shared.services.scrapers.weibo.scraper.JINJA2_ENV") as mock_env:
+            mock_template = MagicMock()
+            mock_template.render.return_value = "<p>rendered</p>"
+            mock_env.get_template.return_value = mock_template
+            from fastfetchbot_shared.services.scrapers.weibo.scraper import WeiboDataProcessor
+            wp = WeiboDataProcessor(url="https://m.weibo.cn/detail/123", cookies="SUB=user")
+
+        mock_resp = MagicMock()
+        mock_resp.status_code = 200
+        mock_resp.text = "<html>login required</html>"
 
         mock_client = AsyncMock()
         mock_client.get.return_value = mock_resp
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=False)
 
-        with patch("fastfetchbot_shared.services.scrapers.weibo.scraper.httpx.AsyncClient", return_value=mock_client):
+        with patch("fastfetchbot_shared.services.scrapers.weibo.scraper.get_session", return_value=mock_client) as mock_get_session:
             result = await wp._get_weibo_info_webpage()
         assert result == {}
+        mock_get_session.assert_called_once_with("SUB=user")
 
 
 # ---------------------------------------------------------------------------
@@ -934,12 +1013,12 @@ class TestGetWeiboInfoApi:
 
         mock_client = AsyncMock()
         mock_client.get.return_value = mock_resp
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=False)
 
-        with patch("fastfetchbot_shared.services.scrapers.weibo.scraper.httpx.AsyncClient", return_value=mock_client):
+        with patch("fastfetchbot_shared.services.scrapers.weibo.scraper.get_session", return_value=mock_client) as mock_get_session:
             result = await wp._get_weibo_info_api()
         assert result["ok"] == 1
+        from fastfetchbot_shared.services.scrapers.weibo.config import WEIBO_GUEST_COOKIES
+        mock_get_session.assert_called_once_with(WEIBO_GUEST_COOKIES)
 
     @pytest.mark.asyncio
     async def test_ok_zero_raises(self):
@@ -957,10 +1036,8 @@ class TestGetWeiboInfoApi:
 
         mock_client = AsyncMock()
         mock_client.get.return_value = mock_resp
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=False)
 
-        with patch("fastfetchbot_shared.services.scrapers.weibo.scraper.httpx.AsyncClient", return_value=mock_client):
+        with patch("fastfetchbot_shared.services.scrapers.weibo.scraper.get_session", return_value=mock_client):
             with pytest.raises(ScraperParseError):
                 await wp._get_weibo_info_api()
 
@@ -980,10 +1057,8 @@ class TestGetWeiboInfoApi:
 
         mock_client = AsyncMock()
         mock_client.get.return_value = mock_resp
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=False)
 
-        with patch("fastfetchbot_shared.services.scrapers.weibo.scraper.httpx.AsyncClient", return_value=mock_client):
+        with patch("fastfetchbot_shared.services.scrapers.weibo.scraper.get_session", return_value=mock_client):
             with pytest.raises(ScraperParseError):
                 await wp._get_weibo_info_api()
 
@@ -1001,10 +1076,8 @@ class TestGetWeiboInfoApi:
 
         mock_client = AsyncMock()
         mock_client.get.return_value = mock_resp
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=False)
 
-        with patch("fastfetchbot_shared.services.scrapers.weibo.scraper.httpx.AsyncClient", return_value=mock_client):
+        with patch("fastfetchbot_shared.services.scrapers.weibo.scraper.get_session", return_value=mock_client):
             with pytest.raises(ScraperNetworkError):
                 await wp._get_weibo_info_api()
 
@@ -1092,6 +1165,52 @@ class TestGetWeibo:
                 await wp._get_weibo()
         assert call_count == 2
 
+    @pytest.mark.asyncio
+    async def test_slow_api_is_hedged_with_webpage(self):
+        import asyncio
+
+        with patch("fastfetchbot_shared.services.scrapers.weibo.scraper.JINJA2_ENV") as mock_env:
+            mock_template = MagicMock()
+            mock_template.render.return_value = "<p>rendered</p>"
+            mock_env.get_template.return_value = mock_template
+            from fastfetchbot_shared.services.scrapers.weibo.scraper import WeiboDataProcessor
+            wp = WeiboDataProcessor(url="https://m.weibo.cn/detail/123")
+
+        api_cancelled = asyncio.Event()
+
+        async def get_weibo_info(method=None):
+            if method == "api":
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    api_cancelled.set()
+                    raise
+            return {"id": "123", "source": method}
+
+        with patch("fastfetchbot_shared.services.scrapers.hedge.settings.HEDGE_DEFAULT_DELAY", 0.01), \
+                patch.object(wp, "_get_weibo_info", side_effect=get_weibo_info), \
+                patch.object(wp, "_process_weibo_item", new_callable=AsyncMock) as mock_process:
+            await wp._get_weibo()
+            await asyncio.wait_for(api_cancelled.wait(), 1)
+        mock_process.assert_awaited_once_with({"id": "123", "source": "webpage"})
+
+    @pytest.mark.asyncio
+    async def test_invalid_api_result_falls_back_to_webpage(self):
+        with patch("fastfetchbot_shared.services.scrapers.weibo.scraper.JINJA2_ENV") as mock_env:
+            mock_template = MagicMock()
+            mock_template.render.return_value = "<p>rendered</p>"
+            mock_env.get_template.return_value = mock_template
+            from fastfetchbot_shared.services.scrapers.weibo.scraper import WeiboDataProcessor
+            wp = WeiboDataProcessor(url="https://m.weibo.cn/detail/123")
+
+        async def get_weibo_info(method=None):
+            return {"id": None} if method == "api" else {"id": "123"}
+
+        with patch.object(wp, "_get_weibo_info", side_effect=get_weibo_info), \
+                patch.object(wp, "_process_weibo_item", new_callable=AsyncMock) as mock_process:
+            await wp._get_weibo()
+        mock_process.assert_awaited_once_with({"id": "123"})
+
     @pytest.mark.asyncio
     async def test_both_fail_raises(self):
         with patch("fastfetchbot_shared.services.scrapers.weibo.scraper.JINJA2_ENV") as mock_env:
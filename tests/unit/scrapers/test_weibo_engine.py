@@ -0,0 +1,67 @@
+"""Tests for packages/shared/fastfetchbot_shared/services/scrapers/weibo/engine.py"""
+
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from fastfetchbot_shared.services.scrapers.weibo import engine
+
+FIXTURE_PAGE = (
+    Path(__file__).resolve().parents[3] / "benchmarks" / "fixtures" / "weibo" / "detail_page.html"
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_sessions():
+    engine._sessions.clear()
+    yield
+    engine._sessions.clear()
+
+
+class TestExtractRenderData:
+    def test_decodes_render_data(self):
+        page = (
+            '<script>var $render_data = [{"status": {"id": "1", "text": "a]b[0] || {};"},'
+            ' "hotScheme": "x"}][0] || {};\nvar config = {"hotScheme": "y"};</script>'
+        )
+        render_data = engine.extract_render_data(page)
+        assert render_data == {"status": {"id": "1", "text": "a]b[0] || {};"}, "hotScheme": "x"}
+
+    def test_whitespace_and_control_characters(self):
+        page = 'var $render_data=[\n  {"status": {"text": "line\tbreak"}}\n][0] || {};'
+        assert engine.extract_render_data(page) == {"status": {"text": "line\tbreak"}}
+
+    def test_page_without_render_data(self):
+        assert engine.extract_render_data("<html>login</html>") is None
+
+    def test_invalid_json_raises(self):
+        with pytest.raises(json.JSONDecodeError):
+            engine.extract_render_data("var $render_data = [{status: 1}][0] || {};")
+
+    def test_recorded_detail_page(self):
+        render_data = engine.extract_render_data(FIXTURE_PAGE.read_text(encoding="utf-8"))
+        assert render_data["status"]["id"]
+        assert render_data["hotScheme"].startswith("sinaweibo://")
+
+
+class TestSessions:
+    def test_one_session_per_cookie_set(self):
+        session = engine.get_session("SUB=a")
+        assert engine.get_session("SUB=a") is session
+        assert engine.get_session("SUB=b") is not session
+        assert session.headers["Cookie"] == "SUB=a"
+
+    def test_no_cookies(self):
+        session = engine.get_session(None)
+        assert engine.get_session("") is session
+        assert "Cookie" not in session.headers
+
+    @pytest.mark.asyncio
+    async def test_close_weibo_sessions(self):
+        session = engine.get_session("SUB=a")
+        with patch.object(session, "aclose", new_callable=AsyncMock) as mock_close:
+            await engine.close_weibo_sessions()
+        mock_close.assert_awaited_once()
+        assert engine._sessions == {}
@@ -0,0 +1,179 @@
+"""Tests for packages/shared/fastfetchbot_shared/services/scrapers/xiaohongshu/signer.py"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from fastfetchbot_shared.exceptions import ExternalServiceError
+from fastfetchbot_shared.services.scrapers.xiaohongshu import signer as signer_module
+from fastfetchbot_shared.services.scrapers.xiaohongshu.signer import (
+    BATCH_SIGN_PATH,
+    SIGN_PATH,
+    XhsSigner,
+)
+
+
+def _sign(tag="a"):
+    return {"x_s": f"xs-{tag}", "x_t": "1", "x_s_common": "c", "x_b3_traceid": "t"}
+
+
+def _response(body, status_code=200):
+    resp = MagicMock()
+    resp.status_code = status_code
+    resp.json.return_value = body
+    return resp
+
+
+class FakeSignServer:
+    """Answers single and batch sign requests, counting the HTTP calls."""
+
+    def __init__(self, batch=True):
+        self.batch = batch
+        self.calls = []
+
+    async def post(self, url, json):
+        self.calls.append(url)
+        await asyncio.sleep(0)
+        if url.endswith(BATCH_SIGN_PATH):
+            if not self.batch:
+                return _response({}, status_code=404)
+            return _response({"isok": True, "data": [_sign(p["uri"]) for p in json["requests"]]})
+        return _response({"isok": True, "data": _sign(json["uri"])})
+
+
+@pytest.fixture(autouse=True)
+def sign_settings():
+    with patch.object(signer_module.settings, "XHS_SIGN_CACHE_TTL", 30.0), \
+            patch.object(signer_module.settings, "XHS_SIGN_BATCH", True):
+        yield
+    signer_module._signers.clear()
+
+
+def _signer(server: FakeSignServer) -> XhsSigner:
+    signer = XhsSigner("http://sign:8989/")
+    signer._http = server
+    return signer
+
+
+class TestCache:
+    @pytest.mark.asyncio
+    async def test_identical_request_is_memoized(self):
+        server = FakeSignServer()
+        signer = _signer(server)
+
+        first = await signer.sign("/api/a", {"k": 1}, "c=1")
+        second = await signer.sign("/api/a", {"k": 1}, "c=1")
+
+        assert first == second == _sign("/api/a")
+        assert server.calls == [f"http://sign:8989{SIGN_PATH}"]
+
+    @pytest.mark.asyncio
+    async def test_different_cookies_are_signed_separately(self):
+        server = FakeSignServer()
+        signer = _signer(server)
+
+        await signer.sign("/api/a", None, "c=1")
+        await signer.sign("/api/a", None, "c=2")
+
+        assert len(server.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_expired_signature_is_renewed(self):
+        server = FakeSignServer()
+        signer = _signer(server)
+
+        with patch.object(signer_module.settings, "XHS_SIGN_CACHE_TTL", 0):
+            await signer.sign("/api/a", None, "c=1")
+            await signer.sign("/api/a", None, "c=1")
+
+        assert len(server.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_requests_share_one_call(self):
+        server = FakeSignServer()
+        signer = _signer(server)
+
+        results = await asyncio.gather(*(signer.sign("/api/a", None, "c=1") for _ in range(3)))
+
+        assert results == [_sign("/api/a")] * 3
+        assert len(server.calls) == 1
+
+
+class TestBatching:
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_go_in_one_batch(self):
+        server = FakeSignServer()
+        signer = _signer(server)
+
+        results = await asyncio.gather(*(signer.sign(f"/api/{i}", None, "c=1") for i in range(3)))
+
+        assert results == [_sign(f"/api/{i}") for i in range(3)]
+        assert server.calls == [f"http://sign:8989{BATCH_SIGN_PATH}"]
+        assert signer.batch_supported is True
+
+    @pytest.mark.asyncio
+    async def test_missing_batch_endpoint_falls_back_to_single_requests(self):
+        server = FakeSignServer(batch=False)
+        signer = _signer(server)
+
+        results = await asyncio.gather(*(signer.sign(f"/api/{i}", None, "c=1") for i in range(2)))
+        assert results == [_sign("/api/0"), _sign("/api/1")]
+        assert signer.batch_supported is False
+
+        server.calls.clear()
+        await asyncio.gather(*(signer.sign(f"/api/x{i}", None, "c=1") for i in range(2)))
+        assert server.calls == [f"http://sign:8989{SIGN_PATH}"] * 2
+
+    @pytest.mark.asyncio
+    async def test_batching_disabled_by_setting(self):
+        server = FakeSignServer()
+        with patch.object(signer_module.settings, "XHS_SIGN_BATCH", False):
+            signer = _signer(server)
+
+        await asyncio.gather(*(signer.sign(f"/api/{i}", None, "c=1") for i in range(2)))
+
+        assert server.calls == [f"http://sign:8989{SIGN_PATH}"] * 2
+
+    @pytest.mark.asyncio
+    async def test_invalid_item_fails_only_its_request(self):
+        server = FakeSignServer()
+        server.post = AsyncMock(return_value=_response({"isok": True, "data": [_sign(), None]}))
+        signer = _signer(server)
+
+        results = await asyncio.gather(
+            signer.sign("/api/0", None, "c=1"),
+            signer.sign("/api/1", None, "c=1"),
+            return_exceptions=True,
+        )
+
+        assert results[0] == _sign()
+        assert isinstance(results[1], ExternalServiceError)
+
+    @pytest.mark.asyncio
+    async def test_server_error_fails_every_request(self):
+        server = FakeSignServer()
+        server.post = AsyncMock(return_value=_response({"isok": False, "msg": "down"}))
+        signer = _signer(server)
+
+        results = await asyncio.gather(
+            signer.sign("/api/0", None, "c=1"),
+            signer.sign("/api/1", None, "c=1"),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, ExternalServiceError) for r in results)
+        assert signer._cache == {}
+
+
+class TestRegistry:
+    @pytest.mark.asyncio
+    async def test_get_signer_is_shared_per_endpoint_and_closed(self):
+        signer = signer_module.get_signer("http://sign:8989/")
+        assert signer_module.get_signer("http://sign:8989") is signer
+
+        signer._http = AsyncMock()
+        await signer_module.close_signers()
+
+        signer._http.aclose.assert_awaited_once()
+        assert signer_module._signers == {}
@@ -5,12 +5,14 @@ Covers:
 - packages/shared/fastfetchbot_shared/services/scrapers/xiaohongshu/adaptar.py
 """
 
+import asyncio
 import json
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch, PropertyMock
 
 import httpx
 
+from fastfetchbot_shared.services.scrapers.xiaohongshu import signer as xhs_signer
 from fastfetchbot_shared.services.scrapers.xiaohongshu.adaptar import (
     XhsSinglePostAdapter,
     parse_xhs_note_url,
@@ -22,6 +24,13 @@ from fastfetchbot_shared.models.metadata_item import MessageType, MediaFile
 from fastfetchbot_shared.exceptions import ScraperError, ScraperParseError, ExternalServiceError
 
 
+@pytest.fixture(autouse=True)
+def fresh_signers():
+    """Signers are shared per sign server; drop them so cached signatures don't leak."""
+    yield
+    xhs_signer._signers.clear()
+
+
 # ---------------------------------------------------------------------------
 # Module-level function tests
 # ---------------------------------------------------------------------------
@@ -173,8 +182,8 @@ class TestSignHeaders:
             },
         }
         mock_resp.raise_for_status = MagicMock()
-        adapter._http = AsyncMock()
-        adapter._http.post = AsyncMock(return_value=mock_resp)
+        adapter._signer._http = AsyncMock()
+        adapter._signer._http.post = AsyncMock(return_value=mock_resp)
 
         headers = await adapter._sign_headers("/api/test")
         assert headers["X-s"] == "xs_val"
@@ -191,8 +200,8 @@ class TestSignHeaders:
         mock_resp = MagicMock()
         mock_resp.json.return_value = {"isok": False, "error": "bad"}
         mock_resp.raise_for_status = MagicMock()
-        adapter._http = AsyncMock()
-        adapter._http.post = AsyncMock(return_value=mock_resp)
+        adapter._signer._http = AsyncMock()
+        adapter._signer._http.post = AsyncMock(return_value=mock_resp)
 
         with pytest.raises(ExternalServiceError, match="sign server returned error"):
             await adapter._sign_headers("/api/test")
@@ -208,8 +217,8 @@ class TestSignHeaders:
             "data": {"x_s": "xs_val"},  # missing x_t, x_s_common, x_b3_traceid
         }
         mock_resp.raise_for_status = MagicMock()
-        adapter._http = AsyncMock()
-        adapter._http.post = AsyncMock(return_value=mock_resp)
+        adapter._signer._http = AsyncMock()
+        adapter._signer._http.post = AsyncMock(return_value=mock_resp)
 
         with pytest.raises(ExternalServiceError, match="missing fields"):
             await adapter._sign_headers("/api/test")
@@ -222,8 +231,8 @@ class TestSignHeaders:
         mock_resp = MagicMock()
         mock_resp.json.return_value = {"isok": True, "data": None}
         mock_resp.raise_for_status = MagicMock()
-        adapter._http = AsyncMock()
-        adapter._http.post = AsyncMock(return_value=mock_resp)
+        adapter._signer._http = AsyncMock()
+        adapter._signer._http.post = AsyncMock(return_value=mock_resp)
 
         with pytest.raises(ExternalServiceError, match="missing fields"):
             await adapter._sign_headers("/api/test")
@@ -241,14 +250,32 @@ class TestSignHeaders:
             },
         }
         mock_resp.raise_for_status = MagicMock()
-        adapter._http = AsyncMock()
-        adapter._http.post = AsyncMock(return_value=mock_resp)
+        adapter._signer._http = AsyncMock()
+        adapter._signer._http.post = AsyncMock(return_value=mock_resp)
 
         await adapter._sign_headers("/api/test", data={"key": "val"})
-        call_args = adapter._http.post.call_args
+        call_args = adapter._signer._http.post.call_args
         payload = call_args.kwargs.get("json") or call_args[1].get("json")
         assert payload["data"] == {"key": "val"}
 
+    @pytest.mark.asyncio
+    async def test_adapters_share_signer_and_cache(self):
+        first = XhsSinglePostAdapter(cookies="c=1", sign_server_endpoint="http://s:8989")
+        second = XhsSinglePostAdapter(cookies="c=1", sign_server_endpoint="http://s:8989/")
+        mock_resp = MagicMock()
+        mock_resp.json.return_value = {
+            "isok": True,
+            "data": {"x_s": "a", "x_t": "b", "x_s_common": "c", "x_b3_traceid": "d"},
+        }
+        first._signer._http = AsyncMock()
+        first._signer._http.post = AsyncMock(return_value=mock_resp)
+
+        await first._sign_headers("/api/test")
+        await second._sign_headers("/api/test")
+
+        assert first._signer is second._signer
+        first._signer._http.post.assert_awaited_once()
+
 
 class TestParseApiResponse:
     """Tests for _parse_api_response static method."""
@@ -1125,6 +1152,67 @@ class TestFetchComments:
         assert len(result) == 2
         adapter._fetch_sub_comments.assert_awaited_once()
 
+    @pytest.mark.asyncio
+    async def test_sub_comment_threads_run_concurrently_in_order(self):
+        adapter = self._make_adapter()
+        adapter._signed_get = AsyncMock(return_value={
+            "comments": [
+                {"id": f"c{i}", "content": str(i), "user_info": {}, "target_comment": {}, "pictures": []}
+                for i in range(3)
+            ],
+            "has_more": False,
+            "cursor": "",
+        })
+        running = 0
+        peak = 0
+
+        async def fetch_sub(note_id, root_comment, xsec_token, limit=0):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            # Later threads finish first
+            await asyncio.sleep(0.01 * (3 - int(root_comment["id"][1:])))
+            running -= 1
+            return [{"comment_id": f"s{root_comment['id']}"}]
+
+        adapter._fetch_sub_comments = fetch_sub
+        result = await adapter._fetch_comments("n1", "tok", include_sub_comments=True)
+
+        assert [c["comment_id"] for c in result] == ["c0", "sc0", "c1", "sc1", "c2", "sc2"]
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_max_comments_cancels_pending_threads(self):
+        adapter = self._make_adapter()
+        adapter._signed_get = AsyncMock(return_value={
+            "comments": [
+                {"id": f"c{i}", "content": str(i), "user_info": {}, "target_comment": {}, "pictures": []}
+                for i in range(3)
+            ],
+            "has_more": True,
+            "cursor": "next",
+        })
+        cancelled = []
+
+        async def fetch_sub(note_id, root_comment, xsec_token, limit=0):
+            if root_comment["id"] == "c0":
+                return [{"comment_id": "s0"}, {"comment_id": "s1"}]
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(root_comment["id"])
+                raise
+
+        adapter._fetch_sub_comments = fetch_sub
+        result = await asyncio.wait_for(
+            adapter._fetch_comments("n1", "tok", max_comments=3, include_sub_comments=True),
+            timeout=1,
+        )
+
+        assert [c["comment_id"] for c in result] == ["c0", "s0", "s1"]
+        assert sorted(cancelled) == ["c1", "c2"]
+        adapter._signed_get.assert_awaited_once()
+
 
 class TestFetchSubComments:
     """Tests for _fetch_sub_comments."""
@@ -1256,6 +1344,27 @@ class TestFetchSubComments:
         result = await adapter._fetch_sub_comments("n1", root, "")
         assert result == []
 
+    @pytest.mark.asyncio
+    async def test_limit_stops_paging(self):
+        adapter = self._make_adapter()
+        adapter._signed_get = AsyncMock(return_value={
+            "comments": [
+                {"id": f"sc{i}", "content": "x", "user_info": {}, "target_comment": {}, "pictures": []}
+                for i in range(2)
+            ],
+            "has_more": True,
+            "cursor": "more",
+        })
+        root = {
+            "id": "c1",
+            "sub_comments": [],
+            "sub_comment_has_more": True,
+            "sub_comment_cursor": "start",
+        }
+        result = await adapter._fetch_sub_comments("n1", root, "", limit=3)
+        assert len(result) == 4
+        assert adapter._signed_get.await_count == 2
+
 
 class TestGetRedirectionUrl:
     """Tests for _get_redirection_url."""
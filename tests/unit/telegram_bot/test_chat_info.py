@@ -0,0 +1,163 @@
+"""Tests for apps/telegram-bot/core/services/chat_info.py"""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def reset_module_state():
+    import core.services.chat_info as ci
+
+    ci._cache.clear()
+    ci._redis = None
+    yield
+    ci._cache.clear()
+    ci._redis = None
+
+
+@pytest.fixture
+def mock_bot():
+    bot = MagicMock()
+    bot.id = 777
+    chat = MagicMock()
+    chat.type = "channel"
+    chat.linked_chat_id = -100200
+    bot.get_chat = AsyncMock(return_value=chat)
+    return bot
+
+
+@pytest.fixture
+def mock_redis():
+    r = AsyncMock()
+    r.get = AsyncMock(return_value=None)
+    r.set = AsyncMock()
+    r.delete = AsyncMock()
+    r.publish = AsyncMock()
+    r.aclose = AsyncMock()
+    return r
+
+
+class TestGetChatInfo:
+    @pytest.mark.asyncio
+    async def test_fetches_once_then_serves_from_memory(self, mock_bot, mock_redis):
+        with patch("core.services.chat_info.aioredis.from_url", return_value=mock_redis):
+            from core.services.chat_info import get_chat_info
+
+            first = await get_chat_info(mock_bot, -100100)
+            second = await get_chat_info(mock_bot, -100100)
+
+        assert first == {"type": "channel", "linked_chat_id": -100200}
+        assert second == first
+        mock_bot.get_chat.assert_awaited_once_with(chat_id=-100100)
+
+    @pytest.mark.asyncio
+    async def test_shares_result_through_redis(self, mock_bot, mock_redis):
+        with patch("core.services.chat_info.aioredis.from_url", return_value=mock_redis):
+            from core.services.chat_info import get_chat_info
+
+            await get_chat_info(mock_bot, -100100)
+
+        key, raw = mock_redis.set.call_args[0]
+        assert key == "chatinfo:777:-100100"
+        assert json.loads(raw) == {"type": "channel", "linked_chat_id": -100200}
+        assert mock_redis.set.call_args.kwargs["ex"] > 0
+
+    @pytest.mark.asyncio
+    async def test_redis_hit_skips_bot_api(self, mock_bot, mock_redis):
+        mock_redis.get = AsyncMock(
+            return_value=json.dumps({"type": "private", "linked_chat_id": None})
+        )
+        with patch("core.services.chat_info.aioredis.from_url", return_value=mock_redis):
+            from core.services.chat_info import get_chat_info
+
+            info = await get_chat_info(mock_bot, 42)
+
+        assert info["type"] == "private"
+        mock_bot.get_chat.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_refetched(self, mock_bot, mock_redis):
+        import core.services.chat_info as ci
+
+        with patch("core.services.chat_info.aioredis.from_url", return_value=mock_redis):
+            await ci.get_chat_info(mock_bot, 42)
+            ci._cache[42] = (0.0, ci._cache[42][1])  # force expiry
+            await ci.get_chat_info(mock_bot, 42)
+
+        assert mock_bot.get_chat.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_falls_back_to_bot_api(self, mock_bot, mock_redis):
+        mock_redis.get = AsyncMock(side_effect=ConnectionError("redis down"))
+        with patch("core.services.chat_info.aioredis.from_url", return_value=mock_redis):
+            from core.services.chat_info import get_chat_info
+
+            info = await get_chat_info(mock_bot, 42)
+
+        assert info["type"] == "channel"
+        mock_redis.set.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_api_mode_does_not_use_redis(self, mock_bot):
+        with patch("core.services.chat_info.settings") as mock_settings, patch(
+            "core.services.chat_info.aioredis.from_url"
+        ) as mock_from_url:
+            mock_settings.SCRAPE_MODE = "api"
+            mock_settings.CHAT_INFO_CACHE_TTL = 60
+            from core.services.chat_info import get_chat_info
+
+            await get_chat_info(mock_bot, 42)
+
+        mock_from_url.assert_not_called()
+
+
+class TestInvalidate:
+    @pytest.mark.asyncio
+    async def test_drops_local_and_shared_entry(self, mock_bot, mock_redis):
+        with patch("core.services.chat_info.aioredis.from_url", return_value=mock_redis):
+            import core.services.chat_info as ci
+
+            await ci.get_chat_info(mock_bot, 42)
+            await ci.invalidate(mock_bot, 42)
+            await ci.get_chat_info(mock_bot, 42)
+
+        mock_redis.delete.assert_awaited_once_with("chatinfo:777:42")
+        mock_redis.publish.assert_awaited_once_with("chatinfo:invalidate", f"{ci._replica_id}:42")
+        assert mock_bot.get_chat.await_count == 2
+
+    def test_other_replica_invalidation_drops_local_copy(self):
+        import core.services.chat_info as ci
+
+        ci._store(-100123, {"type": "channel", "linked_chat_id": -100200}, 0.0)
+        ci._store("@channel", {"type": "channel", "linked_chat_id": None}, 0.0)
+        ci._handle_invalidation("other-replica:-100123")
+        ci._handle_invalidation("other-replica:@channel")
+
+        assert ci._cache == {}
+
+    def test_own_invalidation_is_ignored(self):
+        import core.services.chat_info as ci
+
+        ci._store(42, {"type": "private", "linked_chat_id": None}, 0.0)
+        ci._handle_invalidation(f"{ci._replica_id}:42")
+
+        assert 42 in ci._cache
+
+
+class TestMyChatMemberHandler:
+    @pytest.mark.asyncio
+    async def test_invalidates_chat(self):
+        from core.handlers.messages import my_chat_member_process
+
+        update = MagicMock()
+        update.my_chat_member.chat.id = -100100
+        context = MagicMock()
+
+        with patch(
+            "core.handlers.messages.chat_info.invalidate", new_callable=AsyncMock
+        ) as mock_invalidate:
+            await my_chat_member_process(update, context)
+
+        mock_invalidate.assert_awaited_once_with(context.bot, -100100)
@@ -0,0 +1,273 @@
+"""Tests for apps/telegram-bot/core/services/discussion_forwards.py and its wiring."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def reset_registries():
+    import core.services.discussion_forwards as df
+
+    df._pending.clear()
+    df._seen.clear()
+    df._redis = None
+    yield
+    df._pending.clear()
+    df._seen.clear()
+    df._redis = None
+
+
+@pytest.fixture
+def api_mode():
+    with patch("core.services.discussion_forwards.settings") as mock_settings:
+        mock_settings.SCRAPE_MODE = "api"
+        yield mock_settings
+
+
+@pytest.fixture
+def mock_redis():
+    r = MagicMock()
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    pipe.__aenter__ = AsyncMock(return_value=pipe)
+    pipe.__aexit__ = AsyncMock(return_value=False)
+    r.pipeline = MagicMock(return_value=pipe)
+    r.blpop = AsyncMock(return_value=None)
+    r.aclose = AsyncMock()
+    r.pipe = pipe
+    return r
+
+
+@pytest.mark.usefixtures("api_mode")
+class TestWaitForForward:
+    @pytest.mark.asyncio
+    async def test_resolves_when_forward_arrives(self):
+        from core.services.discussion_forwards import wait_for_forward, record_forward
+
+        waiter = asyncio.create_task(wait_for_forward(-1001, 55, timeout=5))
+        await asyncio.sleep(0)
+        await record_forward(-1001, 55, 900)
+
+        assert await waiter == 900
+
+    @pytest.mark.asyncio
+    async def test_forward_before_wait_is_remembered(self):
+        from core.services.discussion_forwards import wait_for_forward, record_forward
+
+        await record_forward(-1001, 55, 900)
+
+        assert await wait_for_forward(-1001, 55, timeout=5) == 900
+
+    @pytest.mark.asyncio
+    async def test_timeout_returns_none(self):
+        import core.services.discussion_forwards as df
+
+        assert await df.wait_for_forward(-1001, 55, timeout=0.01) is None
+        assert df._pending == {}
+
+    @pytest.mark.asyncio
+    async def test_other_channel_message_does_not_resolve(self):
+        from core.services.discussion_forwards import wait_for_forward, record_forward
+
+        waiter = asyncio.create_task(wait_for_forward(-1001, 55, timeout=0.05))
+        await asyncio.sleep(0)
+        await record_forward(-1001, 56, 901)
+
+        assert await waiter is None
+
+    @pytest.mark.asyncio
+    async def test_seen_registry_is_bounded(self):
+        import core.services.discussion_forwards as df
+
+        for i in range(df._SEEN_MAX_SIZE + 10):
+            await df.record_forward(-1001, i, i)
+
+        assert len(df._seen) == df._SEEN_MAX_SIZE
+        assert (-1001, 0) not in df._seen
+
+
+class TestSharedForwards:
+    @pytest.mark.asyncio
+    async def test_record_pushes_to_redis(self, mock_redis):
+        import core.services.discussion_forwards as df
+
+        with patch("core.services.discussion_forwards.aioredis.from_url", return_value=mock_redis):
+            await df.record_forward(-1001, 55, 900)
+
+        mock_redis.pipe.rpush.assert_called_once_with("discussion_forward:-1001:55", 900)
+        mock_redis.pipe.expire.assert_called_once_with("discussion_forward:-1001:55", df._SEEN_TTL)
+        assert df._seen == {}
+
+    @pytest.mark.asyncio
+    async def test_wait_pops_from_redis(self, mock_redis):
+        from core.services.discussion_forwards import wait_for_forward
+
+        mock_redis.blpop = AsyncMock(return_value=("discussion_forward:-1001:55", "900"))
+        with patch("core.services.discussion_forwards.aioredis.from_url", return_value=mock_redis):
+            assert await wait_for_forward(-1001, 55, timeout=5) == 900
+
+        mock_redis.blpop.assert_awaited_once_with(["discussion_forward:-1001:55"], timeout=5)
+
+    @pytest.mark.asyncio
+    async def test_wait_timeout_returns_none(self, mock_redis):
+        from core.services.discussion_forwards import wait_for_forward
+
+        with patch("core.services.discussion_forwards.aioredis.from_url", return_value=mock_redis):
+            assert await wait_for_forward(-1001, 55, timeout=5) is None
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_returns_none(self, mock_redis):
+        from core.services.discussion_forwards import wait_for_forward
+
+        mock_redis.blpop = AsyncMock(side_effect=ConnectionError("redis down"))
+        with patch("core.services.discussion_forwards.aioredis.from_url", return_value=mock_redis):
+            assert await wait_for_forward(-1001, 55, timeout=5) is None
+
+
+class TestUpdateProcessor:
+    @staticmethod
+    def _update(automatic_forward: bool):
+        update = MagicMock()
+        update.message.is_automatic_forward = automatic_forward
+        return update
+
+    @pytest.mark.asyncio
+    async def test_forward_is_handled_while_another_update_waits_for_it(self):
+        from core.services.bot_app import TracingUpdateProcessor
+
+        processor = TracingUpdateProcessor()
+        forwarded = asyncio.Event()
+
+        async def sender():
+            await asyncio.wait_for(forwarded.wait(), timeout=1)
+
+        async def forward():
+            forwarded.set()
+
+        sending = asyncio.create_task(processor.process_update(self._update(False), sender()))
+        await asyncio.sleep(0)
+        await processor.process_update(self._update(True), forward())
+        await sending
+
+    @pytest.mark.asyncio
+    async def test_other_updates_run_one_at_a_time_in_order(self):
+        from core.services.bot_app import TracingUpdateProcessor
+
+        processor = TracingUpdateProcessor()
+        events = []
+
+        async def handle(i):
+            events.append(("start", i))
+            await asyncio.sleep(0.01)
+            events.append(("end", i))
+
+        await asyncio.gather(
+            *(processor.process_update(self._update(False), handle(i)) for i in range(3))
+        )
+
+        assert events == [(kind, i) for i in range(3) for kind in ("start", "end")]
+
+
+class TestAutomaticForwardHandler:
+    @pytest.mark.asyncio
+    async def test_records_channel_forward(self):
+        from core.handlers.messages import automatic_forward_process
+
+        update = MagicMock()
+        update.message.is_automatic_forward = True
+        update.message.message_id = 900
+        update.message.forward_origin.type = "channel"
+        update.message.forward_origin.chat.id = -1001
+        update.message.forward_origin.message_id = 55
+
+        with patch("core.handlers.messages.record_forward", new_callable=AsyncMock) as mock_record:
+            await automatic_forward_process(update, MagicMock())
+
+        mock_record.assert_awaited_once_with(-1001, 55, 900)
+
+    @pytest.mark.asyncio
+    async def test_ignores_regular_messages(self):
+        from core.handlers.messages import automatic_forward_process
+
+        update = MagicMock()
+        update.message.is_automatic_forward = False
+
+        with patch("core.handlers.messages.record_forward", new_callable=AsyncMock) as mock_record:
+            await automatic_forward_process(update, MagicMock())
+
+        mock_record.assert_not_called()
+
+
+class TestSendItemMessageChannelThread:
+    @staticmethod
+    def _data():
+        return {
+            "media_files": [{"media_type": "document", "url": "https://x/f.pdf"}],
+            "message_type": "short",
+            "text": "test",
+            "title": "Test",
+            "author": "a",
+            "author_url": "",
+            "url": "https://example.com",
+            "telegraph_url": "",
+            "category": "twitter",
+            "content": "",
+        }
+
+    @pytest.mark.asyncio
+    async def test_replies_to_observed_forward_without_polling(self):
+        from core.services.message_sender import send_item_message
+
+        mock_app = MagicMock()
+        mock_bot = AsyncMock()
+        mock_app.bot = mock_bot
+        sent = MagicMock()
+        sent.chat_id = -1001
+        sent.message_id = 55
+        mock_bot.send_message = AsyncMock(return_value=sent)
+
+        with patch("core.services.message_sender._get_application", return_value=mock_app), \
+             patch("core.services.message_sender.get_chat_info", new_callable=AsyncMock,
+                   return_value={"type": "channel", "linked_chat_id": -1002}), \
+             patch("core.services.message_sender.media_files_packaging", new_callable=AsyncMock,
+                   return_value=([], [["doc"]], [])), \
+             patch("core.services.message_sender.wait_for_forward", new_callable=AsyncMock,
+                   return_value=900) as mock_wait:
+            await send_item_message(self._data(), chat_id=-1001)
+
+        mock_wait.assert_awaited_once()
+        assert mock_wait.call_args.kwargs["channel_message_id"] == 55
+        mock_bot.get_chat.assert_not_awaited()
+        file_call = mock_bot.send_media_group.call_args.kwargs
+        assert file_call["chat_id"] == -1002
+        assert file_call["reply_to_message_id"] == 900
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_pinned_message_on_timeout(self):
+        from core.services.message_sender import send_item_message
+
+        mock_app = MagicMock()
+        mock_bot = AsyncMock()
+        mock_app.bot = mock_bot
+        sent = MagicMock()
+        sent.chat_id = -1001
+        sent.message_id = 55
+        mock_bot.send_message = AsyncMock(return_value=sent)
+        group_chat = MagicMock()
+        group_chat.pinned_message.id = 901
+        group_chat.pinned_message.forward_origin.message_id = 55
+        mock_bot.get_chat = AsyncMock(return_value=group_chat)
+
+        with patch("core.services.message_sender._get_application", return_value=mock_app), \
+             patch("core.services.message_sender.get_chat_info", new_callable=AsyncMock,
+                   return_value={"type": "channel", "linked_chat_id": -1002}), \
+             patch("core.services.message_sender.media_files_packaging", new_callable=AsyncMock,
+                   return_value=([], [["doc"]], [])), \
+             patch("core.services.message_sender.wait_for_forward", new_callable=AsyncMock,
+                   return_value=None):
+            await send_item_message(self._data(), chat_id=-1001)
+
+        mock_bot.get_chat.assert_awaited_once_with(chat_id=-1002)
+        assert mock_bot.send_media_group.call_args.kwargs["reply_to_message_id"] == 901
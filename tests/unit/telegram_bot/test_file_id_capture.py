@@ -183,6 +183,124 @@ class TestCaptureAndPushFileIds:
         assert payload["file_id_updates"][0]["telegram_file_id"] == "AgACAgI123"
         assert payload["file_id_updates"][1]["telegram_file_id"] == "BAACAgI456"
 
+    @pytest.mark.asyncio
+    async def test_indexes_file_ids_of_the_bot(self, mock_redis):
+        from core.services.file_id_capture import capture_and_push_file_ids
+
+        msg = MagicMock()
+        msg.photo = [MagicMock(file_id="AgACAgI123")]
+        uncached_info = [{"url": "https://img.com/1.jpg", "media_type": "image"}]
+
+        with patch(
+            "core.services.file_id_capture.aioredis.from_url",
+            return_value=mock_redis,
+        ), patch(
+            "core.services.file_id_capture.record_file_ids", new_callable=AsyncMock
+        ) as mock_record:
+            await capture_and_push_file_ids(
+                uncached_info=uncached_info,
+                sent_messages=(msg,),
+                metadata_url="https://example.com/post/1",
+                bot_id=42,
+            )
+
+        updates = [{"url": "https://img.com/1.jpg", "media_type": "image", "telegram_file_id": "AgACAgI123"}]
+        mock_record.assert_awaited_once_with(42, updates)
+        payload = json.loads(mock_redis.lpush.call_args[0][1])
+        assert payload["bot_id"] == 42
+        assert payload["file_id_updates"] == updates
+
+    @pytest.mark.asyncio
+    async def test_index_failure_still_pushes_updates(self, mock_redis):
+        from core.services.file_id_capture import capture_and_push_file_ids
+
+        msg = MagicMock()
+        msg.photo = [MagicMock(file_id="AgACAgI123")]
+
+        with patch(
+            "core.services.file_id_capture.aioredis.from_url",
+            return_value=mock_redis,
+        ), patch(
+            "core.services.file_id_capture.record_file_ids",
+            new_callable=AsyncMock,
+            side_effect=ConnectionError("redis down"),
+        ):
+            await capture_and_push_file_ids(
+                uncached_info=[{"url": "https://img.com/1.jpg", "media_type": "image"}],
+                sent_messages=(msg,),
+                metadata_url="https://example.com/post/1",
+                bot_id=42,
+            )
+
+        mock_redis.lpush.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_stores_downloaded_media(self, mock_redis, tmp_path):
+        from fastfetchbot_shared.models.classes import NamedBytesIO
+        from fastfetchbot_shared.services.media_store import LocalMediaStore, content_key
+        from core.services.file_id_capture import capture_and_push_file_ids
+
+        store = LocalMediaStore(str(tmp_path))
+        msg = MagicMock()
+        msg.video = MagicMock(file_id="BAACAgI456")
+        uncached_info = [{
+            "url": "https://vid.com/v.mp4",
+            "media_type": "video",
+            "media": NamedBytesIO(b"video bytes", name="media-1.mp4"),
+        }]
+
+        with patch(
+            "core.services.file_id_capture.aioredis.from_url",
+            return_value=mock_redis,
+        ), patch("core.services.file_id_capture.get_media_store", return_value=store):
+            await capture_and_push_file_ids(
+                uncached_info=uncached_info,
+                sent_messages=(msg,),
+                metadata_url="https://example.com/post/1",
+            )
+
+        file_key = content_key(b"video bytes", "mp4")
+        payload = json.loads(mock_redis.lpush.call_args[0][1])
+        assert payload["file_id_updates"] == [{
+            "url": "https://vid.com/v.mp4",
+            "media_type": "video",
+            "telegram_file_id": "BAACAgI456",
+            "file_key": file_key,
+        }]
+        assert await store.get(file_key) == b"video bytes"
+
+    @pytest.mark.asyncio
+    async def test_store_failure_still_pushes_file_id(self, mock_redis):
+        from fastfetchbot_shared.models.classes import NamedBytesIO
+        from core.services.file_id_capture import capture_and_push_file_ids
+
+        store = MagicMock()
+        store.put = AsyncMock(side_effect=RuntimeError("bucket unavailable"))
+        msg = MagicMock()
+        msg.video = MagicMock(file_id="BAACAgI456")
+        uncached_info = [{
+            "url": "https://vid.com/v.mp4",
+            "media_type": "video",
+            "media": NamedBytesIO(b"video bytes", name="media-1.mp4"),
+        }]
+
+        with patch(
+            "core.services.file_id_capture.aioredis.from_url",
+            return_value=mock_redis,
+        ), patch("core.services.file_id_capture.get_media_store", return_value=store):
+            await capture_and_push_file_ids(
+                uncached_info=uncached_info,
+                sent_messages=(msg,),
+                metadata_url="https://example.com/post/1",
+            )
+
+        payload = json.loads(mock_redis.lpush.call_args[0][1])
+        assert payload["file_id_updates"] == [{
+            "url": "https://vid.com/v.mp4",
+            "media_type": "video",
+            "telegram_file_id": "BAACAgI456",
+        }]
+
     @pytest.mark.asyncio
     async def test_skips_none_entries(self, mock_redis):
         """None entries in uncached_info are cached items — skip them."""
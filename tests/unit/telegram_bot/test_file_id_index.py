@@ -0,0 +1,108 @@
+"""Tests for apps/telegram-bot/core/services/file_id_index.py"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from fastfetchbot_shared.utils.file_id_index import index_entries, media_keys
+
+
+@pytest.fixture(autouse=True)
+def reset_module_state():
+    import core.services.file_id_index as fii
+
+    fii._redis = None
+    yield
+    fii._redis = None
+
+
+@pytest.fixture
+def mock_redis():
+    r = AsyncMock()
+    with patch("core.services.file_id_index.aioredis.from_url", return_value=r):
+        yield r
+
+
+class TestKeys:
+    def test_media_keys_content_hash_first(self):
+        assert media_keys("image", "https://img.com/1.jpg", "ab/abc.jpg") == [
+            "image:key:ab/abc.jpg",
+            "image:url:https://img.com/1.jpg",
+        ]
+        assert media_keys("video", "https://vid.com/v.mp4") == ["video:url:https://vid.com/v.mp4"]
+
+    def test_index_entries_skip_updates_without_file_id(self):
+        assert index_entries([
+            {"url": "https://img.com/1.jpg", "media_type": "image", "telegram_file_id": "AgAC1",
+             "file_key": "ab/abc.jpg"},
+            {"url": "https://vid.com/v.mp4", "media_type": "video", "file_key": "cd/cde.mp4"},
+        ]) == {
+            "image:key:ab/abc.jpg": "AgAC1",
+            "image:url:https://img.com/1.jpg": "AgAC1",
+        }
+
+
+class TestLookupFileIds:
+    @pytest.mark.asyncio
+    async def test_one_hmget_for_all_items(self, mock_redis):
+        from core.services.file_id_index import lookup_file_ids
+
+        mock_redis.hmget.return_value = [None, "AgAC1", None, "BAAC2", None]
+        media_files = [
+            {"media_type": "image", "url": "https://img.com/1.jpg", "file_key": "ab/abc.jpg"},
+            {"media_type": "video", "url": "https://vid.com/v.mp4", "file_key": "cd/cde.mp4"},
+            {"media_type": "image", "url": "https://img.com/2.jpg"},
+        ]
+
+        result = await lookup_file_ids(42, media_files)
+
+        assert result == ["AgAC1", "BAAC2", None]
+        mock_redis.hmget.assert_awaited_once_with("fileid:index:42", [
+            "image:key:ab/abc.jpg", "image:url:https://img.com/1.jpg",
+            "video:key:cd/cde.mp4", "video:url:https://vid.com/v.mp4",
+            "image:url:https://img.com/2.jpg",
+        ])
+
+    @pytest.mark.asyncio
+    async def test_redis_error_counts_as_miss(self, mock_redis):
+        from core.services.file_id_index import lookup_file_ids
+
+        mock_redis.hmget.side_effect = ConnectionError("redis down")
+
+        result = await lookup_file_ids(42, [{"media_type": "image", "url": "https://img.com/1.jpg"}])
+
+        assert result == [None]
+
+
+class TestRecordFileIds:
+    @pytest.mark.asyncio
+    async def test_writes_entries(self, mock_redis):
+        from core.services.file_id_index import record_file_ids
+
+        await record_file_ids(42, [
+            {"url": "https://img.com/1.jpg", "media_type": "image", "telegram_file_id": "AgAC1"},
+        ])
+
+        mock_redis.hset.assert_awaited_once_with(
+            "fileid:index:42", mapping={"image:url:https://img.com/1.jpg": "AgAC1"}
+        )
+
+    @pytest.mark.asyncio
+    async def test_nothing_to_write(self, mock_redis):
+        from core.services.file_id_index import record_file_ids
+
+        await record_file_ids(42, [{"url": "https://img.com/1.jpg", "media_type": "image"}])
+
+        mock_redis.hset.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_close(self, mock_redis):
+        import core.services.file_id_index as fii
+
+        await fii.record_file_ids(42, [
+            {"url": "https://img.com/1.jpg", "media_type": "image", "telegram_file_id": "AgAC1"},
+        ])
+        await fii.close()
+
+        mock_redis.aclose.assert_awaited_once()
+        assert fii._redis is None
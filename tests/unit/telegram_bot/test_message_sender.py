@@ -1,7 +1,8 @@
 """Tests for apps/telegram-bot/core/services/message_sender.py
 
-Covers exception handling, the telegram_file_id shortcut in media_files_packaging,
-and the background file_id capture wiring.
+Covers exception handling, the telegram_file_id shortcut, the file_id index and media store reads in
+media_files_packaging,
+the background file_id capture wiring, and the rendered caption cache.
 """
 
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -317,6 +318,150 @@ class TestMediaFilesPackagingFileIdShortcut:
         assert uncached == [None]
 
 
+class TestMediaFilesPackagingFileIdIndex:
+    """Test that media_files_packaging reads the sending bot's file_id index."""
+
+    @pytest.mark.asyncio
+    async def test_index_hit_skips_download(self):
+        from core.services.message_sender import media_files_packaging
+
+        media_files = [
+            {"media_type": "image", "url": "https://img.com/1.jpg"},
+            {"media_type": "video", "url": "https://vid.com/v.mp4", "telegram_file_id": "other_bot_id"},
+        ]
+        data = {"url": "https://example.com", "category": "twitter", "message_type": "short"}
+
+        with patch(
+            "core.services.message_sender.lookup_file_ids",
+            new_callable=AsyncMock,
+            return_value=["AgACAgI123", "BAACAgI456"],
+        ) as mock_lookup, patch(
+            "core.services.message_sender.download_file_by_metadata_item",
+            new_callable=AsyncMock,
+        ) as mock_download:
+            media_group, file_group, uncached = await media_files_packaging(media_files, data, bot_id=42)
+
+        mock_lookup.assert_awaited_once_with(42, media_files)
+        mock_download.assert_not_awaited()
+        assert media_group[0][1].media == "BAACAgI456"
+        assert uncached == [None, None]
+
+    @pytest.mark.asyncio
+    async def test_embedded_file_id_of_another_bot_is_not_used(self):
+        from core.services.message_sender import media_files_packaging
+
+        mock_io = MagicMock()
+        mock_io.name = "video.mp4"
+        mock_io.size = 1024
+        media_files = [
+            {"media_type": "video", "url": "https://vid.com/v.mp4", "telegram_file_id": "other_bot_id"},
+        ]
+        data = {"url": "https://example.com", "category": "twitter", "message_type": "short"}
+
+        with patch(
+            "core.services.message_sender.lookup_file_ids",
+            new_callable=AsyncMock,
+            return_value=[None],
+        ), patch(
+            "core.services.message_sender.download_file_by_metadata_item",
+            new_callable=AsyncMock,
+            return_value=mock_io,
+        ) as mock_download, patch(
+            "core.services.message_sender.settings"
+        ) as mock_settings:
+            mock_settings.TELEBOT_API_SERVER = "http://local:8081/bot"
+            media_group, file_group, uncached = await media_files_packaging(media_files, data, bot_id=42)
+
+        mock_download.assert_awaited_once()
+        assert uncached[0]["url"] == "https://vid.com/v.mp4"
+
+
+class TestMediaFilesPackagingMediaStore:
+    """Test that media_files_packaging reads from the media store before the origin."""
+
+    DATA = {"url": "https://example.com", "category": "twitter", "message_type": "short"}
+
+    @pytest.fixture
+    def media_store(self, tmp_path):
+        from fastfetchbot_shared.services.media_store import LocalMediaStore
+
+        store = LocalMediaStore(str(tmp_path))
+        with patch("core.services.message_sender.get_media_store", return_value=store), \
+                patch("core.services.message_sender.settings") as mock_settings:
+            mock_settings.TELEBOT_API_SERVER = "http://local:8081/bot"
+            yield store
+
+    @pytest.mark.asyncio
+    async def test_file_key_is_read_from_store(self, media_store):
+        from core.services.message_sender import media_files_packaging
+
+        file_key = await media_store.put(b"video bytes", ext="mp4")
+        media_files = [{"media_type": "video", "url": "https://vid.com/v.mp4", "file_key": file_key}]
+
+        with patch(
+            "core.services.message_sender.download_file_by_metadata_item",
+            new_callable=AsyncMock,
+        ) as mock_download:
+            media_group, file_group, uncached = await media_files_packaging(media_files, self.DATA)
+
+        mock_download.assert_not_awaited()
+        assert len(media_group[0]) == 1
+        assert uncached == [{"url": "https://vid.com/v.mp4", "media_type": "video"}]
+
+    @pytest.mark.asyncio
+    async def test_missing_object_falls_back_to_origin(self, media_store):
+        from fastfetchbot_shared.models.classes import NamedBytesIO
+        from core.services.message_sender import media_files_packaging
+
+        downloaded = NamedBytesIO(b"video bytes", name="media-1.mp4")
+        media_files = [{"media_type": "video", "url": "https://vid.com/v.mp4", "file_key": "ab/gone.mp4"}]
+
+        with patch(
+            "core.services.message_sender.download_file_by_metadata_item",
+            new_callable=AsyncMock,
+            return_value=downloaded,
+        ) as mock_download:
+            media_group, file_group, uncached = await media_files_packaging(media_files, self.DATA)
+
+        mock_download.assert_awaited_once()
+        assert uncached[0]["media"] is downloaded
+
+    @pytest.mark.asyncio
+    async def test_origin_download_is_passed_on_for_storing(self, media_store):
+        from fastfetchbot_shared.models.classes import NamedBytesIO
+        from core.services.message_sender import media_files_packaging
+
+        downloaded = NamedBytesIO(b"video bytes", name="media-1.mp4")
+        media_files = [{"media_type": "video", "url": "https://vid.com/v.mp4"}]
+
+        with patch(
+            "core.services.message_sender.download_file_by_metadata_item",
+            new_callable=AsyncMock,
+            return_value=downloaded,
+        ):
+            media_group, file_group, uncached = await media_files_packaging(media_files, self.DATA)
+
+        assert uncached[0]["media"] is downloaded
+
+    @pytest.mark.asyncio
+    async def test_large_origin_download_is_not_kept_for_storing(self, media_store):
+        from fastfetchbot_shared.models.classes import NamedBytesIO
+        from core.services.message_sender import media_files_packaging
+
+        downloaded = NamedBytesIO(b"video bytes", name="media-1.mp4")
+        media_files = [{"media_type": "video", "url": "https://vid.com/v.mp4"}]
+
+        with patch(
+            "core.services.message_sender.download_file_by_metadata_item",
+            new_callable=AsyncMock,
+            return_value=downloaded,
+        ), patch("core.services.message_sender.TELEGRAM_FILE_UPLOAD_LIMIT", 4):
+            media_group, file_group, uncached = await media_files_packaging(media_files, self.DATA)
+
+        assert len(media_group[0]) == 1
+        assert uncached == [{"url": "https://vid.com/v.mp4", "media_type": "video"}]
+
+
 class TestSendItemMessageExceptionHandling:
     @pytest.mark.asyncio
     async def test_exception_logged_and_sent_to_debug_channel(self):
@@ -355,3 +500,56 @@ class TestSendItemMessageExceptionHandling:
             # Debug channel should have been called with the traceback
             mock_debug.assert_awaited_once()
             assert "telegram API down" in mock_debug.call_args[0][0]
+
+
+class TestMessageFormattingCaptionCache:
+    @pytest.fixture(autouse=True)
+    def clear_caption_cache(self):
+        import core.services.message_sender as ms
+
+        ms._caption_cache.clear()
+        yield
+        ms._caption_cache.clear()
+
+    @staticmethod
+    def _data(**overrides):
+        data = {
+            "message_type": "long",
+            "category": "twitter",
+            "title": "Test",
+            "url": "https://example.com",
+            "text": "test",
+            "telegraph_url": "",
+            "author": "a",
+            "author_url": "",
+        }
+        data.update(overrides)
+        return data
+
+    def test_repeated_item_renders_once(self):
+        from core.services.message_sender import message_formatting
+
+        with patch("core.services.message_sender.template") as mock_template:
+            mock_template.render.return_value = "caption"
+            assert message_formatting(self._data()) == "caption"
+            assert message_formatting(self._data()) == "caption"
+
+        mock_template.render.assert_called_once()
+
+    def test_changed_field_renders_again(self):
+        from core.services.message_sender import message_formatting
+
+        with patch("core.services.message_sender.template") as mock_template:
+            mock_template.render.side_effect = ["first", "second"]
+            assert message_formatting(self._data()) == "first"
+            assert message_formatting(self._data(telegraph_url="https://telegra.ph/x")) == "second"
+
+    def test_cache_is_bounded(self):
+        import core.services.message_sender as ms
+
+        with patch("core.services.message_sender.template") as mock_template:
+            mock_template.render.return_value = "caption"
+            for i in range(ms._CAPTION_CACHE_MAX_SIZE + 5):
+                ms.message_formatting(self._data(url=f"https://example.com/{i}"))
+
+        assert len(ms._caption_cache) == ms._CAPTION_CACHE_MAX_SIZE
@@ -5,6 +5,7 @@ import json
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from redis.exceptions import ResponseError
 
 
 # ---------------------------------------------------------------------------
@@ -20,17 +21,26 @@ def reset_module_state():
     oc._redis = None
     oc._consumer_task = None
     oc._outbox_key = None
+    oc._consumer_name = "test-consumer"
     yield
     oc._redis = None
     oc._consumer_task = None
     oc._outbox_key = None
+    oc._consumer_name = None
 
 
 @pytest.fixture
 def mock_redis():
-    """Create a mock async Redis instance."""
+    """Create a mock async Redis instance with stream commands."""
     r = AsyncMock()
-    r.brpop = AsyncMock()
+    r.type = AsyncMock(return_value="stream")
+    r.xgroup_create = AsyncMock()
+    r.xreadgroup = AsyncMock()
+    r.xpending_range = AsyncMock(return_value=[])
+    r.xclaim = AsyncMock(return_value=[])
+    r.xack = AsyncMock()
+    r.xdel = AsyncMock()
+    r.xadd = AsyncMock()
     r.aclose = AsyncMock()
     return r
 
@@ -55,6 +65,21 @@ def _make_payload(
     )
 
 
+def _read_once(*entries):
+    """Build an xreadgroup side effect that yields *entries* once, then cancels."""
+    call_count = 0
+
+    async def side_effect(*args, **kwargs):
+        nonlocal call_count
+        call_count += 1
+        if call_count == 1:
+            return [["scrape:outbox", list(entries)]]
+        # CancelledError is caught inside _consume_loop and breaks the loop
+        raise asyncio.CancelledError()
+
+    return side_effect
+
+
 # ---------------------------------------------------------------------------
 # _get_redis
 # ---------------------------------------------------------------------------
@@ -99,17 +124,7 @@ class TestConsumeLoopSuccessItem:
             chat_id=42,
             message_id=99,
         )
-        call_count = 0
-
-        async def brpop_side_effect(*args, **kwargs):
-            nonlocal call_count
-            call_count += 1
-            if call_count == 1:
-                return ("scrape:outbox", payload)
-            # CancelledError is caught inside _consume_loop and breaks the loop
-            raise asyncio.CancelledError()
-
-        mock_redis.brpop = AsyncMock(side_effect=brpop_side_effect)
+        mock_redis.xreadgroup = AsyncMock(side_effect=_read_once(("1-0", {"payload": payload})))
 
         with patch(
             "core.services.outbox_consumer.aioredis.from_url",
@@ -120,7 +135,6 @@ class TestConsumeLoopSuccessItem:
         ) as mock_send:
             from core.services.outbox_consumer import _consume_loop
 
-            # _consume_loop catches CancelledError and exits cleanly
             await _consume_loop()
 
             mock_send.assert_awaited_once()
@@ -128,6 +142,42 @@ class TestConsumeLoopSuccessItem:
             assert call_kwargs["chat_id"] == 42
             assert call_kwargs["message_id"] == 99
 
+        mock_redis.xack.assert_awaited_once_with("scrape:outbox", "telegram-bot", "1-0")
+        mock_redis.xdel.assert_awaited_once_with("scrape:outbox", "1-0")
+
+    @pytest.mark.asyncio
+    async def test_creates_consumer_group(self, mock_redis):
+        mock_redis.xreadgroup = AsyncMock(side_effect=asyncio.CancelledError())
+
+        with patch(
+            "core.services.outbox_consumer.aioredis.from_url",
+            return_value=mock_redis,
+        ):
+            from core.services.outbox_consumer import _consume_loop
+
+            await _consume_loop()
+
+        mock_redis.xgroup_create.assert_awaited_once_with(
+            "scrape:outbox", "telegram-bot", id="0", mkstream=True
+        )
+
+    @pytest.mark.asyncio
+    async def test_existing_group_is_tolerated(self, mock_redis):
+        mock_redis.xgroup_create = AsyncMock(
+            side_effect=ResponseError("BUSYGROUP Consumer Group name already exists")
+        )
+        mock_redis.xreadgroup = AsyncMock(side_effect=asyncio.CancelledError())
+
+        with patch(
+            "core.services.outbox_consumer.aioredis.from_url",
+            return_value=mock_redis,
+        ):
+            from core.services.outbox_consumer import _consume_loop
+
+            await _consume_loop()
+
+        mock_redis.xreadgroup.assert_awaited_once()
+
 
 # ---------------------------------------------------------------------------
 # _consume_loop — error delivery
@@ -138,16 +188,7 @@ class TestConsumeLoopError:
     @pytest.mark.asyncio
     async def test_sends_error_to_debug_channel(self, mock_redis):
         payload = _make_payload(error="scraper failed", chat_id=99, job_id="j42")
-        call_count = 0
-
-        async def brpop_side_effect(*args, **kwargs):
-            nonlocal call_count
-            call_count += 1
-            if call_count == 1:
-                return ("scrape:outbox", payload)
-            raise asyncio.CancelledError()
-
-        mock_redis.brpop = AsyncMock(side_effect=brpop_side_effect)
+        mock_redis.xreadgroup = AsyncMock(side_effect=_read_once(("1-0", {"payload": payload})))
 
         with patch(
             "core.services.outbox_consumer.aioredis.from_url",
@@ -170,16 +211,7 @@ class TestConsumeLoopError:
     async def test_does_not_send_error_to_user_chat(self, mock_redis):
         """Scrape errors should NOT notify the user."""
         payload = _make_payload(error="scraper failed", chat_id=99)
-        call_count = 0
-
-        async def brpop_side_effect(*args, **kwargs):
-            nonlocal call_count
-            call_count += 1
-            if call_count == 1:
-                return ("scrape:outbox", payload)
-            raise asyncio.CancelledError()
-
-        mock_redis.brpop = AsyncMock(side_effect=brpop_side_effect)
+        mock_redis.xreadgroup = AsyncMock(side_effect=_read_once(("1-0", {"payload": payload})))
 
         with patch(
             "core.services.outbox_consumer.aioredis.from_url",
@@ -198,6 +230,44 @@ class TestConsumeLoopError:
             # User should receive no message at all
             mock_send.assert_not_awaited()
 
+    @pytest.mark.asyncio
+    async def test_failed_delivery_is_not_acked(self, mock_redis):
+        """A delivery that raises stays pending so another replica can reclaim it."""
+        payload = _make_payload(metadata_item={"title": "Test"}, chat_id=42)
+        mock_redis.xreadgroup = AsyncMock(side_effect=_read_once(("1-0", {"payload": payload})))
+
+        with patch(
+            "core.services.outbox_consumer.aioredis.from_url",
+            return_value=mock_redis,
+        ), patch(
+            "core.services.outbox_consumer.send_item_message",
+            new_callable=AsyncMock,
+            side_effect=RuntimeError("telegram down"),
+        ):
+            from core.services.outbox_consumer import _consume_loop
+
+            await _consume_loop()
+
+        mock_redis.xack.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_malformed_payload_goes_to_dlq(self, mock_redis):
+        mock_redis.xreadgroup = AsyncMock(side_effect=_read_once(("1-0", {"payload": "{not json"})))
+
+        with patch(
+            "core.services.outbox_consumer.aioredis.from_url",
+            return_value=mock_redis,
+        ):
+            from core.services.outbox_consumer import _consume_loop
+
+            await _consume_loop()
+
+        dlq_key, fields = mock_redis.xadd.call_args[0]
+        assert dlq_key == "scrape:outbox:dlq"
+        assert fields["payload"] == "{not json"
+        assert fields["entry_id"] == "1-0"
+        mock_redis.xack.assert_awaited_once()
+
 
 # ---------------------------------------------------------------------------
 # _consume_loop — edge cases
@@ -208,16 +278,7 @@ class TestConsumeLoopEdgeCases:
     @pytest.mark.asyncio
     async def test_skips_payload_missing_metadata_and_chat(self, mock_redis):
         payload = _make_payload(metadata_item=None, chat_id=None)
-        call_count = 0
-
-        async def brpop_side_effect(*args, **kwargs):
-            nonlocal call_count
-            call_count += 1
-            if call_count == 1:
-                return ("scrape:outbox", payload)
-            raise asyncio.CancelledError()
-
-        mock_redis.brpop = AsyncMock(side_effect=brpop_side_effect)
+        mock_redis.xreadgroup = AsyncMock(side_effect=_read_once(("1-0", {"payload": payload})))
 
         with patch(
             "core.services.outbox_consumer.aioredis.from_url",
@@ -234,18 +295,18 @@ class TestConsumeLoopEdgeCases:
             mock_send.assert_not_awaited()
 
     @pytest.mark.asyncio
-    async def test_brpop_none_continues_loop(self, mock_redis):
-        """When BRPOP returns None (timeout), loop should continue."""
+    async def test_empty_read_continues_loop(self, mock_redis):
+        """When XREADGROUP times out with no entries, loop should continue."""
         call_count = 0
 
-        async def brpop_side_effect(*args, **kwargs):
+        async def xreadgroup_side_effect(*args, **kwargs):
             nonlocal call_count
             call_count += 1
             if call_count <= 2:
-                return None
+                return []
             raise asyncio.CancelledError()
 
-        mock_redis.brpop = AsyncMock(side_effect=brpop_side_effect)
+        mock_redis.xreadgroup = AsyncMock(side_effect=xreadgroup_side_effect)
 
         with patch(
             "core.services.outbox_consumer.aioredis.from_url",
@@ -255,7 +316,109 @@ class TestConsumeLoopEdgeCases:
 
             await _consume_loop()
 
-        assert call_count == 3  # 2 None returns, then cancel
+        assert call_count == 3  # 2 empty reads, then cancel
+
+    @pytest.mark.asyncio
+    async def test_migrates_legacy_list(self, mock_redis):
+        mock_redis.type = AsyncMock(return_value="list")
+        # LPUSH order: newest first
+        mock_redis.lrange = AsyncMock(return_value=["new", "old"])
+        mock_redis.rename = AsyncMock()
+        mock_redis.delete = AsyncMock()
+        mock_redis.xreadgroup = AsyncMock(side_effect=asyncio.CancelledError())
+
+        with patch(
+            "core.services.outbox_consumer.aioredis.from_url",
+            return_value=mock_redis,
+        ):
+            from core.services.outbox_consumer import _consume_loop
+
+            await _consume_loop()
+
+        mock_redis.rename.assert_awaited_once_with("scrape:outbox", "scrape:outbox:legacy")
+        appended = [c.args[1]["payload"] for c in mock_redis.xadd.call_args_list]
+        assert appended == ["old", "new"]
+        mock_redis.delete.assert_awaited_once_with("scrape:outbox:legacy")
+
+
+# ---------------------------------------------------------------------------
+# _reclaim_pending
+# ---------------------------------------------------------------------------
+
+
+class TestReclaimPending:
+    @pytest.mark.asyncio
+    async def test_redelivers_stale_entry(self, mock_redis):
+        payload = _make_payload(metadata_item={"title": "Test"}, chat_id=42)
+        mock_redis.xpending_range = AsyncMock(
+            return_value=[{"message_id": "1-0", "consumer": "dead", "times_delivered": 1}]
+        )
+        mock_redis.xclaim = AsyncMock(return_value=[("1-0", {"payload": payload})])
+
+        with patch(
+            "core.services.outbox_consumer.send_item_message",
+            new_callable=AsyncMock,
+        ) as mock_send:
+            from core.services.outbox_consumer import _reclaim_pending
+
+            await _reclaim_pending(mock_redis, "scrape:outbox:1")
+
+        mock_send.assert_awaited_once()
+        assert mock_redis.xclaim.call_args[0][2] == "test-consumer"
+        mock_redis.xack.assert_awaited_once_with("scrape:outbox:1", "telegram-bot", "1-0")
+
+    @pytest.mark.asyncio
+    async def test_exhausted_entry_goes_to_dlq(self, mock_redis):
+        payload = _make_payload(metadata_item={"title": "Test"}, chat_id=42)
+        mock_redis.xpending_range = AsyncMock(
+            return_value=[{"message_id": "1-0", "consumer": "dead", "times_delivered": 3}]
+        )
+        mock_redis.xclaim = AsyncMock(return_value=[("1-0", {"payload": payload})])
+
+        with patch(
+            "core.services.outbox_consumer.send_item_message",
+            new_callable=AsyncMock,
+        ) as mock_send:
+            from core.services.outbox_consumer import _reclaim_pending
+
+            await _reclaim_pending(mock_redis, "scrape:outbox:1")
+
+        mock_send.assert_not_awaited()
+        assert mock_redis.xadd.call_args[0][0] == "scrape:outbox:1:dlq"
+        mock_redis.xack.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_nothing_pending(self, mock_redis):
+        from core.services.outbox_consumer import _reclaim_pending
+
+        await _reclaim_pending(mock_redis, "scrape:outbox:1")
+        mock_redis.xclaim.assert_not_awaited()
+
+
+# ---------------------------------------------------------------------------
+# get_stats
+# ---------------------------------------------------------------------------
+
+
+class TestGetStats:
+    @pytest.mark.asyncio
+    async def test_reports_group_lag(self, mock_redis):
+        import core.services.outbox_consumer as oc
+
+        oc._redis = mock_redis
+        oc._outbox_key = "scrape:outbox:1"
+        mock_redis.xlen = AsyncMock(side_effect=[5, 2])
+        mock_redis.xinfo_groups = AsyncMock(
+            return_value=[{"name": "telegram-bot", "pending": 1, "lag": 4, "consumers": 2}]
+        )
+
+        stats = await oc.get_stats()
+
+        assert stats["length"] == 5
+        assert stats["dead_letters"] == 2
+        assert stats["pending"] == 1
+        assert stats["lag"] == 4
+        assert stats["consumers"] == 2
 
 
 # ---------------------------------------------------------------------------
@@ -281,6 +444,7 @@ class TestStartStop:
                 await oc.start(bot_id=123)
                 assert oc._consumer_task is not None
                 assert oc._outbox_key == "scrape:outbox:123"
+                assert oc._consumer_name
 
                 # Clean up
                 await oc.stop()
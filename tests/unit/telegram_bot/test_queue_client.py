@@ -176,6 +176,7 @@ class TestEnqueueScrape:
         assert call_args.kwargs["source"] == "twitter"
         assert call_args.kwargs["content_type"] == "social_media"
         assert call_args.kwargs["bot_id"] == 123
+        assert isinstance(call_args.kwargs["trace_context"], dict)
 
     @pytest.mark.asyncio
     async def test_passes_extra_kwargs(self, mock_arq_pool):
@@ -205,3 +206,33 @@ class TestEnqueueScrape:
         assert call_kwargs["content_type"] == ""
         assert call_kwargs["message_id"] is None
         assert call_kwargs["bot_id"] == 456
+
+    @pytest.mark.asyncio
+    async def test_default_lane_uses_arq_default_queue(self, mock_arq_pool):
+        import core.queue_client as qc
+
+        qc._arq_redis = mock_arq_pool
+        qc._bot_id = 1
+        await qc.enqueue_scrape(url="u", chat_id=1)
+
+        assert mock_arq_pool.enqueue_job.call_args.kwargs["_queue_name"] == "arq:queue"
+
+    @pytest.mark.asyncio
+    async def test_lane_selects_queue(self, mock_arq_pool):
+        import core.queue_client as qc
+
+        qc._arq_redis = mock_arq_pool
+        qc._bot_id = 1
+        await qc.enqueue_scrape(url="u", chat_id=1, lane="background")
+
+        assert mock_arq_pool.enqueue_job.call_args.kwargs["_queue_name"] == "arq:queue:background"
+
+    @pytest.mark.asyncio
+    async def test_unknown_lane_raises(self, mock_arq_pool):
+        import core.queue_client as qc
+
+        qc._arq_redis = mock_arq_pool
+        qc._bot_id = 1
+        with pytest.raises(ValueError):
+            await qc.enqueue_scrape(url="u", chat_id=1, lane="urgent")
+        mock_arq_pool.enqueue_job.assert_not_awaited()
@@ -1,15 +1,28 @@
 """Tests for apps/telegram-bot/core/services/user_settings.py
 
-Covers: ensure_user_settings, get/toggle auto_fetch_in_dm, get/toggle force_refresh_cache.
-All DB interactions are mocked via get_session.
+Covers: ensure_user_settings, get/toggle auto_fetch_in_dm, get/toggle force_refresh_cache,
+and the write-through settings cache.
+All DB interactions are mocked via get_session; Redis is disabled unless a test enables it.
 """
 
+import json
 from unittest.mock import AsyncMock, MagicMock, patch
 from contextlib import asynccontextmanager
 
 import pytest
 
 
+@pytest.fixture(autouse=True)
+def reset_cache():
+    """Start every test with an empty local cache and no shared Redis."""
+    import core.services.user_settings as us
+
+    us._cache.clear()
+    with patch("core.services.user_settings._get_redis", new_callable=AsyncMock, return_value=None):
+        yield
+    us._cache.clear()
+
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
@@ -41,9 +54,7 @@ class TestEnsureUserSettings:
     async def test_creates_row_when_not_exists(self):
         mock_get_session, mock_session = _mock_session_with_result(None)
 
-        with patch(
-            "core.services.user_settings.get_session", mock_get_session
-        ), patch("core.services.user_settings._known_user_ids", set()):
+        with patch("core.services.user_settings.get_session", mock_get_session):
             from core.services.user_settings import ensure_user_settings
 
             await ensure_user_settings(12345)
@@ -54,12 +65,11 @@ class TestEnsureUserSettings:
     async def test_skips_db_when_user_already_known(self):
         mock_get_session, mock_session = _mock_session_with_result(None)
 
-        with patch(
-            "core.services.user_settings.get_session", mock_get_session
-        ), patch("core.services.user_settings._known_user_ids", {12345}):
-            from core.services.user_settings import ensure_user_settings
+        with patch("core.services.user_settings.get_session", mock_get_session):
+            import core.services.user_settings as us
 
-            await ensure_user_settings(12345)
+            us._cache_put(12345, us.CachedUserSettings(persisted=True))
+            await us.ensure_user_settings(12345)
 
         mock_session.execute.assert_not_awaited()
 
@@ -68,9 +78,7 @@ class TestEnsureUserSettings:
         existing_setting = MagicMock()
         mock_get_session, mock_session = _mock_session_with_result(existing_setting)
 
-        with patch(
-            "core.services.user_settings.get_session", mock_get_session
-        ), patch("core.services.user_settings._known_user_ids", set()):
+        with patch("core.services.user_settings.get_session", mock_get_session):
             from core.services.user_settings import ensure_user_settings
 
             await ensure_user_settings(99999)
@@ -78,18 +86,17 @@ class TestEnsureUserSettings:
         mock_session.add.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_adds_user_to_known_ids(self):
-        mock_get_session, _ = _mock_session_with_result(MagicMock())
-        known_ids = set()
+    async def test_caches_user_after_creation(self):
+        mock_get_session, mock_session = _mock_session_with_result(None)
 
-        with patch(
-            "core.services.user_settings.get_session", mock_get_session
-        ), patch("core.services.user_settings._known_user_ids", known_ids):
+        with patch("core.services.user_settings.get_session", mock_get_session):
             from core.services.user_settings import ensure_user_settings
 
             await ensure_user_settings(42)
+            mock_session.execute.reset_mock()
+            await ensure_user_settings(42)
 
-        assert 42 in known_ids
+        mock_session.execute.assert_not_awaited()
 
 
 # ---------------------------------------------------------------------------
@@ -100,7 +107,9 @@ class TestEnsureUserSettings:
 class TestGetAutoFetchInDm:
     @pytest.mark.asyncio
     async def test_returns_stored_value(self):
-        mock_get_session, _ = _mock_session_with_result(False)
+        row = MagicMock()
+        row.auto_fetch_in_dm = False
+        mock_get_session, _ = _mock_session_with_result(row)
 
         with patch("core.services.user_settings.get_session", mock_get_session):
             from core.services.user_settings import get_auto_fetch_in_dm
@@ -163,7 +172,9 @@ class TestToggleAutoFetchInDm:
 class TestGetForceRefreshCache:
     @pytest.mark.asyncio
     async def test_returns_stored_value(self):
-        mock_get_session, _ = _mock_session_with_result(True)
+        row = MagicMock()
+        row.force_refresh_cache = True
+        mock_get_session, _ = _mock_session_with_result(row)
 
         with patch("core.services.user_settings.get_session", mock_get_session):
             from core.services.user_settings import get_force_refresh_cache
@@ -216,3 +227,163 @@ class TestToggleForceRefreshCache:
         # New setting created with force_refresh=True (toggled from default False)
         mock_session.add.assert_called_once()
         assert result is True
+
+
+# ---------------------------------------------------------------------------
+# settings cache
+# ---------------------------------------------------------------------------
+
+
+class TestUserSettingsCache:
+    @pytest.mark.asyncio
+    async def test_loads_all_settings_in_one_query(self):
+        row = MagicMock()
+        row.auto_fetch_in_dm = False
+        row.force_refresh_cache = True
+        mock_get_session, mock_session = _mock_session_with_result(row)
+
+        with patch("core.services.user_settings.get_session", mock_get_session):
+            from core.services.user_settings import get_auto_fetch_in_dm, get_force_refresh_cache
+
+            assert await get_auto_fetch_in_dm(1) is False
+            assert await get_force_refresh_cache(1) is True
+
+        mock_session.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_toggle_writes_through(self):
+        row = MagicMock()
+        row.auto_fetch_in_dm = True
+        row.force_refresh_cache = False
+        mock_get_session, mock_session = _mock_session_with_result(row)
+
+        with patch("core.services.user_settings.get_session", mock_get_session):
+            from core.services.user_settings import get_auto_fetch_in_dm, toggle_auto_fetch_in_dm
+
+            assert await get_auto_fetch_in_dm(1) is True
+            await toggle_auto_fetch_in_dm(1)
+            mock_session.execute.reset_mock()
+            assert await get_auto_fetch_in_dm(1) is False
+
+        mock_session.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_reloads(self):
+        mock_get_session, mock_session = _mock_session_with_result(None)
+
+        with patch("core.services.user_settings.get_session", mock_get_session):
+            import core.services.user_settings as us
+
+            await us.get_user_settings(1)
+            expires_at, value = us._cache[1]
+            us._cache[1] = (0.0, value)
+            await us.get_user_settings(1)
+
+        assert mock_session.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_lru_is_bounded(self):
+        import core.services.user_settings as us
+
+        with patch.object(us.settings, "USER_SETTINGS_CACHE_SIZE", 2):
+            us._cache_put(1, us.CachedUserSettings())
+            us._cache_put(2, us.CachedUserSettings())
+            us._cache_get(1)  # 1 becomes most recently used
+            us._cache_put(3, us.CachedUserSettings())
+
+        assert list(us._cache) == [1, 3]
+
+    @pytest.mark.asyncio
+    async def test_redis_hit_skips_db(self):
+        mock_get_session, mock_session = _mock_session_with_result(None)
+        mock_redis = AsyncMock()
+        mock_redis.get = AsyncMock(return_value=json.dumps(
+            {"auto_fetch_in_dm": False, "force_refresh_cache": True, "persisted": True}
+        ))
+
+        with patch("core.services.user_settings.get_session", mock_get_session), patch(
+            "core.services.user_settings._get_redis", new_callable=AsyncMock, return_value=mock_redis
+        ):
+            from core.services.user_settings import get_user_settings
+
+            user_settings = await get_user_settings(1)
+
+        assert user_settings.auto_fetch_in_dm is False
+        assert user_settings.force_refresh_cache is True
+        mock_session.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_toggle_publishes_to_redis(self):
+        row = MagicMock()
+        row.auto_fetch_in_dm = True
+        row.force_refresh_cache = False
+        mock_get_session, _ = _mock_session_with_result(row)
+        mock_redis = AsyncMock()
+
+        with patch("core.services.user_settings.get_session", mock_get_session), patch(
+            "core.services.user_settings._get_redis", new_callable=AsyncMock, return_value=mock_redis
+        ):
+            from core.services.user_settings import toggle_force_refresh_cache
+
+            await toggle_force_refresh_cache(7)
+
+        key, raw = mock_redis.set.call_args[0]
+        assert key == "usersettings:7"
+        assert json.loads(raw)["force_refresh_cache"] is True
+        mock_redis.publish.assert_awaited_once()
+        channel, message = mock_redis.publish.call_args[0]
+        assert channel == "usersettings:invalidate"
+        assert message.endswith(":7")
+
+    @pytest.mark.asyncio
+    async def test_db_fill_does_not_invalidate_other_replicas(self):
+        mock_get_session, _ = _mock_session_with_result(None)
+        mock_redis = AsyncMock()
+        mock_redis.get = AsyncMock(return_value=None)
+
+        with patch("core.services.user_settings.get_session", mock_get_session), patch(
+            "core.services.user_settings._get_redis", new_callable=AsyncMock, return_value=mock_redis
+        ):
+            from core.services.user_settings import get_user_settings
+
+            await get_user_settings(1)
+
+        mock_redis.set.assert_awaited_once()
+        assert mock_redis.set.call_args.kwargs["nx"] is True
+        mock_redis.publish.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_db_fill_keeps_newer_shared_value(self):
+        import core.services.user_settings as us
+
+        mock_get_session, _ = _mock_session_with_result(None)
+        mock_redis = AsyncMock()
+        # Another replica toggled the setting between the miss and the fill
+        mock_redis.get = AsyncMock(side_effect=[None, json.dumps(
+            {"auto_fetch_in_dm": False, "force_refresh_cache": False, "persisted": True}
+        )])
+        mock_redis.set = AsyncMock(return_value=None)
+
+        with patch("core.services.user_settings.get_session", mock_get_session), patch(
+            "core.services.user_settings._get_redis", new_callable=AsyncMock, return_value=mock_redis
+        ):
+            user_settings = await us.get_user_settings(1)
+
+        assert user_settings.auto_fetch_in_dm is False
+        assert us._cache_get(1) == user_settings
+
+    def test_invalidation_from_other_replica_drops_local_copy(self):
+        import core.services.user_settings as us
+
+        us._cache_put(7, us.CachedUserSettings())
+        us._handle_invalidation("other-replica:7")
+
+        assert 7 not in us._cache
+
+    def test_own_invalidation_keeps_local_copy(self):
+        import core.services.user_settings as us
+
+        us._cache_put(7, us.CachedUserSettings())
+        us._handle_invalidation(f"{us._replica_id}:7")
+
+        assert 7 in us._cache
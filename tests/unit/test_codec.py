@@ -0,0 +1,73 @@
+"""Tests for packages/shared/fastfetchbot_shared/utils/codec.py and the MetadataItem conversions"""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from fastfetchbot_shared.models.metadata_item import MediaFile, MessageType, MetadataItem
+from fastfetchbot_shared.utils import codec
+
+
+@pytest.fixture
+def item_dict(sample_metadata_item_dict):
+    return {
+        **sample_metadata_item_dict,
+        "media_files": [
+            {"media_type": "image", "url": "https://example.com/1.jpg", "caption": "一张图"},
+            {"media_type": "video", "url": "https://example.com/1.mp4", "caption": "", "telegram_file_id": "f1"},
+        ],
+    }
+
+
+class TestMetadataItemConversion:
+    def test_round_trip(self, item_dict):
+        item = MetadataItem.from_dict(item_dict)
+
+        assert item.message_type is MessageType.SHORT
+        assert item.media_files[1] == MediaFile("video", "https://example.com/1.mp4", caption="", telegram_file_id="f1")
+        assert item.to_dict() == item_dict
+
+    def test_missing_strings_default_to_empty(self, item_dict):
+        item_dict.update(author=None, author_url=None, text=None)
+        item_dict["media_files"] = [{"media_type": "image", "url": "u"}]
+
+        result = MetadataItem.from_dict(item_dict).to_dict()
+
+        assert (result["author"], result["author_url"], result["text"]) == ("", "", "")
+        assert result["media_files"] == [{"media_type": "image", "url": "u", "caption": ""}]
+
+    def test_media_file_has_no_instance_dict(self):
+        media_file = MediaFile("image", "u")
+        assert not hasattr(media_file, "__dict__")
+        with pytest.raises(AttributeError):
+            media_file.width = 100
+
+
+class TestCodec:
+    def test_encodes_like_json_without_ascii_escapes(self, item_dict):
+        encoded = codec.encode(item_dict)
+
+        assert isinstance(encoded, bytes)
+        assert "一张图".encode() in encoded
+        assert json.loads(encoded) == item_dict
+        assert codec.decode(encoded) == codec.decode(encoded.decode()) == item_dict
+
+    def test_encodes_dataclasses_enums_and_datetimes(self):
+        payload = {
+            "media_files": [MediaFile("image", "u")],
+            "message_type": MessageType.LONG,
+            "timestamp": datetime(2024, 1, 2, 3, 4, 5),
+        }
+
+        assert codec.decode(codec.encode(payload)) == {
+            "media_files": [
+                {"media_type": "image", "url": "u", "original_url": None, "caption": None, "telegram_file_id": None}
+            ],
+            "message_type": "long",
+            "timestamp": "2024-01-02T03:04:05",
+        }
+
+    def test_malformed_input(self):
+        with pytest.raises(codec.DecodeError):
+            codec.decode("{not json")
@@ -10,6 +10,7 @@ from fastfetchbot_shared.exceptions import (
     TelegraphPublishError,
     FileExportError,
     ExternalServiceError,
+    CircuitOpenError,
 )
 
 
@@ -32,6 +33,9 @@ class TestExceptionHierarchy:
     def test_external_service_error_is_fastfetchbot_error(self):
         assert issubclass(ExternalServiceError, FastFetchBotError)
 
+    def test_circuit_open_error_is_external_service_error(self):
+        assert issubclass(CircuitOpenError, ExternalServiceError)
+
     def test_all_are_exceptions(self):
         for cls in (
             FastFetchBotError,
@@ -0,0 +1,76 @@
+"""Tests for packages/shared/fastfetchbot_shared/utils/headers.py"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from fastfetchbot_shared.utils import headers
+
+
+@pytest.fixture
+def fresh_pool():
+    with patch.object(headers, "_pool", None):
+        yield
+
+
+class TestMakeProfile:
+    def test_chromium_profile_has_matching_client_hints(self):
+        profile = headers.make_profile("UA/Edge", "Edge", "124.0.2478.80", "Mac OS X")
+
+        assert profile.headers["User-Agent"] == "UA/Edge"
+        assert profile.headers["sec-ch-ua"] == (
+            '"Chromium";v="124", "Microsoft Edge";v="124", "Not.A/Brand";v="99"'
+        )
+        assert profile.headers["sec-ch-ua-platform"] == '"macOS"'
+
+    def test_firefox_profile_has_no_client_hints(self):
+        profile = headers.make_profile("UA/Firefox", "Firefox", "125.0", "Windows")
+        assert dict(profile.headers) == {"User-Agent": "UA/Firefox"}
+
+    def test_profile_headers_are_read_only(self):
+        with pytest.raises(TypeError):
+            headers.DEFAULT_PROFILE.headers["Referer"] = "https://example.com"
+
+
+class TestUserAgentPool:
+    def test_pool_is_built_once(self, fresh_pool):
+        user_agents = MagicMock()
+        entries = iter([
+            {"useragent": "UA/1", "browser": "Chrome", "browser_version": "130.0", "os": "Windows"},
+            {"useragent": "UA/2", "browser": "Safari", "browser_version": "17.4", "os": "Mac OS X"},
+            {"useragent": "UA/1", "browser": "Chrome", "browser_version": "130.0", "os": "Windows"},
+        ])
+        type(user_agents).getRandom = property(lambda self: next(entries))
+
+        with patch("fake_useragent.UserAgent", return_value=user_agents) as user_agent_class, \
+                patch.object(headers.settings, "USER_AGENT_POOL_SIZE", 3):
+            pool = headers.init_user_agent_pool()
+            for _ in range(5):
+                assert headers.random_user_agent() in ("UA/1", "UA/2")
+
+        user_agent_class.assert_called_once()
+        assert [p.user_agent for p in pool] == ["UA/1", "UA/2"]
+
+    def test_falls_back_to_default_profile(self, fresh_pool):
+        with patch("fake_useragent.UserAgent", side_effect=OSError("no browser data")):
+            assert headers.init_user_agent_pool() == (headers.DEFAULT_PROFILE,)
+
+
+class TestBuildHeaders:
+    def test_returns_a_new_dict_per_call(self):
+        first = headers.build_headers(referer="https://a.example")
+        second = headers.build_headers()
+
+        assert first is not second
+        assert first["Referer"] == "https://a.example"
+        assert "Referer" not in second
+        assert second["Accept"] == headers.ACCEPT_HTML
+
+    def test_platform_and_extra_headers(self):
+        built = headers.build_headers(platform="reddit", extra={"Cookie": "a=1"})
+
+        assert built["Accept"] == headers.ACCEPT_IMAGE
+        assert built["Cookie"] == "a=1"
+
+    def test_unknown_platform(self):
+        assert headers.build_headers(platform="twitter")["Accept"] == headers.ACCEPT_HTML
@@ -0,0 +1,167 @@
+"""Tests for packages/shared/fastfetchbot_shared/services/media_store.py"""
+
+import hashlib
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+from fastfetchbot_shared.services import media_store
+from fastfetchbot_shared.services.media_store import (
+    LocalMediaStore,
+    S3MediaStore,
+    content_key,
+    media_extension,
+)
+
+DATA = b"\x89PNG image bytes"
+DIGEST = hashlib.sha256(DATA).hexdigest()
+
+
+@pytest.fixture(autouse=True)
+def reset_module_state():
+    media_store._store = None
+    yield
+    media_store._store = None
+
+
+def _client_error(code):
+    return ClientError({"Error": {"Code": code}}, "operation")
+
+
+class TestKeys:
+    def test_content_key_is_sharded_sha256(self):
+        assert content_key(DATA, "png") == f"{DIGEST[:2]}/{DIGEST}.png"
+        assert content_key(DATA) == f"{DIGEST[:2]}/{DIGEST}"
+
+    @pytest.mark.parametrize("name, ext", [
+        ("media-1a2b.JPG", "jpg"),
+        ("gif_image-0.gif.gif", "gif"),
+        ("no_extension", ""),
+        ("weird.jpg?size=large", ""),
+        (None, ""),
+    ])
+    def test_media_extension(self, name, ext):
+        assert media_extension(name) == ext
+
+
+class TestLocalMediaStore:
+    @pytest.mark.asyncio
+    async def test_put_and_get(self, tmp_path):
+        store = LocalMediaStore(str(tmp_path))
+
+        key = await store.put(DATA, ext="png")
+
+        assert key == content_key(DATA, "png")
+        assert (tmp_path / DIGEST[:2] / f"{DIGEST}.png").read_bytes() == DATA
+        assert await store.exists(key)
+        assert await store.get(key) == DATA
+
+    @pytest.mark.asyncio
+    async def test_missing_key(self, tmp_path):
+        store = LocalMediaStore(str(tmp_path))
+
+        assert await store.get("ab/missing.png") is None
+        assert not await store.exists("ab/missing.png")
+
+    @pytest.mark.asyncio
+    async def test_existing_content_is_not_rewritten(self, tmp_path):
+        store = LocalMediaStore(str(tmp_path))
+        key = await store.put(DATA)
+
+        with patch.object(store, "write", new_callable=AsyncMock) as mock_write:
+            assert await store.put(DATA) == key
+
+        mock_write.assert_not_awaited()
+
+
+class TestS3MediaStore:
+    @pytest.fixture
+    def s3(self):
+        client = MagicMock()
+        client.get_object = AsyncMock()
+        client.head_object = AsyncMock()
+        client.put_object = AsyncMock()
+        client_cm = MagicMock()
+        client_cm.__aenter__ = AsyncMock(return_value=client)
+        client_cm.__aexit__ = AsyncMock(return_value=False)
+        session = MagicMock()
+        session.client = MagicMock(return_value=client_cm)
+        with patch("aioboto3.Session", return_value=session):
+            yield client, session, client_cm
+
+    @pytest.mark.asyncio
+    async def test_put_uploads_missing_object(self, s3):
+        client, session, client_cm = s3
+        client.head_object.side_effect = _client_error("404")
+        store = S3MediaStore("media-bucket", prefix="media", endpoint_url="http://minio:9000")
+
+        key = await store.put(DATA, ext="png")
+        await store.close()
+
+        session.client.assert_called_once_with("s3", endpoint_url="http://minio:9000", region_name=None)
+        client.put_object.assert_awaited_once_with(
+            Bucket="media-bucket", Key=f"media/{key}", Body=DATA, ContentType="image/png"
+        )
+        client_cm.__aexit__.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_put_skips_existing_object(self, s3):
+        client, _, _ = s3
+        store = S3MediaStore("media-bucket")
+
+        await store.put(DATA)
+
+        client.put_object.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_get(self, s3):
+        client, _, _ = s3
+        body = MagicMock()
+        body.__aenter__ = AsyncMock(return_value=body)
+        body.__aexit__ = AsyncMock(return_value=False)
+        body.read = AsyncMock(return_value=DATA)
+        client.get_object.return_value = {"Body": body}
+        store = S3MediaStore("media-bucket", prefix="media")
+
+        assert await store.get("ab/abc.png") == DATA
+        client.get_object.assert_awaited_once_with(Bucket="media-bucket", Key="media/ab/abc.png")
+
+    @pytest.mark.asyncio
+    async def test_get_missing_object(self, s3):
+        client, _, _ = s3
+        client.get_object.side_effect = _client_error("NoSuchKey")
+        store = S3MediaStore("media-bucket")
+
+        assert await store.get("ab/abc.png") is None
+
+    @pytest.mark.asyncio
+    async def test_other_errors_propagate(self, s3):
+        client, _, _ = s3
+        client.head_object.side_effect = _client_error("AccessDenied")
+        store = S3MediaStore("media-bucket")
+
+        with pytest.raises(ClientError):
+            await store.exists("ab/abc.png")
+
+
+class TestGetMediaStore:
+    def test_disabled_by_default(self):
+        with patch.object(media_store.settings, "MEDIA_STORE_BACKEND", ""):
+            assert media_store.get_media_store() is None
+
+    @pytest.mark.asyncio
+    async def test_local_backend_is_reused(self, tmp_path):
+        with patch.object(media_store.settings, "MEDIA_STORE_BACKEND", "local"), \
+                patch.object(media_store.settings, "MEDIA_STORE_LOCAL_DIR", str(tmp_path)):
+            store = media_store.get_media_store()
+            assert isinstance(store, LocalMediaStore)
+            assert media_store.get_media_store() is store
+            await media_store.close_media_store()
+
+        assert media_store._store is None
+
+    def test_unknown_backend(self):
+        with patch.object(media_store.settings, "MEDIA_STORE_BACKEND", "ftp"):
+            with pytest.raises(ValueError):
+                media_store.get_media_store()
@@ -72,6 +72,47 @@ class TestDownloadFileByMetadataItem:
         assert isinstance(result, NamedBytesIO)
 
 
+    @pytest.mark.asyncio
+    async def test_request_headers_are_per_call(self):
+        from fastfetchbot_shared.utils.network import HEADERS, download_file_by_metadata_item
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = b"fake image data"
+
+        mock_client = AsyncMock()
+        mock_client.get = AsyncMock(return_value=mock_response)
+        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+        mock_client.__aexit__ = AsyncMock(return_value=False)
+        default_headers = dict(HEADERS)
+
+        with patch("fastfetchbot_shared.utils.network.httpx.AsyncClient", return_value=mock_client):
+            await download_file_by_metadata_item(
+                url="https://i.redd.it/a.jpg",
+                data={"url": "https://www.reddit.com/r/test/comments/abc/", "category": "reddit"},
+            )
+            await download_file_by_metadata_item(
+                url="https://example.com/b.jpg",
+                data={"url": "https://example.com/post", "category": "twitter"},
+                headers={"Cookie": "a=1"},
+            )
+
+        reddit_headers, other_headers = [c.kwargs["headers"] for c in mock_client.get.call_args_list]
+        assert reddit_headers["Referer"] == "https://www.reddit.com/r/test/comments/abc/"
+        assert reddit_headers["Accept"] == "image/avif,image/webp,*/*"
+        assert "Cookie" not in reddit_headers
+        assert other_headers["Referer"] == "https://example.com/post"
+        assert other_headers["Accept"] == HEADERS["Accept"]
+        assert other_headers["Cookie"] == "a=1"
+        assert dict(HEADERS) == default_headers
+
+    def test_default_headers_are_read_only(self):
+        from fastfetchbot_shared.utils.network import HEADERS
+
+        with pytest.raises(TypeError):
+            HEADERS["Referer"] = "https://example.com"
+
+
 class TestGetResponseJson:
     @pytest.mark.asyncio
     async def test_exception_returns_none_and_logs(self):
@@ -0,0 +1,84 @@
+"""Tests for packages/shared/fastfetchbot_shared/utils/telemetry.py"""
+
+from unittest.mock import patch
+
+import prometheus_client
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from fastfetchbot_shared.utils import telemetry
+
+
+def _count(stage_name: str, status: str) -> float:
+    value = prometheus_client.REGISTRY.get_sample_value(
+        "fastfetchbot_stage_duration_seconds_count",
+        {"stage": stage_name, "status": status},
+    )
+    return value or 0.0
+
+
+@pytest.fixture
+def exporter():
+    span_exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(span_exporter))
+    with patch.object(telemetry.trace, "get_tracer", side_effect=lambda name: provider.get_tracer(name)):
+        yield span_exporter
+
+
+class TestStage:
+    def test_observes_duration(self):
+        before = _count("test_ok", "ok")
+
+        with telemetry.stage("test_ok"):
+            pass
+
+        assert _count("test_ok", "ok") == before + 1
+
+    def test_error_status_and_reraises(self):
+        before = _count("test_error", "error")
+
+        with pytest.raises(ValueError):
+            with telemetry.stage("test_error"):
+                raise ValueError("boom")
+
+        assert _count("test_error", "error") == before + 1
+
+    def test_records_span_with_attributes(self, exporter):
+        with telemetry.stage("scrape", source="twitter", job_id=None):
+            pass
+
+        (span,) = exporter.get_finished_spans()
+        assert span.name == "scrape"
+        assert dict(span.attributes) == {"source": "twitter"}
+
+    def test_parent_carrier_joins_trace(self, exporter):
+        with telemetry.stage("enqueue"):
+            carrier = telemetry.inject_context()
+
+        # Continued elsewhere, e.g. in the worker, with no current span
+        with telemetry.stage("scrape_and_enrich", parent=carrier):
+            pass
+
+        enqueue_span, worker_span = exporter.get_finished_spans()
+        assert "traceparent" in carrier
+        assert worker_span.context.trace_id == enqueue_span.context.trace_id
+        assert worker_span.parent.span_id == enqueue_span.context.span_id
+
+
+class TestRenderMetrics:
+    def test_exposes_stage_histogram(self):
+        telemetry.observe("test_render", 0.2)
+
+        body, content_type = telemetry.render_metrics()
+
+        assert content_type.startswith("text/plain")
+        # Label order in the exposition differs between prometheus_client versions
+        buckets = [
+            line for line in body.decode().splitlines()
+            if line.startswith("fastfetchbot_stage_duration_seconds_bucket{")
+            and 'stage="test_render"' in line and 'status="ok"' in line
+        ]
+        assert any('le="0.25"' in line and line.endswith(" 1.0") for line in buckets)
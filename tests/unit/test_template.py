@@ -0,0 +1,81 @@
+"""Tests for packages/shared/fastfetchbot_shared/utils/template.py"""
+
+import os
+from unittest.mock import patch
+
+import pytest
+from jinja2 import StrictUndefined, UndefinedError
+
+from fastfetchbot_shared.utils.template import (
+    create_template_environment,
+    precompile_templates,
+)
+
+
+@pytest.fixture
+def templates_dir(tmp_path):
+    directory = tmp_path / "templates"
+    directory.mkdir()
+    (directory / "a.jinja2").write_text("Hello {{ data.name }}")
+    (directory / "b.jinja2").write_text("{% if data.flag %}on{% endif %}")
+    (directory / "notes.txt").write_text("not a template")
+    return str(directory)
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    directory = tmp_path / "bytecode"
+    with patch("fastfetchbot_shared.utils.template.settings.TEMPLATE_BYTECODE_CACHE_DIR", str(directory)):
+        yield directory
+
+
+class TestCreateTemplateEnvironment:
+    def test_writes_namespaced_bytecode_cache(self, templates_dir, cache_dir):
+        env = create_template_environment(templates_dir, cache_namespace="test")
+
+        assert env.get_template("a.jinja2").render(data={"name": "x"}) == "Hello x"
+        cache_files = os.listdir(cache_dir)
+        assert len(cache_files) == 1
+        assert cache_files[0].startswith("test-")
+
+    def test_second_environment_loads_from_cache(self, templates_dir, cache_dir):
+        create_template_environment(templates_dir, cache_namespace="test").get_template("a.jinja2")
+        env = create_template_environment(templates_dir, cache_namespace="test")
+
+        with patch.object(env, "_compile", wraps=env._compile) as mock_compile:
+            env.get_template("a.jinja2")
+
+        mock_compile.assert_not_called()
+
+    def test_auto_reload_disabled(self, templates_dir, cache_dir):
+        env = create_template_environment(templates_dir, cache_namespace="test")
+
+        assert env.auto_reload is False
+
+    def test_lenient_undefined_by_default(self, templates_dir, cache_dir):
+        with patch("fastfetchbot_shared.utils.template.settings.TEMPLATE_STRICT_UNDEFINED", False):
+            env = create_template_environment(templates_dir, cache_namespace="test")
+
+        assert env.get_template("a.jinja2").render(data={}) == "Hello "
+
+    def test_strict_undefined_raises(self, templates_dir, cache_dir):
+        env = create_template_environment(templates_dir, cache_namespace="test", strict_undefined=True)
+
+        assert env.undefined is StrictUndefined
+        with pytest.raises(UndefinedError):
+            env.get_template("a.jinja2").render(data={})
+
+    def test_unwritable_cache_dir_disables_cache(self, templates_dir):
+        with patch("fastfetchbot_shared.utils.template.os.makedirs", side_effect=PermissionError("denied")):
+            env = create_template_environment(templates_dir, cache_namespace="test")
+
+        assert env.bytecode_cache is None
+        assert env.get_template("a.jinja2").render(data={"name": "x"}) == "Hello x"
+
+
+class TestPrecompileTemplates:
+    def test_loads_every_jinja2_template(self, templates_dir, cache_dir):
+        env = create_template_environment(templates_dir, cache_namespace="test")
+
+        assert precompile_templates(env) == 2
+        assert len(os.listdir(cache_dir)) == 2